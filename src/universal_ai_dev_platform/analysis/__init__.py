@@ -5,7 +5,30 @@ Project analysis and intelligence for the Universal AI Development Platform.
 """
 
 from .project_scanner.universal_analyzer import UniversalProjectAnalyzer
+from .project_scanner.file_index import ProjectFileIndex
+from .project_scanner.scan_cache import ScanCache
+from .project_scanner.content_matcher import MultiPatternMatcher
+from .project_scanner.ignore_rules import IgnoreMatcher
+from .project_scanner.syntax_parser import SyntaxParser
+from .project_scanner.dependency_graph import DependencyGraph
+from .project_scanner.vulnerability_index import VulnerabilityIndex
+from .project_scanner.columnar_export import AnalysisTableBuilder, ParquetExporter
+from .project_scanner.result_store import AnalysisResultStore
+from .project_scanner.fingerprint import ProjectFingerprint, changed_paths, fingerprint_project
 
 __all__ = [
-    "UniversalProjectAnalyzer"
+    "UniversalProjectAnalyzer",
+    "ProjectFileIndex",
+    "ScanCache",
+    "MultiPatternMatcher",
+    "IgnoreMatcher",
+    "SyntaxParser",
+    "DependencyGraph",
+    "VulnerabilityIndex",
+    "AnalysisTableBuilder",
+    "ParquetExporter",
+    "AnalysisResultStore",
+    "ProjectFingerprint",
+    "changed_paths",
+    "fingerprint_project"
 ]
\ No newline at end of file
@@ -5,7 +5,43 @@ Universal project analysis and scanning capabilities.
 """
 
 from .universal_analyzer import UniversalProjectAnalyzer
+from .file_index import ProjectFileIndex
+from .scan_cache import ScanCache
+from .content_matcher import MultiPatternMatcher
+from .ignore_rules import IgnoreMatcher
+from .syntax_parser import SyntaxParser
+from .dependency_graph import DependencyGraph
+from .vulnerability_index import VulnerabilityIndex
+from .columnar_export import AnalysisTableBuilder, ParquetExporter
+from .result_store import AnalysisResultStore
+from .fingerprint import ProjectFingerprint, changed_paths, fingerprint_project
+from .size_distribution import SizeDistribution
+from .workspace import find_package_roots
+from .suffix_census import SuffixCensus, SuffixClassifier
+from .stage_registry import AnalysisStage, StageRegistry
+from .stage_profiler import AnalysisProfiler, StageProfile
 
 __all__ = [
-    "UniversalProjectAnalyzer"
+    "UniversalProjectAnalyzer",
+    "ProjectFileIndex",
+    "ScanCache",
+    "MultiPatternMatcher",
+    "IgnoreMatcher",
+    "SyntaxParser",
+    "DependencyGraph",
+    "VulnerabilityIndex",
+    "AnalysisTableBuilder",
+    "ParquetExporter",
+    "AnalysisResultStore",
+    "ProjectFingerprint",
+    "changed_paths",
+    "fingerprint_project",
+    "SizeDistribution",
+    "find_package_roots",
+    "SuffixCensus",
+    "SuffixClassifier",
+    "AnalysisStage",
+    "StageRegistry",
+    "AnalysisProfiler",
+    "StageProfile"
 ]
\ No newline at end of file
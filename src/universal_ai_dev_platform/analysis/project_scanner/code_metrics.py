@@ -0,0 +1,330 @@
+"""
+Code Metrics
+
+Per-file code metrics and their project-wide aggregation: McCabe cyclomatic complexity
+per function (from ast for Python and from tree-sitter trees for other languages),
+lines of code, and near-duplicate detection. Duplication uses token shingles hashed
+with a Rabin-Karp rolling hash, summarized per file as a one-permutation MinHash
+signature and grouped through a banded LSH index, so comparing files never needs
+more than the fixed-size signatures.
+"""
+
+import ast
+import logging
+import re
+import zlib
+from collections import defaultdict
+from heapq import nlargest
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .syntax_parser import SyntaxParser
+
+logger = logging.getLogger(__name__)
+
+# Bump when per-file metrics change meaning
+CODE_METRICS_VERSION = 1
+
+# Tokens per shingle, and the minimum number of shingles for a duplication signature
+SHINGLE_TOKENS = 16
+MIN_SHINGLES = 64
+
+# MinHash signature length and LSH banding (bands * rows == NUM_BINS)
+NUM_BINS = 64
+LSH_BANDS = 16
+
+_HASH_BITS = 61
+_MODULUS = (1 << _HASH_BITS) - 1  # Mersenne prime
+_BASE = 1_000_003
+_BIN_SHIFT = _HASH_BITS - (NUM_BINS.bit_length() - 1)
+_EMPTY_BIN = 1 << _HASH_BITS
+
+_TOKEN = re.compile(rb"[A-Za-z_$][\w$]*|\d[\w.]*|\S")
+
+# Python decision points (BoolOp and comprehensions are counted separately)
+_PYTHON_BRANCHES = (ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler,
+                    ast.match_case)
+_PYTHON_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+_JS_RULES = {
+    "functions": {"function_declaration", "function_expression", "arrow_function",
+                  "method_definition", "generator_function_declaration"},
+    "branches": {"if_statement", "for_statement", "for_in_statement", "while_statement",
+                 "do_statement", "switch_case", "catch_clause", "ternary_expression"},
+}
+
+# Grammar key -> function node types and decision point node types
+COMPLEXITY_NODE_TYPES = {
+    "javascript": _JS_RULES,
+    "typescript": _JS_RULES,
+    "tsx": _JS_RULES,
+    "rust": {
+        "functions": {"function_item", "closure_expression"},
+        "branches": {"if_expression", "for_expression", "while_expression", "match_arm",
+                     "try_expression"},
+    },
+    "go": {
+        "functions": {"function_declaration", "method_declaration", "func_literal"},
+        "branches": {"if_statement", "for_statement", "expression_case", "type_case",
+                     "communication_case"},
+    },
+}
+
+# Short-circuit operators that add a decision point
+_BOOLEAN_OPERATORS = {"&&", "||", "??"}
+
+
+def measure_source(file_path: str, source: bytes,
+                   syntax_parser: Optional[SyntaxParser] = None) -> Dict[str, Any]:
+    """
+    Compute the metrics of one source file.
+    
+    Args:
+        file_path: Path of the file, used to pick the parser
+        source: File contents
+        syntax_parser: Tree-sitter parser pool for non-Python languages
+    
+    Returns:
+        {"loc": non-blank lines, "functions": [[name, complexity, line], ...],
+         "signature": MinHash signature or None for files too small to compare}
+    """
+    if file_path.endswith((".py", ".pyw")):
+        functions = python_function_complexities(source)
+    elif syntax_parser is not None:
+        parsed = syntax_parser.parse_tree(file_path, source)
+        functions = tree_function_complexities(*parsed) if parsed else []
+    else:
+        functions = []
+    
+    return {
+        "loc": sum(1 for line in source.split(b"\n") if line.strip()),
+        "functions": functions,
+        "signature": minhash_signature(shingle_hashes(source))
+    }
+
+
+def python_function_complexities(source: bytes) -> List[List[Any]]:
+    """
+    Cyclomatic complexity of every Python function, including methods and nested functions.
+    
+    Returns:
+        [name, complexity, line] per function in source order; empty on syntax errors
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    
+    functions = []
+    # (node, index of the enclosing function in `functions` or -1); one pass over the tree
+    stack = [(node, -1) for node in reversed(tree.body)]
+    while stack:
+        node, owner = stack.pop()
+        if isinstance(node, _PYTHON_FUNCTIONS):
+            functions.append([node.name, 1, node.lineno])
+            owner = len(functions) - 1
+        elif isinstance(node, ast.ClassDef):
+            owner = -1  # Methods are measured on their own
+        elif owner >= 0:
+            if isinstance(node, _PYTHON_BRANCHES):
+                functions[owner][1] += 1
+            elif isinstance(node, ast.BoolOp):
+                functions[owner][1] += len(node.values) - 1
+            elif isinstance(node, ast.comprehension):
+                functions[owner][1] += 1 + len(node.ifs)
+        stack.extend((child, owner) for child in reversed(list(ast.iter_child_nodes(node))))
+    return functions
+
+
+def tree_function_complexities(grammar: str, tree: Any) -> List[List[Any]]:
+    """
+    Cyclomatic complexity of every function in a tree-sitter tree.
+    
+    Returns:
+        [name, complexity, line] per function in source order
+    """
+    rules = COMPLEXITY_NODE_TYPES.get(grammar)
+    if rules is None:
+        return []
+    function_types, branch_types = rules["functions"], rules["branches"]
+    
+    functions = []
+    # (node, index of the enclosing function in `functions` or -1)
+    stack = [(tree.root_node, -1)]
+    while stack:
+        node, owner = stack.pop()
+        node_type = node.type
+        if node_type in function_types and node.is_named:
+            name = node.child_by_field_name("name")
+            functions.append([
+                name.text.decode("utf-8", errors="ignore") if name is not None else "<anonymous>",
+                1, node.start_point[0] + 1
+            ])
+            owner = len(functions) - 1
+        elif owner >= 0:
+            if node_type in branch_types:
+                functions[owner][1] += 1
+            elif node_type == "binary_expression":
+                operator = node.child_by_field_name("operator")
+                if operator is not None and operator.type in _BOOLEAN_OPERATORS:
+                    functions[owner][1] += 1
+        stack.extend((child, owner) for child in reversed(node.children))
+    return functions
+
+
+def shingle_hashes(source: bytes, size: int = SHINGLE_TOKENS) -> Set[int]:
+    """Rolling hashes of every run of `size` consecutive tokens."""
+    token_ids = list(map(zlib.crc32, _TOKEN.findall(source)))
+    if len(token_ids) < size:
+        return set()
+    
+    leading_power = pow(_BASE, size - 1, _MODULUS)
+    value = 0
+    for token_id in token_ids[:size]:
+        value = (value * _BASE + token_id) % _MODULUS
+    hashes = {value}
+    for outgoing, incoming in zip(token_ids[:len(token_ids) - size], token_ids[size:], strict=True):
+        value = ((value - outgoing * leading_power) * _BASE + incoming) % _MODULUS
+        hashes.add(value)
+    return hashes
+
+
+def minhash_signature(hashes: Set[int]) -> Optional[List[int]]:
+    """
+    One-permutation MinHash signature of a shingle set.
+    
+    The hash space is split into NUM_BINS bins by the leading bits and the minimum of
+    each bin is kept. Empty bins borrow the value of the next non-empty bin, offset by
+    the distance, so signatures of similar sets stay comparable bin by bin.
+    
+    Returns:
+        NUM_BINS integers, or None when the set has fewer than MIN_SHINGLES hashes
+    """
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    
+    bins = [_EMPTY_BIN] * NUM_BINS
+    for value in hashes:
+        slot = value >> _BIN_SHIFT
+        if value < bins[slot]:
+            bins[slot] = value
+    
+    signature = list(bins)
+    for slot in range(NUM_BINS):
+        distance = 1
+        while signature[slot] == _EMPTY_BIN:
+            borrowed = bins[(slot + distance) % NUM_BINS]
+            if borrowed != _EMPTY_BIN:
+                signature[slot] = borrowed + distance * _MODULUS
+            distance += 1
+    return signature
+
+
+def signature_similarity(first: List[int], second: List[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(a == b for a, b in zip(first, second, strict=True)) / NUM_BINS
+
+
+class MinHashLSH:
+    """
+    Banded locality-sensitive hashing index over MinHash signatures.
+    
+    Files whose signatures agree on every row of at least one band share a bucket and
+    become candidates; candidates are confirmed by the estimated similarity.
+    """
+    
+    def __init__(self, bands: int = LSH_BANDS):
+        self.bands = bands
+        self.rows = NUM_BINS // bands
+        self.signatures: Dict[str, List[int]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = defaultdict(list)
+    
+    def add(self, key: str, signature: List[int]):
+        self.signatures[key] = signature
+        for band in range(self.bands):
+            rows = tuple(signature[band * self.rows:(band + 1) * self.rows])
+            self._buckets[(band, rows)].append(key)
+    
+    def near_duplicates(self, threshold: float) -> List[Tuple[str, str, float]]:
+        """
+        Pairs of keys with an estimated similarity of at least `threshold`.
+        
+        Within a bucket every key is compared to the bucket's first key only, which keeps
+        large buckets (templates, generated files) linear; the other bands still catch
+        pairs that are missed this way.
+        
+        Returns:
+            (key, key, similarity) tuples, each pair once
+        """
+        pairs = {}
+        for keys in self._buckets.values():
+            anchor = keys[0]
+            for key in keys[1:]:
+                pair = (anchor, key) if anchor < key else (key, anchor)
+                if pair not in pairs:
+                    pairs[pair] = signature_similarity(self.signatures[anchor], self.signatures[key])
+        return [(a, b, similarity) for (a, b), similarity in pairs.items() if similarity >= threshold]
+
+
+def aggregate_metrics(file_metrics: Dict[str, Dict[str, Any]], complexity_threshold: int = 10,
+                      duplicate_threshold: float = 0.8, top: int = 10) -> Dict[str, Any]:
+    """
+    Combine per-file metrics into the project complexity_metrics dict.
+    
+    Args:
+        file_metrics: Result of measure_source per relative path
+        complexity_threshold: Complexity above which a function counts as complex
+        duplicate_threshold: Estimated similarity from which two files are duplicates
+        top: Number of most complex functions and duplicate pairs to list
+    
+    Returns:
+        Aggregated metrics; duplication_ratio is the share of lines of code in files
+        that have a near-duplicate
+    """
+    total_loc = 0
+    complexities = []
+    lsh = MinHashLSH()
+    for rel_path, metrics in file_metrics.items():
+        total_loc += metrics["loc"]
+        complexities.extend(
+            (complexity, rel_path, name, line) for name, complexity, line in metrics["functions"]
+        )
+        if metrics["signature"] is not None:
+            lsh.add(rel_path, metrics["signature"])
+    
+    duplicates = lsh.near_duplicates(duplicate_threshold)
+    duplicated_files = {path for pair in duplicates for path in pair[:2]}
+    duplicated_loc = sum(file_metrics[path]["loc"] for path in duplicated_files)
+    
+    values = [entry[0] for entry in complexities]
+    return {
+        "cyclomatic_complexity": round(sum(values) / len(values), 2) if values else 1.0,
+        "max_cyclomatic_complexity": max(values, default=0),
+        "function_count": len(values),
+        "complex_function_count": sum(1 for value in values if value > complexity_threshold),
+        "most_complex_functions": [
+            {"path": path, "function": name, "line": line, "complexity": complexity}
+            for complexity, path, name, line in nlargest(top, complexities)
+        ],
+        "lines_of_code": total_loc,
+        "file_count": len(file_metrics),
+        "duplication_ratio": round(duplicated_loc / total_loc, 4) if total_loc else 0.0,
+        "duplicate_files": [
+            [a, b, round(similarity, 2)]
+            for a, b, similarity in nlargest(top, duplicates, key=lambda pair: pair[2])
+        ]
+    }
+
+
+# Parser pool of the current metrics worker process, created by _init_metrics_worker
+_worker_parser: Optional[SyntaxParser] = None
+
+
+def _init_metrics_worker(languages: Dict[str, List[str]]):
+    """Process pool initializer: one tree-sitter parser pool per worker."""
+    global _worker_parser
+    _worker_parser = SyntaxParser(languages)
+
+
+def _measure_shard(items: Iterable[Tuple[str, bytes]]) -> List[Dict[str, Any]]:
+    """Measure a shard of (path, source) pairs in a worker process."""
+    return [measure_source(path, source, _worker_parser) for path, source in items]
@@ -0,0 +1,333 @@
+"""
+Columnar Export
+
+Fleet-wide export of ProjectAnalysis results as Arrow tables and Parquet files with a
+fixed schema, so the results of thousands of projects can be queried with DuckDB or
+pandas instead of parsing one JSON document per project. Scalar fields of each
+analysis, its TechnologyStack and its ProjectHealth become one row of the "projects"
+table; list-shaped results go to long tables keyed by project_path.
+
+Values are appended straight into per-column lists (no asdict/JSON round trip) and
+coerced to the declared column type, so the schema does not drift with the data.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+from .universal_analyzer import ProjectAnalysis
+
+# Optional columnar dependencies
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Bump when columns are renamed, removed or change type; adding columns is compatible
+EXPORT_SCHEMA_VERSION = 1
+
+# Column types: "string", "int64", "float64" or "list<string>"
+ColumnSpec = Tuple[str, str, Union[str, Callable[[ProjectAnalysis], Any]]]
+
+# projects table: (column, type, dotted path into the analysis or a getter)
+PROJECT_COLUMNS: List[ColumnSpec] = [
+    ("project_path", "string", "project_path"),
+    ("project_name", "string", "project_name"),
+    ("project_type", "string", "project_type"),
+    ("estimated_complexity", "string", "estimated_complexity"),
+    ("analyzer_version", "string", "analysis_metadata.analyzer_version"),
+    ("files_indexed", "int64", "analysis_metadata.files_indexed"),
+    # TechnologyStack
+    ("primary_language", "string", "technology_stack.primary_language"),
+    ("secondary_languages", "list<string>", "technology_stack.secondary_languages"),
+    ("frameworks", "list<string>", "technology_stack.frameworks"),
+    ("databases", "list<string>", "technology_stack.databases"),
+    ("build_tools", "list<string>", "technology_stack.build_tools"),
+    ("package_managers", "list<string>", "technology_stack.package_managers"),
+    ("deployment_targets", "list<string>", "technology_stack.deployment_targets"),
+    ("development_tools", "list<string>", "technology_stack.development_tools"),
+    ("technology_confidence", "float64", "technology_stack.confidence_score"),
+    # ProjectHealth
+    ("health_overall_score", "float64", "health_assessment.overall_score"),
+    ("health_code_quality", "float64", "health_assessment.code_quality"),
+    ("health_security_score", "float64", "health_assessment.security_score"),
+    ("health_performance_score", "float64", "health_assessment.performance_score"),
+    ("health_maintainability_score", "float64", "health_assessment.maintainability_score"),
+    ("health_test_coverage", "float64", "health_assessment.test_coverage"),
+    ("health_documentation_score", "float64", "health_assessment.documentation_score"),
+    ("health_dependency_health", "float64", "health_assessment.dependency_health"),
+    ("duplicate_clusters", "int64", "health_assessment.duplicate_files.clusters"),
+    ("duplicate_bytes", "int64", "health_assessment.duplicate_files.redundant_bytes"),
+    # File structure and code metrics
+    ("total_files", "int64", "file_structure.total_files"),
+    ("directory_depth", "int64", "file_structure.depth"),
+    ("organization_score", "float64", "file_structure.organization_score"),
+    ("total_bytes", "int64", "file_structure.size_distribution.total_bytes"),
+    ("large_files", "int64", "file_structure.size_distribution.large_files.count"),
+    ("lines_of_code", "int64", "complexity_metrics.lines_of_code"),
+    ("function_count", "int64", "complexity_metrics.function_count"),
+    ("cyclomatic_complexity", "float64", "complexity_metrics.cyclomatic_complexity"),
+    ("max_cyclomatic_complexity", "int64", "complexity_metrics.max_cyclomatic_complexity"),
+    ("complex_function_count", "int64", "complexity_metrics.complex_function_count"),
+    ("duplication_ratio", "float64", "complexity_metrics.duplication_ratio"),
+    # Dependency graph
+    ("dependency_packages", "int64", "dependency_graph.packages"),
+    ("dependency_edges", "int64", "dependency_graph.edges"),
+    ("direct_dependencies", "int64", "dependency_graph.direct_dependencies"),
+    ("transitive_dependencies", "int64", "dependency_graph.transitive_dependencies"),
+    ("dependency_max_depth", "int64", "dependency_graph.max_depth"),
+    ("dependency_cycles", "int64", "dependency_graph.dependency_cycles"),
+    ("vulnerability_count", "int64", lambda analysis: len(analysis.vulnerabilities)),
+]
+
+# Long tables: (column, type); rows come from _long_rows
+LONG_TABLE_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    "architecture_patterns": [
+        ("project_path", "string"), ("pattern_name", "string"), ("confidence", "float64")
+    ],
+    "dependencies": [
+        ("project_path", "string"), ("scope", "string"), ("name", "string")
+    ],
+    "health_issues": [
+        ("project_path", "string"), ("issue", "string")
+    ],
+    "largest_files": [
+        ("project_path", "string"), ("category", "string"), ("path", "string"), ("size", "int64")
+    ],
+    "vulnerabilities": [
+        ("project_path", "string"), ("advisory_id", "string"), ("ecosystem", "string"),
+        ("package", "string"), ("version", "string"), ("severity", "string"),
+        ("summary", "string"), ("fixed_versions", "list<string>")
+    ],
+}
+
+EXPORT_TABLES = ["projects"] + list(LONG_TABLE_COLUMNS)
+
+_COERCE = {
+    "string": str,
+    "int64": int,
+    "float64": float,
+    "list<string>": lambda values: [str(value) for value in values],
+}
+
+
+def export_schema() -> Dict[str, List[Tuple[str, str]]]:
+    """(column, type) pairs of every exported table."""
+    schema = {"projects": [(column, column_type) for column, column_type, _ in PROJECT_COLUMNS]}
+    schema.update(LONG_TABLE_COLUMNS)
+    return schema
+
+
+def _resolve(analysis: ProjectAnalysis, source: Union[str, Callable]) -> Any:
+    """Value at a dotted attribute/key path of an analysis, or None when missing."""
+    if callable(source):
+        return source(analysis)
+    value: Any = analysis
+    for part in source.split("."):
+        value = value.get(part) if isinstance(value, dict) else getattr(value, part, None)
+        if value is None:
+            return None
+    return value
+
+
+def _long_rows(analysis: ProjectAnalysis) -> Dict[str, List[tuple]]:
+    """Rows of the long tables for one analysis, in LONG_TABLE_COLUMNS order."""
+    path = analysis.project_path
+    sizes = analysis.file_structure.get("size_distribution", {})
+    return {
+        "architecture_patterns": [
+            (path, pattern.pattern_name, pattern.confidence)
+            for pattern in analysis.architecture_patterns
+        ],
+        "dependencies": [
+            (path, scope, name)
+            for scope, names in analysis.dependencies.items() for name in names
+        ],
+        "health_issues": [(path, issue) for issue in analysis.health_assessment.issues],
+        "largest_files": [
+            (path, category, file_path, size)
+            for category, files in sizes.get("largest_by_category", {}).items()
+            for file_path, size in files
+        ],
+        "vulnerabilities": [
+            (path, match["advisory_id"], match["ecosystem"], match["package"], match["version"],
+             match["severity"], match["summary"], match.get("fixed_versions", []))
+            for match in analysis.vulnerabilities
+        ],
+    }
+
+
+class AnalysisTableBuilder:
+    """
+    Accumulates analyses into column lists, one set per exported table.
+    
+    Example:
+        builder = AnalysisTableBuilder()
+        async for result in analyzer.analyze_projects(paths):
+            if result.analysis is not None:
+                builder.add(result.analysis)
+        tables = builder.to_arrow()
+    """
+    
+    def __init__(self):
+        self.schema = export_schema()
+        self.columns: Dict[str, Dict[str, List[Any]]] = {}
+        self.clear()
+    
+    def __len__(self) -> int:
+        """Number of projects added since the last clear."""
+        return len(self.columns["projects"]["project_path"])
+    
+    def clear(self):
+        self.columns = {
+            table: {column: [] for column, _ in columns} for table, columns in self.schema.items()
+        }
+    
+    def add(self, analysis: ProjectAnalysis):
+        """Append one analysis to every table."""
+        projects = self.columns["projects"]
+        for column, column_type, source in PROJECT_COLUMNS:
+            projects[column].append(_coerce(column_type, _resolve(analysis, source)))
+        
+        for table, rows in _long_rows(analysis).items():
+            columns = self.columns[table]
+            for column_index, (column, column_type) in enumerate(self.schema[table]):
+                values = columns[column]
+                values.extend(_coerce(column_type, row[column_index]) for row in rows)
+    
+    def extend(self, analyses: Iterable[ProjectAnalysis]):
+        for analysis in analyses:
+            self.add(analysis)
+    
+    def to_arrow(self) -> Dict[str, "pa.Table"]:
+        """Arrow table per exported table; requires pyarrow."""
+        _require_pyarrow()
+        return {
+            table: pa.Table.from_pydict(columns, schema=arrow_schema(table))
+            for table, columns in self.columns.items()
+        }
+    
+    def to_dataframes(self) -> Dict[str, Any]:
+        """
+        pandas DataFrame per exported table.
+        
+        Integer columns use the nullable Int64 dtype so missing metrics stay missing
+        instead of turning the column into floats.
+        """
+        import pandas as pd
+        
+        frames = {}
+        for table, columns in self.columns.items():
+            frame = pd.DataFrame(columns)
+            for column, column_type in self.schema[table]:
+                if column_type == "int64":
+                    frame[column] = frame[column].astype("Int64")
+                elif column_type == "float64":
+                    frame[column] = frame[column].astype("float64")
+            frames[table] = frame
+        return frames
+
+
+def _coerce(column_type: str, value: Any) -> Any:
+    if value is None:
+        return None
+    return _COERCE[column_type](value)
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Arrow and Parquet export (pip install pyarrow)")
+
+
+def arrow_schema(table: str) -> "pa.Schema":
+    """Arrow schema of an exported table; requires pyarrow."""
+    _require_pyarrow()
+    arrow_types = {
+        "string": pa.string(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "list<string>": pa.list_(pa.string()),
+    }
+    return pa.schema(
+        [(column, arrow_types[column_type]) for column, column_type in export_schema()[table]],
+        metadata={"uai_export_schema_version": str(EXPORT_SCHEMA_VERSION)}
+    )
+
+
+class ParquetExporter:
+    """
+    Streams analyses into one Parquet file per table in a directory.
+    
+    Analyses are buffered and written as a row group every `row_group_size` projects,
+    so memory stays bounded however many projects are exported. Files are only complete
+    after close().
+    
+    Example:
+        with ParquetExporter("results/") as exporter:
+            async for result in analyzer.analyze_projects(paths):
+                if result.analysis is not None:
+                    exporter.add(result.analysis)
+    """
+    
+    def __init__(self, directory: Union[str, Path], row_group_size: int = 500,
+                 compression: str = "zstd"):
+        _require_pyarrow()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.project_count = 0
+        self._builder = AnalysisTableBuilder()
+        self._writers: Dict[str, "pq.ParquetWriter"] = {}
+    
+    def add(self, analysis: ProjectAnalysis):
+        self._builder.add(analysis)
+        self.project_count += 1
+        if len(self._builder) >= self.row_group_size:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered analyses as one row group per table."""
+        if not len(self._builder) and self._writers:
+            return
+        for table, arrow_table in self._builder.to_arrow().items():
+            writer = self._writers.get(table)
+            if writer is None:
+                writer = self._writers[table] = pq.ParquetWriter(
+                    self.directory / f"{table}.parquet", arrow_table.schema,
+                    compression=self.compression
+                )
+            writer.write_table(arrow_table)
+        self._builder.clear()
+    
+    def close(self):
+        """Flush and finish every file; tables are written even when empty."""
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+        logger.info(f"Exported {self.project_count} project analyses to {self.directory}")
+    
+    def __enter__(self) -> "ParquetExporter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def write_parquet(analyses: Iterable[ProjectAnalysis], directory: Union[str, Path],
+                  row_group_size: int = 500) -> Dict[str, Path]:
+    """
+    Export analyses to `<directory>/<table>.parquet`.
+    
+    Returns:
+        Path of the Parquet file per table
+    """
+    with ParquetExporter(directory, row_group_size) as exporter:
+        for analysis in analyses:
+            exporter.add(analysis)
+    return {table: Path(directory) / f"{table}.parquet" for table in EXPORT_TABLES}
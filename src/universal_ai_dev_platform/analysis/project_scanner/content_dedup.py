@@ -0,0 +1,152 @@
+"""
+Content Deduplication
+
+Groups byte-identical files of a project (vendored libraries, generated clients, copied
+configuration) so per-file stages can scan one copy of every blob and fan the result out
+to the other paths. Candidates are narrowed down cheaply before anything is hashed:
+sizes come from the file index, so files with a unique size are never read; files of a
+shared size are compared by their first PREFIX_BYTES, which is their whole content when
+they are small; only larger files whose prefixes collide are hashed in full, with the
+fastest installed content hash. Digests are kept in the scan cache by stat key, so
+unchanged files are not read again on later runs.
+"""
+
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from .file_index import ProjectFileIndex
+from .fingerprint import CONTENT_HASHES, DIGEST_SIZE, content_hash_algorithm
+from .scan_cache import ScanCache
+from .stage_profiler import record_read
+
+logger = logging.getLogger(__name__)
+
+# Bump when grouping changes in a way that invalidates cached digests
+CONTENT_DEDUP_VERSION = "1"
+PREFIX_BYTES = 4096
+DEFAULT_MIN_SIZE = 64  # Smaller files are not worth grouping or reporting
+
+
+def find_duplicate_clusters(index: ProjectFileIndex, file_ids: Iterable[int], cache: Optional[ScanCache] = None,
+                            min_size: int = 1, algorithm: Optional[str] = None,
+                            kind: str = "content") -> List[List[int]]:
+    """
+    Clusters of byte-identical files among the given files.
+    
+    Args:
+        index: Project file index
+        file_ids: Files to compare
+        cache: Optional scan cache for content digests
+        min_size: Files smaller than this many bytes are left out
+        algorithm: Content hash for larger files (default: the fastest installed one)
+        kind: Scan cache kind of the digests. A complete session prunes the entries
+            it did not visit, so callers comparing only some of the project's files
+            (cache misses) use a kind of their own
+    
+    Returns:
+        Clusters of at least two file ids, each in index order, ordered by their first file
+    """
+    algorithm = content_hash_algorithm(algorithm)
+    hash_file = CONTENT_HASHES[algorithm][2]
+    if cache is not None:
+        cache.bind(kind, ScanCache.signature_of([CONTENT_DEDUP_VERSION, algorithm, PREFIX_BYTES]))
+    
+    by_size: Dict[int, List[int]] = defaultdict(list)
+    for file_id in file_ids:
+        if index.sizes[file_id] >= min_size:
+            by_size[index.sizes[file_id]].append(file_id)
+    
+    clusters = []
+    hashed = 0
+    for size, members in by_size.items():
+        if len(members) < 2:
+            continue  # A unique size is a unique content
+        
+        digests: Dict[int, str] = {}
+        pending = []
+        for file_id in members:
+            digest = cache.get(kind, index.paths[file_id], index.stat_key(file_id)) if cache else None
+            if digest is None:
+                pending.append(file_id)
+            else:
+                digests[file_id] = digest
+        
+        # Files whose prefix no other pending file shares cannot match one of them; when
+        # some digests came from the cache, their prefixes are unknown and every pending
+        # file is hashed
+        candidates = pending
+        prefixed = size > PREFIX_BYTES and not digests
+        if prefixed:
+            by_prefix: Dict[bytes, List[int]] = defaultdict(list)
+            for file_id in pending:
+                prefix = _read(index, file_id, PREFIX_BYTES)
+                if prefix is not None:
+                    by_prefix[prefix].append(file_id)
+            candidates = [file_id for group in by_prefix.values() if len(group) > 1 for file_id in group]
+        
+        for file_id in candidates:
+            if size <= PREFIX_BYTES:
+                content = _read(index, file_id, PREFIX_BYTES)
+                digest = hashlib.blake2b(content, digest_size=DIGEST_SIZE).hexdigest() if content is not None else None
+            else:
+                try:
+                    digest = hash_file(index.abs_path(file_id)).hex()
+                    record_read(size, files=0 if prefixed else 1)  # Counted once per file
+                except OSError as e:
+                    logger.debug(f"Could not hash {index.paths[file_id]}: {e}")
+                    digest = None
+            if digest is None:
+                continue
+            hashed += 1
+            digests[file_id] = digest
+            if cache is not None:
+                cache.put(kind, index.paths[file_id], index.stat_key(file_id), digest)
+        
+        by_digest: Dict[str, List[int]] = defaultdict(list)
+        for file_id in members:
+            if file_id in digests:
+                by_digest[digests[file_id]].append(file_id)
+        clusters.extend(group for group in by_digest.values() if len(group) > 1)
+    
+    clusters.sort(key=lambda cluster: cluster[0])
+    logger.debug(f"Found {len(clusters)} duplicate clusters ({hashed} files hashed)")
+    return clusters
+
+
+def cluster_representatives(clusters: List[List[int]]) -> Dict[int, int]:
+    """Map every copy to the first file of its cluster (the one that is scanned)."""
+    return {file_id: cluster[0] for cluster in clusters for file_id in cluster[1:]}
+
+
+def summarize_duplicates(index: ProjectFileIndex, clusters: List[List[int]], top_k: int = 10) -> Dict[str, Any]:
+    """
+    JSON-friendly summary of duplicate clusters, largest waste first.
+    
+    Args:
+        index: Project file index
+        clusters: Clusters from find_duplicate_clusters
+        top_k: Number of clusters listed with their paths
+    """
+    ranked = sorted(clusters, key=lambda cluster: (-index.sizes[cluster[0]] * (len(cluster) - 1), cluster[0]))
+    return {
+        "clusters": len(clusters),
+        "redundant_files": sum(len(cluster) - 1 for cluster in clusters),
+        "redundant_bytes": sum(index.sizes[cluster[0]] * (len(cluster) - 1) for cluster in clusters),
+        "largest_clusters": [
+            {"size": index.sizes[cluster[0]], "paths": [index.paths[file_id] for file_id in cluster]}
+            for cluster in ranked[:top_k]
+        ],
+    }
+
+
+def _read(index: ProjectFileIndex, file_id: int, limit: int) -> Optional[bytes]:
+    try:
+        with open(index.abs_path(file_id), "rb") as f:
+            content = f.read(limit)
+    except OSError as e:
+        logger.debug(f"Could not read {index.paths[file_id]}: {e}")
+        return None
+    record_read(len(content))
+    return content
@@ -0,0 +1,265 @@
+"""
+Content Matcher
+
+Multi-pattern content matching shared by the analyzers. Patterns are compiled once,
+and a literal prefilter decides from a single case-folded copy of the file which
+patterns can match at all; only those are run. Hits are reported as
+(pattern_id, offset) pairs and line context is derived from a newline offset table.
+
+Large files can be matched as bytes-like buffers (typically an mmap) instead of
+decoded text, so only the context around reported matches is ever decoded.
+"""
+
+import logging
+import re
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter
+_IGNORECASE_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+
+# Leading bytes inspected when deciding whether a file is binary
+BINARY_SNIFF_BYTES = 8192
+
+# Buffers are case-folded and scanned for newlines in windows of this size
+_WINDOW_BYTES = 1 << 20
+
+
+def looks_binary(head: bytes) -> bool:
+    """Whether the leading bytes of a file indicate binary content (a NUL byte, as git does)."""
+    return b"\0" in head
+
+
+class MultiPatternMatcher:
+    """
+    Matches a fixed set of regular expressions against file contents.
+    
+    For every pattern the longest literal run that any match must contain is extracted
+    from its parse tree. A file is case-folded once and each distinct literal is looked
+    up with a substring search; patterns whose literal is absent are skipped without
+    running the regex. Patterns without a usable literal are always run.
+    """
+    
+    def __init__(self, patterns: List[str], flags: int = re.IGNORECASE | re.MULTILINE):
+        self.patterns = list(patterns)
+        self.compiled: List[Pattern] = [re.compile(pattern, flags) for pattern in self.patterns]
+        self._flags = flags
+        self._ignorecase = bool(flags & re.IGNORECASE)
+        self._compiled_bytes: Optional[List[Optional[Pattern]]] = None
+        
+        self._unfiltered: List[int] = []
+        self._by_literal: Dict[str, List[int]] = defaultdict(list)
+        for pattern_id, pattern in enumerate(self.patterns):
+            literal = self._required_literal(pattern, flags)
+            if literal is None:
+                self._unfiltered.append(pattern_id)
+            else:
+                self._by_literal[literal].append(pattern_id)
+        
+        logger.debug(f"Compiled {len(self.patterns)} content patterns, "
+                     f"{len(self._unfiltered)} without literal prefilter")
+    
+    def _required_literal(self, pattern: str, flags: int) -> Optional[str]:
+        """Longest literal run at the top level of a pattern, or None if there is none."""
+        try:
+            parsed = sre_parse.parse(pattern, flags)
+        except re.error:
+            return None
+        if parsed.state.flags & re.IGNORECASE and not self._ignorecase:
+            return None  # Inline (?i) would make a case-sensitive prefilter miss matches
+        
+        best: List[str] = []
+        run: List[str] = []
+        for op, value in list(parsed) + [(None, None)]:
+            if op is sre_parse.LITERAL:
+                run.append(chr(value))
+                continue
+            if len(run) > len(best):
+                best = run
+            run = []
+        
+        literal = "".join(best)
+        if not literal:
+            return None
+        if self._ignorecase:
+            # Case folding is only exact for ASCII literals
+            if not literal.isascii():
+                return None
+            literal = literal.lower()
+        return literal
+    
+    def candidates(self, content: str) -> List[int]:
+        """Ids of the patterns that can match somewhere in the content."""
+        text = content
+        if self._ignorecase:
+            if not text.isascii():
+                text = text.translate(_IGNORECASE_FOLD)
+            text = text.lower()
+        
+        pattern_ids = list(self._unfiltered)
+        for literal, literal_ids in self._by_literal.items():
+            if literal in text:
+                pattern_ids.extend(literal_ids)
+        pattern_ids.sort()
+        return pattern_ids
+    
+    def scan(self, content: str) -> Iterator[Tuple[int, int]]:
+        """
+        Find every non-overlapping match of every pattern.
+        
+        Yields:
+            (pattern_id, offset) pairs, grouped by pattern in id order, then by offset
+        """
+        for pattern_id in self.candidates(content):
+            for match in self.compiled[pattern_id].finditer(content):
+                yield pattern_id, match.start()
+    
+    def search(self, content: str) -> List[int]:
+        """Ids of the patterns with at least one match in the content."""
+        return [
+            pattern_id for pattern_id in self.candidates(content)
+            if self.compiled[pattern_id].search(content)
+        ]
+    
+    @property
+    def compiled_bytes(self) -> List[Optional[Pattern]]:
+        """
+        The patterns compiled for UTF-8 bytes, built on first use.
+        
+        Bytes patterns follow ASCII rules: IGNORECASE and character classes only cover
+        ASCII characters. Patterns that cannot be compiled for bytes are None.
+        """
+        if self._compiled_bytes is None:
+            self._compiled_bytes = []
+            for pattern in self.patterns:
+                try:
+                    self._compiled_bytes.append(re.compile(pattern.encode("utf-8"), self._flags))
+                except re.error as e:
+                    logger.debug(f"Content pattern {pattern!r} cannot match bytes: {e}")
+                    self._compiled_bytes.append(None)
+        return self._compiled_bytes
+    
+    def buffer_candidates(self, buffer, end: int) -> List[int]:
+        """
+        Ids of the patterns that can match in buffer[:end].
+        
+        The buffer is case-folded one window at a time, with windows overlapping by the
+        longest literal, so no copy of the whole buffer is made.
+        """
+        remaining = {literal.encode("utf-8"): literal_ids for literal, literal_ids in self._by_literal.items()}
+        overlap = max((len(literal) for literal in remaining), default=1) - 1
+        
+        pattern_ids = list(self._unfiltered)
+        start = 0
+        while remaining and start < end:
+            window = buffer[start:min(end, start + _WINDOW_BYTES + overlap)]
+            if self._ignorecase:
+                window = window.lower()
+            for literal in [literal for literal in remaining if literal in window]:
+                pattern_ids.extend(remaining.pop(literal))
+            start += _WINDOW_BYTES
+        
+        pattern_ids.sort()
+        return [pattern_id for pattern_id in pattern_ids if self.compiled_bytes[pattern_id] is not None]
+    
+    def scan_buffer(self, buffer, end: int) -> Iterator[Tuple[int, int]]:
+        """
+        Like scan, over buffer[:end] of a bytes-like object such as an mmap.
+        
+        Yields:
+            (pattern_id, byte offset) pairs, grouped by pattern in id order, then by offset
+        """
+        for pattern_id in self.buffer_candidates(buffer, end):
+            for match in self.compiled_bytes[pattern_id].finditer(buffer, 0, end):
+                yield pattern_id, match.start()
+
+
+class LineTable:
+    """Newline offset table mapping content offsets to lines and line context."""
+    
+    def __init__(self, content: str):
+        self.content = content
+        self.newlines = array("q")
+        position = content.find("\n")
+        while position != -1:
+            self.newlines.append(position)
+            position = content.find("\n", position + 1)
+    
+    def __len__(self) -> int:
+        return len(self.newlines) + 1
+    
+    def line_of(self, offset: int) -> int:
+        """Zero-based line number containing a content offset."""
+        return bisect_left(self.newlines, offset)
+    
+    def line_start(self, line: int) -> int:
+        return self.newlines[line - 1] + 1 if line > 0 else 0
+    
+    def line_end(self, line: int) -> int:
+        return self.newlines[line] if line < len(self.newlines) else len(self.content)
+    
+    def line(self, line: int) -> str:
+        """Text of a line, without its newline."""
+        return self.content[self.line_start(line):self.line_end(line)]
+    
+    def context(self, line: int, before: int = 2, after: int = 2) -> str:
+        """Text of a line with up to `before`/`after` surrounding lines."""
+        first = max(0, line - before)
+        last = min(len(self) - 1, line + after)
+        return self.content[self.line_start(first):self.line_end(last)]
+
+
+class BufferLines:
+    """
+    Line lookups on buffer[:end] of a bytes-like object, for buffers too large to index.
+    
+    Lines are found by searching for the nearest newlines around an offset, and only
+    the requested lines are decoded.
+    """
+    
+    def __init__(self, buffer, end: int):
+        self.buffer = buffer
+        self.end = end
+    
+    def count(self) -> int:
+        """Number of lines, counting newlines one window at a time."""
+        newlines = 0
+        for start in range(0, self.end, _WINDOW_BYTES):
+            newlines += self.buffer[start:min(self.end, start + _WINDOW_BYTES)].count(b"\n")
+        return newlines + 1
+    
+    def bounds(self, offset: int) -> Tuple[int, int]:
+        """Start and end offsets of the line containing an offset, without its newline."""
+        start = self.buffer.rfind(b"\n", 0, offset) + 1
+        end = self.buffer.find(b"\n", offset, self.end)
+        return start, self.end if end == -1 else end
+    
+    def context(self, offset: int, before: int = 2, after: int = 2) -> str:
+        """Decoded line containing an offset with up to `before`/`after` surrounding lines."""
+        start, end = self.bounds(offset)
+        for _ in range(before):
+            if start == 0:
+                break
+            start = self.bounds(start - 1)[0]
+        for _ in range(after):
+            if end == self.end:
+                break
+            end = self.bounds(end + 1)[1]
+        return decode_text(self.buffer[start:end])
+
+
+def decode_text(data: bytes) -> str:
+    """Decode bytes the way text-mode open(encoding='utf-8', errors='ignore') would."""
+    text = data.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
@@ -0,0 +1,104 @@
+"""
+Content Sampling
+
+Deterministic, stratified ordering of the files a content-based detector reads, and
+the convergence rule that decides how far along that order to go. Files are grouped
+into strata by top-level directory and language; strata take turns in proportion to
+their size times the language's relevance weight, so every area and language of the
+project is represented early while large areas still dominate the sample. Inside a
+stratum files are ordered by a hash of their path, which spreads the sample over
+subdirectories without depending on walk order.
+"""
+
+import logging
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from .file_index import ProjectFileIndex
+
+logger = logging.getLogger(__name__)
+
+# Size of the first batch; every further batch doubles the sample
+CONTENT_SAMPLE_BATCH = 10
+
+# Batches read before the sample may stop on convergence
+CONTENT_SAMPLE_MIN_BATCHES = 2
+
+
+def _stratum_of(rel_path: str, language: str) -> Tuple[str, str]:
+    """Top-level directory ("" for root files) and language of a file."""
+    top, _, rest = rel_path.partition("/")
+    return (top if rest else "", language)
+
+
+def stratified_sample_order(index: ProjectFileIndex, suffix_languages: Mapping[str, str],
+                            language_weights: Mapping[str, float]) -> List[int]:
+    """
+    Order the relevant source files of a project for sampling.
+    
+    A file is relevant when its suffix maps to a language with a positive weight. The
+    k-th file of a stratum h is placed at k / (N_h * w_h), so any prefix of the order is
+    a weighted proportional allocation with at least one file from every stratum.
+    
+    Args:
+        index: Project file index
+        suffix_languages: Language of each relevant suffix
+        language_weights: Relevance weight of each language
+    
+    Returns:
+        File ids, most informative first
+    """
+    strata: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    for file_id in index.source_files():
+        language = suffix_languages.get(index.suffix(file_id))
+        if language is not None and language_weights.get(language, 0) > 0:
+            strata[_stratum_of(index.paths[file_id], language)].append(file_id)
+    
+    keyed = []
+    for stratum, file_ids in strata.items():
+        share = len(file_ids) * language_weights[stratum[1]]
+        file_ids.sort(key=lambda file_id: (zlib.crc32(index.paths[file_id].encode()), file_id))
+        for position, file_id in enumerate(file_ids):
+            keyed.append((position / share, -share, stratum, file_id))
+    
+    keyed.sort()
+    logger.debug(f"Content sample drawn from {len(strata)} strata, {len(keyed)} candidate files")
+    return [file_id for _, _, _, file_id in keyed]
+
+
+def sample_batches(order: Iterable[int], first_batch: int = CONTENT_SAMPLE_BATCH) -> Iterator[List[int]]:
+    """
+    Split a sampling order into batches that double the sample each time.
+    
+    Doubling keeps the number of convergence checks logarithmic in the sample size,
+    and a batch that adds no evidence then means the sample grew by half without
+    changing the estimate, not that a handful of files happened to miss.
+    """
+    batch = []
+    size = first_batch
+    read = 0
+    for file_id in order:
+        batch.append(file_id)
+        if len(batch) >= size:
+            yield batch
+            read += len(batch)
+            batch = []
+            size = read
+    if batch:
+        yield batch
+
+
+def converged(previous: Mapping[str, float], current: Mapping[str, float], batches: int,
+              ceiling: float) -> bool:
+    """
+    Whether a growing sample can stop.
+    
+    The estimates have converged when the last batch left every confidence unchanged,
+    or when every framework seen so far is already at the confidence ceiling.
+    """
+    if batches < CONTENT_SAMPLE_MIN_BATCHES:
+        return False
+    if current and all(value >= ceiling for value in current.values()):
+        return True
+    return dict(previous) == dict(current)
@@ -0,0 +1,1090 @@
+"""
+Dependency Graph
+
+Project dependency graph built from lockfiles and manifests. Packages are interned to
+integer node ids and edges are frozen into CSR arrays (row offsets plus a flat target
+array), so depth, fan-in and transitive closure queries walk typed arrays instead of
+nested dicts.
+
+Lockfiles can be tens of megabytes in monorepos; every parser reads its file
+incrementally. JSON lockfiles go through a small streaming reader that decodes one
+package entry at a time and skips unneeded sections without building them, and the
+line-oriented formats (yarn.lock, pnpm-lock.yaml, poetry.lock, Cargo.lock, go.sum,
+requirements) are parsed line by line. Manifests (package.json, pyproject.toml,
+Cargo.toml, go.mod, pom.xml, build.gradle) contribute the direct dependencies and
+their scope.
+"""
+
+import json
+import logging
+import re
+import tomllib
+from array import array
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+# Bump when parsers or the payload layout change
+DEPENDENCY_GRAPH_VERSION = 1
+
+# Dependency scopes in decreasing precedence; a package keeps its strongest scope
+DEPENDENCY_SCOPES = ("production", "optional", "development")
+
+_JSON_CHUNK_CHARS = 1 << 20
+
+_NON_WHITESPACE = re.compile(r"\S")
+_JSON_STRUCTURAL = re.compile(r'["{}\[\]]')
+_JSON_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+_PYTHON_NAME_SEPARATORS = re.compile(r"[-_.]+")
+_REQUIREMENT = re.compile(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(?:===?\s*([^\s,;]+))?")
+_REQUIREMENTS_FILE = re.compile(r"requirements.*\.txt$")
+_PNPM_V5_KEY = re.compile(r"/?((?:@[^/]+/)?[^/@]+)/(\d[^/_(]*)")
+_GRADLE_DEPENDENCY = re.compile(
+    r"""^\s*(\w+)\s*\(?\s*['"]([^:'"\s]+):([^:'"\s]+)(?::([^:'"\s@]+))?[^'"]*['"]"""
+)
+_GRADLE_SCOPES = {
+    "implementation": "production", "api": "production", "compile": "production",
+    "runtimeOnly": "production", "runtime": "production",
+    "compileOnly": "optional",
+    "testImplementation": "development", "testRuntimeOnly": "development",
+    "testCompileOnly": "development", "testCompile": "development",
+    "androidTestImplementation": "development", "annotationProcessor": "development",
+    "kapt": "development",
+}
+_MAVEN_SCOPES = {"test": "development", "provided": "optional", "system": "optional"}
+
+
+class DependencyGraph:
+    """
+    Interned dependency graph with CSR adjacency.
+    
+    A node is one (ecosystem, name, version) package. A package added without a version
+    resolves to an existing node of that name, so manifests that only name their direct
+    dependencies attach to the exact versions found in lockfiles. Edges are appended to
+    flat arrays and the CSR form is rebuilt on the first query after a change.
+    """
+    
+    def __init__(self):
+        self.ecosystems: List[str] = []
+        self.names: List[str] = []
+        self.versions: List[str] = []
+        self.roots: Dict[int, str] = {}  # Direct dependency -> scope
+        self._ids: Dict[Tuple[str, str, str], int] = {}
+        self._by_name: Dict[Tuple[str, str], int] = {}
+        self._sources = array("I")
+        self._targets = array("I")
+        self._csr: Optional[Tuple[array, array]] = None
+        self._components: Optional[Tuple[array, int]] = None
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def add_package(self, ecosystem: str, name: str, version: str = "") -> int:
+        """
+        Intern a package.
+        
+        Args:
+            ecosystem: Package ecosystem ("npm", "pypi", "cargo", "go", "maven")
+            name: Package name, normalized by the caller
+            version: Resolved version, or "" when only the name is known
+        
+        Returns:
+            Node id of the package
+        """
+        name_key = (ecosystem, name)
+        if not version:
+            package_id = self._by_name.get(name_key)
+            if package_id is not None:
+                return package_id
+        else:
+            package_id = self._ids.get((ecosystem, name, version))
+            if package_id is not None:
+                return package_id
+            # A version-less placeholder of this name becomes the versioned node
+            package_id = self._ids.get((ecosystem, name, ""))
+            if package_id is not None:
+                del self._ids[(ecosystem, name, "")]
+                self.versions[package_id] = version
+                self._ids[(ecosystem, name, version)] = package_id
+                return package_id
+        
+        package_id = len(self.names)
+        self.ecosystems.append(ecosystem)
+        self.names.append(name)
+        self.versions.append(version)
+        self._ids[(ecosystem, name, version)] = package_id
+        self._by_name.setdefault(name_key, package_id)
+        return package_id
+    
+    def add_dependency(self, source: int, target: int):
+        """Record that package `source` depends on package `target`."""
+        if source != target:
+            self._sources.append(source)
+            self._targets.append(target)
+            self._csr = self._components = None
+    
+    def add_root(self, scope: str, package_id: int):
+        """Mark a package as a direct dependency of the project."""
+        current = self.roots.get(package_id)
+        if current is None or DEPENDENCY_SCOPES.index(scope) < DEPENDENCY_SCOPES.index(current):
+            self.roots[package_id] = scope
+    
+    def label(self, package_id: int) -> str:
+        """Display name of a package, with its version when known."""
+        version = self.versions[package_id]
+        return f"{self.names[package_id]}@{version}" if version else self.names[package_id]
+    
+    # CSR queries
+    
+    def adjacency(self) -> Tuple[array, array]:
+        """
+        CSR adjacency of the graph.
+        
+        Returns:
+            (offsets, targets): the dependencies of node n are
+            targets[offsets[n]:offsets[n + 1]], sorted and without duplicates
+        """
+        if self._csr is not None:
+            return self._csr
+        
+        node_count = len(self.names)
+        counts = array("I", bytes(4 * (node_count + 1)))
+        for source in self._sources:
+            counts[source + 1] += 1
+        row_starts = array("I", accumulate(counts))
+        
+        # Counting sort of the edge list by source
+        cursor = row_starts[:-1]
+        grouped = array("I", bytes(4 * len(self._targets)))
+        for source, target in zip(self._sources, self._targets, strict=True):
+            grouped[cursor[source]] = target
+            cursor[source] += 1
+        
+        offsets = array("I", [0])
+        targets = array("I")
+        for node in range(node_count):
+            row = grouped[row_starts[node]:row_starts[node + 1]]
+            targets.extend(sorted(set(row)) if len(row) > 1 else row)
+            offsets.append(len(targets))
+        
+        self._csr = (offsets, targets)
+        return self._csr
+    
+    def dependencies_of(self, package_id: int) -> array:
+        """Direct dependencies of a package."""
+        offsets, targets = self.adjacency()
+        return targets[offsets[package_id]:offsets[package_id + 1]]
+    
+    def transitive_closure(self, sources: Iterable[int]) -> bytearray:
+        """
+        Packages reachable from `sources`, the sources included.
+        
+        Returns:
+            Membership mask indexed by node id
+        """
+        offsets, targets = self.adjacency()
+        reached = bytearray(len(self.names))
+        stack = list(sources)
+        for node in stack:
+            reached[node] = 1
+        while stack:
+            node = stack.pop()
+            for target in targets[offsets[node]:offsets[node + 1]]:
+                if not reached[target]:
+                    reached[target] = 1
+                    stack.append(target)
+        return reached
+    
+    def depths(self) -> array:
+        """
+        Shortest dependency depth of every package: 1 for direct dependencies, 2 for
+        their dependencies and so on; -1 for packages not reachable from the roots.
+        """
+        offsets, targets = self.adjacency()
+        depth = array("i", [-1]) * len(self.names)
+        frontier = list(self.roots)
+        for node in frontier:
+            depth[node] = 1
+        level = 1
+        while frontier:
+            level += 1
+            next_frontier = []
+            for node in frontier:
+                for target in targets[offsets[node]:offsets[node + 1]]:
+                    if depth[target] < 0:
+                        depth[target] = level
+                        next_frontier.append(target)
+            frontier = next_frontier
+        return depth
+    
+    def fan_in(self) -> array:
+        """Number of distinct packages depending on each package."""
+        _, targets = self.adjacency()
+        counts = array("I", bytes(4 * len(self.names)))
+        for target in targets:
+            counts[target] += 1
+        return counts
+    
+    def strongly_connected_components(self) -> Tuple[array, int]:
+        """
+        Strongly connected components (dependency cycles), with an iterative Tarjan walk.
+        
+        Returns:
+            (component id per node, component count); components are numbered in
+            reverse topological order, so a component only depends on lower ids
+        """
+        if self._components is not None:
+            return self._components
+        
+        offsets, targets = self.adjacency()
+        node_count = len(self.names)
+        order = array("i", [-1]) * node_count
+        lowlink = array("I", bytes(4 * node_count))
+        component = array("i", [-1]) * node_count
+        stack: List[int] = []
+        visited = 0
+        count = 0
+        
+        for start in range(node_count):
+            if order[start] >= 0:
+                continue
+            order[start] = lowlink[start] = visited
+            visited += 1
+            stack.append(start)
+            work = [(start, offsets[start])]
+            while work:
+                node, edge = work[-1]
+                if edge < offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    target = targets[edge]
+                    if order[target] < 0:
+                        order[target] = lowlink[target] = visited
+                        visited += 1
+                        stack.append(target)
+                        work.append((target, offsets[target]))
+                    elif component[target] < 0 and order[target] < lowlink[node]:
+                        lowlink[node] = order[target]  # Target is still on the stack
+                    continue
+                
+                work.pop()
+                if work and lowlink[node] < lowlink[work[-1][0]]:
+                    lowlink[work[-1][0]] = lowlink[node]
+                if lowlink[node] == order[node]:
+                    while True:
+                        member = stack.pop()
+                        component[member] = count
+                        if member == node:
+                            break
+                    count += 1
+        
+        self._components = (component, count)
+        return self._components
+    
+    def closure_sizes(self, package_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Number of transitive dependencies of each given package.
+        
+        Instead of one traversal per package, the graph is condensed into its strongly
+        connected components and a bit mask of the packages reaching each component is
+        propagated once in topological order. Components reached by the same packages
+        share a mask, so sizes are summed per distinct mask.
+        """
+        package_ids = list(package_ids)
+        offsets, targets = self.adjacency()
+        component, count = self.strongly_connected_components()
+        
+        masks = [0] * count
+        for bit, package_id in enumerate(package_ids):
+            masks[component[package_id]] |= 1 << bit
+        for node in sorted(range(len(self.names)), key=component.__getitem__, reverse=True):
+            mask = masks[component[node]]
+            if mask:
+                for target in targets[offsets[node]:offsets[node + 1]]:
+                    masks[component[target]] |= mask
+        
+        weights: Dict[int, int] = {}
+        for node in range(len(self.names)):
+            mask = masks[component[node]]
+            if mask:
+                weights[mask] = weights.get(mask, 0) + 1
+        
+        totals = [0] * len(package_ids)
+        for mask, weight in weights.items():
+            while mask:
+                low = mask & -mask
+                totals[low.bit_length() - 1] += weight
+                mask ^= low
+        # Every package reaches itself
+        return {package_id: totals[bit] - 1 for bit, package_id in enumerate(package_ids)}
+    
+    def direct_dependencies(self) -> Dict[str, List[str]]:
+        """Direct dependency names per scope, sorted."""
+        dependencies = {scope: [] for scope in DEPENDENCY_SCOPES}
+        for package_id, scope in self.roots.items():
+            dependencies[scope].append(self.names[package_id])
+        for names in dependencies.values():
+            names.sort()
+        return dependencies
+    
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Summary statistics of the graph.
+        
+        Args:
+            top: Number of most depended-on and heaviest direct dependencies to list
+        
+        Returns:
+            Package, edge and direct/transitive counts, depth statistics, the number of
+            dependency cycles, packages per ecosystem, the packages with the highest fan-in and the direct dependencies
+            pulling in the most transitive dependencies
+        """
+        offsets, targets = self.adjacency()
+        depth = self.depths()
+        reached = [value for value in depth if value > 0]
+        fan_in = self.fan_in()
+        closure_sizes = self.closure_sizes(self.roots)
+        component, count = self.strongly_connected_components()
+        component_sizes = array("I", bytes(4 * count))
+        for value in component:
+            component_sizes[value] += 1
+        
+        ecosystems: Dict[str, int] = {}
+        for ecosystem in self.ecosystems:
+            ecosystems[ecosystem] = ecosystems.get(ecosystem, 0) + 1
+        
+        most_depended_on = sorted(
+            (package_id for package_id in range(len(self.names)) if fan_in[package_id]),
+            key=lambda package_id: (-fan_in[package_id], self.label(package_id))
+        )[:top]
+        heaviest = sorted(
+            (package_id for package_id, size in closure_sizes.items() if size),
+            key=lambda package_id: (-closure_sizes[package_id], self.label(package_id))
+        )[:top]
+        
+        return {
+            "packages": len(self.names),
+            "edges": len(targets),
+            "direct_dependencies": len(self.roots),
+            "transitive_dependencies": len(reached) - len(self.roots),
+            "unreachable_packages": len(self.names) - len(reached),
+            "max_depth": max(reached, default=0),
+            "average_depth": round(sum(reached) / len(reached), 2) if reached else 0.0,
+            "dependency_cycles": sum(1 for size in component_sizes if size > 1),
+            "ecosystems": ecosystems,
+            "most_depended_on": [
+                {"package": self.label(package_id), "dependents": fan_in[package_id]}
+                for package_id in most_depended_on
+            ],
+            "heaviest_dependencies": [
+                {"package": self.label(package_id), "transitive_dependencies": closure_sizes[package_id]}
+                for package_id in heaviest
+            ]
+        }
+    
+    # Serialization
+    
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON-serializable form of the graph, used to cache per-file parses."""
+        return {
+            "packages": [list(package) for package in zip(self.ecosystems, self.names, self.versions, strict=True)],
+            "edges": [self._sources.tolist(), self._targets.tolist()],
+            "roots": [[package_id, scope] for package_id, scope in self.roots.items()]
+        }
+    
+    def merge(self, payload: Dict[str, Any]):
+        """Add the packages, edges and roots of a to_payload() result."""
+        mapping = [self.add_package(*package) for package in payload["packages"]]
+        sources, targets = payload["edges"]
+        for source, target in zip(sources, targets, strict=True):
+            self.add_dependency(mapping[source], mapping[target])
+        for package_id, scope in payload["roots"]:
+            self.add_root(scope, mapping[package_id])
+
+
+class _JsonStream:
+    """
+    Incremental reader over a JSON document.
+    
+    Only the buffered window of the file is held in memory. Callers walk objects key by
+    key with members() and, for every key, consume its value with value(), skip() or a
+    nested members() before asking for the next key.
+    """
+    
+    def __init__(self, file: TextIO, chunk_size: int = _JSON_CHUNK_CHARS):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+    
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping consumed text; False at end of file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """Next non-whitespace character, without consuming it."""
+        while True:
+            match = _NON_WHITESPACE.search(self._buffer, self._pos)
+            if match is not None:
+                self._pos = match.start()
+                return self._buffer[self._pos]
+            self._pos = len(self._buffer)
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+    
+    def _consume(self, expected: str):
+        char = self.peek()
+        if char != expected:
+            raise ValueError(f"Expected {expected!r} in JSON document, found {char!r}")
+        self._pos += 1
+    
+    def value(self) -> Any:
+        """Decode the next value; meant for values that fit comfortably in memory."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number or literal ending at the buffer edge may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+    
+    def skip(self):
+        """Skip the next value without decoding it."""
+        if self.peek() not in "{[":
+            self.value()
+            return
+        
+        depth = 0
+        while True:
+            match = _JSON_STRUCTURAL.search(self._buffer, self._pos)
+            if match is None:
+                self._pos = len(self._buffer)
+                if not self._fill():
+                    raise ValueError("Unexpected end of JSON document")
+                continue
+            char = match.group()
+            self._pos = match.end()
+            if char == '"':
+                tail = _JSON_STRING_TAIL.match(self._buffer, self._pos)
+                while tail is None:
+                    if not self._fill():
+                        raise ValueError("Unterminated string in JSON document")
+                    tail = _JSON_STRING_TAIL.match(self._buffer, self._pos)
+                self._pos = tail.end()
+            elif char in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+    
+    def members(self) -> Iterator[str]:
+        """Iterate over the keys of the next object; each value must be consumed."""
+        self._consume("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self._consume(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or '}}' in JSON object, found {char!r}")
+
+
+# npm
+
+def parse_package_lock(file_path: Path, graph: DependencyGraph):
+    """
+    Parse package-lock.json or npm-shrinkwrap.json (lockfile versions 1 to 3).
+    
+    Entries are keyed by their node_modules location; a dependency resolves the way
+    Node does, to the nearest node_modules folder up the location's ancestors. Entries
+    outside node_modules are the project and its workspaces: their dependencies become
+    direct dependencies instead of graph nodes.
+    """
+    locations: Dict[str, int] = {}
+    links: Dict[str, str] = {}
+    pending: List[Tuple[Optional[int], str, Dict[str, str]]] = []  # (node or None, location, {name: scope})
+    
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        stream = _JsonStream(f)
+        for key in stream.members():
+            if key == "packages":
+                for location in stream.members():
+                    _add_npm_entry(graph, location, stream.value(), locations, links, pending)
+            elif key == "dependencies" and not locations:
+                _read_npm_v1_dependencies(stream, graph, "", locations, pending)
+            else:
+                stream.skip()
+    
+    # Links point at workspaces, which are not graph nodes (-1)
+    for location, target in links.items():
+        locations[location] = locations.get(target, -1)
+    
+    for package_id, location, requested in pending:
+        for name, scope in requested.items():
+            target = _resolve_npm_location(locations, location, name)
+            if target == -1:
+                continue
+            if package_id is not None:
+                if target is not None:
+                    graph.add_dependency(package_id, target)
+            elif scope:
+                graph.add_root(scope, target if target is not None else graph.add_package("npm", name))
+
+
+def _add_npm_entry(graph: DependencyGraph, location: str, entry: Dict[str, Any],
+                   locations: Dict[str, int], links: Dict[str, str],
+                   pending: List[Tuple[Optional[int], str, Dict[str, str]]]):
+    """Record one entry of a v2/v3 "packages" map."""
+    if not isinstance(entry, dict):
+        return
+    if entry.get("link"):
+        links[location] = entry.get("resolved", "")
+        return
+    
+    cut = location.rfind("node_modules/")
+    if cut < 0:
+        # The project itself or one of its workspaces
+        requested = {}
+        for field_name, scope in (("devDependencies", "development"),
+                                  ("optionalDependencies", "optional"),
+                                  ("dependencies", "production")):
+            for name in entry.get(field_name) or {}:
+                requested[name] = scope
+        pending.append((None, location, requested))
+        return
+    
+    name = entry.get("name") or location[cut + len("node_modules/"):]
+    package_id = graph.add_package("npm", name, entry.get("version", ""))
+    locations[location] = package_id
+    requested = {}
+    for field_name in ("dependencies", "optionalDependencies"):
+        for dependency in entry.get(field_name) or {}:
+            requested[dependency] = ""
+    if requested:
+        pending.append((package_id, location, requested))
+
+
+def _read_npm_v1_dependencies(stream: _JsonStream, graph: DependencyGraph, parent: str,
+                              locations: Dict[str, int],
+                              pending: List[Tuple[Optional[int], str, Dict[str, str]]]):
+    """Walk a lockfile v1 "dependencies" tree, mapping it onto node_modules locations."""
+    for name in stream.members():
+        location = f"{parent}/node_modules/{name}" if parent else f"node_modules/{name}"
+        version = ""
+        requires = {}
+        for key in stream.members():
+            if key == "dependencies":
+                _read_npm_v1_dependencies(stream, graph, location, locations, pending)
+            elif key == "version":
+                version = stream.value()
+            elif key == "requires":
+                requires = stream.value()
+            else:
+                stream.skip()
+        package_id = graph.add_package("npm", name, version if isinstance(version, str) else "")
+        locations[location] = package_id
+        if isinstance(requires, dict) and requires:
+            pending.append((package_id, location, {dependency: "" for dependency in requires}))
+
+
+def _resolve_npm_location(locations: Dict[str, int], location: str, name: str) -> Optional[int]:
+    """Node id of `name` as required from `location`, searching up node_modules folders."""
+    base = location
+    while True:
+        candidate = f"{base}/node_modules/{name}" if base else f"node_modules/{name}"
+        package_id = locations.get(candidate)
+        if package_id is not None:
+            return package_id
+        if not base:
+            return None
+        cut = base.rfind("/node_modules/")
+        base = base[:cut] if cut >= 0 else ""
+
+
+def parse_yarn_lock(file_path: Path, graph: DependencyGraph):
+    """Parse a yarn.lock file, classic (v1) or Berry (v2+)."""
+    specifiers: Dict[str, int] = {}
+    pending: List[Tuple[int, List[Tuple[str, str]]]] = []
+    entry: Optional[List[str]] = None
+    version = ""
+    requested: List[Tuple[str, str]] = []
+    in_dependencies = False
+    
+    def finish_entry():
+        if not entry or "@workspace:" in entry[0]:
+            return
+        package_id = graph.add_package("npm", _split_npm_specifier(entry[0])[0], version)
+        for specifier in entry:
+            specifiers[specifier] = package_id
+        if requested:
+            pending.append((package_id, list(requested)))
+    
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            text = line.strip()
+            if not text or text.startswith("#"):
+                continue
+            indent = len(line) - len(line.lstrip(" "))
+            if indent == 0:
+                finish_entry()
+                entry, version, requested, in_dependencies = None, "", [], False
+                if text.endswith(":") and not text.startswith("__metadata"):
+                    entry = [part.strip().strip('"') for part in text[:-1].split(",")]
+            elif entry is None:
+                continue
+            elif indent <= 2:
+                key, value = _yarn_pair(text)
+                in_dependencies = key in ("dependencies", "optionalDependencies") and not value
+                if key == "version":
+                    version = value
+            elif in_dependencies:
+                requested.append(_yarn_pair(text))
+        finish_entry()
+    
+    for package_id, dependencies in pending:
+        for name, requested_range in dependencies:
+            target = specifiers.get(f"{name}@{requested_range}")
+            if target is None:
+                target = specifiers.get(f"{name}@npm:{requested_range}")
+            if target is None:
+                target = graph.add_package("npm", name)
+            graph.add_dependency(package_id, target)
+
+
+def _yarn_pair(text: str) -> Tuple[str, str]:
+    """Split a yarn.lock line into key and value (`key "value"` or `key: value`)."""
+    if text.startswith('"'):
+        end = text.find('"', 1)
+        key, rest = text[1:end], text[end + 1:]
+    else:
+        match = re.match(r"[^\s:]+", text)
+        key = match.group() if match else text
+        rest = text[len(key):]
+    return key, rest.lstrip(":").strip().strip('"')
+
+
+def _split_npm_specifier(specifier: str) -> Tuple[str, str]:
+    """Split "name@range" (names may be scoped, like "@scope/name@range")."""
+    at = specifier.rfind("@")
+    if at <= 0:
+        return specifier, ""
+    return specifier[:at], specifier[at + 1:]
+
+
+def parse_pnpm_lock(file_path: Path, graph: DependencyGraph):
+    """
+    Parse a pnpm-lock.yaml file (lockfile versions 5 to 9).
+    
+    pnpm records exact versions for every dependency, so edges resolve directly to
+    (name, version) nodes. Importers, or the top-level dependency sections of
+    single-project lockfiles, provide the direct dependencies.
+    """
+    section = ""
+    package_id: Optional[int] = None
+    in_dependencies = False
+    scope = ""
+    root_name = ""  # Direct dependency waiting for its nested "version:" line
+    
+    scopes = {"dependencies": "production", "devDependencies": "development",
+              "optionalDependencies": "optional"}
+    
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            text = line.strip()
+            if not text or text.startswith("#"):
+                continue
+            indent = len(line) - len(line.lstrip(" "))
+            key, value = _yaml_pair(text)
+            
+            if indent == 0:
+                section, package_id, in_dependencies, root_name = key, None, False, ""
+                scope = scopes.get(key, "")
+                continue
+            
+            if section in ("packages", "snapshots"):
+                if indent == 2:
+                    name, version = _split_pnpm_key(key)
+                    package_id = graph.add_package("npm", name, version)
+                elif indent == 4:
+                    in_dependencies = key in ("dependencies", "optionalDependencies")
+                elif in_dependencies and package_id is not None and value and not value.startswith("link:"):
+                    target = graph.add_package("npm", key, _pnpm_version(value))
+                    graph.add_dependency(package_id, target)
+                continue
+            
+            # Direct dependencies: "importers: <path>: <scope>: <name>" or "<scope>: <name>"
+            base = 6 if section == "importers" else 2 if scope else -1
+            if section == "importers" and indent == 4:
+                scope = scopes.get(key, "")
+            elif not scope or base < 0:
+                continue
+            elif indent == base:
+                root_name = ""
+                if value.startswith("link:"):
+                    continue
+                if value:
+                    graph.add_root(scope, graph.add_package("npm", key, _pnpm_version(value)))
+                else:
+                    root_name = key
+            elif indent > base and root_name and key == "version" and not value.startswith("link:"):
+                graph.add_root(scope, graph.add_package("npm", root_name, _pnpm_version(value)))
+                root_name = ""
+
+
+def _yaml_pair(text: str) -> Tuple[str, str]:
+    """Split a simple YAML mapping line into unquoted key and value."""
+    if text[0] in "'\"":
+        end = text.find(text[0], 1)
+        key, rest = text[1:end], text[end + 1:]
+        return key, rest.lstrip(":").strip().strip("'\"")
+    key, separator, value = text.partition(": ")
+    if not separator:
+        key = key.rstrip(":")
+    return key, value.strip().strip("'\"")
+
+
+def _split_pnpm_key(key: str) -> Tuple[str, str]:
+    """Name and version of a pnpm package key ("/name@1.0.0", "name@1.0.0(peer@2)" or "/name/1.0.0")."""
+    match = _PNPM_V5_KEY.match(key)
+    if match and key[match.end():match.end() + 1] in ("", "_"):
+        return match.group(1), match.group(2)
+    key = key.lstrip("/").split("(", 1)[0]
+    at = key.rfind("@")
+    return (key[:at], key[at + 1:]) if at > 0 else (key, "")
+
+
+def _pnpm_version(value: str) -> str:
+    """Version without the peer dependency suffix ("1.0.0(react@18.2.0)" or "1.0.0_react@18.2.0")."""
+    return re.split(r"[(_]", value, maxsplit=1)[0]
+
+
+def parse_package_json(file_path: Path, graph: DependencyGraph):
+    """Direct dependencies declared in a package.json manifest."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for field_name, scope in (("dependencies", "production"), ("devDependencies", "development"),
+                              ("optionalDependencies", "optional")):
+        for name in data.get(field_name) or {}:
+            graph.add_root(scope, graph.add_package("npm", name))
+
+
+# Python
+
+def normalize_python_name(name: str) -> str:
+    """PEP 503 normalized project name."""
+    return _PYTHON_NAME_SEPARATORS.sub("-", name).lower()
+
+
+def parse_poetry_lock(file_path: Path, graph: DependencyGraph):
+    """Parse a poetry.lock file; dependencies resolve by name to the locked package."""
+    pending: List[Tuple[int, List[str]]] = []
+    name = version = ""
+    requested: List[str] = []
+    table = ""
+    
+    def finish_package():
+        if name:
+            pending.append((graph.add_package("pypi", normalize_python_name(name), version),
+                            list(requested)))
+    
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            text = line.strip()
+            if not text or text.startswith("#"):
+                continue
+            if text.startswith("["):
+                if text == "[[package]]":
+                    finish_package()
+                    name, version, requested = "", "", []
+                table = text.strip("[]")
+                continue
+            key, _, value = text.partition("=")
+            key = key.strip().strip('"')
+            if table == "package":
+                if key == "name":
+                    name = value.strip().strip('"')
+                elif key == "version":
+                    version = value.strip().strip('"')
+            elif table == "package.dependencies" and value:
+                requested.append(key)
+        finish_package()
+    
+    for package_id, dependencies in pending:
+        for dependency in dependencies:
+            graph.add_dependency(package_id, graph.add_package("pypi", normalize_python_name(dependency)))
+
+
+def parse_requirements(file_path: Path, graph: DependencyGraph):
+    """
+    Direct dependencies listed in a requirements file. Files named like
+    requirements-dev.txt or requirements-test.txt hold development dependencies.
+    """
+    stem = Path(file_path).stem.lower()
+    scope = "development" if "dev" in stem or "test" in stem else "production"
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            text = line.split("#", 1)[0].strip()
+            if not text or text.startswith("-") or "://" in text:
+                continue
+            match = _REQUIREMENT.match(text)
+            if match:
+                package_id = graph.add_package("pypi", normalize_python_name(match.group(1)),
+                                               match.group(2) or "")
+                graph.add_root(scope, package_id)
+
+
+def parse_pyproject(file_path: Path, graph: DependencyGraph):
+    """Direct dependencies of a pyproject.toml (PEP 621, PEP 735 groups and Poetry tables)."""
+    with open(file_path, 'rb') as f:
+        data = tomllib.load(f)
+    
+    def add(requirements: Iterable[str], scope: str):
+        for requirement in requirements:
+            match = _REQUIREMENT.match(requirement) if isinstance(requirement, str) else None
+            if match:
+                graph.add_root(scope, graph.add_package(
+                    "pypi", normalize_python_name(match.group(1)), match.group(2) or ""
+                ))
+    
+    project = data.get("project", {})
+    add(project.get("dependencies", []), "production")
+    for requirements in project.get("optional-dependencies", {}).values():
+        add(requirements, "optional")
+    for requirements in data.get("dependency-groups", {}).values():
+        add(requirements, "development")
+    
+    poetry = data.get("tool", {}).get("poetry", {})
+    add((name for name in poetry.get("dependencies", {}) if name.lower() != "python"), "production")
+    add(poetry.get("dev-dependencies", {}), "development")
+    for group in poetry.get("group", {}).values():
+        add(group.get("dependencies", {}), "development")
+
+
+# Rust
+
+def parse_cargo_lock(file_path: Path, graph: DependencyGraph):
+    """
+    Parse a Cargo.lock file. Packages without a source are the workspace's own crates
+    and are left out of the graph; their manifests provide the direct dependencies.
+    """
+    packages: List[Tuple[str, str, bool, List[str]]] = []  # (name, version, local, dependencies)
+    name = version = ""
+    has_source = False
+    requested: List[str] = []
+    in_package = in_list = False
+    
+    def finish_package():
+        if in_package and name:
+            packages.append((name, version, not has_source, list(requested)))
+    
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            text = line.strip()
+            if not text or text.startswith("#"):
+                continue
+            if in_list:
+                if text.startswith("]"):
+                    in_list = False
+                else:
+                    requested.append(text.strip(",").strip('"'))
+                continue
+            if text.startswith("["):
+                finish_package()
+                in_package = text == "[[package]]"
+                name, version, has_source, requested = "", "", False, []
+                continue
+            if not in_package:
+                continue
+            key, _, value = text.partition("=")
+            key, value = key.strip(), value.strip()
+            if key == "name":
+                name = value.strip('"')
+            elif key == "version":
+                version = value.strip('"')
+            elif key == "source":
+                has_source = True
+            elif key == "dependencies":
+                items = value.strip("[]")
+                requested.extend(item.strip().strip('"') for item in items.split(",") if item.strip())
+                in_list = value == "["
+        finish_package()
+    
+    # A dependency is "name" or "name version [(source)]" when several versions are locked
+    ids = {}
+    for name, version, local, _ in packages:
+        if not local:
+            ids[(name, version)] = ids[(name, "")] = graph.add_package("cargo", name, version)
+    for name, version, local, dependencies in packages:
+        if local:
+            continue
+        for dependency in dependencies:
+            parts = dependency.split(" ")
+            target = ids.get((parts[0], parts[1] if len(parts) > 1 else ""))
+            if target is not None:
+                graph.add_dependency(ids[(name, version)], target)
+
+
+def parse_cargo_toml(file_path: Path, graph: DependencyGraph):
+    """Direct dependencies of a Cargo.toml manifest, including target-specific tables."""
+    with open(file_path, 'rb') as f:
+        data = tomllib.load(f)
+    
+    tables = [data]
+    tables.extend(data.get("target", {}).values())
+    for table in tables:
+        for section, scope in (("dependencies", "production"), ("build-dependencies", "production"),
+                               ("dev-dependencies", "development")):
+            for name, spec in table.get(section, {}).items():
+                if isinstance(spec, dict):
+                    if spec.get("path") and not spec.get("version"):
+                        continue  # Local crate
+                    name = spec.get("package", name)
+                    if spec.get("optional") and scope == "production":
+                        graph.add_root("optional", graph.add_package("cargo", name))
+                        continue
+                graph.add_root(scope, graph.add_package("cargo", name))
+
+
+# Go
+
+def parse_go_sum(file_path: Path, graph: DependencyGraph):
+    """
+    Modules checksummed in go.sum. go.sum records no edges; modules that only appear
+    with a /go.mod hash were consulted for version selection but are not built.
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and not parts[1].endswith("/go.mod"):
+                graph.add_package("go", parts[0], parts[1])
+
+
+def parse_go_mod(file_path: Path, graph: DependencyGraph):
+    """Required modules of a go.mod file; "// indirect" requirements are not direct."""
+    in_block = False
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            text, _, comment = line.partition("//")
+            parts = text.split()
+            if in_block:
+                if parts[:1] == [")"]:
+                    in_block = False
+                    continue
+            elif parts[:1] == ["require"]:
+                if parts[1:] == ["("]:
+                    in_block = True
+                    continue
+                parts = parts[1:]
+            else:
+                continue
+            if len(parts) >= 2:
+                package_id = graph.add_package("go", parts[0], parts[1])
+                if comment.strip() != "indirect":
+                    graph.add_root("production", package_id)
+
+
+# JVM
+
+def parse_pom_xml(file_path: Path, graph: DependencyGraph):
+    """
+    Dependencies of a Maven pom.xml, read with iterparse. Only the project's own
+    <dependencies> count; dependencyManagement and plugin dependencies are skipped.
+    ${property} versions are expanded from the pom's <properties>.
+    """
+    properties: Dict[str, str] = {}
+    path: List[str] = []
+    for event, element in ElementTree.iterparse(str(file_path), events=("start", "end")):
+        tag = element.tag.rsplit("}", 1)[-1]
+        if event == "start":
+            path.append(tag)
+            continue
+        path.pop()
+        if len(path) == 2 and path[1] == "properties":
+            properties[tag] = (element.text or "").strip()
+        elif tag == "dependency" and path[1:] == ["dependencies"]:
+            fields = {child.tag.rsplit("}", 1)[-1]: (child.text or "").strip() for child in element}
+            if fields.get("groupId") and fields.get("artifactId"):
+                version = re.sub(r"\$\{([^}]+)\}", lambda m: properties.get(m.group(1), ""),
+                                 fields.get("version", ""))
+                scope = "optional" if fields.get("optional") == "true" else \
+                    _MAVEN_SCOPES.get(fields.get("scope", ""), "production")
+                graph.add_root(scope, graph.add_package(
+                    "maven", f"{fields['groupId']}:{fields['artifactId']}", version
+                ))
+        if len(path) <= 2:
+            element.clear()
+
+
+def parse_gradle(file_path: Path, graph: DependencyGraph):
+    """Dependencies declared with string coordinates in build.gradle or build.gradle.kts."""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            match = _GRADLE_DEPENDENCY.match(line)
+            if match and match.group(1) in _GRADLE_SCOPES:
+                graph.add_root(_GRADLE_SCOPES[match.group(1)], graph.add_package(
+                    "maven", f"{match.group(2)}:{match.group(3)}", match.group(4) or ""
+                ))
+
+
+# Lockfiles resolve exact versions; manifests then attach their direct dependencies
+LOCKFILE_PARSERS: Dict[str, Callable[[Path, DependencyGraph], None]] = {
+    "package-lock.json": parse_package_lock,
+    "npm-shrinkwrap.json": parse_package_lock,
+    "yarn.lock": parse_yarn_lock,
+    "pnpm-lock.yaml": parse_pnpm_lock,
+    "poetry.lock": parse_poetry_lock,
+    "Cargo.lock": parse_cargo_lock,
+    "go.sum": parse_go_sum,
+}
+
+MANIFEST_PARSERS: Dict[str, Callable[[Path, DependencyGraph], None]] = {
+    "package.json": parse_package_json,
+    "pyproject.toml": parse_pyproject,
+    "Cargo.toml": parse_cargo_toml,
+    "go.mod": parse_go_mod,
+    "pom.xml": parse_pom_xml,
+    "build.gradle": parse_gradle,
+    "build.gradle.kts": parse_gradle,
+}
+
+
+def dependency_parser(file_name: str) -> Tuple[Optional[Callable[[Path, DependencyGraph], None]], bool]:
+    """
+    Parser for a dependency file.
+    
+    Returns:
+        (parser or None, whether the file is a lockfile)
+    """
+    parser = LOCKFILE_PARSERS.get(file_name)
+    if parser is not None:
+        return parser, True
+    parser = MANIFEST_PARSERS.get(file_name)
+    if parser is None and _REQUIREMENTS_FILE.match(file_name):
+        parser = parse_requirements
+    return parser, False
@@ -0,0 +1,381 @@
+"""
+Project File Index
+
+Single-pass file index shared by every project analysis stage. The tree is walked once
+with os.scandir and stored column-wise in compact arrays, so stages query the index
+instead of re-walking the filesystem with os.walk/glob/rglob. Ignore rules are applied
+during the walk: ignored directories are recorded but not descended into, and ignored
+files are recorded with a flag.
+"""
+
+import logging
+import os
+import re
+from array import array
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+from .ignore_rules import IgnoreMatcher
+
+logger = logging.getLogger(__name__)
+
+# Hidden directories that still carry analysis signals (CI configuration)
+INDEXED_HIDDEN_DIRECTORIES = {".github", ".gitlab", ".circleci"}
+
+# Directory and file flags
+FLAG_HIDDEN = 0x01
+FLAG_PRUNED = 0x02
+FLAG_IGNORED = 0x04
+
+
+class ProjectFileIndex:
+    """
+    Compact, column-oriented index of the files and directories in a project.
+    
+    Paths are kept as relative POSIX strings; suffixes are interned and every numeric
+    attribute (suffix id, size, mtime, inode, directory, depth, flags) lives in a typed
+    array.
+    Files of one directory are stored contiguously, in sorted name order.
+    """
+    
+    def __init__(self, root: Path):
+        self.root = root
+        
+        # File columns
+        self.paths: List[str] = []
+        self.suffix_ids = array("I")
+        self.sizes = array("q")
+        self.mtimes = array("q")  # st_mtime_ns
+        self.inodes = array("Q")
+        self.dir_ids = array("I")
+        self.depths = array("H")
+        self.flags = array("B")
+        
+        # Interned suffix table
+        self.suffixes: List[str] = []
+        self._suffix_lookup: Dict[str, int] = {}
+        
+        # Directory columns ("" is the project root)
+        self.directories: List[str] = []
+        self.dir_depths = array("H")
+        self.dir_flags = array("B")
+        self.dir_parents = array("i")
+        self.dir_file_start = array("I")
+        self.dir_file_end = array("I")
+        self._dir_lookup: Dict[str, int] = {}
+        self._dir_children: Dict[int, List[int]] = defaultdict(list)
+        self._file_lookup: Optional[Dict[str, int]] = None
+        
+        # Set when a file limit stopped the walk before the whole tree was indexed
+        self.truncated = False
+    
+    @classmethod
+    def build(cls, project_path: Path, ignore: Optional[IgnoreMatcher] = None,
+              max_files: Optional[int] = None) -> "ProjectFileIndex":
+        """
+        Build the index with a single os.scandir pass over the project tree.
+        
+        Args:
+            project_path: Root directory of the project
+            ignore: Ignore rules above the project's own ignore files
+                (default: the built-in DEFAULT_IGNORE_PATTERNS)
+            max_files: Stop after indexing this many files. The tree is then walked
+                breadth-first, so the sample covers the shallow levels (manifests,
+                configuration, top-level layout) completely; `truncated` tells whether
+                the limit was hit.
+        
+        Returns:
+            Populated file index
+        """
+        index = cls(Path(project_path))
+        root_id = index._add_directory("", -1, 0, 0)
+        stack: deque = deque([(root_id, str(index.root), ignore or IgnoreMatcher.default())])
+        next_directory = stack.pop if max_files is None else stack.popleft
+        
+        while stack:
+            if max_files is not None and len(index.paths) >= max_files:
+                index.truncated = True
+                break
+            dir_id, abs_dir, ignore = next_directory()
+            rel_dir = index.directories[dir_id]
+            dir_flag = index.dir_flags[dir_id]
+            depth = index.dir_depths[dir_id]
+            
+            try:
+                with os.scandir(abs_dir) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError as e:
+                logger.debug(f"Could not scan directory {abs_dir}: {e}")
+                entries = []
+            ignore = ignore.enter(rel_dir, abs_dir, (entry.name for entry in entries))
+            
+            subdirs = []
+            index.dir_file_start[dir_id] = len(index.paths)
+            for entry in entries:
+                name = entry.name
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((name, rel_path, entry.path))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    if max_files is not None and len(index.paths) >= max_files:
+                        index.truncated = True
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                
+                flag = dir_flag & FLAG_HIDDEN
+                if name.startswith('.'):
+                    flag |= FLAG_HIDDEN
+                if ignore.is_ignored(rel_path):
+                    flag |= FLAG_IGNORED
+                index._add_file(rel_path, name, stat.st_size, stat.st_mtime_ns,
+                                stat.st_ino, dir_id, depth, flag)
+            index.dir_file_end[dir_id] = len(index.paths)
+            
+            # Depth-first walks push children in reverse so they are visited in sorted order
+            for name, rel_path, abs_path in (subdirs if max_files is not None else reversed(subdirs)):
+                flag = dir_flag & FLAG_HIDDEN
+                if name.startswith('.'):
+                    flag |= FLAG_HIDDEN
+                    if name not in INDEXED_HIDDEN_DIRECTORIES:
+                        flag |= FLAG_PRUNED
+                if not flag & FLAG_PRUNED and ignore.is_ignored(rel_path, is_dir=True):
+                    flag |= FLAG_PRUNED | FLAG_IGNORED
+                
+                child_id = index._add_directory(rel_path, dir_id, depth + 1, flag)
+                if not flag & FLAG_PRUNED:
+                    stack.append((child_id, abs_path, ignore))
+        
+        logger.debug(f"Indexed {len(index.paths)} files in {len(index.directories)} "
+                     f"directories under {index.root}" + (" (truncated)" if index.truncated else ""))
+        return index
+    
+    def _add_directory(self, rel_path: str, parent: int, depth: int, flag: int) -> int:
+        dir_id = len(self.directories)
+        self.directories.append(rel_path)
+        self.dir_depths.append(depth)
+        self.dir_flags.append(flag)
+        self.dir_parents.append(parent)
+        self.dir_file_start.append(0)
+        self.dir_file_end.append(0)
+        self._dir_lookup[rel_path] = dir_id
+        if parent >= 0:
+            self._dir_children[parent].append(dir_id)
+        return dir_id
+    
+    def _add_file(self, rel_path: str, name: str, size: int, mtime_ns: int, inode: int,
+                  dir_id: int, depth: int, flag: int):
+        dot = name.rfind('.')
+        suffix = name[dot:].lower() if dot > 0 else ""
+        suffix_id = self._suffix_lookup.get(suffix)
+        if suffix_id is None:
+            suffix_id = len(self.suffixes)
+            self.suffixes.append(suffix)
+            self._suffix_lookup[suffix] = suffix_id
+        
+        self.paths.append(rel_path)
+        self.suffix_ids.append(suffix_id)
+        self.sizes.append(size)
+        self.mtimes.append(mtime_ns)
+        self.inodes.append(inode)
+        self.dir_ids.append(dir_id)
+        self.depths.append(depth)
+        self.flags.append(flag)
+    
+    def subtree(self, rel_dir: str) -> "ProjectFileIndex":
+        """
+        Index of one directory of the project, taken from this index without a walk.
+        
+        Paths, depths and directory ids are rebased onto the directory; flags (hidden,
+        pruned, ignored) are kept as they were decided for the whole project.
+        
+        Args:
+            rel_dir: Walked directory, relative to the project root
+        
+        Returns:
+            File index rooted at the directory
+        """
+        rel_dir = rel_dir.strip("/")
+        base_id = self._dir_lookup.get(rel_dir)
+        if base_id is None:
+            raise ValueError(f"Directory is not indexed: {rel_dir}")
+        prefix = len(rel_dir) + 1 if rel_dir else 0
+        base_depth = self.dir_depths[base_id]
+        
+        sub = ProjectFileIndex(self.root / rel_dir if rel_dir else self.root)
+        sub.truncated = self.truncated
+        # Breadth-first, so parents keep lower ids than their children
+        queue = deque([(base_id, -1)])
+        while queue:
+            dir_id, parent = queue.popleft()
+            depth = self.dir_depths[dir_id] - base_depth
+            new_id = sub._add_directory(self.directories[dir_id][prefix:], parent, depth,
+                                        0 if dir_id == base_id else self.dir_flags[dir_id])
+            sub.dir_file_start[new_id] = len(sub.paths)
+            for file_id in self.files_in_directory(dir_id):
+                path = self.paths[file_id]
+                sub._add_file(path[prefix:], path.rsplit("/", 1)[-1], self.sizes[file_id],
+                              self.mtimes[file_id], self.inodes[file_id], new_id, depth,
+                              self.flags[file_id])
+            sub.dir_file_end[new_id] = len(sub.paths)
+            queue.extend((child, new_id) for child in self._dir_children.get(dir_id, []))
+        return sub
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    # File accessors
+    
+    def suffix(self, file_id: int) -> str:
+        """Lower-cased suffix of a file (empty string when there is none)."""
+        return self.suffixes[self.suffix_ids[file_id]]
+    
+    def abs_path(self, file_id: int) -> Path:
+        """Absolute path of a file."""
+        return self.root / self.paths[file_id]
+    
+    def stat_key(self, file_id: int) -> Tuple[int, int, int]:
+        """(mtime_ns, size, inode) of a file, used to validate cached per-file results."""
+        return (self.mtimes[file_id], self.sizes[file_id], self.inodes[file_id])
+    
+    def is_hidden(self, file_id: int) -> bool:
+        """Whether the file or one of its parent directories is hidden."""
+        return bool(self.flags[file_id] & FLAG_HIDDEN)
+    
+    def is_ignored(self, file_id: int) -> bool:
+        """Whether the file is excluded by an ignore rule."""
+        return bool(self.flags[file_id] & FLAG_IGNORED)
+    
+    def source_files(self) -> Iterator[int]:
+        """Iterate over ids of non-hidden, non-ignored files."""
+        flags = self.flags
+        return (i for i in range(len(self.paths)) if not flags[i] & (FLAG_HIDDEN | FLAG_IGNORED))
+    
+    def files_in_directory(self, dir_id: int) -> range:
+        """Ids of the files directly inside a directory, in sorted name order."""
+        return range(self.dir_file_start[dir_id], self.dir_file_end[dir_id])
+    
+    # Directory accessors
+    
+    def source_directories(self) -> Iterator[int]:
+        """Iterate over ids of walked, non-hidden directories in discovery order."""
+        flags = self.dir_flags
+        return (d for d in range(len(self.directories))
+                if not flags[d] & (FLAG_HIDDEN | FLAG_PRUNED))
+    
+    def child_directories(self, rel_dir: str) -> List[str]:
+        """Relative paths of the immediate subdirectories of a directory."""
+        dir_id = self._dir_lookup.get(rel_dir.strip("/"))
+        if dir_id is None:
+            return []
+        return [self.directories[c] for c in self._dir_children.get(dir_id, [])]
+    
+    def max_depth(self) -> int:
+        """Deepest walked, non-hidden directory level (the root is depth 0)."""
+        return max((self.dir_depths[d] for d in self.source_directories()), default=0)
+    
+    # Path queries
+    
+    def is_dir(self, rel_path: str) -> bool:
+        """Whether a relative path is a known directory."""
+        return rel_path.strip("/") in self._dir_lookup
+    
+    def file_id(self, rel_path: str) -> Optional[int]:
+        """Id of an indexed file, or None when the path is not an indexed file."""
+        if self._file_lookup is None:
+            self._file_lookup = {path: i for i, path in enumerate(self.paths)}
+        return self._file_lookup.get(rel_path)
+    
+    def is_file(self, rel_path: str) -> bool:
+        """Whether a relative path is an indexed file."""
+        return self.file_id(rel_path) is not None
+    
+    def exists(self, rel_path: str) -> bool:
+        """Whether a relative path is an indexed file or directory."""
+        return self.is_dir(rel_path) or self.is_file(rel_path)
+    
+    def glob(self, pattern: str) -> List[str]:
+        """
+        Match indexed paths against a pathlib-style glob pattern.
+        
+        Supports '*', '?', character classes and '**' for any number of directories.
+        A trailing '/' restricts matches to directories. Patterns without a '/' only
+        match entries in the project root, like Path.glob.
+        
+        Args:
+            pattern: Glob pattern relative to the project root
+        
+        Returns:
+            Matching relative paths, directories first
+        """
+        dirs_only = pattern.endswith("/")
+        regex = _compile_glob(pattern)
+        
+        if "/" not in pattern.rstrip("/"):
+            # Root-level pattern: only consider entries directly under the root
+            dir_candidates = self.child_directories("")
+            file_candidates = [] if dirs_only else [
+                self.paths[i] for i in self.files_in_directory(0)
+            ]
+        else:
+            dir_candidates = self.directories[1:]
+            file_candidates = [] if dirs_only else self.paths
+        
+        matches = [d for d in dir_candidates if regex.match(d)]
+        matches.extend(p for p in file_candidates if regex.match(p))
+        return matches
+    
+    def fingerprint(self) -> str:
+        """
+        Root hash of the project's Merkle tree (see fingerprint.fingerprint_index): any
+        added, removed, renamed or modified file changes it, and computing it reads no
+        file contents.
+        """
+        from .fingerprint import fingerprint_index
+        return fingerprint_index(self).digest
+
+
+def _compile_glob(pattern: str) -> Pattern:
+    """Translate a pathlib-style glob pattern into a compiled regular expression."""
+    parts = [part for part in pattern.strip("/").split("/") if part]
+    regex = ""
+    for i, part in enumerate(parts):
+        last = i == len(parts) - 1
+        if part == "**":
+            regex += ".*" if last else "(?:[^/]+/)*"
+            continue
+        regex += _translate_segment(part)
+        if not last:
+            regex += "/"
+    return re.compile(f"^{regex}$")
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate one glob path segment; wildcards never cross '/'."""
+    out = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = segment.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = segment[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
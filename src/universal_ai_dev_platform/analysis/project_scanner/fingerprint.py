@@ -0,0 +1,432 @@
+"""
+Project Fingerprint
+
+Merkle tree of per-directory hashes over the project file index. A directory's hash
+covers the (name, size, mtime_ns) of its files, or their content hashes in content
+mode, and the names and hashes of its subdirectories, so the root hash identifies a
+tree state and equal subtree hashes let comparisons skip whole subtrees. Hidden
+directories the index does not walk (.git, .uai) are not part of the tree.
+
+The tree is persisted next to the scan cache. Fingerprinting again against the
+previous tree reuses the hash of every directory whose listing and subdirectories
+are unchanged, and in content mode only re-reads files whose stat key changed, so on
+an unchanged tree the cost is the stat calls of the index walk.
+"""
+
+import hashlib
+import logging
+import sqlite3
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .file_index import FLAG_HIDDEN, FLAG_PRUNED, ProjectFileIndex
+from .ignore_rules import DEFAULT_IGNORE_PATTERNS, IgnoreMatcher
+from .scan_cache import DEFAULT_CACHE_DIR
+
+# Optional fast content hashes
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_FILENAME = "fingerprint.sqlite"
+SCHEMA_VERSION = 1
+DIGEST_SIZE = 16
+READ_CHUNK_SIZE = 1024 * 1024
+
+MODE_STAT = "stat"
+
+
+def _xxh3(path: Path) -> bytes:
+    hasher = xxhash.xxh3_128()
+    _feed(hasher, path)
+    return hasher.digest()
+
+
+def _blake3(path: Path) -> bytes:
+    hasher = blake3.blake3()
+    _feed(hasher, path)
+    return hasher.digest(length=DIGEST_SIZE)
+
+
+def _blake2b(path: Path) -> bytes:
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    _feed(hasher, path)
+    return hasher.digest()
+
+
+def _feed(hasher: Any, path: Path):
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+
+
+# Content hash algorithms, fastest first: (package, installed, hash function); every
+# function returns a DIGEST_SIZE-byte digest
+CONTENT_HASHES: Dict[str, Tuple[str, bool, Callable[[Path], bytes]]] = {
+    "xxh3_128": ("xxhash", XXHASH_AVAILABLE, _xxh3),
+    "blake3": ("blake3", BLAKE3_AVAILABLE, _blake3),
+    "blake2b": ("hashlib", True, _blake2b),
+}
+
+
+def content_hash_algorithm(requested: Optional[str] = None) -> str:
+    """
+    Content hash to use: the requested one, or the fastest installed one.
+    
+    Raises:
+        ValueError: If the requested algorithm is unknown or not installed
+    """
+    if requested is None:
+        return next(name for name, (_, available, _) in CONTENT_HASHES.items() if available)
+    if requested not in CONTENT_HASHES:
+        raise ValueError(f"Unknown content hash '{requested}' (expected one of {', '.join(CONTENT_HASHES)})")
+    package, available, _ = CONTENT_HASHES[requested]
+    if not available:
+        raise ValueError(f"Content hash '{requested}' requires the {package} package (pip install {package})")
+    return requested
+
+
+@dataclass
+class DirectoryNode:
+    """One directory of the tree: its hash, its files' stat data and its subdirectories."""
+    
+    digest: bytes
+    names: Tuple[str, ...]
+    sizes: array
+    mtimes: array
+    inodes: array
+    hashes: Optional[List[bytes]] = None  # Content hashes, in content mode
+    subdirs: Tuple[str, ...] = ()
+    
+    def entries(self, content: bool) -> Dict[str, Any]:
+        """What identifies each file's state, by name."""
+        if content:
+            return dict(zip(self.names, self.hashes, strict=True))
+        return {name: (size, mtime) for name, size, mtime in zip(self.names, self.sizes, self.mtimes, strict=True)}
+
+
+@dataclass
+class ProjectFingerprint:
+    """Merkle tree of a project; `digest` is the hex hash of the root directory."""
+    
+    mode: str  # "stat" or "content:<algorithm>"
+    nodes: Dict[str, DirectoryNode] = field(default_factory=dict)  # By relative directory
+    changed_directories: List[str] = field(default_factory=list)  # Rehashed against the previous tree
+    
+    @property
+    def digest(self) -> str:
+        root = self.nodes.get("")
+        return root.digest.hex() if root is not None else ""
+    
+    @property
+    def content(self) -> bool:
+        return self.mode != MODE_STAT
+
+
+def fingerprint_index(index: ProjectFileIndex, previous: Optional[ProjectFingerprint] = None,
+                      content: bool = False, algorithm: Optional[str] = None) -> ProjectFingerprint:
+    """
+    Build the Merkle tree of an indexed project.
+    
+    Args:
+        index: Project file index
+        previous: Earlier fingerprint of the same project; unchanged directories reuse
+            its hashes (ignored when it was built in another mode)
+        content: Hash file contents instead of (size, mtime_ns)
+        algorithm: Content hash (see CONTENT_HASHES); default: the fastest installed
+    
+    Returns:
+        The project fingerprint
+    """
+    mode = f"content:{content_hash_algorithm(algorithm)}" if content else MODE_STAT
+    hash_file = CONTENT_HASHES[mode.partition(":")[2]][2] if content else None
+    if previous is not None and previous.mode != mode:
+        previous = None
+    previous_nodes = previous.nodes if previous is not None else {}
+    
+    fingerprint = ProjectFingerprint(mode)
+    nodes = fingerprint.nodes
+    directories = index.directories
+    # Hidden directories that are never walked (.git, .uai, virtualenvs) are left out, so
+    # version control and cache writes do not change the fingerprint
+    skipped = [
+        index.dir_flags[dir_id] & (FLAG_HIDDEN | FLAG_PRUNED) == FLAG_HIDDEN | FLAG_PRUNED
+        for dir_id in range(len(directories))
+    ]
+    children: Dict[int, List[int]] = {}
+    for dir_id in range(1, len(directories)):
+        if not skipped[dir_id]:
+            children.setdefault(index.dir_parents[dir_id], []).append(dir_id)
+    
+    # Children are always indexed after their parent, so reverse id order is bottom-up
+    for dir_id in range(len(directories) - 1, -1, -1):
+        if skipped[dir_id]:
+            continue
+        rel_dir = directories[dir_id]
+        start, end = index.dir_file_start[dir_id], index.dir_file_end[dir_id]
+        prefix = len(rel_dir) + 1 if rel_dir else 0
+        names = tuple(path[prefix:] for path in index.paths[start:end])
+        sizes, mtimes, inodes = index.sizes[start:end], index.mtimes[start:end], index.inodes[start:end]
+        subdir_nodes = sorted(
+            (directories[child][prefix:], nodes[directories[child]]) for child in children.get(dir_id, [])
+        )
+        subdirs = tuple(name for name, _ in subdir_nodes)
+        
+        old = previous_nodes.get(rel_dir)
+        same_listing = (old is not None and old.names == names and old.sizes == sizes
+                        and old.mtimes == mtimes and old.inodes == inodes)
+        
+        hashes = None
+        if content:
+            if same_listing:
+                hashes = old.hashes
+            else:
+                hashes = _content_hashes(index, start, end, names, old, hash_file)
+        
+        if same_listing and old.subdirs == subdirs and all(
+            node.digest == previous_nodes[f"{rel_dir}/{name}" if rel_dir else name].digest
+            for name, node in subdir_nodes
+        ):
+            digest = old.digest
+        else:
+            digest = _directory_digest(names, sizes, mtimes, hashes, subdir_nodes,
+                                       bool(index.dir_flags[dir_id] & FLAG_PRUNED))
+            fingerprint.changed_directories.append(rel_dir)
+        
+        nodes[rel_dir] = DirectoryNode(digest, names, sizes, mtimes, inodes, hashes, subdirs)
+    
+    fingerprint.changed_directories.reverse()
+    logger.debug(f"Fingerprinted {len(index)} files in {len(nodes)} directories "
+                 f"({len(fingerprint.changed_directories)} rehashed, mode {mode})")
+    return fingerprint
+
+
+def _content_hashes(index: ProjectFileIndex, start: int, end: int, names: Tuple[str, ...],
+                    old: Optional[DirectoryNode], hash_file: Callable[[Path], bytes]) -> List[bytes]:
+    """Content hashes of a directory's files, reusing those whose stat key is unchanged."""
+    known = {}
+    if old is not None:
+        known = {
+            name: (size, mtime, inode, digest)
+            for name, size, mtime, inode, digest
+            in zip(old.names, old.sizes, old.mtimes, old.inodes, old.hashes, strict=True)
+        }
+    hashes = []
+    for offset, file_id in enumerate(range(start, end)):
+        stat_key = (index.sizes[file_id], index.mtimes[file_id], index.inodes[file_id])
+        cached = known.get(names[offset])
+        if cached is not None and cached[:3] == stat_key:
+            hashes.append(cached[3])
+            continue
+        try:
+            hashes.append(hash_file(index.abs_path(file_id)))
+        except OSError as e:
+            logger.debug(f"Could not hash {index.paths[file_id]}: {e}")
+            hashes.append(bytes(DIGEST_SIZE))
+    return hashes
+
+
+def _directory_digest(names: Tuple[str, ...], sizes: array, mtimes: array, hashes: Optional[List[bytes]],
+                      subdir_nodes: List[Tuple[str, DirectoryNode]], pruned: bool) -> bytes:
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    digest.update(b"P" if pruned else b"D")
+    digest.update("\0".join(names).encode("utf-8", "surrogateescape"))
+    digest.update(b"\1")
+    if hashes is None:
+        digest.update(sizes.tobytes())
+        digest.update(mtimes.tobytes())
+    else:
+        digest.update(b"".join(hashes))
+    for name, node in subdir_nodes:
+        digest.update(b"\1" + name.encode("utf-8", "surrogateescape") + b"\0" + node.digest)
+    return digest.digest()
+
+
+def changed_paths(old: ProjectFingerprint, new: ProjectFingerprint) -> List[str]:
+    """
+    Relative paths of the files added, removed or modified between two fingerprints.
+    
+    Subtrees whose hashes are equal are skipped without looking at their files. In
+    content mode a file only counts as modified when its content hash changed.
+    
+    Raises:
+        ValueError: If the fingerprints were built in different modes
+    """
+    if old.mode != new.mode:
+        raise ValueError(f"Cannot compare fingerprints of modes {old.mode} and {new.mode}")
+    content = new.content
+    changed = []
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        old_node, new_node = old.nodes.get(rel_dir), new.nodes.get(rel_dir)
+        if old_node is not None and new_node is not None and old_node.digest == new_node.digest:
+            continue
+        
+        old_entries = old_node.entries(content) if old_node is not None else {}
+        new_entries = new_node.entries(content) if new_node is not None else {}
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        changed.extend(
+            prefix + name for name in old_entries.keys() | new_entries.keys()
+            if old_entries.get(name) != new_entries.get(name)
+        )
+        subdirs = set(old_node.subdirs if old_node is not None else ())
+        subdirs.update(new_node.subdirs if new_node is not None else ())
+        stack.extend(prefix + name for name in subdirs)
+    
+    return sorted(changed)
+
+
+class FingerprintStore:
+    """
+    SQLite persistence of a project's fingerprint, one row per directory.
+    
+    Saving only writes the directories rehashed since the loaded fingerprint and deletes
+    those that disappeared.
+    """
+    
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path))
+        self._initialize_schema()
+    
+    @classmethod
+    def for_project(cls, project_path: Path, cache_dir: str = DEFAULT_CACHE_DIR) -> "FingerprintStore":
+        return cls(Path(project_path) / cache_dir / FINGERPRINT_FILENAME)
+    
+    def _initialize_schema(self):
+        conn = self._conn
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None or int(row[0]) != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS directories")
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS directories (
+                mode TEXT NOT NULL,
+                path TEXT NOT NULL,
+                digest BLOB NOT NULL,
+                names TEXT NOT NULL,
+                sizes BLOB NOT NULL,
+                mtimes BLOB NOT NULL,
+                inodes BLOB NOT NULL,
+                hashes BLOB,
+                subdirs TEXT NOT NULL,
+                PRIMARY KEY (mode, path)
+            )"""
+        )
+        conn.commit()
+    
+    def load(self, mode: str = MODE_STAT) -> Optional[ProjectFingerprint]:
+        """The stored fingerprint of a mode, or None."""
+        rows = self._conn.execute(
+            "SELECT path, digest, names, sizes, mtimes, inodes, hashes, subdirs FROM directories WHERE mode = ?",
+            (mode,)
+        ).fetchall()
+        if not rows:
+            return None
+        fingerprint = ProjectFingerprint(mode)
+        for path, digest, names, sizes, mtimes, inodes, hashes, subdirs in rows:
+            fingerprint.nodes[path] = DirectoryNode(
+                digest, _split(names), _array("q", sizes), _array("q", mtimes), _array("Q", inodes),
+                [hashes[i:i + DIGEST_SIZE] for i in range(0, len(hashes), DIGEST_SIZE)]
+                if hashes is not None else None,
+                _split(subdirs)
+            )
+        return fingerprint
+    
+    def save(self, fingerprint: ProjectFingerprint, previous: Optional[ProjectFingerprint] = None):
+        """
+        Store a fingerprint.
+        
+        Args:
+            fingerprint: Fingerprint to store
+            previous: The stored fingerprint it was built against, if any; only its
+                differences are written
+        """
+        if previous is None or previous.mode != fingerprint.mode:
+            self._conn.execute("DELETE FROM directories WHERE mode = ?", (fingerprint.mode,))
+            paths = list(fingerprint.nodes)
+        else:
+            paths = fingerprint.changed_directories
+            removed = previous.nodes.keys() - fingerprint.nodes.keys()
+            self._conn.executemany("DELETE FROM directories WHERE mode = ? AND path = ?",
+                                   [(fingerprint.mode, path) for path in removed])
+        
+        rows = []
+        for path in paths:
+            node = fingerprint.nodes[path]
+            rows.append((
+                fingerprint.mode, path, node.digest, "\0".join(node.names), node.sizes.tobytes(),
+                node.mtimes.tobytes(), node.inodes.tobytes(),
+                b"".join(node.hashes) if node.hashes is not None else None, "\0".join(node.subdirs)
+            ))
+        self._conn.executemany("INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self._conn.commit()
+    
+    def close(self):
+        self._conn.close()
+
+
+def _split(joined: str) -> Tuple[str, ...]:
+    return tuple(joined.split("\0")) if joined else ()
+
+
+def _array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    return values
+
+
+def fingerprint_project(project_path: str, config: Optional[Dict[str, Any]] = None,
+                        content: bool = False, algorithm: Optional[str] = None
+                        ) -> Tuple[ProjectFingerprint, Optional[ProjectFingerprint]]:
+    """
+    Fingerprint a project against its stored fingerprint and store the new one.
+    
+    Args:
+        project_path: Root directory of the project
+        config: Analyzer configuration (ignore_patterns, cache_enabled, cache_dir)
+        content: Hash file contents instead of (size, mtime_ns)
+        algorithm: Content hash algorithm
+    
+    Returns:
+        (new fingerprint, previously stored fingerprint or None); pass both to
+        changed_paths to list what changed
+    """
+    config = config or {}
+    project_path = Path(project_path).resolve()
+    index = ProjectFileIndex.build(
+        project_path, IgnoreMatcher(config.get("ignore_patterns", DEFAULT_IGNORE_PATTERNS))
+    )
+    mode = f"content:{content_hash_algorithm(algorithm)}" if content else MODE_STAT
+    
+    store = None
+    if config.get("cache_enabled", True):
+        try:
+            store = FingerprintStore.for_project(project_path, config.get("cache_dir", DEFAULT_CACHE_DIR))
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Fingerprint store unavailable for {project_path}: {e}")
+    if store is None:
+        return fingerprint_index(index, content=content, algorithm=algorithm), None
+    
+    try:
+        previous = store.load(mode)
+        fingerprint = fingerprint_index(index, previous, content, algorithm)
+        store.save(fingerprint, previous)
+    finally:
+        store.close()
+    return fingerprint, previous
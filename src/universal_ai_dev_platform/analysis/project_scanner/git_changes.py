@@ -0,0 +1,104 @@
+"""
+Git Changes
+
+Thin wrappers around local git commands used for git-aware incremental analysis.
+Every helper returns None when git is unavailable or the project is not inside a
+git work tree, so callers can fall back to full (stat-validated) analysis.
+"""
+
+import logging
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+GIT_TIMEOUT_SECONDS = 60
+
+
+def _run_git(project_path: Path, args: List[str]) -> Optional[subprocess.CompletedProcess]:
+    """Run a git command inside the project directory."""
+    try:
+        return subprocess.run(
+            ["git", "-C", str(project_path), *args],
+            capture_output=True,
+            text=True,
+            timeout=GIT_TIMEOUT_SECONDS
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"git {' '.join(args)} failed: {e}")
+        return None
+
+
+def _git_output(project_path: Path, args: List[str]) -> Optional[str]:
+    """Stdout of a successful git command, or None."""
+    result = _run_git(project_path, args)
+    if result is None or result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def _split_z(output: str) -> Set[str]:
+    """Split NUL-separated git path output."""
+    return {path for path in output.split("\0") if path}
+
+
+def resolve_commit(project_path: Path, ref: str) -> Optional[str]:
+    """
+    Resolve a git ref to a full commit id.
+    
+    Args:
+        project_path: Directory inside the git work tree
+        ref: Any git revision (branch, tag, sha, HEAD~1, ...)
+    
+    Returns:
+        Commit id, or None when the ref cannot be resolved
+    """
+    output = _git_output(project_path, ["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"])
+    return output.strip() if output else None
+
+
+def clean_head_commit(project_path: Path) -> Optional[str]:
+    """
+    Commit id of HEAD when no tracked file under the project differs from it.
+    
+    Untracked files are allowed: incremental analysis never trusts cached results for
+    them.
+    
+    Returns:
+        HEAD commit id, or None when the tree is dirty or git is unavailable
+    """
+    head = resolve_commit(project_path, "HEAD")
+    if head is None:
+        return None
+    result = _run_git(project_path, ["diff", "--quiet", "HEAD", "--", "."])
+    if result is None or result.returncode != 0:
+        return None
+    return head
+
+
+def unchanged_paths_since(project_path: Path, ref: str) -> Optional[Set[str]]:
+    """
+    Tracked files whose content is identical to their version at a ref.
+    
+    Paths are relative to project_path (POSIX separators). Files changed between the
+    ref and the working tree, and untracked or ignored files, are excluded.
+    
+    Args:
+        project_path: Directory inside the git work tree
+        ref: Baseline git revision
+    
+    Returns:
+        Set of unchanged relative paths, or None when git cannot answer
+    """
+    tracked = _git_output(project_path, ["ls-files", "-z", "--", "."])
+    changed = _git_output(
+        project_path,
+        ["diff", "--name-only", "-z", "--no-renames", "--relative", ref, "--", "."]
+    )
+    if tracked is None or changed is None:
+        return None
+    
+    changed_paths = _split_z(changed)
+    logger.info(f"git reports {len(changed_paths)} changed paths since {ref}")
+    return _split_z(tracked) - changed_paths
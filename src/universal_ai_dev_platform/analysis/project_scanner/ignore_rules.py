@@ -0,0 +1,225 @@
+"""
+Ignore Rules
+
+Compiled ignore patterns with .gitignore semantics, shared by the file index and the
+analyzers. Rules come from built-in defaults, .gitignore and .uaiignore files; rules
+of deeper directories take precedence and within one file the last matching rule
+wins. Directories are matched before they are walked, so ignored trees are pruned
+without being descended into.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Ignore files read from every walked directory, in increasing precedence
+IGNORE_FILE_NAMES = (".gitignore", ".uaiignore")
+
+# Built-in rules applied below the project root
+DEFAULT_IGNORE_PATTERNS = [
+    "node_modules/", "__pycache__/", "target/", "dist/", "build/", "venv/", ".venv/",
+    "*.pyc", "*.pyo", "*.log", "*.tmp"
+]
+
+
+class IgnoreRules:
+    """
+    The rules of one ignore file (or rule list), relative to the directory holding it.
+    
+    Patterns without a '/' (other than a trailing one) match an entry name at any depth;
+    other patterns match the path relative to the rules' directory. Rule lists without
+    negations are folded into one alternation per kind, so a lookup costs a few regex
+    matches regardless of the number of rules.
+    """
+    
+    def __init__(self, patterns: Iterable[str], base: str = ""):
+        self.base = base.strip("/")
+        self.rules: List[Tuple[Pattern, bool, bool, bool]] = []  # (regex, negate, dir_only, anchored)
+        for line in patterns:
+            rule = _parse_rule(line)
+            if rule is not None:
+                self.rules.append(rule)
+        
+        self._combined = None
+        if not any(negate for _, negate, _, _ in self.rules):
+            self._combined = {
+                (dir_only, anchored): _combine(
+                    [regex for regex, _, rule_dir_only, rule_anchored in self.rules
+                     if rule_dir_only == dir_only and rule_anchored == anchored]
+                )
+                for dir_only in (False, True) for anchored in (False, True)
+            }
+    
+    @classmethod
+    def from_file(cls, file_path: Path, base: str = "") -> Optional["IgnoreRules"]:
+        """Load an ignore file, or None when it cannot be read or has no rules."""
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                rules = cls(f.read().splitlines(), base)
+        except OSError as e:
+            logger.debug(f"Could not read ignore file {file_path}: {e}")
+            return None
+        return rules if rules.rules else None
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+    
+    def match(self, rel_path: str, name: str, is_dir: bool) -> Optional[bool]:
+        """
+        Decide a path against these rules.
+        
+        Args:
+            rel_path: Path relative to the project root (POSIX separators)
+            name: Last component of the path
+            is_dir: Whether the path is a directory
+        
+        Returns:
+            True if ignored, False if re-included by a negated rule, None if no rule matches
+        """
+        local_path = rel_path[len(self.base) + 1:] if self.base else rel_path
+        
+        if self._combined is not None:
+            for dir_only in ((False, True) if is_dir else (False,)):
+                name_regex = self._combined[(dir_only, False)]
+                path_regex = self._combined[(dir_only, True)]
+                if (name_regex and name_regex.match(name)) or (path_regex and path_regex.match(local_path)):
+                    return True
+            return None
+        
+        for regex, negate, dir_only, anchored in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(local_path if anchored else name):
+                return not negate
+        return None
+
+
+class IgnoreMatcher:
+    """
+    The stack of ignore rules in effect inside one directory.
+    
+    Matchers are immutable; entering a directory with its own ignore files returns a
+    new matcher, so a tree walk keeps one matcher per pending directory.
+    """
+    
+    def __init__(self, patterns: Optional[Iterable[str]] = None,
+                 _stack: Tuple[IgnoreRules, ...] = ()):
+        if patterns is not None:
+            defaults = IgnoreRules(patterns)
+            _stack = (defaults,) if defaults.rules else ()
+        self._stack = _stack
+    
+    @classmethod
+    def default(cls) -> "IgnoreMatcher":
+        """Matcher with the built-in DEFAULT_IGNORE_PATTERNS."""
+        return cls(DEFAULT_IGNORE_PATTERNS)
+    
+    def enter(self, rel_dir: str, abs_dir: Path, entry_names: Iterable[str]) -> "IgnoreMatcher":
+        """
+        Matcher for the entries of a directory, adding the ignore files it contains.
+        
+        Args:
+            rel_dir: Directory path relative to the project root ("" for the root)
+            abs_dir: Absolute directory path
+            entry_names: Names of the directory's entries, used to find ignore files
+        
+        Returns:
+            This matcher, or a new one when the directory has ignore rules
+        """
+        names = set(entry_names)
+        stack = self._stack
+        for file_name in IGNORE_FILE_NAMES:
+            if file_name in names:
+                rules = IgnoreRules.from_file(Path(abs_dir) / file_name, rel_dir)
+                if rules is not None:
+                    stack = stack + (rules,)
+        return self if stack is self._stack else IgnoreMatcher(_stack=stack)
+    
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Whether a path below the project root is ignored."""
+        name = rel_path.rstrip("/").rsplit("/", 1)[-1]
+        for rules in reversed(self._stack):
+            decision = rules.match(rel_path, name, is_dir)
+            if decision is not None:
+                return decision
+        return False
+
+
+def _parse_rule(line: str) -> Optional[Tuple[Pattern, bool, bool, bool]]:
+    """Compile one ignore file line, or None for blank lines and comments."""
+    if not line or line.startswith("#"):
+        return None
+    
+    pattern = line.rstrip(" ")
+    if pattern.endswith("\\") and len(pattern) < len(line):
+        pattern += " "  # Escaped trailing space
+    
+    negate = pattern.startswith("!")
+    if negate:
+        pattern = pattern[1:]
+    elif pattern.startswith(("\\!", "\\#")):
+        pattern = pattern[1:]
+    
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    if not pattern:
+        return None
+    
+    anchored = "/" in pattern
+    return re.compile(_translate(pattern.lstrip("/"))), negate, dir_only, anchored
+
+
+def _translate(pattern: str) -> str:
+    """Translate an ignore pattern into a regex over '/'-separated paths."""
+    parts = pattern.split("/")
+    regex = ""
+    for i, part in enumerate(parts):
+        last = i == len(parts) - 1
+        if part == "**":
+            regex += ".*" if last else "(?:[^/]+/)*"
+            continue
+        regex += _translate_segment(part)
+        if not last:
+            regex += "/"
+    return f"{regex}$"
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate one pattern segment; wildcards never cross '/'."""
+    out = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        if char == "*":
+            while i + 1 < len(segment) and segment[i + 1] == "*":
+                i += 1
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "\\" and i + 1 < len(segment):
+            i += 1
+            out.append(re.escape(segment[i]))
+        elif char == "[":
+            end = segment.find("]", i + 2 if segment[i + 1:i + 2] in ("!", "^") else i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = segment[i + 1:end].replace("\\", "\\\\")
+                if body.startswith(("!", "^")):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
+
+
+def _combine(regexes: List[Pattern]) -> Optional[Pattern]:
+    """Fold several anchored regexes into one alternation."""
+    if not regexes:
+        return None
+    return re.compile("|".join(f"(?:{regex.pattern})" for regex in regexes))
@@ -0,0 +1,301 @@
+"""
+Result Store
+
+Memoizes whole analysis results across analyzer instances, CLI commands and runs.
+A result is stored under its kind ("project", "patterns", ...), the project path and
+a signature of the options that produced it, and is only returned while the tree
+fingerprint and analyzer version it was computed for still match. Results are kept
+pickled in a process-wide LRU layer and in a size-capped SQLite file shared by every
+process, so an unchanged tree is answered without re-running any analysis stage. The
+file lives in the project's cache directory, next to its scan cache, unless an
+absolute path is configured for a store shared by several projects.
+"""
+
+import atexit
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .scan_cache import DEFAULT_CACHE_DIR, ScanCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_STORE = "results.sqlite"  # Relative paths are resolved in the project's cache_dir
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MEMORY_MAX_BYTES = 64 * 1024 * 1024
+MAX_OPEN_STORES = 8  # Stores (projects, by default) kept open with their memory level
+SCHEMA_VERSION = 1
+
+StoreKey = Tuple[str, str, str]  # (kind, project_path, options signature)
+
+
+class AnalysisResultStore:
+    """
+    Two-level LRU store of analysis results.
+    
+    The memory level holds pickled results of this process, so every caller gets its
+    own copy to mutate. The disk level is a SQLite table with one row per key; rows
+    record when they were last read, and the least recently used rows are evicted
+    once the payloads exceed max_bytes. A row whose fingerprint or version no longer
+    matches is replaced by the next put for the same key.
+    
+    Example:
+        store = get_result_store("/src/app/.uai/cache/results.sqlite")
+        key = ("project", "/src/app", ScanCache.signature_of(options))
+        analysis = store.get(key, index.fingerprint(), ANALYZER_VERSION)
+        if analysis is None:
+            analysis = run_analysis()
+            store.put(key, index.fingerprint(), ANALYZER_VERSION, analysis)
+    """
+    
+    def __init__(self, db_path: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 memory_max_bytes: int = DEFAULT_MEMORY_MAX_BYTES):
+        self.db_path = Path(db_path).expanduser() if db_path is not None else None
+        self.max_bytes = max_bytes
+        self.memory_max_bytes = memory_max_bytes
+        self._memory: "OrderedDict[StoreKey, Tuple[str, str, bytes]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._touched: Dict[StoreKey, float] = {}  # Memory hits not yet recorded on disk
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.RLock()  # The store is shared by every thread of the process
+        self.hits = 0
+        self.misses = 0
+    
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Connection of this process; reopened after a fork, None without a disk level."""
+        if self.db_path is None:
+            return None
+        if self._conn is None or self._pid != os.getpid():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+            self._pid = os.getpid()
+            self._initialize_schema()
+        return self._conn
+    
+    def _initialize_schema(self):
+        conn = self._conn
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None or int(row[0]) != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS results")
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                kind TEXT NOT NULL,
+                project_path TEXT NOT NULL,
+                options TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                version TEXT NOT NULL,
+                accessed REAL NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                PRIMARY KEY (kind, project_path, options)
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        conn.commit()
+    
+    def get(self, key: StoreKey, fingerprint: str, version: str) -> Optional[Any]:
+        """
+        Result stored for a key, if it was computed for this fingerprint and version.
+        
+        Args:
+            key: (kind, project_path, options signature)
+            fingerprint: Current tree fingerprint (ProjectFileIndex.fingerprint)
+            version: Version of the analyzer producing the result
+        
+        Returns:
+            A fresh copy of the result, or None
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[:2] == (fingerprint, version):
+                self._memory.move_to_end(key)
+                self._touched[key] = time.time()
+                self.hits += 1
+                return pickle.loads(entry[2])
+        
+            payload = None
+            try:
+                conn = self._connection()
+                if conn is not None:
+                    row = conn.execute(
+                        "SELECT payload FROM results WHERE kind = ? AND project_path = ? AND options = ? "
+                        "AND fingerprint = ? AND version = ?", (*key, fingerprint, version)
+                    ).fetchone()
+                    if row is not None:
+                        payload = row[0]
+                        conn.execute(
+                            "UPDATE results SET accessed = ? WHERE kind = ? AND project_path = ? AND options = ?",
+                            (time.time(), *key)
+                        )
+                        conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Result store unavailable: {e}")
+        
+            if payload is None:
+                self.misses += 1
+                return None
+            try:
+                result = pickle.loads(payload)
+            except Exception as e:  # Written by an incompatible version of a result class
+                logger.debug(f"Discarding unreadable stored result for {key[1]}: {e}")
+                self.misses += 1
+                return None
+            self._remember(key, fingerprint, version, bytes(payload))
+            self.hits += 1
+            return result
+    
+    def put(self, key: StoreKey, fingerprint: str, version: str, result: Any):
+        """Store a result, replacing whatever the key held, and evict past the size caps."""
+        with self._lock:
+            try:
+                payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                logger.debug(f"Analysis result of {key[1]} cannot be stored: {e}")
+                return
+            self._remember(key, fingerprint, version, payload)
+            
+            try:
+                conn = self._connection()
+                if conn is None:
+                    return
+                self._record_touches(conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key, fingerprint, version, time.time(), len(payload), payload)
+                )
+                self._evict(conn)
+                conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Could not store analysis result: {e}")
+    
+    def _remember(self, key: StoreKey, fingerprint: str, version: str, payload: bytes):
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous[2])
+        if len(payload) > self.memory_max_bytes:
+            return
+        self._memory[key] = (fingerprint, version, payload)
+        self._memory_bytes += len(payload)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, (_, _, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+    
+    def _record_touches(self, conn: sqlite3.Connection):
+        """Write the access times of memory hits, so disk eviction sees them."""
+        if self._touched:
+            conn.executemany(
+                "UPDATE results SET accessed = ? WHERE kind = ? AND project_path = ? AND options = ?",
+                [(accessed, *key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+    
+    def _evict(self, conn: sqlite3.Connection):
+        """Delete least recently used rows until the payloads fit in max_bytes."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for rowid, size in conn.execute("SELECT rowid, size FROM results ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM results WHERE rowid = ?", (rowid,))
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} stored analysis results")
+    
+    def invalidate(self, project_path: Optional[str] = None):
+        """Drop the stored results of one project, or of every project."""
+        with self._lock:
+            for key in [key for key in self._memory if project_path is None or key[1] == project_path]:
+                self._memory_bytes -= len(self._memory.pop(key)[2])
+            try:
+                conn = self._connection()
+                if conn is not None:
+                    if project_path is None:
+                        conn.execute("DELETE FROM results")
+                    else:
+                        conn.execute("DELETE FROM results WHERE project_path = ?", (project_path,))
+                    conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Could not invalidate stored results: {e}")
+    
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                try:
+                    self._record_touches(self._conn)
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.debug(f"Could not record result store access times: {e}")
+                self._conn.close()
+            self._conn = None
+
+
+# Stores shared by every analyzer of this process, by database path, most recently
+# used last; past MAX_OPEN_STORES the least recently used one is closed and dropped
+_stores: "OrderedDict[Optional[str], AnalysisResultStore]" = OrderedDict()
+_stores_lock = threading.Lock()
+
+
+def get_result_store(db_path: Optional[str] = None,
+                     max_bytes: int = DEFAULT_MAX_BYTES) -> AnalysisResultStore:
+    """
+    Process-wide result store for a database path (None: memory only).
+    
+    Every caller asking for the same path shares one store, and so one memory level.
+    """
+    key = str(Path(db_path).expanduser()) if db_path is not None else None
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = AnalysisResultStore(key, max_bytes)
+            while len(_stores) > MAX_OPEN_STORES:
+                _stores.popitem(last=False)[1].close()
+        _stores.move_to_end(key)
+    store.max_bytes = max_bytes
+    return store
+
+
+@atexit.register
+def _close_stores():
+    with _stores_lock:
+        for store in _stores.values():
+            store.close()
+
+
+def open_result_store(config: Dict[str, Any], project_path: Path) -> Optional[AnalysisResultStore]:
+    """
+    Result store selected by an analyzer configuration.
+    
+    A relative result_store path is resolved in the project's cache directory
+    (cache_dir); an absolute one, or one starting with ~, is shared by every project.
+    
+    Returns None when caching is disabled (cache_enabled) or no store is configured
+    (result_store is None).
+    """
+    location = config.get("result_store", DEFAULT_RESULT_STORE)
+    if not config.get("cache_enabled", True) or location is None:
+        return None
+    db_path = Path(location).expanduser()
+    if not db_path.is_absolute():
+        db_path = Path(project_path) / config.get("cache_dir", DEFAULT_CACHE_DIR) / db_path
+    return get_result_store(str(db_path), config.get("result_store_max_bytes", DEFAULT_MAX_BYTES))
+
+
+def options_signature(config: Dict[str, Any], **options: Any) -> str:
+    """Signature of the configuration and call options a result depends on."""
+    relevant = {
+        name: value for name, value in config.items()
+        if name not in ("cache_enabled", "cache_dir", "result_store", "result_store_max_bytes",
+                        "max_workers", "parallel_min_files", "project_timeout", "profile", "profile_memory")
+    }
+    return ScanCache.signature_of([relevant, options])
@@ -0,0 +1,321 @@
+"""
+Scan Cache
+
+Persistent, per-file cache of analysis results stored under the project in
+.uai/cache. Entries are keyed by relative path and invalidated whenever the file's
+(mtime_ns, size, inode) stat key changes, so unchanged files are never re-read.
+
+When a run happens on a clean git checkout, the cache also records that commit. A
+later run can then trust entries of files git reports as unchanged since that commit,
+even if their stat keys differ (for example after a fresh CI checkout).
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .git_changes import clean_head_commit, resolve_commit, unchanged_paths_since
+
+logger = logging.getLogger(__name__)
+
+StatKey = Tuple[int, int, int]  # (mtime_ns, size, inode)
+
+DEFAULT_CACHE_DIR = ".uai/cache"
+CACHE_FILENAME = "scan_cache.sqlite"
+SCHEMA_VERSION = 2
+
+
+class ScanCache:
+    """
+    SQLite-backed store of per-file scan results.
+    
+    Results are grouped by kind (for example "scanner" or "patterns"). Every kind
+    carries a signature of the rules that produced it; when the signature changes,
+    all entries of that kind are discarded. Rows of a kind are loaded into memory in
+    one query on first use and written back in a single transaction on commit.
+    
+    Entries that were not looked up or stored during a session are pruned on close, so
+    after every run the cache holds exactly the results validated by that run.
+    """
+    
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path))
+        self._entries: Dict[str, Dict[str, Tuple[StatKey, str]]] = {}
+        self._pending: Dict[str, Dict[str, Tuple[StatKey, str]]] = {}
+        self._signatures: Dict[str, str] = {}
+        self._touched: Dict[str, Set[str]] = {}
+        self._trusted: Dict[str, Set[str]] = {}
+        self._git_baseline: Optional[Tuple[str, Set[str]]] = None
+        self.git_commit: Optional[str] = None  # Clean commit this run analyzes, if any
+        self.hits = 0
+        self.misses = 0
+        self._initialize_schema()
+    
+    @classmethod
+    def for_project(cls, project_path: Path,
+                    cache_dir: str = DEFAULT_CACHE_DIR) -> "ScanCache":
+        """
+        Open (or create) the scan cache of a project.
+        
+        Args:
+            project_path: Root directory of the project
+            cache_dir: Cache directory, relative to the project root unless absolute
+        
+        Returns:
+            Open scan cache
+        """
+        directory = Path(cache_dir)
+        if not directory.is_absolute():
+            directory = Path(project_path) / directory
+        return cls(directory / CACHE_FILENAME)
+    
+    def _initialize_schema(self):
+        """Create tables, discarding caches written by an older schema."""
+        conn = self._conn
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None or int(row[0]) != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS file_results")
+            conn.execute("DROP TABLE IF EXISTS kinds")
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)",
+                         (str(SCHEMA_VERSION),))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS kinds ("
+            " kind TEXT PRIMARY KEY, signature TEXT, git_commit TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS file_results ("
+            " kind TEXT NOT NULL,"
+            " path TEXT NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " inode INTEGER NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " PRIMARY KEY (kind, path))"
+        )
+        conn.commit()
+    
+    @staticmethod
+    def signature_of(rules: Any) -> str:
+        """Stable signature of the rules used to produce cached results."""
+        encoded = json.dumps(rules, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha1(encoded).hexdigest()
+    
+    def trust_git_baseline(self, commit: str, unchanged_paths: Set[str]):
+        """
+        Trust cached results of files git reports as unchanged since a commit.
+        
+        Only applies to kinds whose previous run was recorded at exactly this commit;
+        other kinds keep plain stat validation.
+        
+        Args:
+            commit: Baseline commit id
+            unchanged_paths: Tracked paths identical to their version at the commit
+        """
+        self._git_baseline = (commit, unchanged_paths)
+    
+    def bind(self, kind: str, signature: str):
+        """
+        Prepare a result kind for use, dropping its entries if the rules changed.
+        
+        Args:
+            kind: Result kind name
+            signature: Signature of the rules producing this kind of result
+        """
+        if self._signatures.get(kind) == signature:
+            return
+        
+        conn = self._conn
+        row = conn.execute(
+            "SELECT signature, git_commit FROM kinds WHERE kind = ?", (kind,)
+        ).fetchone()
+        if row is None or row[0] != signature:
+            if row is not None:
+                logger.info(f"Scan cache rules changed for '{kind}', discarding entries")
+            conn.execute("DELETE FROM file_results WHERE kind = ?", (kind,))
+            conn.execute("INSERT OR REPLACE INTO kinds VALUES (?, ?, NULL)", (kind, signature))
+            conn.commit()
+            row = (signature, None)
+        
+        if self._git_baseline is not None:
+            commit, unchanged_paths = self._git_baseline
+            if row[1] == commit:
+                self._trusted[kind] = unchanged_paths
+            else:
+                logger.warning(f"Scan cache for '{kind}' was not recorded at {commit[:12]}; "
+                               f"validating entries by file stat instead")
+        
+        self._signatures[kind] = signature
+        self._touched[kind] = set()
+        self._entries[kind] = {
+            path: ((mtime_ns, size, inode), payload)
+            for path, mtime_ns, size, inode, payload in conn.execute(
+                "SELECT path, mtime_ns, size, inode, payload FROM file_results "
+                "WHERE kind = ?", (kind,)
+            )
+        }
+        self._pending.setdefault(kind, {})
+    
+    def get(self, kind: str, rel_path: str, stat_key: StatKey) -> Optional[Any]:
+        """
+        Return the cached result for a file if its stat key is unchanged.
+        
+        Args:
+            kind: Result kind name (must have been bound)
+            rel_path: Path relative to the project root
+            stat_key: Current (mtime_ns, size, inode) of the file
+        
+        Returns:
+            Cached payload, or None when missing or stale
+        """
+        entry = self._entries.get(kind, {}).get(rel_path)
+        key = _storable_key(stat_key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        if entry[0] != key:
+            if rel_path not in self._trusted.get(kind, ()):
+                self.misses += 1
+                return None
+            # Unchanged according to git: adopt the new stat key
+            entry = (key, entry[1])
+            self._entries[kind][rel_path] = entry
+            self._pending.setdefault(kind, {})[rel_path] = entry
+        
+        self.hits += 1
+        self._touched.setdefault(kind, set()).add(rel_path)
+        return json.loads(entry[1])
+    
+    def put(self, kind: str, rel_path: str, stat_key: StatKey, payload: Any):
+        """Store the result for a file; written to disk on commit."""
+        encoded = json.dumps(payload, separators=(",", ":"))
+        entry = (_storable_key(stat_key), encoded)
+        self._entries.setdefault(kind, {})[rel_path] = entry
+        self._pending.setdefault(kind, {})[rel_path] = entry
+        self._touched.setdefault(kind, set()).add(rel_path)
+    
+    def commit(self):
+        """Write pending entries to disk in a single transaction."""
+        rows = [
+            (kind, path, key[0], key[1], key[2], payload)
+            for kind, entries in self._pending.items()
+            for path, (key, payload) in entries.items()
+        ]
+        if rows:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO file_results VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+        self._conn.commit()
+        for entries in self._pending.values():
+            entries.clear()
+    
+    def _prune_untouched(self):
+        """Drop entries of bound kinds that this session neither read nor wrote."""
+        stale = [
+            (kind, path)
+            for kind, touched in self._touched.items()
+            for path in self._entries.get(kind, {})
+            if path not in touched
+        ]
+        for kind, path in stale:
+            del self._entries[kind][path]
+        if stale:
+            self._conn.executemany(
+                "DELETE FROM file_results WHERE kind = ? AND path = ?", stale
+            )
+    
+    def close(self, complete: bool = True):
+        """
+        Prune unused entries, record the git baseline and close the database.
+        
+        Args:
+            complete: Whether this session visited every file of the kinds it bound.
+                Sampled sessions keep the entries they did not visit and clear the
+                baseline, since those entries were not checked against the commit.
+        """
+        try:
+            if complete:
+                self._prune_untouched()
+            self._conn.executemany(
+                "UPDATE kinds SET git_commit = ? WHERE kind = ?",
+                [(self.git_commit if complete else None, kind) for kind in self._signatures]
+            )
+            self.commit()
+        finally:
+            self._conn.close()
+            logger.debug(f"Scan cache closed ({self.hits} hits, {self.misses} misses)")
+
+
+class ScopedScanCache:
+    """
+    View of a project's scan cache for one of its subdirectories.
+    
+    Stages analyzing the subdirectory on its own (a workspace package) use paths
+    relative to it; the view maps them onto the project's entries, so files the project
+    run already validated are not read again. Opening and closing stay with the
+    project's cache.
+    """
+    
+    def __init__(self, cache: ScanCache, rel_dir: str):
+        self.cache = cache
+        self.prefix = f"{rel_dir.strip('/')}/" if rel_dir.strip("/") else ""
+    
+    def bind(self, kind: str, signature: str):
+        self.cache.bind(kind, signature)
+    
+    def get(self, kind: str, rel_path: str, stat_key: StatKey) -> Optional[Any]:
+        return self.cache.get(kind, self.prefix + rel_path, stat_key)
+    
+    def put(self, kind: str, rel_path: str, stat_key: StatKey, payload: Any):
+        self.cache.put(kind, self.prefix + rel_path, stat_key, payload)
+
+
+def _storable_key(stat_key: StatKey) -> StatKey:
+    """Fold the inode into SQLite's signed 64-bit integer range."""
+    mtime_ns, size, inode = stat_key
+    if inode >= 1 << 63:
+        inode -= 1 << 64
+    return (mtime_ns, size, inode)
+
+
+def open_scan_cache(project_path: Path, config: Dict[str, Any],
+                    since: Optional[str] = None) -> Optional[ScanCache]:
+    """
+    Open the scan cache for a project according to an analyzer configuration.
+    
+    Returns None when caching is disabled or the cache cannot be opened (for example
+    on a read-only checkout); analysis then proceeds without caching.
+    
+    Args:
+        project_path: Root directory of the project
+        config: Analyzer configuration (cache_enabled, cache_dir)
+        since: Git ref of the baseline run; results of files unchanged since this ref
+            are reused without re-reading them
+    """
+    if not config.get("cache_enabled", True):
+        if since is not None:
+            logger.warning("--since requires the scan cache; running a full analysis")
+        return None
+    try:
+        cache = ScanCache.for_project(project_path, config.get("cache_dir", DEFAULT_CACHE_DIR))
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Scan cache unavailable for {project_path}: {e}")
+        return None
+    
+    cache.git_commit = clean_head_commit(project_path)
+    if since is not None:
+        commit = resolve_commit(project_path, since)
+        unchanged_paths = unchanged_paths_since(project_path, since) if commit else None
+        if unchanged_paths is None:
+            logger.warning(f"Could not compare against git ref '{since}'; "
+                           f"validating cached results by file stat instead")
+        else:
+            cache.trust_git_baseline(commit, unchanged_paths)
+    
+    return cache
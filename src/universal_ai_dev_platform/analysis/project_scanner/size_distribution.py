@@ -0,0 +1,183 @@
+"""
+Size Distribution
+
+Streaming summary of where a project's bytes are: a histogram of file sizes per
+suffix, byte totals per directory (including everything below it), the largest files
+overall and per category, and the files above the size at which per-file stages stop
+reading. It is fed one file id at a time from the file structure pass, keeps only
+bounded heaps and per-suffix/per-directory counters, and builds path strings for the
+files it reports only, so vendored blobs and generated bundles are easy to spot even
+on very large trees.
+"""
+
+import heapq
+import logging
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .file_index import ProjectFileIndex
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (exclusive) of the histogram buckets; the last bucket is open-ended
+SIZE_BUCKET_LIMITS = [1024, 4 * 1024, 16 * 1024, 64 * 1024, 256 * 1024,
+                      1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024]
+SIZE_BUCKET_LABELS = ["<1KiB", "1-4KiB", "4-16KiB", "16-64KiB", "64-256KiB",
+                      "256KiB-1MiB", "1-4MiB", "4-16MiB", ">=16MiB"]
+
+DEFAULT_TOP_K = 10
+DEFAULT_LARGE_FILE_THRESHOLD = 1024 * 1024
+
+# Suffix categories for the per-category top lists; source suffixes are supplied by
+# the caller, everything unlisted is "other"
+SIZE_CATEGORIES: Dict[str, List[str]] = {
+    "data": [".json", ".csv", ".tsv", ".xml", ".yaml", ".yml", ".sql", ".parquet",
+             ".db", ".sqlite", ".pkl", ".npy", ".h5"],
+    "media": [".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp", ".bmp",
+              ".mp3", ".mp4", ".wav", ".webm", ".mov", ".pdf", ".ttf", ".otf",
+              ".woff", ".woff2", ".eot"],
+    "archive": [".zip", ".tar", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar",
+                ".jar", ".war", ".whl", ".egg"],
+    "binary": [".so", ".dll", ".dylib", ".exe", ".bin", ".o", ".a", ".lib",
+               ".class", ".pyc", ".wasm", ".map"],
+    "docs": [".md", ".rst", ".txt", ".html", ".htm"],
+}
+
+
+class SizeDistribution:
+    """
+    Size statistics of the files of one index, accumulated file by file.
+    
+    Every counter is keyed by suffix id or directory id, and the top lists are bounded
+    min-heaps of (size, -file_id), so adding a file is O(log K) and memory does not
+    grow with the number of files beyond one byte counter per directory.
+    
+    Example:
+        sizes = SizeDistribution(index, source_suffixes={".py"})
+        for file_id in index.source_files():
+            sizes.add(file_id)
+        summary = sizes.summary()
+    """
+    
+    def __init__(self, index: ProjectFileIndex, source_suffixes: Iterable[str] = (),
+                 top_k: int = DEFAULT_TOP_K,
+                 large_file_threshold: int = DEFAULT_LARGE_FILE_THRESHOLD):
+        self.index = index
+        self.top_k = top_k
+        self.large_file_threshold = large_file_threshold
+        
+        category_of = {suffix: "source" for suffix in source_suffixes}
+        for category, suffixes in SIZE_CATEGORIES.items():
+            category_of.update((suffix, category) for suffix in suffixes if suffix not in category_of)
+        self._category_of = category_of
+        self._suffix_categories: Dict[int, str] = {}  # Suffix id -> category, filled lazily
+        
+        self.total_files = 0
+        self.total_bytes = 0
+        self.large_files = 0
+        self.large_bytes = 0
+        self._histograms: Dict[int, List[int]] = {}  # Suffix id -> count per bucket
+        self._suffix_bytes: Dict[int, int] = defaultdict(int)
+        self._directory_bytes = array("q", bytes(8 * len(index.directories)))
+        self._directory_files = array("q", bytes(8 * len(index.directories)))
+        self._largest: List[Tuple[int, int]] = []
+        self._largest_by_category: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    
+    def add(self, file_id: int):
+        """Account one file of the index."""
+        index = self.index
+        size = index.sizes[file_id]
+        suffix_id = index.suffix_ids[file_id]
+        
+        self.total_files += 1
+        self.total_bytes += size
+        if size > self.large_file_threshold:
+            self.large_files += 1
+            self.large_bytes += size
+        
+        histogram = self._histograms.get(suffix_id)
+        if histogram is None:
+            histogram = self._histograms[suffix_id] = [0] * len(SIZE_BUCKET_LABELS)
+        histogram[bisect_right(SIZE_BUCKET_LIMITS, size)] += 1
+        self._suffix_bytes[suffix_id] += size
+        
+        dir_id = index.dir_ids[file_id]
+        self._directory_bytes[dir_id] += size
+        self._directory_files[dir_id] += 1
+        
+        entry = (size, -file_id)  # Ties go to the file found first
+        self._push(self._largest, entry)
+        category = self._suffix_categories.get(suffix_id)
+        if category is None:
+            category = self._suffix_categories[suffix_id] = self._category_of.get(index.suffixes[suffix_id], "other")
+        self._push(self._largest_by_category[category], entry)
+    
+    def _push(self, heap: List[Tuple[int, int]], entry: Tuple[int, int]):
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    
+    def _ranked(self, heap: List[Tuple[int, int]]) -> List[Tuple[str, int]]:
+        """Heap entries as (relative path, size), largest first."""
+        return [(self.index.paths[-negated_id], size) for size, negated_id in sorted(heap, reverse=True)]
+    
+    def largest_files(self, absolute: bool = False) -> List[Tuple[str, int]]:
+        """The top_k largest files, largest first."""
+        if not absolute:
+            return self._ranked(self._largest)
+        return [(str(self.index.root / path), size) for path, size in self._ranked(self._largest)]
+    
+    def directory_totals(self) -> Tuple[array, array]:
+        """
+        Bytes and files of every directory including its subdirectories.
+        
+        Directories are numbered parents first, so one pass from the last id down adds
+        each directory's totals to its parent.
+        """
+        total_bytes = array("q", self._directory_bytes)
+        total_files = array("q", self._directory_files)
+        parents = self.index.dir_parents
+        for dir_id in range(len(total_bytes) - 1, 0, -1):
+            parent = parents[dir_id]
+            if parent >= 0:
+                total_bytes[parent] += total_bytes[dir_id]
+                total_files[parent] += total_files[dir_id]
+        return total_bytes, total_files
+    
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly summary of the distribution."""
+        index = self.index
+        total_bytes, total_files = self.directory_totals()
+        largest_directories = heapq.nsmallest(
+            self.top_k, (dir_id for dir_id in range(1, len(total_bytes)) if total_files[dir_id]),
+            key=lambda dir_id: (-total_bytes[dir_id], index.directories[dir_id])
+        )
+        suffix_order = sorted(self._histograms, key=lambda suffix_id: -self._suffix_bytes[suffix_id])
+        
+        return {
+            "total_files": self.total_files,
+            "total_bytes": self.total_bytes,
+            "size_buckets": list(SIZE_BUCKET_LABELS),
+            "histogram_by_suffix": {
+                index.suffixes[suffix_id]: list(self._histograms[suffix_id]) for suffix_id in suffix_order
+            },
+            "bytes_by_suffix": {
+                index.suffixes[suffix_id]: self._suffix_bytes[suffix_id] for suffix_id in suffix_order
+            },
+            "largest_directories": [
+                {"path": index.directories[dir_id], "bytes": total_bytes[dir_id], "files": total_files[dir_id]}
+                for dir_id in largest_directories
+            ],
+            "largest_files": self.largest_files(),
+            "largest_by_category": {
+                category: self._ranked(heap) for category, heap in sorted(self._largest_by_category.items())
+            },
+            "large_files": {
+                "threshold": self.large_file_threshold,
+                "count": self.large_files,
+                "bytes": self.large_bytes,
+            },
+        }
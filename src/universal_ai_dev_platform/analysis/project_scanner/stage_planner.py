@@ -0,0 +1,177 @@
+"""
+Stage Planner
+
+Decides which project analysis stages run, and with which budgets, for an analysis
+depth and a set of focus areas. Every stage declares a cost class (how much of the
+project it reads) and the focus areas it feeds. A depth profile admits cost classes,
+sets per-cost budgets (files read, bytes per file, time) and may cap the file index
+itself, so "surface" stays fast on repositories of any size while "comprehensive"
+reads everything and overlaps the heavy stages.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_DEPTHS = ("surface", "standard", "deep", "comprehensive")
+FOCUS_AREAS = ("performance", "security", "maintainability", "architecture")
+
+# Cost classes, cheapest first
+COST_INDEX = "index"  # Queries the file index only
+COST_SAMPLED = "sampled"  # Reads a bounded set of files (manifests, content samples)
+COST_FULL = "full"  # Reads every relevant source file
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """An analysis stage: its cost class and the focus areas it feeds."""
+    
+    name: str
+    cost: str
+    focus: Tuple[str, ...] = ()
+    required: bool = False  # Produces fields every ProjectAnalysis has; never skipped
+
+
+@dataclass(frozen=True)
+class StageBudget:
+    """Limits a stage works within; None means the stage's own default."""
+    
+    max_files: Optional[int] = None  # Files read by the stage
+    max_file_bytes: Optional[int] = None  # Larger files are skipped
+    time_budget: Optional[float] = None  # Seconds after which no further files are read
+    
+    def deadline(self) -> Optional[float]:
+        """time.monotonic() value at which the stage should stop, if it has a time budget."""
+        return time.monotonic() + self.time_budget if self.time_budget is not None else None
+
+
+def deadline_passed(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+ANALYSIS_STAGES: Dict[str, StageSpec] = {spec.name: spec for spec in [
+    StageSpec("file_structure", COST_INDEX, ("maintainability", "architecture"), required=True),
+    StageSpec("technology_stack", COST_SAMPLED, ("architecture",), required=True),
+    StageSpec("configuration_files", COST_INDEX, required=True),
+    StageSpec("health", COST_INDEX, FOCUS_AREAS, required=True),
+    StageSpec("architecture_patterns", COST_INDEX, ("architecture",)),
+    StageSpec("dependencies", COST_SAMPLED, ("security", "maintainability")),
+    StageSpec("vulnerabilities", COST_SAMPLED, ("security",)),
+    StageSpec("complexity_metrics", COST_FULL, ("performance", "maintainability")),
+    StageSpec("duplicate_files", COST_FULL, ("maintainability",)),
+    StageSpec("syntax_summaries", COST_FULL, ("maintainability", "architecture")),
+]}
+
+
+@dataclass(frozen=True)
+class DepthProfile:
+    """Cost classes and budgets of one analysis depth."""
+    
+    name: str
+    costs: Tuple[str, ...]
+    budgets: Dict[str, StageBudget] = field(default_factory=dict)  # Per cost class
+    index_max_files: Optional[int] = None  # Sample the file index itself
+    parallel: bool = False  # Fan per-file work out to worker processes and overlap stages
+
+
+DEPTH_PROFILES: Dict[str, DepthProfile] = {profile.name: profile for profile in [
+    DepthProfile(
+        "surface", (COST_INDEX, COST_SAMPLED),
+        budgets={COST_SAMPLED: StageBudget(max_files=20, max_file_bytes=256 * 1024, time_budget=0.25)},
+        index_max_files=5000
+    ),
+    DepthProfile(
+        "standard", (COST_INDEX, COST_SAMPLED, COST_FULL),
+        budgets={COST_SAMPLED: StageBudget(max_files=100)}
+    ),
+    DepthProfile(
+        "deep", (COST_INDEX, COST_SAMPLED, COST_FULL),
+        budgets={COST_SAMPLED: StageBudget(max_files=500)}
+    ),
+    DepthProfile(
+        "comprehensive", (COST_INDEX, COST_SAMPLED, COST_FULL),
+        budgets={COST_SAMPLED: StageBudget(max_files=None)},
+        parallel=True
+    ),
+]}
+
+
+@dataclass
+class AnalysisPlan:
+    """Stages selected for one analysis and the budget each runs with."""
+    
+    depth: str
+    focus: Tuple[str, ...]
+    stages: Dict[str, StageBudget]
+    skipped: List[str]
+    index_max_files: Optional[int] = None
+    parallel: bool = False
+    
+    def runs(self, stage: str) -> bool:
+        return stage in self.stages
+    
+    def budget(self, stage: str) -> StageBudget:
+        return self.stages.get(stage) or StageBudget()
+    
+    def admits(self, cost: str, focus: Iterable[str] = ()) -> bool:
+        """
+        Whether a stage outside ANALYSIS_STAGES (a plugin) with this cost class and focus
+        should run. Stages without focus areas are not narrowed by the plan's focus.
+        """
+        focus = set(focus)
+        return cost in DEPTH_PROFILES[self.depth].costs and (not self.focus or not focus or bool(focus & set(self.focus)))
+    
+    @property
+    def complete(self) -> bool:
+        """Whether the stages that run see the whole project (no index sampling, size or time cuts)."""
+        return self.index_max_files is None and not any(
+            budget.max_file_bytes is not None or budget.time_budget is not None
+            for budget in self.stages.values()
+        )
+    
+    def describe(self) -> Dict[str, object]:
+        """Summary recorded in the analysis metadata."""
+        return {
+            "depth": self.depth,
+            "focus": list(self.focus),
+            "stages": list(self.stages),
+            "skipped_stages": list(self.skipped),
+        }
+
+
+def plan_analysis(depth: str = "standard", focus: Iterable[str] = ()) -> AnalysisPlan:
+    """
+    Select the stages and budgets of an analysis.
+    
+    A stage runs when it is required, or when the depth admits its cost class and,
+    if focus areas are given, it feeds at least one of them.
+    
+    Args:
+        depth: One of ANALYSIS_DEPTHS
+        focus: Focus areas (FOCUS_AREAS) narrowing the optional stages
+    
+    Returns:
+        The analysis plan
+    """
+    if depth not in DEPTH_PROFILES:
+        raise ValueError(f"Unknown analysis depth '{depth}' (expected one of {', '.join(ANALYSIS_DEPTHS)})")
+    focus = tuple(focus)
+    unknown = [area for area in focus if area not in FOCUS_AREAS]
+    if unknown:
+        raise ValueError(f"Unknown focus areas: {', '.join(unknown)}")
+    
+    profile = DEPTH_PROFILES[depth]
+    stages = {}
+    skipped = []
+    for name, spec in ANALYSIS_STAGES.items():
+        admitted = spec.cost in profile.costs and (not focus or set(spec.focus) & set(focus))
+        if spec.required or admitted:
+            stages[name] = profile.budgets.get(spec.cost) or StageBudget()
+        else:
+            skipped.append(name)
+    
+    logger.debug(f"Analysis plan ({depth}, focus={list(focus)}): run {list(stages)}, skip {skipped}")
+    return AnalysisPlan(depth, focus, stages, skipped, profile.index_max_files, profile.parallel)
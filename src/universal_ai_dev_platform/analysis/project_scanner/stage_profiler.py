@@ -0,0 +1,253 @@
+"""
+Stage Profiler
+
+Per-stage timing and allocation profiles of analysis runs. An AnalysisProfiler is
+activated around a run; while it is active, every profile_stage block (the analyzers
+open one per stage) records its wall time, CPU time, the files and bytes it read and,
+with trace_memory, the tracemalloc peak it allocated on top of what was traced when it
+started. Nothing is recorded, and profile_stage costs one context variable lookup, when
+no profiler is active.
+
+The active profiler and stage live in context variables, so they follow asyncio tasks
+and threads started with asyncio.to_thread: stages running concurrently each get their
+own reads. CPU time is that of the whole process (plus worker processes reaped during
+the stage), so the CPU times of overlapping stages overlap too; so do their memory
+peaks, which are taken at every stage boundary and credited to all stages running.
+
+Profiles export as Chrome trace events (chrome://tracing, Perfetto) or speedscope JSON,
+with overlapping stages on separate tracks.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+TRACE_FORMATS = ("chrome", "speedscope")
+
+_active_profiler: ContextVar[Optional["AnalysisProfiler"]] = ContextVar("active_profiler", default=None)
+_current_stage: ContextVar[Optional["StageProfile"]] = ContextVar("current_stage", default=None)
+
+
+@dataclass
+class StageProfile:
+    """Measurements of one stage; times are in seconds from the start of the profile."""
+    
+    name: str
+    start: float
+    parent: Optional[str] = None  # Enclosing stage, if any
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    files: int = 0  # Files whose content the stage read
+    bytes_read: int = 0
+    memory_peak: Optional[int] = None  # Bytes above the traced memory at the start; None: not traced
+    cached: bool = False  # Outputs came from the result store
+
+
+class AnalysisProfiler:
+    """
+    Collects the stage profiles of one analysis run.
+    
+    Example:
+        profiler = AnalysisProfiler(trace_memory=True)
+        with profiler.activate():
+            analysis = await analyzer.analyze_project(path)
+        profiler.write_trace("analysis.trace.json")
+    """
+    
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: List[StageProfile] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._running: Dict[int, List[int]] = {}  # id(stage) -> [memory at start, peak so far]
+        self._started_tracing = False
+    
+    @contextmanager
+    def activate(self) -> Iterator["AnalysisProfiler"]:
+        """Make this the active profiler for the enclosed code (and tasks it starts)."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        token = _active_profiler.set(self)
+        try:
+            yield self
+        finally:
+            _active_profiler.reset(token)
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageProfile]:
+        """Profile the enclosed block as one stage."""
+        parent = _current_stage.get()
+        profile = StageProfile(name, 0.0, parent.name if parent else None)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            self._memory_boundary(start=profile)
+        wall, cpu, children = time.perf_counter(), time.process_time(), _children_cpu_time()
+        profile.start = wall - self._origin
+        token = _current_stage.set(profile)
+        try:
+            yield profile
+        finally:
+            _current_stage.reset(token)
+            profile.wall_time = time.perf_counter() - wall
+            profile.cpu_time = time.process_time() - cpu + _children_cpu_time() - children
+            if tracing:
+                self._memory_boundary(end=profile)
+            with self._lock:
+                self.stages.append(profile)
+    
+    def _memory_boundary(self, start: Optional[StageProfile] = None, end: Optional[StageProfile] = None):
+        """Credit the peak since the previous boundary to every running stage."""
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            for memory in self._running.values():
+                memory[1] = max(memory[1], peak)
+            if start is not None:
+                self._running[id(start)] = [current, current]
+            if end is not None:
+                baseline, stage_peak = self._running.pop(id(end), (current, current))
+                end.memory_peak = max(stage_peak, peak) - baseline
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly profile, stages in start order (analysis_metadata["profile"])."""
+        stages = sorted(self.stages, key=lambda stage: stage.start)
+        top_level = [stage for stage in stages if stage.parent is None]
+        return {
+            "wall_time": max((stage.start + stage.wall_time for stage in stages), default=0.0),
+            "cpu_time": sum(stage.cpu_time for stage in top_level),
+            "files": sum(stage.files for stage in stages),
+            "bytes_read": sum(stage.bytes_read for stage in stages),
+            "memory_traced": self.trace_memory,
+            "stages": [asdict(stage) for stage in stages],
+        }
+    
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace event format: one complete event per stage, in microseconds."""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "uai analysis"}}]
+        for track, stage in _assign_tracks(self.stages):
+            events.append({
+                "name": stage.name,
+                "cat": "cached" if stage.cached else "stage",
+                "ph": "X",
+                "ts": round(stage.start * 1e6, 3),
+                "dur": round(stage.wall_time * 1e6, 3),
+                "pid": pid,
+                "tid": track,
+                "args": {field: value for field, value in asdict(stage).items()
+                         if field not in ("name", "start", "wall_time") and value is not None},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+    
+    def speedscope(self, name: str = "analysis") -> Dict[str, Any]:
+        """speedscope file: one evented profile per track, stages as frames."""
+        frames: Dict[str, int] = {}
+        tracks: Dict[int, List[StageProfile]] = {}
+        for track, stage in _assign_tracks(self.stages):
+            frames.setdefault(stage.name, len(frames))
+            tracks.setdefault(track, []).append(stage)
+        end_value = max((stage.start + stage.wall_time for stage in self.stages), default=0.0)
+        
+        profiles = []
+        for track, stages in sorted(tracks.items()):
+            # Stages of a track are disjoint or nested: close the open ones that ended first
+            events, open_stages = [], []
+            for stage in stages + [None]:
+                while open_stages and (stage is None or
+                                       open_stages[-1].start + open_stages[-1].wall_time <= stage.start):
+                    closed = open_stages.pop()
+                    events.append({"type": "C", "frame": frames[closed.name],
+                                   "at": closed.start + closed.wall_time})
+                if stage is not None:
+                    events.append({"type": "O", "frame": frames[stage.name], "at": stage.start})
+                    open_stages.append(stage)
+            profiles.append({
+                "type": "evented",
+                "name": f"{name} (track {track})",
+                "unit": "seconds",
+                "startValue": 0.0,
+                "endValue": end_value,
+                "events": events,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "shared": {"frames": [{"name": frame} for frame in frames]},
+            "profiles": profiles,
+            "exporter": "universal-ai-dev-platform",
+        }
+    
+    def write_trace(self, path: Union[str, Path], format: str = "chrome"):
+        """
+        Write the profile as a trace file.
+        
+        Args:
+            path: Output file
+            format: "chrome" (trace event JSON) or "speedscope"
+        """
+        if format not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format '{format}' (expected one of {', '.join(TRACE_FORMATS)})")
+        trace = self.chrome_trace() if format == "chrome" else self.speedscope(Path(path).stem)
+        Path(path).write_text(json.dumps(trace))
+        logger.info(f"Wrote {format} trace of {len(self.stages)} stages to {path}")
+
+
+def active_profiler() -> Optional[AnalysisProfiler]:
+    """Profiler active in the current context, if any."""
+    return _active_profiler.get()
+
+
+def profile_stage(name: str):
+    """Context manager profiling a stage when a profiler is active; yields its StageProfile or None."""
+    profiler = _active_profiler.get()
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+def record_read(bytes_read: int, files: int = 1):
+    """Count file content read by the current stage (no-op outside profiled stages)."""
+    stage = _current_stage.get()
+    if stage is not None:
+        stage.files += files
+        stage.bytes_read += bytes_read
+
+
+def _children_cpu_time() -> float:
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+def _assign_tracks(stages: List[StageProfile]) -> List[Tuple[int, StageProfile]]:
+    """
+    (track, stage) pairs placing stages so that the stages of one track are either
+    disjoint or nested, as trace viewers expect.
+    """
+    tracks: List[List[StageProfile]] = []  # Open stages per track, outermost first
+    placed = []
+    for stage in sorted(stages, key=lambda stage: (stage.start, -stage.wall_time)):
+        end = stage.start + stage.wall_time
+        for open_stages in tracks:
+            while open_stages and open_stages[-1].start + open_stages[-1].wall_time <= stage.start:
+                open_stages.pop()
+        # First track where the stage nests in the innermost open stage, else a new one
+        track = next((track for track, open_stages in enumerate(tracks)
+                      if not open_stages or end <= open_stages[-1].start + open_stages[-1].wall_time), len(tracks))
+        if track == len(tracks):
+            tracks.append([])
+        tracks[track].append(stage)
+        placed.append((track, stage))
+    return placed
+
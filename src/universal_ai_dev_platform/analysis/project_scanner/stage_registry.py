@@ -0,0 +1,312 @@
+"""
+Stage Registry
+
+Analysis stages declared by the values they consume and produce ("index",
+"technology_stack", "health_assessment", ...). The registry orders them into a DAG and
+the runner starts every stage as soon as its inputs exist, so independent stages run
+concurrently: coroutine stages on the event loop, blocking I/O stages in threads and
+CPU-bound stages in a process pool. Stages marked cacheable are skipped when their
+outputs for the same tree and options are in the result store.
+
+Third-party stages plug in through the "universal_ai_dev_platform.analysis_stages" entry
+point group; each entry point names an AnalysisStage, or a callable returning one or a
+list of them. Their outputs appear in ProjectAnalysis.extensions.
+"""
+
+import asyncio
+import inspect
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .result_store import AnalysisResultStore
+from .stage_planner import COST_INDEX
+from .stage_profiler import profile_stage
+
+logger = logging.getLogger(__name__)
+
+STAGE_ENTRY_POINT_GROUP = "universal_ai_dev_platform.analysis_stages"
+STAGE_EXECUTORS = ("async", "thread", "process")
+
+# Values only async stages may consume: the scan cache's SQLite connection belongs to
+# the event loop's thread and cannot be pickled
+ASYNC_ONLY_INPUTS = ("cache",)
+
+
+@dataclass(frozen=True)
+class AnalysisStage:
+    """
+    One node of the analysis DAG.
+    
+    run is called with the stage's inputs as positional arguments, in declaration
+    order, and returns its single output, or a tuple of its outputs when it declares
+    several. Process stages must be picklable module-level functions.
+    
+    Thread and process stages run off the event loop's thread, so they cannot take
+    ASYNC_ONLY_INPUTS (the scan cache); a stage that needs the cache runs on the loop
+    and hands its blocking work to a thread or process itself.
+    """
+    
+    name: str
+    run: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    executor: str = "async"  # One of STAGE_EXECUTORS
+    cacheable: bool = False  # Outputs may be taken from the result store
+    optional: bool = False  # A failure yields None outputs instead of failing the analysis
+    version: str = "1"  # Bump to invalidate stored outputs
+    cost: str = COST_INDEX  # Cost class and focus areas, for depth and focus planning
+    focus: Tuple[str, ...] = ()
+    
+    def __post_init__(self):
+        if self.executor not in STAGE_EXECUTORS:
+            raise ValueError(f"Stage '{self.name}' has unknown executor '{self.executor}' "
+                             f"(expected one of {', '.join(STAGE_EXECUTORS)})")
+        if not self.outputs:
+            raise ValueError(f"Stage '{self.name}' declares no outputs")
+        loop_bound = [name for name in self.inputs if name in ASYNC_ONLY_INPUTS]
+        if loop_bound and self.executor != "async":
+            raise ValueError(f"{self.executor.capitalize()} stage '{self.name}' cannot take "
+                             f"{', '.join(loop_bound)} (only async stages can)")
+
+
+class StageRegistry:
+    """
+    Registered analysis stages, resolvable into dependency order.
+    
+    Example:
+        registry = StageRegistry()
+        registry.register(AnalysisStage("loc", count_lines, inputs=("index",), outputs=("loc",)))
+        stages = registry.resolve(available=("index",))
+    """
+    
+    def __init__(self, stages: Iterable[AnalysisStage] = ()):
+        self._stages: Dict[str, AnalysisStage] = {}
+        self._producers: Dict[str, str] = {}  # Output -> stage name
+        for stage in stages:
+            self.register(stage)
+    
+    def register(self, stage: AnalysisStage):
+        """
+        Add a stage.
+        
+        Raises:
+            ValueError: If the stage's name or one of its outputs is already registered
+        """
+        if stage.name in self._stages:
+            raise ValueError(f"Analysis stage '{stage.name}' is already registered")
+        taken = [output for output in stage.outputs if output in self._producers]
+        if taken:
+            raise ValueError(f"Outputs of stage '{stage.name}' are already produced by "
+                             f"{', '.join(self._producers[output] for output in taken)}")
+        self._stages[stage.name] = stage
+        self._producers.update((output, stage.name) for output in stage.outputs)
+    
+    def load_entry_points(self, group: str = STAGE_ENTRY_POINT_GROUP) -> List[str]:
+        """
+        Register the stages of installed plugins. Plugins that fail to load or clash
+        with a registered stage are skipped with a warning.
+        
+        Returns:
+            Names of the registered plugin stages
+        """
+        loaded = []
+        for stage in load_stage_plugins(group):
+            try:
+                self.register(stage)
+                loaded.append(stage.name)
+            except ValueError as e:
+                logger.warning(f"Skipping analysis stage plugin: {e}")
+        return loaded
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._stages
+    
+    def __iter__(self):
+        return iter(self._stages.values())
+    
+    def resolve(self, available: Iterable[str] = (),
+                include: Optional[Callable[[AnalysisStage], bool]] = None) -> List[AnalysisStage]:
+        """
+        Stages in dependency order, each after the producers of its inputs.
+        
+        Stages whose inputs are neither available nor produced by a selected stage are
+        left out with a warning, as are the stages depending on them.
+        
+        Args:
+            available: Values provided by the caller
+            include: Predicate selecting stages (default: all)
+        
+        Raises:
+            ValueError: If the selected stages depend on each other in a cycle
+        """
+        selected = {name: stage for name, stage in self._stages.items() if include is None or include(stage)}
+        ready = set(available)
+        ordered = []
+        while selected:
+            runnable = [stage for stage in selected.values() if all(
+                name in ready or (name in self._producers and self._producers[name] in selected)
+                for name in stage.inputs
+            )]
+            if len(runnable) < len(selected):
+                for name in set(selected) - {stage.name for stage in runnable}:
+                    missing = [value for value in selected[name].inputs
+                               if value not in ready and self._producers.get(value) not in selected]
+                    logger.warning(f"Skipping analysis stage '{name}': no stage produces {', '.join(missing)}")
+                    del selected[name]
+                continue
+            
+            wave = [stage for stage in runnable if all(name in ready for name in stage.inputs)]
+            if not wave:
+                raise ValueError(f"Analysis stages form a cycle: {', '.join(sorted(selected))}")
+            for stage in wave:
+                ordered.append(stage)
+                ready.update(stage.outputs)
+                del selected[stage.name]
+        return ordered
+
+
+@lru_cache(maxsize=None)
+def load_stage_plugins(group: str = STAGE_ENTRY_POINT_GROUP) -> Tuple[AnalysisStage, ...]:
+    """Analysis stages advertised by installed packages (loaded once per process)."""
+    stages = []
+    for entry_point in entry_points(group=group):
+        try:
+            provided = entry_point.load()
+            if not isinstance(provided, AnalysisStage) and callable(provided):
+                provided = provided()
+            provided = [provided] if isinstance(provided, AnalysisStage) else list(provided)
+            if not all(isinstance(stage, AnalysisStage) for stage in provided):
+                raise TypeError("expected AnalysisStage objects")
+        except Exception as e:
+            logger.warning(f"Could not load analysis stage plugin '{entry_point.name}': {e}")
+            continue
+        stages.extend(provided)
+        logger.debug(f"Loaded analysis stages {[stage.name for stage in provided]} from '{entry_point.name}'")
+    return tuple(stages)
+
+
+class StageOutputCache:
+    """
+    Stage outputs in the result store, valid for one tree fingerprint.
+    
+    Args:
+        store: Result store
+        project_path: Project (or workspace package) the outputs belong to
+        fingerprint: Tree fingerprint of the analyzed index
+        version: Version of the analyzer running the stages
+        signature: Signature of the options a stage's outputs depend on
+    """
+    
+    def __init__(self, store: AnalysisResultStore, project_path: str, fingerprint: str, version: str,
+                 signature: Callable[[AnalysisStage], str]):
+        self.store = store
+        self.project_path = project_path
+        self.fingerprint = fingerprint
+        self.version = version
+        self.signature = signature
+    
+    def _key(self, stage: AnalysisStage) -> Tuple[Tuple[str, str, str], str]:
+        return (f"stage:{stage.name}", self.project_path, self.signature(stage)), f"{self.version}/{stage.version}"
+    
+    def get(self, stage: AnalysisStage) -> Optional[Tuple[Any, ...]]:
+        key, version = self._key(stage)
+        return self.store.get(key, self.fingerprint, version)
+    
+    def put(self, stage: AnalysisStage, outputs: Tuple[Any, ...]):
+        key, version = self._key(stage)
+        self.store.put(key, self.fingerprint, version, outputs)
+
+
+async def run_stages(stages: List[AnalysisStage], values: Dict[str, Any],
+                     cache: Optional[StageOutputCache] = None,
+                     max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run resolved stages, each as soon as its inputs are produced.
+    
+    Args:
+        stages: Stages in dependency order (StageRegistry.resolve)
+        values: Values available up front; produced outputs are added to it
+        cache: Optional store of cacheable stage outputs
+        max_workers: Size of the process pool for process stages
+    
+    Returns:
+        values, including every stage output
+    
+    Raises:
+        Exception: The first failure of a non-optional stage; the other stages are cancelled
+    """
+    loop = asyncio.get_running_loop()
+    produced = {output: loop.create_future() for stage in stages for output in stage.outputs}
+    for future in produced.values():
+        # Failures are re-raised by run_stages; dependents never awaiting them is fine
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    pool: List[Optional[ProcessPoolExecutor]] = []
+    
+    async def execute(stage: AnalysisStage, arguments: List[Any]) -> Any:
+        if stage.executor == "thread":
+            return await asyncio.to_thread(stage.run, *arguments)
+        if stage.executor == "process":
+            if not pool:
+                try:
+                    pool.append(ProcessPoolExecutor(max_workers=max_workers))
+                except (OSError, NotImplementedError) as e:
+                    logger.warning(f"Process pool unavailable ({e}); running process stages in threads")
+                    pool.append(None)
+            if pool[0] is not None:
+                try:
+                    return await loop.run_in_executor(pool[0], stage.run, *arguments)
+                except BrokenProcessPool as e:
+                    logger.warning(f"Stage '{stage.name}' lost its worker ({e}); running it in a thread")
+            return await asyncio.to_thread(stage.run, *arguments)
+        result = stage.run(*arguments)
+        return await result if inspect.isawaitable(result) else result
+    
+    async def run(stage: AnalysisStage):
+        try:
+            arguments = [values[name] if name in values else await produced[name] for name in stage.inputs]
+            # Profiled once its inputs exist, so waiting for producers is not counted
+            with profile_stage(stage.name) as profile:
+                outputs = cache.get(stage) if cache is not None and stage.cacheable else None
+                if outputs is None:
+                    result = await execute(stage, arguments)
+                    outputs = result if len(stage.outputs) > 1 else (result,)
+                    if len(outputs) != len(stage.outputs):
+                        raise ValueError(f"Stage '{stage.name}' returned {len(outputs)} values "
+                                         f"for {len(stage.outputs)} outputs")
+                    if cache is not None and stage.cacheable:
+                        cache.put(stage, tuple(outputs))
+                else:
+                    logger.debug(f"Stage '{stage.name}' reused from the result store")
+                    if profile is not None:
+                        profile.cached = True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not stage.optional:
+                for output in stage.outputs:
+                    produced[output].set_exception(e)
+                raise
+            logger.warning(f"Optional analysis stage '{stage.name}' failed: {e}")
+            outputs = (None,) * len(stage.outputs)
+        
+        for output, value in zip(stage.outputs, outputs, strict=True):
+            values[output] = value
+            produced[output].set_result(value)
+    
+    tasks = [asyncio.ensure_future(run(stage)) for stage in stages]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        if pool and pool[0] is not None:
+            pool[0].shutdown(wait=False, cancel_futures=True)
+    return values
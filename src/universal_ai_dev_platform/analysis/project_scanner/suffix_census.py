@@ -0,0 +1,189 @@
+"""
+Suffix Census
+
+Batched classification of a project's files by suffix. Suffixes are already interned by
+the file index, so a suffix -> category lookup table is built once per index (one entry
+per distinct suffix) and every file is classified through it in a single pass: with
+NumPy the suffix id, directory id and flag columns are viewed as arrays and counted with
+np.bincount; without it the same counts are taken in one loop over the columns. The
+result holds the suffix counts (file_types), category counts (language shares) and the
+category mix of every directory at the same time.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, TypeVar
+
+from .file_index import FLAG_HIDDEN, FLAG_IGNORED, ProjectFileIndex
+
+# Optional vectorized counting
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SKIPPED_FLAGS = FLAG_HIDDEN | FLAG_IGNORED  # Files left out of the census, as in source_files()
+
+
+def suffix_table(index: ProjectFileIndex, values: Dict[str, T], default: Optional[T] = None) -> List[Optional[T]]:
+    """
+    Value of every interned suffix of an index, indexed by suffix id.
+    
+    Args:
+        index: Project file index
+        values: Value per suffix (matched lower-cased, like the index's suffixes)
+        default: Value of suffixes missing from values
+    """
+    lowered = {suffix.lower(): value for suffix, value in values.items()}
+    return [lowered.get(suffix, default) for suffix in index.suffixes]
+
+
+def files_with_suffixes(index: ProjectFileIndex, suffixes: Iterable[str],
+                        skip_flags: int = FLAG_IGNORED) -> List[int]:
+    """
+    Ids of the files with one of the given suffixes, in index order.
+    
+    Args:
+        index: Project file index
+        suffixes: Suffixes to select
+        skip_flags: Files with any of these flags are left out
+    """
+    member = suffix_table(index, {suffix: True for suffix in suffixes}, False)
+    if not any(member):
+        return []
+    if NUMPY_AVAILABLE:
+        selected = np.asarray(member, dtype=bool)[np.asarray(index.suffix_ids)]
+        if skip_flags:
+            selected &= (np.asarray(index.flags) & skip_flags) == 0
+        return np.flatnonzero(selected).tolist()
+    flags = index.flags
+    return [file_id for file_id, suffix_id in enumerate(index.suffix_ids)
+            if member[suffix_id] and not flags[file_id] & skip_flags]
+
+
+class SuffixCensus:
+    """
+    File counts of one index by suffix, by category and by directory and category.
+    
+    Categories are numbered in the order they were given to SuffixClassifier; files of
+    unlisted suffixes count towards the extra last slot, "other".
+    """
+    
+    def __init__(self, index: ProjectFileIndex, categories: List[str], suffix_counts: Sequence[int],
+                 category_counts: Sequence[int], directory_counts: List[List[int]]):
+        self.index = index
+        self.categories = categories
+        self.suffix_counts = suffix_counts  # Per suffix id
+        self.category_counts = category_counts  # Per category id, "other" last
+        self.directory_counts = directory_counts  # Per directory id, per category id
+    
+    @property
+    def total_files(self) -> int:
+        return int(sum(self.suffix_counts))
+    
+    def file_types(self) -> Dict[str, int]:
+        """Number of files per suffix ("" for files without one)."""
+        return {self.index.suffixes[suffix_id]: int(count)
+                for suffix_id, count in enumerate(self.suffix_counts) if count}
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of files per category that has any."""
+        counts = zip(self.categories, self.category_counts[:len(self.categories)], strict=True)
+        return {category: int(count) for category, count in counts if count}
+    
+    def shares(self) -> Dict[str, float]:
+        """Share of each category among the categorized files."""
+        counts = self.counts()
+        total = sum(counts.values())
+        return {category: count / total for category, count in counts.items()} if total else {}
+    
+    def directory_mix(self, max_depth: int = 1) -> Dict[str, Dict[str, float]]:
+        """
+        Category shares of every directory down to max_depth, including the files of
+        its subdirectories. Directories without categorized files are left out.
+        """
+        index = self.index
+        width = len(self.categories)
+        totals = [list(row[:width]) for row in self.directory_counts]
+        parents = index.dir_parents
+        # Directories are numbered parents first, so one pass from the last id down
+        # adds each directory's counts to its parent
+        for dir_id in range(len(totals) - 1, 0, -1):
+            parent = parents[dir_id]
+            if parent >= 0:
+                row = totals[parent]
+                for category_id, count in enumerate(totals[dir_id]):
+                    row[category_id] += count
+        
+        mix = {}
+        for dir_id in range(1, len(totals)):
+            total = sum(totals[dir_id])
+            if total and index.dir_depths[dir_id] <= max_depth:
+                mix[index.directories[dir_id]] = {
+                    category: totals[dir_id][category_id] / total
+                    for category_id, category in enumerate(self.categories) if totals[dir_id][category_id]
+                }
+        return mix
+
+
+class SuffixClassifier:
+    """
+    Classifies the files of an index into categories (languages) by suffix.
+    
+    Example:
+        classifier = SuffixClassifier({"python": [".py"], "go": [".go"]})
+        census = classifier.classify(index)
+        census.shares()  # {"python": 0.75, "go": 0.25}
+    """
+    
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self.categories = list(categories)
+        self._category_of: Dict[str, int] = {}
+        for category_id, suffixes in enumerate(categories.values()):
+            for suffix in suffixes:
+                # A suffix listed by two categories belongs to the first
+                self._category_of.setdefault(suffix.lower(), category_id)
+    
+    def lookup_table(self, index: ProjectFileIndex) -> List[int]:
+        """Category id of every interned suffix of an index ("other" when unlisted)."""
+        return suffix_table(index, self._category_of, len(self.categories))
+    
+    def classify(self, index: ProjectFileIndex) -> SuffixCensus:
+        """Count the non-hidden, non-ignored files of an index in one pass."""
+        table = self.lookup_table(index)
+        width = len(self.categories) + 1
+        if NUMPY_AVAILABLE:
+            return self._classify_arrays(index, table, width)
+        
+        suffix_counts = [0] * len(index.suffixes)
+        category_counts = [0] * width
+        directory_counts = [[0] * width for _ in index.directories]
+        flags = index.flags
+        for file_id, (suffix_id, dir_id) in enumerate(zip(index.suffix_ids, index.dir_ids, strict=True)):
+            if flags[file_id] & SKIPPED_FLAGS:
+                continue
+            category_id = table[suffix_id]
+            suffix_counts[suffix_id] += 1
+            category_counts[category_id] += 1
+            directory_counts[dir_id][category_id] += 1
+        return SuffixCensus(index, self.categories, suffix_counts, category_counts, directory_counts)
+    
+    def _classify_arrays(self, index: ProjectFileIndex, table: List[int], width: int) -> SuffixCensus:
+        """classify() with NumPy: the index columns are counted without a Python loop."""
+        kept = (np.asarray(index.flags) & SKIPPED_FLAGS) == 0
+        suffix_ids = np.asarray(index.suffix_ids)[kept]
+        dir_ids = np.asarray(index.dir_ids)[kept].astype(np.int64)
+        category_ids = np.asarray(table, dtype=np.int64)[suffix_ids]
+        
+        directories = len(index.directories)
+        directory_counts = np.bincount(dir_ids * width + category_ids, minlength=directories * width)
+        return SuffixCensus(
+            index, self.categories,
+            np.bincount(suffix_ids, minlength=len(index.suffixes)).tolist(),
+            np.bincount(category_ids, minlength=width).tolist(),
+            directory_counts.reshape(directories, width).tolist()
+        )
@@ -0,0 +1,419 @@
+"""
+Syntax Parser
+
+Tree-sitter parsing backend that turns source files into compact syntax summaries
+(classes, functions, imports and call sites) which analysis stages can query instead
+of matching raw text. Grammars are imported lazily the first time a language is
+parsed, one parser per language is kept per process, and the most recent tree of
+each file is retained so that re-parsing an edited file reuses it incrementally.
+Python files fall back to the standard library ast module when tree-sitter or its
+grammar is not installed.
+"""
+
+import ast
+import importlib
+import importlib.util
+import logging
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Optional advanced parsing dependencies
+try:
+    from tree_sitter import Language, Parser
+    TREE_SITTER_AVAILABLE = True
+except ImportError:
+    TREE_SITTER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Bump when the summary format or extraction rules change
+SYNTAX_SUMMARY_VERSION = 1
+
+# Grammar key -> (module, language function) of the declared grammar packages
+GRAMMAR_MODULES = {
+    "python": ("tree_sitter_python", "language"),
+    "javascript": ("tree_sitter_javascript", "language"),
+    "typescript": ("tree_sitter_typescript", "language_typescript"),
+    "tsx": ("tree_sitter_typescript", "language_tsx"),
+    "rust": ("tree_sitter_rust", "language"),
+    "go": ("tree_sitter_go", "language"),
+}
+
+# Suffixes parsed with a different grammar than their language's default
+SUFFIX_GRAMMARS = {".tsx": "tsx"}
+
+_JS_NODES = {
+    "class_declaration": "classes",
+    "abstract_class_declaration": "classes",
+    "function_declaration": "functions",
+    "generator_function_declaration": "functions",
+    "method_definition": "functions",
+    "import_statement": "imports",
+    "call_expression": "calls",
+    "new_expression": "calls",
+}
+
+# Grammar key -> node type -> summary field
+SUMMARY_NODE_TYPES = {
+    "python": {
+        "class_definition": "classes",
+        "function_definition": "functions",
+        "import_statement": "imports",
+        "import_from_statement": "imports",
+        "call": "calls",
+    },
+    "javascript": _JS_NODES,
+    "typescript": _JS_NODES,
+    "tsx": _JS_NODES,
+    "rust": {
+        "struct_item": "classes",
+        "enum_item": "classes",
+        "trait_item": "classes",
+        "function_item": "functions",
+        "use_declaration": "imports",
+        "call_expression": "calls",
+        "macro_invocation": "calls",
+    },
+    "go": {
+        "type_spec": "classes",
+        "function_declaration": "functions",
+        "method_declaration": "functions",
+        "import_spec": "imports",
+        "call_expression": "calls",
+    },
+}
+
+# Callee node types whose text can be a plain (possibly qualified) name
+_CALLEE_NODE_TYPES = {
+    "identifier", "attribute", "member_expression", "scoped_identifier",
+    "selector_expression", "field_expression", "field_identifier", "dotted_name"
+}
+
+# Callees are only recorded when they are names like a, a.b or a::b
+_QUALIFIED_NAME = re.compile(r"[\w$]+(?:(?:\.|::)[\w$]+)*")
+
+
+@dataclass
+class SyntaxSummary:
+    """Structural facts extracted from one source file."""
+    
+    language: str
+    backend: str  # "tree-sitter" or "ast"
+    classes: List[str] = field(default_factory=list)
+    functions: List[str] = field(default_factory=list)
+    imports: List[str] = field(default_factory=list)
+    calls: Dict[str, int] = field(default_factory=dict)  # callee -> number of call sites
+    has_errors: bool = False
+
+
+class SyntaxParser:
+    """
+    Pool of lazily created tree-sitter parsers, one per grammar.
+    
+    Parsers are not thread-safe; use one SyntaxParser per process (or worker).
+    """
+    
+    def __init__(self, languages: Dict[str, List[str]], max_trees: int = 128):
+        """
+        Args:
+            languages: Language name -> file suffixes, as in supported_languages
+            max_trees: Number of recent parse trees kept for incremental re-parsing
+        """
+        self._suffix_grammars: Dict[str, str] = {}
+        for language, suffixes in languages.items():
+            for suffix in suffixes:
+                grammar = SUFFIX_GRAMMARS.get(suffix, language)
+                if grammar in GRAMMAR_MODULES:
+                    self._suffix_grammars[suffix] = grammar
+        
+        self.max_trees = max_trees
+        self._parsers: Dict[str, Any] = {}
+        self._trees: "OrderedDict[str, Tuple[bytes, Any]]" = OrderedDict()
+    
+    def grammar_for(self, file_path: str) -> Optional[str]:
+        """Grammar key used for a file, or None when its language has no grammar."""
+        return self._suffix_grammars.get(Path(file_path).suffix.lower())
+    
+    def backends(self) -> Dict[str, str]:
+        """Backend each grammar would use, without importing any grammar."""
+        backends = {}
+        for grammar in sorted(set(self._suffix_grammars.values())):
+            module_name = GRAMMAR_MODULES[grammar][0]
+            if TREE_SITTER_AVAILABLE and importlib.util.find_spec(module_name) is not None:
+                backends[grammar] = "tree-sitter"
+            elif grammar == "python":
+                backends[grammar] = "ast"
+        return backends
+    
+    def parse(self, file_path: str, source: bytes) -> Optional[SyntaxSummary]:
+        """
+        Parse a file and summarize its structure.
+        
+        Args:
+            file_path: Path of the file, used for the grammar and the tree cache
+            source: File contents
+        
+        Returns:
+            Syntax summary, or None when no backend can parse the file's language
+        """
+        grammar = self.grammar_for(file_path)
+        if grammar is None:
+            return None
+        
+        parser = self._parser(grammar)
+        if parser is not None:
+            return self._summarize_tree(grammar, self._parse_tree(parser, file_path, source))
+        if grammar == "python":
+            return _summarize_python_ast(source)
+        return None
+    
+    def parse_tree(self, file_path: str, source: bytes) -> Optional[Tuple[str, Any]]:
+        """
+        Parse a file with tree-sitter.
+        
+        Returns:
+            (grammar key, tree), or None when no tree-sitter grammar is available
+        """
+        grammar = self.grammar_for(file_path)
+        parser = self._parser(grammar) if grammar is not None else None
+        if parser is None:
+            return None
+        return grammar, self._parse_tree(parser, file_path, source)
+    
+    def _parser(self, grammar: str) -> Optional[Any]:
+        """Parser for a grammar, loading the grammar on first use."""
+        if grammar in self._parsers:
+            return self._parsers[grammar]
+        
+        language = self._load_language(grammar)
+        parser = None
+        if language is not None:
+            try:
+                parser = Parser(language)
+            except TypeError:  # tree-sitter < 0.22
+                parser = Parser()
+                parser.set_language(language)
+        self._parsers[grammar] = parser
+        return parser
+    
+    def _load_language(self, grammar: str) -> Optional[Any]:
+        if not TREE_SITTER_AVAILABLE:
+            return None
+        module_name, function_name = GRAMMAR_MODULES[grammar]
+        try:
+            module = importlib.import_module(module_name)
+            handle = getattr(module, function_name)()
+            try:
+                return Language(handle)
+            except TypeError:  # tree-sitter < 0.22
+                return Language(handle, grammar)
+        except Exception as e:
+            logger.warning(f"Tree-sitter grammar for {grammar} unavailable: {e}")
+            return None
+    
+    def _parse_tree(self, parser: Any, file_path: str, source: bytes) -> Any:
+        """Parse source, editing and reusing the previous tree of the same file."""
+        previous = self._trees.pop(file_path, None)
+        if previous is None:
+            tree = parser.parse(source)
+        else:
+            old_source, old_tree = previous
+            edit = _source_edit(old_source, source)
+            if edit is None:
+                tree = old_tree
+            else:
+                old_tree.edit(**edit)
+                tree = parser.parse(source, old_tree)
+        
+        self._trees[file_path] = (source, tree)
+        if len(self._trees) > self.max_trees:
+            self._trees.popitem(last=False)
+        return tree
+    
+    def _summarize_tree(self, grammar: str, tree: Any) -> SyntaxSummary:
+        node_types = SUMMARY_NODE_TYPES[grammar]
+        summary = SyntaxSummary(language=grammar, backend="tree-sitter",
+                                has_errors=tree.root_node.has_error)
+        calls = Counter()
+        
+        for node in _walk(tree.root_node):
+            kind = node_types.get(node.type)
+            if kind is None:
+                continue
+            if kind == "calls":
+                callee = _callee_name(node)
+                if callee:
+                    calls[callee] += 1
+            elif kind == "imports":
+                summary.imports.extend(_import_names(node))
+            else:
+                name = node.child_by_field_name("name")
+                if name is not None:
+                    getattr(summary, kind).append(_text(name))
+        
+        summary.calls = dict(calls)
+        return summary
+
+
+def summarize_syntax(summaries: Dict[str, SyntaxSummary], top_k: int = 10) -> Dict[str, Any]:
+    """
+    JSON-friendly code structure of a project, from its per-file syntax summaries.
+    
+    Args:
+        summaries: Syntax summary per relative path (extract_syntax_summaries)
+        top_k: Number of imports and callees listed, most used first
+    """
+    languages: Counter = Counter()
+    backends: Counter = Counter()
+    imports: Counter = Counter()  # Module -> files importing it
+    calls: Counter = Counter()
+    for summary in summaries.values():
+        languages[summary.language] += 1
+        backends[summary.backend] += 1
+        imports.update(set(summary.imports))
+        calls.update(summary.calls)
+    return {
+        "files_parsed": len(summaries),
+        "classes": sum(len(summary.classes) for summary in summaries.values()),
+        "functions": sum(len(summary.functions) for summary in summaries.values()),
+        "languages": dict(languages.most_common()),
+        "backends": dict(backends.most_common()),
+        "top_imports": imports.most_common(top_k),
+        "top_calls": calls.most_common(top_k),
+        "files_with_errors": sorted(path for path, summary in summaries.items() if summary.has_errors),
+    }
+
+
+def _walk(root: Any) -> Iterator[Any]:
+    """Pre-order traversal of a tree-sitter tree using a cursor."""
+    cursor = root.walk()
+    while True:
+        yield cursor.node
+        if cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return
+
+
+def _text(node: Any) -> str:
+    return node.text.decode("utf-8", errors="ignore")
+
+
+def _callee_name(node: Any) -> Optional[str]:
+    callee = (node.child_by_field_name("function") or node.child_by_field_name("constructor")
+              or node.child_by_field_name("macro"))
+    if callee is None or callee.type not in _CALLEE_NODE_TYPES:
+        return None
+    name = _text(callee)
+    return name if _QUALIFIED_NAME.fullmatch(name) else None
+
+
+def _import_names(node: Any) -> List[str]:
+    """Imported module names of an import node."""
+    if node.type == "import_from_statement":
+        module = node.child_by_field_name("module_name")
+        return [_text(module)] if module is not None else []
+    if node.type == "import_statement" and node.child_by_field_name("source") is None:
+        # Python: import a.b, c as d
+        names = []
+        for name in node.children_by_field_name("name"):
+            if name.type == "aliased_import":
+                name = name.child_by_field_name("name")
+            names.append(_text(name))
+        return names
+    
+    target = (node.child_by_field_name("source") or node.child_by_field_name("path")
+              or node.child_by_field_name("argument"))
+    return [_text(target).strip("'\"`")] if target is not None else []
+
+
+def _source_edit(old: bytes, new: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Describe the change between two versions of a file as one tree-sitter edit.
+    
+    Returns:
+        Keyword arguments for Tree.edit, or None when the sources are identical
+    """
+    if old == new:
+        return None
+    
+    limit = min(len(old), len(new))
+    prefix = _common_length(lambda n: old[:n] == new[:n], limit)
+    suffix = _common_length(
+        lambda n: old[len(old) - n:] == new[len(new) - n:], limit - prefix
+    )
+    old_end = len(old) - suffix
+    new_end = len(new) - suffix
+    return {
+        "start_byte": prefix,
+        "old_end_byte": old_end,
+        "new_end_byte": new_end,
+        "start_point": _point(old, prefix),
+        "old_end_point": _point(old, old_end),
+        "new_end_point": _point(new, new_end),
+    }
+
+
+def _common_length(matches, limit: int) -> int:
+    """Largest n <= limit with matches(n), by binary search over slice comparisons."""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if matches(middle):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _point(source: bytes, offset: int) -> Tuple[int, int]:
+    """(row, column) of a byte offset."""
+    row = source.count(b"\n", 0, offset)
+    return row, offset - (source.rfind(b"\n", 0, offset) + 1)
+
+
+def _summarize_python_ast(source: bytes) -> SyntaxSummary:
+    """Summarize Python source with the standard library parser."""
+    summary = SyntaxSummary(language="python", backend="ast")
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        summary.has_errors = True
+        return summary
+    
+    calls = Counter()
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.ClassDef):
+            summary.classes.append(node.name)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            summary.functions.append(node.name)
+        elif isinstance(node, ast.Import):
+            summary.imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            summary.imports.append("." * node.level + (node.module or ""))
+        elif isinstance(node, ast.Call):
+            callee = _dotted_name(node.func)
+            if callee:
+                calls[callee] += 1
+        # Children in reverse so the traversal follows source order
+        stack.extend(reversed(list(ast.iter_child_nodes(node))))
+    
+    summary.calls = dict(calls)
+    return summary
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
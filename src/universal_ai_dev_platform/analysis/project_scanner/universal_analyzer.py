@@ -6,13 +6,23 @@ and provide intelligent insights for improvement and enhancement.
 """
 
 import asyncio
+import contextlib
+import hashlib
+import io
+import itertools
 import json
 import logging
 import os
 import re
-from dataclasses import dataclass, asdict
+import signal
+import sqlite3
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple, Union, Any
 from collections import defaultdict
 
 # Optional advanced parsing dependencies
@@ -30,8 +40,60 @@ except ImportError:
     AST_GREP_AVAILABLE = False
 from packaging import version
 
+from .code_metrics import (
+    CODE_METRICS_VERSION, _init_metrics_worker, _measure_shard, aggregate_metrics, measure_source
+)
+from .content_dedup import DEFAULT_MIN_SIZE, find_duplicate_clusters, summarize_duplicates
+from .content_matcher import BINARY_SNIFF_BYTES, MultiPatternMatcher, looks_binary
+from .content_sampling import converged, sample_batches, stratified_sample_order
+from .dependency_graph import DEPENDENCY_GRAPH_VERSION, DependencyGraph, dependency_parser
+from .file_index import ProjectFileIndex
+from .fingerprint import ProjectFingerprint, fingerprint_index
+from .ignore_rules import DEFAULT_IGNORE_PATTERNS, IgnoreMatcher
+from .result_store import DEFAULT_RESULT_STORE, AnalysisResultStore, open_result_store, options_signature
+from .scan_cache import ScanCache, ScopedScanCache, open_scan_cache
+from .size_distribution import DEFAULT_LARGE_FILE_THRESHOLD, DEFAULT_TOP_K, SizeDistribution
+from .stage_planner import AnalysisPlan, StageBudget, deadline_passed, plan_analysis
+from .stage_profiler import AnalysisProfiler, active_profiler, profile_stage, record_read
+from .stage_registry import AnalysisStage, StageOutputCache, StageRegistry, run_stages
+from .suffix_census import SuffixCensus, SuffixClassifier
+from .syntax_parser import SYNTAX_SUMMARY_VERSION, SyntaxParser, SyntaxSummary, summarize_syntax
+from .vulnerability_index import DEFAULT_VULNERABILITY_DB, VulnerabilityIndex, VulnerabilityMatch
+from .workspace import DEFAULT_MAX_PACKAGES, find_package_roots, package_parents
+
 logger = logging.getLogger(__name__)
 
+ANALYZER_VERSION = "0.7.0"
+
+# Extra seconds the batch driver waits past a project's timeout before giving up on
+# its worker; the worker normally interrupts itself first
+BATCH_TIMEOUT_GRACE = 5.0
+
+# Highest confidence content patterns alone can give a framework
+CONTENT_CONFIDENCE_CAP = 0.8
+
+# Maven groups (or group:artifact coordinates) of JVM technologies, for pom.xml and Gradle builds
+JVM_TECHNOLOGIES = {
+    "frameworks": {
+        "org.springframework.boot": "spring_boot",
+        "org.springframework": "spring",
+        "io.quarkus": "quarkus",
+        "io.micronaut": "micronaut",
+        "io.ktor": "ktor",
+        "io.dropwizard": "dropwizard",
+        "org.hibernate": "hibernate"
+    },
+    "databases": {
+        "org.postgresql:postgresql": "postgresql",
+        "mysql:mysql-connector-java": "mysql",
+        "com.mysql:mysql-connector-j": "mysql",
+        "org.xerial:sqlite-jdbc": "sqlite",
+        "com.h2database:h2": "h2",
+        "org.mongodb": "mongodb",
+        "redis.clients:jedis": "redis"
+    }
+}
+
 
 @dataclass
 class TechnologyStack:
@@ -73,6 +135,7 @@ class ProjectHealth:
     dependency_health: float
     issues: List[str]
     recommendations: List[str]
+    duplicate_files: Dict[str, Any] = field(default_factory=dict)  # See summarize_duplicates
 
 
 @dataclass
@@ -92,6 +155,22 @@ class ProjectAnalysis:
     migration_recommendations: List[str]
     estimated_complexity: str  # "simple", "moderate", "complex", "enterprise"
     analysis_metadata: Dict[str, Any]
+    complexity_metrics: Dict[str, Any] = field(default_factory=dict)
+    dependency_graph: Dict[str, Any] = field(default_factory=dict)
+    vulnerabilities: List[Dict[str, Any]] = field(default_factory=list)
+    sub_projects: List["ProjectAnalysis"] = field(default_factory=list)  # Workspace packages
+    code_structure: Dict[str, Any] = field(default_factory=dict)  # See summarize_syntax
+    extensions: Dict[str, Any] = field(default_factory=dict)  # Outputs of plugin stages
+
+
+@dataclass
+class BatchAnalysisResult:
+    """Outcome of one project analyzed by UniversalProjectAnalyzer.analyze_projects."""
+    
+    project_path: str
+    analysis: Optional[ProjectAnalysis]
+    error: Optional[str] = None  # Set when the analysis failed or timed out
+    duration: float = 0.0  # Seconds
 
 
 class UniversalProjectAnalyzer:
@@ -100,7 +179,8 @@ class UniversalProjectAnalyzer:
     Uses multiple analysis techniques including AST parsing, pattern matching, and heuristics.
     """
     
-    def __init__(self):
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = config or self._default_config()
         self.supported_languages = {
             "python": [".py", ".pyw", ".pyx"],
             "javascript": [".js", ".jsx", ".mjs"],
@@ -117,29 +197,101 @@ class UniversalProjectAnalyzer:
             "scala": [".scala"],
         }
         
+        self.language_classifier = SuffixClassifier(self.supported_languages)
+        self._censuses: "weakref.WeakKeyDictionary[ProjectFileIndex, SuffixCensus]" = weakref.WeakKeyDictionary()
+        self._index_digests: "weakref.WeakKeyDictionary[ProjectFileIndex, str]" = weakref.WeakKeyDictionary()
+        
+        # Analysis stages: the builtin DAG plus stages of installed plugins
+        self.stage_registry = StageRegistry(self._builtin_stages())
+        self._builtin_stage_names = {stage.name for stage in self.stage_registry}
+        if self.config.get("stage_plugins", True):
+            self.stage_registry.load_entry_points()
+        
         self.framework_patterns = self._load_framework_patterns()
+        self.framework_matcher, self.framework_pattern_owners = self._compile_framework_patterns()
         self.architecture_patterns = self._load_architecture_patterns()
         self.project_type_indicators = self._load_project_type_indicators()
         
-        # Initialize parsers for supported languages
-        self.parsers = {}
-        self._initialize_parsers()
+        # Parsers for supported languages; grammars are loaded on first use
+        self.syntax_parser = self._initialize_parsers()
     
-    def _initialize_parsers(self):
+    def _default_config(self) -> Dict:
+        """Default configuration for project analysis."""
+        return {
+            "ignore_patterns": list(DEFAULT_IGNORE_PATTERNS),  # Applied below .gitignore/.uaiignore
+            "syntax_max_file_size": 1024 * 1024,  # Larger files are not parsed or measured
+            "metrics_enabled": True,
+            "max_workers": None,  # None: one metrics process per CPU
+            "parallel_min_files": 256,
+            "vulnerability_db": DEFAULT_VULNERABILITY_DB,  # Offline OSV index, see VulnerabilityIndex
+            "project_timeout": None,  # Seconds per project in analyze_projects; None: no limit
+            "cache_enabled": True,
+            "result_store": DEFAULT_RESULT_STORE,  # Whole results by tree fingerprint; relative: in cache_dir, None: off
+            "result_store_max_bytes": 256 * 1024 * 1024,
+            "size_top_k": DEFAULT_TOP_K,  # Largest files and directories reported per list
+            "language_mix_depth": 1,  # Deepest directory level reported in language_mix
+            "duplicate_min_size": DEFAULT_MIN_SIZE,  # Smaller identical files are not reported
+            "stage_plugins": True,  # Load stages from the universal_ai_dev_platform.analysis_stages entry points
+            "workspace_detection": True,  # Analyze each package of a monorepo as a sub-project
+            "workspace_max_packages": DEFAULT_MAX_PACKAGES,
+            "profile": False,  # Per-stage timings in analysis_metadata["profile"]
+            "profile_memory": False,  # Also trace allocation peaks (slows the analysis down)
+            "cache_dir": ".uai/cache"
+        }
+    
+    def _initialize_parsers(self) -> SyntaxParser:
         """Initialize Tree-sitter parsers for supported languages."""
-        # In a real implementation, you would need to compile and load Tree-sitter grammars
-        # This is a placeholder for the parser initialization
-        logger.info("Initializing language parsers...")
+        syntax_parser = SyntaxParser(self.supported_languages)
+        logger.debug(f"Syntax backends: {syntax_parser.backends()}")
+        return syntax_parser
+    
+    async def extract_syntax_summaries(self, index: ProjectFileIndex,
+                                       cache: Optional[ScanCache] = None,
+                                       budget: Optional[StageBudget] = None) -> Dict[str, SyntaxSummary]:
+        """
+        Summarize the classes, functions, imports and calls of the project's source files.
+        
+        Summaries are cached by content hash (see _read_changed_sources), so unchanged
+        files are not read again and renamed, copied or touched files are not parsed again.
+        
+        Args:
+            index: Project file index
+            cache: Optional scan cache
+            budget: Size limit overriding syntax_max_file_size, and a time budget for
+                reading files
+        
+        Returns:
+            Syntax summary per relative path, for files a backend can parse
+        """
+        budget = budget or StageBudget()
+        backends = self.syntax_parser.backends()
+        if cache is not None:
+            cache.bind("syntax", ScanCache.signature_of([SYNTAX_SUMMARY_VERSION, backends]))
+        
+        max_size = budget.max_file_bytes or self.config.get("syntax_max_file_size", 1024 * 1024)
+        file_ids = [
+            file_id for file_id in index.source_files()
+            if index.sizes[file_id] <= max_size and self.syntax_parser.grammar_for(index.paths[file_id]) in backends
+        ]
         
-        # TODO: Load actual Tree-sitter parsers
-        # self.parsers["python"] = Parser()
-        # self.parsers["python"].set_language(Language(python_lib, "python"))
+        cached, misses = self._read_changed_sources(index, file_ids, cache, "syntax", budget.deadline())
+        summaries = {index.paths[file_id]: SyntaxSummary(**summary) for file_id, summary in cached.items()}
+        for file_id, digest, source in misses:
+            summary = self.syntax_parser.parse(str(index.abs_path(file_id)), source)
+            if summary is None:
+                continue
+            summaries[index.paths[file_id]] = summary
+            if cache is not None:
+                cache.put("syntax", digest, (0, len(source), 0), asdict(summary))
+        
+        return summaries
     
     def _load_framework_patterns(self) -> Dict[str, Dict]:
         """Load framework detection patterns."""
         return {
             "react": {
                 "files": ["package.json"],
+                "languages": ["javascript", "typescript"],
                 "content_patterns": [
                     r'"react":\s*"[^"]*"',
                     r'import.*from\s+[\'"]react[\'"]',
@@ -150,6 +302,7 @@ class UniversalProjectAnalyzer:
             },
             "vue": {
                 "files": ["package.json", "vue.config.js"],
+                "languages": ["javascript", "typescript"],
                 "content_patterns": [
                     r'"vue":\s*"[^"]*"',
                     r'<template>.*</template>',
@@ -159,6 +312,7 @@ class UniversalProjectAnalyzer:
             },
             "angular": {
                 "files": ["angular.json", "package.json"],
+                "languages": ["typescript", "javascript"],
                 "content_patterns": [
                     r'"@angular/core":\s*"[^"]*"',
                     r'@Component\s*\(',
@@ -168,6 +322,7 @@ class UniversalProjectAnalyzer:
             },
             "express": {
                 "files": ["package.json"],
+                "languages": ["javascript", "typescript"],
                 "content_patterns": [
                     r'"express":\s*"[^"]*"',
                     r'require\([\'"]express[\'"]\)',
@@ -178,6 +333,7 @@ class UniversalProjectAnalyzer:
             },
             "django": {
                 "files": ["manage.py", "settings.py", "requirements.txt"],
+                "languages": ["python"],
                 "content_patterns": [
                     r'from\s+django',
                     r'import\s+django',
@@ -188,6 +344,7 @@ class UniversalProjectAnalyzer:
             },
             "flask": {
                 "files": ["app.py", "requirements.txt"],
+                "languages": ["python"],
                 "content_patterns": [
                     r'from\s+flask',
                     r'import\s+Flask',
@@ -197,6 +354,7 @@ class UniversalProjectAnalyzer:
             },
             "nextjs": {
                 "files": ["next.config.js", "package.json"],
+                "languages": ["javascript", "typescript"],
                 "content_patterns": [
                     r'"next":\s*"[^"]*"',
                     r'import.*from\s+[\'"]next[\'"]'
@@ -206,6 +364,7 @@ class UniversalProjectAnalyzer:
             },
             "fastapi": {
                 "files": ["main.py", "requirements.txt"],
+                "languages": ["python"],
                 "content_patterns": [
                     r'from\s+fastapi',
                     r'import\s+FastAPI',
@@ -215,6 +374,16 @@ class UniversalProjectAnalyzer:
             }
         }
     
+    def _compile_framework_patterns(self) -> Tuple[MultiPatternMatcher, List[str]]:
+        """Compile all framework content patterns into one matcher and map ids to frameworks."""
+        patterns = []
+        owners = []
+        for framework, config in self.framework_patterns.items():
+            for pattern in config.get("content_patterns", []):
+                patterns.append(pattern)
+                owners.append(framework)
+        return MultiPatternMatcher(patterns, re.IGNORECASE), owners
+    
     def _load_architecture_patterns(self) -> Dict[str, Dict]:
         """Load architecture pattern detection rules."""
         return {
@@ -310,77 +479,77 @@ class UniversalProjectAnalyzer:
             }
         }
     
-    async def analyze_project(self, project_path: str) -> ProjectAnalysis:
+    async def analyze_project(self, project_path: str, since: Optional[str] = None,
+                              depth: str = "standard", focus: Iterable[str] = ()) -> ProjectAnalysis:
         """
         Perform comprehensive analysis of a project.
         
         Args:
             project_path: Path to the project directory
+            since: Git ref of a previous run whose cached per-file results are reused
+                for files unchanged since that ref; only changed files are re-read
+            depth: Analysis depth selecting stages and budgets (see stage_planner)
+            focus: Focus areas; optional stages feeding none of them are skipped
             
         Returns:
-            Complete project analysis results
+            Complete project analysis results; with the profile option, or inside an
+            active AnalysisProfiler, analysis_metadata["profile"] times every stage
         """
         logger.info(f"Starting analysis of project: {project_path}")
         
         project_path = Path(project_path).resolve()
         if not project_path.exists():
             raise ValueError(f"Project path does not exist: {project_path}")
+        plan = plan_analysis(depth, focus)
+        
+        # Profiled when configured or when the caller activated a profiler (to export a trace)
+        profiler = active_profiler()
+        if profiler is None and not self.config.get("profile", False):
+            return await self._analyze_project(project_path, since, plan)
+        
+        profiler = profiler or AnalysisProfiler(trace_memory=self.config.get("profile_memory", False))
+        with profiler.activate():
+            analysis = await self._analyze_project(project_path, since, plan)
+        # Profiles describe this run, so they are attached after the result is stored
+        analysis.analysis_metadata["profile"] = profiler.to_dict()
+        return analysis
+    
+    async def _analyze_project(self, project_path: Path, since: Optional[str], plan: AnalysisPlan) -> ProjectAnalysis:
+        """Index, look up and analyze a project (see analyze_project)."""
+        # Walk the tree once; every stage queries this index
+        with profile_stage("index"):
+            index = ProjectFileIndex.build(
+                project_path, IgnoreMatcher(self.config.get("ignore_patterns", DEFAULT_IGNORE_PATTERNS)),
+                max_files=plan.index_max_files
+            )
         
+        # An unchanged tree analyzed with the same options is answered from the result store
+        store = open_result_store(self.config, project_path)
+        tree = None
+        if store is not None:
+            with profile_stage("result_store") as profile:
+                store_key = ("project", str(project_path), self._result_options_signature(plan))
+                tree = fingerprint_index(index)
+                self._index_digests[index] = tree.digest
+                stored = store.get(store_key, tree.digest, ANALYZER_VERSION)
+                if profile is not None:
+                    profile.cached = stored is not None
+            if stored is not None:
+                logger.info(f"Analysis of {project_path.name} reused from the result store")
+                return stored
+        
+        cache = open_scan_cache(project_path, self.config, since=since)
         try:
-            # Parallel analysis tasks
-            tasks = [
-                self._analyze_file_structure(project_path),
-                self._detect_technology_stack(project_path),
-                self._detect_architecture_patterns(project_path),
-                self._assess_project_health(project_path),
-                self._analyze_dependencies(project_path),
-                self._identify_configuration_files(project_path),
-            ]
-            
-            results = await asyncio.gather(*tasks)
+            analysis = await self._analyze_index(index, cache, plan, store)
             
-            file_structure = results[0]
-            tech_stack = results[1]
-            architecture_patterns = results[2]
-            health_assessment = results[3]
-            dependencies = results[4]
-            config_files = results[5]
+            # Workspaces: every package is also analyzed on its own and rolled up here
+            if self.config.get("workspace_detection", True):
+                packages = find_package_roots(index, self.config.get("workspace_max_packages", DEFAULT_MAX_PACKAGES))
+                if packages:
+                    await self._analyze_workspace(analysis, index, packages, cache, plan, store, tree)
             
-            # Determine project type and complexity
-            project_type = await self._determine_project_type(
-                project_path, tech_stack, file_structure
-            )
-            complexity = self._estimate_complexity(
-                file_structure, tech_stack, dependencies
-            )
-            
-            # Generate enhancement opportunities and recommendations
-            enhancement_opportunities = await self._identify_enhancement_opportunities(
-                tech_stack, architecture_patterns, health_assessment
-            )
-            migration_recommendations = await self._generate_migration_recommendations(
-                tech_stack, architecture_patterns
-            )
-            
-            analysis = ProjectAnalysis(
-                project_path=str(project_path),
-                project_name=project_path.name,
-                project_type=project_type,
-                technology_stack=tech_stack,
-                architecture_patterns=architecture_patterns,
-                health_assessment=health_assessment,
-                file_structure=file_structure,
-                dependencies=dependencies,
-                configuration_files=config_files,
-                enhancement_opportunities=enhancement_opportunities,
-                migration_recommendations=migration_recommendations,
-                estimated_complexity=complexity,
-                analysis_metadata={
-                    "analysis_version": "1.0.0",
-                    "analysis_timestamp": asyncio.get_event_loop().time(),
-                    "analyzer_version": "0.1.0"
-                }
-            )
+            if store is not None:
+                store.put(store_key, tree.digest, ANALYZER_VERSION, analysis)
             
             logger.info(f"Analysis completed for {project_path.name}")
             return analysis
@@ -388,52 +557,396 @@ class UniversalProjectAnalyzer:
         except Exception as e:
             logger.error(f"Error analyzing project {project_path}: {e}")
             raise
+        
+        finally:
+            if cache is not None:
+                cache.close(complete=plan.complete)
+    
+    async def _analyze_index(self, index: ProjectFileIndex, cache: Optional[Union[ScanCache, ScopedScanCache]],
+                             plan: AnalysisPlan, store: Optional[AnalysisResultStore] = None) -> ProjectAnalysis:
+        """Run the planned stages over an indexed project (or workspace package), with its project's store."""
+        project_path = index.root
+        
+        # Builtin stages check the plan themselves; plugin stages are planned by their cost and focus
+        stages = self.stage_registry.resolve(
+            available=("index", "cache", "plan", "config"),
+            include=lambda stage: stage.name in self._builtin_stage_names or plan.admits(stage.cost, stage.focus)
+        )
+        
+        # Outputs of cacheable stages are reused for the same tree and stage options
+        digest = self._index_digests.get(index)
+        stage_cache = None
+        if store is not None and digest is not None:
+            stage_cache = StageOutputCache(store, str(project_path), digest, ANALYZER_VERSION,
+                                           lambda stage: self._stage_options_signature(stage, plan))
+        
+        values = await run_stages(stages, {"index": index, "cache": cache, "plan": plan, "config": self.config},
+                                  stage_cache, self.config.get("max_workers"))
+        
+        complexity_metrics = values["complexity_metrics"]
+        dependency_graph = values["dependency_graph"]
+        vulnerabilities = values["vulnerabilities"]
+        if complexity_metrics:
+            complexity_metrics["dependency_count"] = len(dependency_graph)
+        
+        return ProjectAnalysis(
+            project_path=str(project_path),
+            project_name=project_path.name,
+            project_type=values["project_type"],
+            technology_stack=values["technology_stack"],
+            architecture_patterns=values["architecture_patterns"],
+            health_assessment=values["health_assessment"],
+            file_structure=values["file_structure"],
+            dependencies=values["dependencies"],
+            configuration_files=values["configuration_files"],
+            enhancement_opportunities=values["enhancement_opportunities"],
+            migration_recommendations=values["migration_recommendations"],
+            estimated_complexity=values["estimated_complexity"],
+            analysis_metadata={
+                "analysis_version": "1.0.0",
+                "analysis_timestamp": asyncio.get_event_loop().time(),
+                "analyzer_version": ANALYZER_VERSION,
+                "files_indexed": len(index),
+                "index_truncated": index.truncated,
+                **plan.describe()
+            },
+            complexity_metrics=complexity_metrics,
+            dependency_graph=dependency_graph.stats(),
+            vulnerabilities=[asdict(match) for match in vulnerabilities or []],
+            code_structure=values["code_structure"],
+            extensions={
+                output: values[output]
+                for stage in stages if stage.name not in self._builtin_stage_names
+                for output in stage.outputs
+            }
+        )
+    
+    def _builtin_stages(self) -> List[AnalysisStage]:
+        """
+        The analyzer's own stages. The index, scan cache, plan and configuration are
+        provided per run; methods are looked up when a stage runs.
+        """
+        run_inputs = ("index", "cache", "plan")
+        return [
+            # Per-file stages, reading the project
+            AnalysisStage("complexity_metrics", lambda index, cache, plan: self._run_metrics_stage(index, cache, plan),
+                          run_inputs, ("complexity_metrics",), cacheable=True),
+            AnalysisStage("dependencies", lambda index, cache, plan: self._run_dependency_stage(index, cache, plan),
+                          run_inputs, ("dependency_graph", "vulnerabilities"), cacheable=True),
+            AnalysisStage("duplicate_files",
+                          lambda index, cache, plan: self._find_duplicate_files(index, cache)
+                          if plan.runs("duplicate_files") else None,
+                          run_inputs, ("duplicate_files",), cacheable=True),
+            AnalysisStage("syntax_summaries", lambda index, cache, plan: self._run_syntax_stage(index, cache, plan),
+                          run_inputs, ("syntax_summaries",), cacheable=True, optional=True),
+            AnalysisStage("technology_stack",
+                          lambda index, cache, plan: self._detect_technology_stack(
+                              index, cache, plan.budget("technology_stack")),
+                          run_inputs, ("technology_stack",)),
+            # Index queries
+            AnalysisStage("file_structure", lambda index: self._analyze_file_structure(index),
+                          ("index",), ("file_structure",)),
+            AnalysisStage("architecture_patterns",
+                          lambda index, plan: self._detect_architecture_patterns(index)
+                          if plan.runs("architecture_patterns") else [],
+                          ("index", "plan"), ("architecture_patterns",)),
+            AnalysisStage("configuration_files", lambda index: self._identify_configuration_files(index),
+                          ("index",), ("configuration_files",)),
+            # Derived results
+            AnalysisStage("health", lambda *inputs: self._assess_project_health(*inputs),
+                          ("index", "complexity_metrics", "dependency_graph", "vulnerabilities", "duplicate_files"),
+                          ("health_assessment",)),
+            AnalysisStage("code_structure",
+                          lambda syntax_summaries: summarize_syntax(
+                              syntax_summaries, self.config.get("size_top_k", DEFAULT_TOP_K))
+                          if syntax_summaries is not None else {},
+                          ("syntax_summaries",), ("code_structure",)),
+            AnalysisStage("direct_dependencies", lambda dependency_graph: dependency_graph.direct_dependencies(),
+                          ("dependency_graph",), ("dependencies",)),
+            AnalysisStage("project_type", lambda *inputs: self._determine_project_type(*inputs),
+                          ("index", "technology_stack", "file_structure"), ("project_type",)),
+            AnalysisStage("estimated_complexity", lambda *inputs: self._estimate_complexity(*inputs),
+                          ("file_structure", "technology_stack", "dependencies"), ("estimated_complexity",)),
+            AnalysisStage("enhancement_opportunities", lambda *inputs: self._identify_enhancement_opportunities(*inputs),
+                          ("technology_stack", "architecture_patterns", "health_assessment"),
+                          ("enhancement_opportunities",)),
+            AnalysisStage("migration_recommendations", lambda *inputs: self._generate_migration_recommendations(*inputs),
+                          ("technology_stack", "architecture_patterns"), ("migration_recommendations",)),
+        ]
+    
+    def _stage_options_signature(self, stage: AnalysisStage, plan: AnalysisPlan) -> str:
+        """Signature of the options a stage's stored outputs depend on."""
+        planned = {name: asdict(plan.budget(name)) for name in (stage.name, *stage.outputs) if plan.runs(name)}
+        return options_signature(self.config, stage=stage.name, planned=planned,
+                                 vulnerability_db=self._vulnerability_db_state(plan))
     
-    async def _analyze_file_structure(self, project_path: Path) -> Dict[str, Any]:
+    async def _analyze_workspace(self, analysis: ProjectAnalysis, index: ProjectFileIndex,
+                                 packages: List[str], cache: Optional[ScanCache], plan: AnalysisPlan,
+                                 store: Optional[AnalysisResultStore] = None,
+                                 tree: Optional[ProjectFingerprint] = None):
+        """
+        Analyze the packages of a workspace and attach them to the project's analysis.
+        
+        Packages are analyzed concurrently from subtrees of the project's index, and
+        their per-file results come from the project's scan cache, so no file is walked
+        or read again. A package whose subtree hash (from the project's Merkle tree) is
+        unchanged is taken from the result store. Packages nested in another package
+        become its sub_projects; the technology stacks of all packages are rolled up
+        into the project's.
+        """
+        options = self._result_options_signature(plan)
+        concurrency = asyncio.Semaphore(self.config.get("max_workers") or os.cpu_count() or 1)
+        
+        async def analyze_package(rel_dir: str) -> ProjectAnalysis:
+            node = tree.nodes.get(rel_dir) if tree is not None else None
+            key = ("package", str(index.root / rel_dir), options)
+            if store is not None and node is not None:
+                stored = store.get(key, node.digest.hex(), ANALYZER_VERSION)
+                if stored is not None:
+                    return stored
+            subtree = index.subtree(rel_dir)
+            if node is not None:
+                self._index_digests[subtree] = node.digest.hex()
+            async with concurrency:
+                with profile_stage(f"package:{rel_dir}"):
+                    package = await self._analyze_index(
+                        subtree, ScopedScanCache(cache, rel_dir) if cache is not None else None, plan, store
+                    )
+            package.analysis_metadata["package_path"] = rel_dir
+            if store is not None and node is not None:
+                store.put(key, node.digest.hex(), ANALYZER_VERSION, package)
+            return package
+        
+        analyses = await asyncio.gather(*(analyze_package(rel_dir) for rel_dir in packages))
+        results = dict(zip(packages, analyses, strict=True))
+        for rel_dir, parent in package_parents(packages).items():
+            (results[parent] if parent is not None else analysis).sub_projects.append(results[rel_dir])
+        
+        self._roll_up_technology(analysis)
+        analysis.project_type = await self._determine_project_type(
+            index, analysis.technology_stack, analysis.file_structure
+        )
+        analysis.analysis_metadata["workspace_packages"] = len(packages)
+        logger.info(f"Analyzed {len(packages)} workspace packages of {index.root.name}")
+    
+    def _roll_up_technology(self, analysis: ProjectAnalysis):
+        """Add the technologies of every (nested) sub-project to a project's stack."""
+        stack = analysis.technology_stack
+        for sub_project in analysis.sub_projects:
+            self._roll_up_technology(sub_project)
+            for field_name in ("frameworks", "databases", "build_tools", "package_managers",
+                               "deployment_targets", "development_tools"):
+                values = getattr(stack, field_name)
+                values.extend(value for value in getattr(sub_project.technology_stack, field_name)
+                              if value not in values)
+    
+    def _result_options_signature(self, plan: AnalysisPlan) -> str:
+        """Signature of everything besides the tree that a stored analysis depends on."""
+        return options_signature(self.config, plan=plan.describe(), vulnerability_db=self._vulnerability_db_state(plan))
+    
+    def _vulnerability_db_state(self, plan: AnalysisPlan) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the vulnerability database the plan reads, if any."""
+        vulnerability_db = self.config.get("vulnerability_db", DEFAULT_VULNERABILITY_DB)
+        if vulnerability_db is None or not plan.runs("vulnerabilities"):
+            return None
+        with contextlib.suppress(OSError):
+            stat = os.stat(os.path.expanduser(vulnerability_db))
+            return (stat.st_mtime_ns, stat.st_size)
+        return None
+    
+    def _find_duplicate_files(self, index: ProjectFileIndex,
+                              cache: Optional[ScanCache] = None) -> Dict[str, Any]:
+        """Clusters of byte-identical source files, summarized for the health assessment."""
+        clusters = find_duplicate_clusters(
+            index, index.source_files(), cache, min_size=self.config.get("duplicate_min_size", DEFAULT_MIN_SIZE)
+        )
+        return summarize_duplicates(index, clusters, top_k=self.config.get("size_top_k", DEFAULT_TOP_K))
+    
+    async def _run_metrics_stage(self, index: ProjectFileIndex, cache: Optional[ScanCache],
+                                 plan: AnalysisPlan) -> Dict[str, Any]:
+        """Complexity metrics when the plan and configuration enable them, else {}."""
+        if not plan.runs("complexity_metrics") or not self.config.get("metrics_enabled", True):
+            return {}
+        return await self._compute_complexity_metrics(
+            index, cache, plan.budget("complexity_metrics"), parallel=plan.parallel
+        )
+    
+    async def _run_syntax_stage(self, index: ProjectFileIndex, cache: Optional[ScanCache],
+                                plan: AnalysisPlan) -> Optional[Dict[str, SyntaxSummary]]:
+        """Syntax summaries of the source files when the plan runs them, else None."""
+        if not plan.runs("syntax_summaries"):
+            return None
+        return await self.extract_syntax_summaries(index, cache, plan.budget("syntax_summaries"))
+    
+    async def _run_dependency_stage(self, index: ProjectFileIndex, cache: Optional[ScanCache],
+                                    plan: AnalysisPlan) -> Tuple[DependencyGraph, Optional[List[VulnerabilityMatch]]]:
+        """Dependency graph and its known vulnerabilities, for the stages the plan runs."""
+        if not plan.runs("dependencies"):
+            return DependencyGraph(), None
+        # Dependency health is scored from the graph's known vulnerabilities
+        dependency_graph = await self._analyze_dependencies(index, cache, plan.budget("dependencies"))
+        vulnerabilities = None
+        if plan.runs("vulnerabilities"):
+            vulnerabilities = self._check_vulnerabilities(dependency_graph)
+        return dependency_graph, vulnerabilities
+    
+    async def analyze_projects(self, project_paths: Iterable[str], concurrency: Optional[int] = None,
+                               timeout: Optional[float] = None, since: Optional[str] = None,
+                               depth: str = "standard",
+                               focus: Iterable[str] = ()) -> AsyncIterator[BatchAnalysisResult]:
+        """
+        Analyze many projects, yielding each result as soon as it completes.
+        
+        Projects run in one process pool shared by the whole batch. Each worker builds a
+        single analyzer (framework patterns, compiled matchers, parsers) and reuses it
+        for every project it is given; per-file metrics run inside the worker. A project
+        that fails, times out or crashes its worker is reported in its result without
+        affecting the others: when a worker dies the pool is replaced, and every project
+        it was running is retried once in a single-worker pool of its own, so only the
+        project that causes the crash is reported as crashed.
+        
+        Args:
+            project_paths: Project directories, consumed lazily
+            concurrency: Projects analyzed at once; defaults to max_workers or one per CPU
+            timeout: Seconds allowed per project; defaults to the project_timeout config
+            since: Git ref passed on to analyze_project
+            depth: Analysis depth passed on to analyze_project
+            focus: Focus areas passed on to analyze_project
+        
+        Yields:
+            One BatchAnalysisResult per project, in completion order
+        """
+        concurrency = concurrency or self.config.get("max_workers") or os.cpu_count() or 1
+        if timeout is None:
+            timeout = self.config.get("project_timeout")
+        paths = iter(project_paths)
+        options = {"since": since, "depth": depth, "focus": tuple(focus)}
+        plan_analysis(depth, focus)  # Reject unknown depths and focus areas up front
+        
+        executor = None
+        if concurrency > 1:
+            try:
+                executor = self._start_batch_pool(concurrency)
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Parallel batch analysis unavailable ({e}); analyzing in-process")
+        if executor is None:
+            for project_path in paths:
+                yield await self._analyze_batch_project(str(project_path), options, timeout)
+            return
+        
+        # task -> (project path, attempt, pool running it)
+        in_flight: Dict[asyncio.Task, Tuple[str, int, ProcessPoolExecutor]] = {}
+        
+        def submit(project_path: str, attempt: int, pool: ProcessPoolExecutor):
+            task = asyncio.ensure_future(self._analyze_batch_project(project_path, options, timeout, pool))
+            in_flight[task] = (project_path, attempt, pool)
+        
+        try:
+            for project_path in itertools.islice(paths, concurrency):
+                submit(str(project_path), 0, executor)
+            
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    project_path, attempt, pool = in_flight.pop(task)
+                    if pool is not executor:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                    try:
+                        result = task.result()
+                    except BrokenProcessPool as e:
+                        if pool is executor:
+                            logger.warning(f"Batch worker pool crashed ({e}); starting a new one")
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            executor = self._start_batch_pool(concurrency)
+                        if attempt == 0:
+                            submit(project_path, 1, self._start_batch_pool(1))
+                            continue
+                        result = BatchAnalysisResult(project_path, None, "Worker process crashed")
+                    
+                    next_path = next(paths, None)
+                    if next_path is not None:
+                        submit(str(next_path), 0, executor)
+                    yield result
+        finally:
+            for task, (_, _, pool) in in_flight.items():
+                task.cancel()
+                pool.shutdown(wait=False, cancel_futures=True)
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _start_batch_pool(self, concurrency: int) -> ProcessPoolExecutor:
+        """Process pool whose workers each hold one analyzer with this configuration."""
+        # Workers measure files in-process instead of starting pools of their own
+        worker_config = dict(self.config, max_workers=1)
+        return ProcessPoolExecutor(max_workers=concurrency, initializer=_init_batch_worker,
+                                   initargs=(type(self), worker_config))
+    
+    async def _analyze_batch_project(self, project_path: str, options: Dict[str, Any],
+                                     timeout: Optional[float],
+                                     executor: Optional[ProcessPoolExecutor] = None) -> BatchAnalysisResult:
+        """
+        Analyze one project of a batch, in a pool worker or in this process.
+        
+        Errors and timeouts become the result's error; a crashed pool raises
+        BrokenProcessPool so the caller can retry.
+        """
+        started = time.perf_counter()
+        try:
+            if executor is not None:
+                future = asyncio.get_running_loop().run_in_executor(
+                    executor, _analyze_in_worker, project_path, options, timeout
+                )
+                wait_limit = timeout + BATCH_TIMEOUT_GRACE if timeout else None
+                analysis = await asyncio.wait_for(future, wait_limit)
+            else:
+                analysis = await asyncio.wait_for(self.analyze_project(project_path, **options), timeout)
+        except BrokenProcessPool:
+            raise
+        except (asyncio.TimeoutError, TimeoutError):
+            logger.warning(f"Analysis of {project_path} timed out after {timeout}s")
+            return BatchAnalysisResult(project_path, None, f"Timed out after {timeout}s",
+                                       time.perf_counter() - started)
+        except Exception as e:
+            return BatchAnalysisResult(project_path, None, f"{type(e).__name__}: {e}",
+                                       time.perf_counter() - started)
+        
+        return BatchAnalysisResult(project_path, analysis, None, time.perf_counter() - started)
+    
+    async def _analyze_file_structure(self, index: ProjectFileIndex) -> Dict[str, Any]:
         """Analyze project file structure and organization."""
         structure = {
             "total_files": 0,
             "directories": [],
-            "file_types": defaultdict(int),
+            "file_types": {},
             "largest_files": [],
             "depth": 0,
             "organization_score": 0.0
         }
         
         try:
-            for root, dirs, files in os.walk(project_path):
-                # Skip hidden and common ignore directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') and 
-                          d not in ['node_modules', '__pycache__', 'target', 'dist', 'build']]
-                
-                current_depth = len(Path(root).relative_to(project_path).parts)
-                structure["depth"] = max(structure["depth"], current_depth)
-                
-                for file in files:
-                    if file.startswith('.'):
-                        continue
-                        
-                    file_path = Path(root) / file
-                    structure["total_files"] += 1
-                    
-                    # Count file types
-                    suffix = file_path.suffix.lower()
-                    structure["file_types"][suffix] += 1
-                    
-                    # Track largest files
-                    try:
-                        size = file_path.stat().st_size
-                        structure["largest_files"].append((str(file_path), size))
-                    except OSError:
-                        pass
+            structure["depth"] = index.max_depth()
+            
+            # Size histograms, directory totals and largest files, in the same pass
+            sizes = SizeDistribution(
+                index, itertools.chain.from_iterable(self.supported_languages.values()),
+                top_k=self.config.get("size_top_k", DEFAULT_TOP_K),
+                large_file_threshold=self.config.get("syntax_max_file_size", DEFAULT_LARGE_FILE_THRESHOLD)
+            )
             
-            # Sort and limit largest files
-            structure["largest_files"].sort(key=lambda x: x[1], reverse=True)
-            structure["largest_files"] = structure["largest_files"][:10]
+            for file_id in index.source_files():
+                sizes.add(file_id)
+            
+            # File types and the language mix of each directory come from the census
+            census = self._language_census(index)
+            structure["total_files"] = census.total_files
+            structure["file_types"] = census.file_types()
+            structure["language_mix"] = census.directory_mix(self.config.get("language_mix_depth", 1))
+            
+            structure["largest_files"] = sizes.largest_files(absolute=True)
+            structure["size_distribution"] = sizes.summary()
             
             # Calculate organization score based on structure patterns
             structure["organization_score"] = self._calculate_organization_score(
-                project_path, structure
+                index, structure
             )
             
         except Exception as e:
@@ -441,13 +954,13 @@ class UniversalProjectAnalyzer:
         
         return structure
     
-    def _calculate_organization_score(self, project_path: Path, structure: Dict) -> float:
+    def _calculate_organization_score(self, index: ProjectFileIndex, structure: Dict) -> float:
         """Calculate how well-organized the project structure is."""
         score = 0.0
         
         # Check for common organizational patterns
         common_dirs = ['src', 'lib', 'tests', 'docs', 'config']
-        found_dirs = [d for d in common_dirs if (project_path / d).exists()]
+        found_dirs = [d for d in common_dirs if index.exists(d)]
         score += len(found_dirs) * 0.1
         
         # Penalize excessive depth
@@ -462,7 +975,21 @@ class UniversalProjectAnalyzer:
         
         return min(max(score, 0.0), 1.0)
     
-    async def _detect_technology_stack(self, project_path: Path) -> TechnologyStack:
+    def _language_census(self, index: ProjectFileIndex) -> SuffixCensus:
+        """
+        File counts of an index by suffix, language and directory.
+        
+        Classified once per index; the file structure and technology stack stages of a
+        run share the result.
+        """
+        census = self._censuses.get(index)
+        if census is None:
+            census = self._censuses[index] = self.language_classifier.classify(index)
+        return census
+    
+    async def _detect_technology_stack(self, index: ProjectFileIndex,
+                                       cache: Optional[ScanCache] = None,
+                                       budget: Optional[StageBudget] = None) -> TechnologyStack:
         """Detect the technology stack used in the project."""
         detected_tech = {
             "languages": defaultdict(float),
@@ -474,25 +1001,14 @@ class UniversalProjectAnalyzer:
             "development_tools": defaultdict(float)
         }
         
-        # Analyze file extensions for primary language
-        for root, dirs, files in os.walk(project_path):
-            dirs[:] = [d for d in dirs if not d.startswith('.') and 
-                      d not in ['node_modules', '__pycache__', 'target']]
-            
-            for file in files:
-                file_path = Path(root) / file
-                suffix = file_path.suffix.lower()
-                
-                # Detect languages by file extensions
-                for lang, extensions in self.supported_languages.items():
-                    if suffix in extensions:
-                        detected_tech["languages"][lang] += 1
+        # Count files per language through the suffix lookup table
+        detected_tech["languages"].update(self._language_census(index).counts())
         
         # Analyze configuration files and package manifests
-        await self._analyze_package_files(project_path, detected_tech)
+        await self._analyze_package_files(index, detected_tech, cache)
         
         # Detect frameworks based on patterns
-        await self._detect_frameworks(project_path, detected_tech)
+        await self._detect_frameworks(index, detected_tech, cache, budget)
         
         # Normalize scores and determine primary language
         total_lang_files = sum(detected_tech["languages"].values())
@@ -525,7 +1041,8 @@ class UniversalProjectAnalyzer:
             confidence_score=confidence
         )
     
-    async def _analyze_package_files(self, project_path: Path, detected_tech: Dict):
+    async def _analyze_package_files(self, index: ProjectFileIndex, detected_tech: Dict,
+                                     cache: Optional[ScanCache] = None):
         """Analyze package manifests and configuration files."""
         package_files = {
             "package.json": self._analyze_package_json,
@@ -534,15 +1051,34 @@ class UniversalProjectAnalyzer:
             "go.mod": self._analyze_go_mod,
             "pom.xml": self._analyze_pom_xml,
             "build.gradle": self._analyze_gradle,
+            "build.gradle.kts": self._analyze_gradle,
         }
         
+        if cache is not None:
+            cache.bind("manifests", ScanCache.signature_of([ANALYZER_VERSION, sorted(package_files)]))
+        
         for filename, analyzer in package_files.items():
-            file_path = project_path / filename
-            if file_path.exists():
+            file_id = index.file_id(filename)
+            if file_id is None:
+                continue
+            
+            # Manifest findings are cached per file so unchanged manifests are not re-read
+            stat_key = index.stat_key(file_id)
+            findings = cache.get("manifests", filename, stat_key) if cache else None
+            if findings is None:
+                scratch = defaultdict(lambda: defaultdict(float))
                 try:
-                    await analyzer(file_path, detected_tech)
+                    await analyzer(index.root / filename, scratch)
                 except Exception as e:
                     logger.error(f"Error analyzing {filename}: {e}")
+                    continue
+                findings = {category: dict(values) for category, values in scratch.items()}
+                if cache is not None:
+                    cache.put("manifests", filename, stat_key, findings)
+            
+            for category, values in findings.items():
+                for name, score in values.items():
+                    detected_tech[category][name] += score
     
     async def _analyze_package_json(self, file_path: Path, detected_tech: Dict):
         """Analyze package.json for Node.js projects."""
@@ -622,87 +1158,373 @@ class UniversalProjectAnalyzer:
         """Analyze Cargo.toml for Rust projects."""
         detected_tech["package_managers"]["cargo"] += 1.0
         detected_tech["build_tools"]["cargo"] += 1.0
-        # TODO: Add more detailed Rust dependency analysis
+        self._detect_manifest_technologies(file_path, detected_tech, {
+            "frameworks": {
+                "actix-web": "actix",
+                "axum": "axum",
+                "rocket": "rocket",
+                "warp": "warp",
+                "tokio": "tokio",
+                "tauri": "tauri",
+                "bevy": "bevy",
+                "leptos": "leptos",
+                "yew": "yew"
+            },
+            "databases": {
+                "postgres": "postgresql",
+                "tokio-postgres": "postgresql",
+                "mysql": "mysql",
+                "rusqlite": "sqlite",
+                "redis": "redis",
+                "mongodb": "mongodb"
+            }
+        })
     
     async def _analyze_go_mod(self, file_path: Path, detected_tech: Dict):
         """Analyze go.mod for Go projects."""
         detected_tech["package_managers"]["go_modules"] += 1.0
         detected_tech["build_tools"]["go"] += 1.0
-        # TODO: Add more detailed Go dependency analysis
+        self._detect_manifest_technologies(file_path, detected_tech, {
+            "frameworks": {
+                "github.com/gin-gonic/gin": "gin",
+                "github.com/labstack/echo": "echo",
+                "github.com/gofiber/fiber": "fiber",
+                "github.com/gorilla/mux": "gorilla_mux",
+                "github.com/go-chi/chi": "chi",
+                "google.golang.org/grpc": "grpc",
+                "github.com/spf13/cobra": "cobra"
+            },
+            "databases": {
+                "github.com/lib/pq": "postgresql",
+                "github.com/jackc/pgx": "postgresql",
+                "github.com/go-sql-driver/mysql": "mysql",
+                "github.com/mattn/go-sqlite3": "sqlite",
+                "github.com/redis/go-redis": "redis",
+                "github.com/go-redis/redis": "redis",
+                "go.mongodb.org/mongo-driver": "mongodb"
+            }
+        })
     
     async def _analyze_pom_xml(self, file_path: Path, detected_tech: Dict):
         """Analyze pom.xml for Java projects."""
         detected_tech["package_managers"]["maven"] += 1.0
         detected_tech["build_tools"]["maven"] += 1.0
-        # TODO: Add more detailed Maven dependency analysis
+        self._detect_manifest_technologies(file_path, detected_tech, JVM_TECHNOLOGIES)
     
     async def _analyze_gradle(self, file_path: Path, detected_tech: Dict):
-        """Analyze build.gradle for Java/Kotlin projects."""
+        """Analyze build.gradle (or build.gradle.kts) for Java/Kotlin projects."""
         detected_tech["package_managers"]["gradle"] += 1.0
         detected_tech["build_tools"]["gradle"] += 1.0
-        # TODO: Add more detailed Gradle dependency analysis
+        self._detect_manifest_technologies(file_path, detected_tech, JVM_TECHNOLOGIES)
     
-    async def _detect_frameworks(self, project_path: Path, detected_tech: Dict):
+    def _detect_manifest_technologies(self, file_path: Path, detected_tech: Dict,
+                                      technologies: Dict[str, Dict[str, str]]):
+        """
+        Score the technologies a manifest declares as direct dependencies.
+        
+        Args:
+            file_path: Manifest, read with its dependency_graph parser
+            detected_tech: Technology scores to add to
+            technologies: Category -> dependency name -> technology; a name also matches
+                the modules below it ("name/...") and the artifacts of a group ("name:...")
+        """
+        parser, _ = dependency_parser(file_path.name)
+        graph = DependencyGraph()
+        try:
+            parser(file_path, graph)
+        except Exception as e:
+            logger.error(f"Error parsing {file_path.name}: {e}")
+            return
+        
+        dependencies = [name for names in graph.direct_dependencies().values() for name in names]
+        for category, mappings in technologies.items():
+            for dependency, technology in mappings.items():
+                prefixes = (dependency + "/", dependency + ":")
+                if any(name == dependency or name.startswith(prefixes) for name in dependencies):
+                    detected_tech[category][technology] += 0.8
+    
+    async def _detect_frameworks(self, index: ProjectFileIndex, detected_tech: Dict,
+                                 cache: Optional[ScanCache] = None,
+                                 budget: Optional[StageBudget] = None):
         """Detect frameworks based on file patterns and content."""
+        content_confidence = await self._check_content_patterns(index, cache, budget)
+        
         for framework, patterns in self.framework_patterns.items():
             confidence = 0.0
             
             # Check for specific files
             for file_pattern in patterns.get("files", []):
-                if (project_path / file_pattern).exists():
+                if index.exists(file_pattern):
                     confidence += 0.3
             
             # Check directory patterns
             for dir_pattern in patterns.get("directory_patterns", []):
-                if (project_path / dir_pattern).exists():
+                if index.exists(dir_pattern):
                     confidence += 0.2
             
             # Check content patterns in relevant files
-            content_confidence = await self._check_content_patterns(
-                project_path, patterns.get("content_patterns", [])
-            )
-            confidence += content_confidence
+            confidence += content_confidence.get(framework, 0.0)
             
             if confidence > 0.5:
                 detected_tech["frameworks"][framework] += confidence
     
-    async def _check_content_patterns(self, project_path: Path, patterns: List[str]) -> float:
-        """Check for content patterns in project files."""
-        confidence = 0.0
-        files_checked = 0
-        max_files = 20  # Limit to avoid performance issues
+    async def _check_content_patterns(self, index: ProjectFileIndex,
+                                      cache: Optional[ScanCache] = None,
+                                      budget: Optional[StageBudget] = None) -> Dict[str, float]:
+        """
+        Check framework content patterns in an adaptive, stratified sample of project files.
+        
+        Files are read in the order of _sample_content_files, in batches that double the
+        sample, and every file is matched against the content patterns of all frameworks
+        at once. The sample grows until a batch no longer changes any framework's
+        confidence (or all of them are at the cap), so small or homogeneous projects stop
+        early and large, mixed ones read more. Per-file hit counts are cached by (mtime_ns, size, inode).
+        
+        Args:
+            index: Project file index
+            cache: Optional scan cache
+            budget: Upper bound on the sample (max_files, None to read every candidate
+                without stopping early) and time budget; defaults to 100 files
         
+        Returns:
+            Content confidence per framework
+        """
+        hits = defaultdict(int)
+        budget = budget or StageBudget(max_files=100)
+        deadline = budget.deadline()
+        confidence: Dict[str, float] = {}
+        
+        if cache is not None:
+            cache.bind("scanner", ScanCache.signature_of({
+                framework: patterns.get("content_patterns", [])
+                for framework, patterns in self.framework_patterns.items()
+            }))
+        
+        sample = self._sample_content_files(index, budget.max_files)
+        read = 0
         try:
-            for root, dirs, files in os.walk(project_path):
-                if files_checked >= max_files:
-                    break
-                
-                dirs[:] = [d for d in dirs if not d.startswith('.') and 
-                          d not in ['node_modules', '__pycache__']]
-                
-                for file in files[:5]:  # Check max 5 files per directory
-                    if files_checked >= max_files:
-                        break
+            for batches, batch in enumerate(sample_batches(sample), 1):
+                for file_id in batch:
+                    rel_path = index.paths[file_id]
+                    stat_key = index.stat_key(file_id)
                     
-                    file_path = Path(root) / file
-                    if file_path.suffix in ['.js', '.jsx', '.ts', '.tsx', '.py', '.java', '.go', '.rs']:
+                    file_hits = cache.get("scanner", rel_path, stat_key) if cache else None
+                    if file_hits is None:
+                        if deadline_passed(deadline):
+                            break
                         try:
-                            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read(10000)  # Read first 10KB
-                            
-                            for pattern in patterns:
-                                if re.search(pattern, content, re.IGNORECASE):
-                                    confidence += 0.1
-                            
-                            files_checked += 1
-                            
+                            file_hits = self._scan_framework_patterns(index.abs_path(file_id))
                         except Exception:
                             continue  # Skip files that can't be read
+                        if cache is not None:
+                            cache.put("scanner", rel_path, stat_key, file_hits)
+                    
+                    read += 1
+                    for framework, count in file_hits.items():
+                        hits[framework] += count
+                else:
+                    previous, confidence = confidence, self._content_confidence(hits)
+                    if budget.max_files is None or not converged(
+                        previous, confidence, batches, CONTENT_CONFIDENCE_CAP
+                    ):
+                        continue
+                break
         
         except Exception as e:
             logger.error(f"Error checking content patterns: {e}")
         
-        return min(confidence, 0.8)  # Cap at 0.8
+        logger.debug(f"Framework content patterns checked in {read} of {len(sample)} sampled files")
+        return self._content_confidence(hits)
+    
+    def _content_confidence(self, hits: Dict[str, int]) -> Dict[str, float]:
+        return {framework: min(count * 0.1, CONTENT_CONFIDENCE_CAP) for framework, count in hits.items()}
+    
+    async def _compute_complexity_metrics(self, index: ProjectFileIndex,
+                                          cache: Optional[ScanCache] = None,
+                                          budget: Optional[StageBudget] = None,
+                                          parallel: bool = False) -> Dict[str, Any]:
+        """
+        Measure complexity, size and duplication of the project's source files.
+        
+        Per-file metrics are cached by content hash (see _read_changed_sources), so
+        unchanged files are not read again; files not in the cache are measured in
+        worker processes when there are at least `parallel_min_files` of them, or
+        whenever `parallel` is set.
+        
+        Args:
+            index: Project file index
+            cache: Optional scan cache
+            budget: Evenly spaced sample of at most max_files files, a size limit
+                overriding syntax_max_file_size, and a time budget for reading files
+            parallel: Always fan uncached files out to worker processes
+        
+        Returns:
+            Aggregated complexity_metrics (see code_metrics.aggregate_metrics)
+        """
+        budget = budget or StageBudget()
+        if cache is not None:
+            cache.bind("metrics", ScanCache.signature_of(
+                [CODE_METRICS_VERSION, self.syntax_parser.backends()]
+            ))
+        
+        suffixes = {suffix for language_suffixes in self.supported_languages.values()
+                    for suffix in language_suffixes}
+        max_size = budget.max_file_bytes or self.config.get("syntax_max_file_size", 1024 * 1024)
+        file_ids = [
+            file_id for file_id in index.source_files()
+            if index.suffix(file_id) in suffixes and index.sizes[file_id] <= max_size
+        ]
+        if budget.max_files is not None and len(file_ids) > budget.max_files:
+            stride = len(file_ids) / budget.max_files
+            file_ids = [file_ids[int(position * stride)] for position in range(budget.max_files)]
+        
+        cached, misses = self._read_changed_sources(index, file_ids, cache, "metrics", budget.deadline())
+        file_metrics = {index.paths[file_id]: metrics for file_id, metrics in cached.items()}
+        
+        # Copies of one blob (in the same language) are measured once
+        unique = {}
+        for file_id, digest, source in misses:
+            rel_path = index.paths[file_id]
+            unique.setdefault((digest, os.path.splitext(rel_path)[1]), (rel_path, digest, source))
+        measured = await self._measure_files(list(unique.values()), parallel)
+        measured = dict(zip(unique, measured, strict=True))
+        for file_id, digest, source in misses:
+            rel_path = index.paths[file_id]
+            metrics = measured[(digest, os.path.splitext(rel_path)[1])]
+            file_metrics[rel_path] = metrics
+            if cache is not None:
+                cache.put("metrics", digest, (0, len(source), 0), metrics)
+        
+        return aggregate_metrics(file_metrics)
+    
+    def _read_changed_sources(self, index: ProjectFileIndex, file_ids: List[int],
+                              cache: Optional[Union[ScanCache, ScopedScanCache]], kind: str,
+                              deadline: Optional[float] = None
+                              ) -> Tuple[Dict[int, Any], List[Tuple[int, str, bytes]]]:
+        """
+        Cached per-content results of source files, reading only the files that changed.
+        
+        A kind's entries come in two levels: a file's path and stat key map to the SHA-1
+        of its content ({"digest": None} for binary files), and the digest maps to the
+        result. Unchanged files are answered without being read; changed, renamed and
+        copied files are read and hashed, and reuse the result of identical content.
+        
+        Args:
+            index: Project file index
+            file_ids: Source files, in the order they are read
+            cache: Optional scan cache, bound for the kind
+            kind: Result kind in the cache
+            deadline: No further files are read after this time.monotonic() value
+        
+        Returns:
+            (cached result per file id, (file_id, digest, source) of the files without one)
+        """
+        cached: Dict[int, Any] = {}
+        misses = []
+        for file_id in file_ids:
+            rel_path = index.paths[file_id]
+            stat_key = index.stat_key(file_id)
+            entry = cache.get(kind, rel_path, stat_key) if cache is not None else None
+            if entry is not None:
+                if entry["digest"] is None:
+                    continue  # Binary
+                result = cache.get(kind, entry["digest"], (0, index.sizes[file_id], 0))
+                if result is not None:
+                    cached[file_id] = result
+                    continue
+            
+            if deadline_passed(deadline):
+                logger.debug(f"Time budget for {kind} reached; using the files read so far")
+                break
+            try:
+                with open(index.abs_path(file_id), 'rb') as f:
+                    source = f.read()
+            except OSError as e:
+                logger.debug(f"Could not read file {rel_path}: {e}")
+                continue
+            record_read(len(source))
+            if looks_binary(source[:BINARY_SNIFF_BYTES]):
+                if cache is not None:
+                    cache.put(kind, rel_path, stat_key, {"digest": None})
+                continue
+            
+            digest = hashlib.sha1(source).hexdigest()
+            if cache is not None:
+                cache.put(kind, rel_path, stat_key, {"digest": digest})
+            result = cache.get(kind, digest, (0, len(source), 0)) if cache is not None else None
+            if result is not None:
+                cached[file_id] = result
+            else:
+                misses.append((file_id, digest, source))
+        return cached, misses
+    
+    async def _measure_files(self, files: List[Tuple[str, str, bytes]],
+                             parallel: bool = False) -> List[Dict[str, Any]]:
+        """
+        Metrics of (rel_path, digest, source) entries, in input order.
+        
+        Worker shards are awaited, so other stages can run while the pool measures.
+        """
+        items = [(rel_path, source) for rel_path, _, source in files]
+        max_workers = self.config.get("max_workers") or os.cpu_count() or 1
+        min_files = 2 if parallel else self.config.get("parallel_min_files", 256)
+        if max_workers > 1 and len(items) >= min_files:
+            shard_size = max(len(items) // (max_workers * 4), 1)
+            shards = [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
+            loop = asyncio.get_running_loop()
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_metrics_worker,
+                                         initargs=(self.supported_languages,)) as executor:
+                    results = await asyncio.gather(*(
+                        loop.run_in_executor(executor, _measure_shard, shard) for shard in shards
+                    ))
+                return list(itertools.chain.from_iterable(results))
+            except (OSError, NotImplementedError, BrokenProcessPool) as e:
+                logger.warning(f"Parallel metrics unavailable ({e}); measuring in-process")
+        
+        return [measure_source(rel_path, source, self.syntax_parser) for rel_path, source in items]
+    
+    def _sample_content_files(self, index: ProjectFileIndex, max_files: Optional[int] = 100) -> List[int]:
+        """
+        Select, in reading order, the source files checked for framework patterns.
+        
+        Only files in a language some framework's content patterns apply to are
+        candidates. They are stratified by top-level directory and language, languages
+        weighted by the number of frameworks they can reveal (see content_sampling), so
+        the order is deterministic and any prefix of it covers the whole project.
+        max_files=None selects every candidate.
+        """
+        language_weights = defaultdict(int)
+        for patterns in self.framework_patterns.values():
+            if patterns.get("content_patterns"):
+                for language in patterns.get("languages", []):
+                    language_weights[language] += 1
+        suffix_languages = {
+            suffix: language
+            for language, suffixes in self.supported_languages.items() if language in language_weights
+            for suffix in suffixes
+        }
+        
+        order = stratified_sample_order(index, suffix_languages, language_weights)
+        return order if max_files is None else order[:max_files]
+    
+    def _scan_framework_patterns(self, file_path: Path) -> Dict[str, int]:
+        """Count, per framework, the content patterns found in the head of a file."""
+        with open(file_path, 'rb') as f:
+            head = f.read(BINARY_SNIFF_BYTES)
+            if looks_binary(head):
+                record_read(len(head))
+                return {}
+            f.seek(0)
+            text = io.TextIOWrapper(f, encoding='utf-8', errors='ignore')
+            content = text.read(10000)  # Read first 10KB
+            record_read(f.tell())
+        
+        file_hits = defaultdict(int)
+        for pattern_id in self.framework_matcher.search(content):
+            file_hits[self.framework_pattern_owners[pattern_id]] += 1
+        
+        return dict(file_hits)
     
     def _calculate_tech_stack_confidence(self, detected_tech: Dict) -> float:
         """Calculate overall confidence in technology stack detection."""
@@ -720,13 +1542,13 @@ class UniversalProjectAnalyzer:
         else:
             return 0.3
     
-    async def _detect_architecture_patterns(self, project_path: Path) -> List[ArchitecturePattern]:
+    async def _detect_architecture_patterns(self, index: ProjectFileIndex) -> List[ArchitecturePattern]:
         """Detect architectural patterns in the project."""
         patterns = []
         
         for pattern_name, config in self.architecture_patterns.items():
             confidence = await self._assess_architecture_pattern(
-                project_path, pattern_name, config
+                index, pattern_name, config
             )
             
             if confidence >= config.get("confidence_threshold", 0.5):
@@ -741,34 +1563,32 @@ class UniversalProjectAnalyzer:
         
         return patterns
     
-    async def _assess_architecture_pattern(self, project_path: Path, pattern_name: str, config: Dict) -> float:
+    async def _assess_architecture_pattern(self, index: ProjectFileIndex, pattern_name: str, config: Dict) -> float:
         """Assess confidence for a specific architecture pattern."""
         confidence = 0.0
         
         # Check for file patterns
         for file_pattern in config.get("file_patterns", []):
-            if list(project_path.glob(file_pattern)):
+            if index.glob(file_pattern):
                 confidence += 0.3
         
         # Check for directory patterns
         for dir_pattern in config.get("directory_patterns", []):
-            if (project_path / dir_pattern).exists():
+            if index.exists(dir_pattern):
                 confidence += 0.2
         
         # Additional pattern-specific logic
         if pattern_name == "microservices":
             # Look for multiple service directories or docker-compose
             service_indicators = 0
-            if (project_path / "docker-compose.yml").exists():
+            if index.exists("docker-compose.yml"):
                 service_indicators += 1
             
             # Count potential service directories
             service_dirs = ["services", "apps", "microservices"]
             for service_dir in service_dirs:
-                if (project_path / service_dir).exists():
-                    subdirs = list((project_path / service_dir).iterdir())
-                    if len([d for d in subdirs if d.is_dir()]) > 1:
-                        service_indicators += 1
+                if len(index.child_directories(service_dir)) > 1:
+                    service_indicators += 1
             
             confidence += service_indicators * 0.25
         
@@ -796,7 +1616,11 @@ class UniversalProjectAnalyzer:
         
         return recommendations.get(pattern_name, [])
     
-    async def _assess_project_health(self, project_path: Path) -> ProjectHealth:
+    async def _assess_project_health(self, index: ProjectFileIndex,
+                                     complexity_metrics: Optional[Dict[str, Any]] = None,
+                                     dependency_graph: Optional[DependencyGraph] = None,
+                                     vulnerabilities: Optional[List[VulnerabilityMatch]] = None,
+                                     duplicate_files: Optional[Dict[str, Any]] = None) -> ProjectHealth:
         """Assess overall project health across multiple dimensions."""
         health = ProjectHealth(
             overall_score=0.0,
@@ -808,16 +1632,19 @@ class UniversalProjectAnalyzer:
             documentation_score=0.0,
             dependency_health=0.0,
             issues=[],
-            recommendations=[]
+            recommendations=[],
+            duplicate_files=duplicate_files or {}
         )
         
         try:
             # Assess different health dimensions
-            health.code_quality = await self._assess_code_quality(project_path)
-            health.security_score = await self._assess_security(project_path)
-            health.maintainability_score = await self._assess_maintainability(project_path)
-            health.documentation_score = await self._assess_documentation(project_path)
-            health.dependency_health = await self._assess_dependency_health(project_path)
+            health.code_quality = await self._assess_code_quality(index, complexity_metrics or {})
+            health.security_score = await self._assess_security(index)
+            health.maintainability_score = await self._assess_maintainability(index, duplicate_files)
+            health.documentation_score = await self._assess_documentation(index)
+            health.dependency_health = await self._assess_dependency_health(
+                index, dependency_graph, vulnerabilities
+            )
             
             # Calculate overall score
             scores = [
@@ -830,7 +1657,7 @@ class UniversalProjectAnalyzer:
             health.overall_score = sum(scores) / len(scores) * 100
             
             # Generate issues and recommendations
-            health.issues = await self._identify_health_issues(project_path, health)
+            health.issues = await self._identify_health_issues(index, health)
             health.recommendations = await self._generate_health_recommendations(health)
             
         except Exception as e:
@@ -838,43 +1665,51 @@ class UniversalProjectAnalyzer:
         
         return health
     
-    async def _assess_code_quality(self, project_path: Path) -> float:
+    async def _assess_code_quality(self, index: ProjectFileIndex,
+                                   complexity_metrics: Dict[str, Any]) -> float:
         """Assess code quality based on various metrics."""
         score = 0.5  # Base score
         
         # Check for linting configuration
         lint_configs = [".eslintrc", ".pylintrc", "pyproject.toml", "tslint.json"]
         for config in lint_configs:
-            if (project_path / config).exists():
+            if index.exists(config):
                 score += 0.15
                 break
         
         # Check for code formatting configuration
         format_configs = [".prettierrc", ".black", "rustfmt.toml"]
         for config in format_configs:
-            if (project_path / config).exists():
+            if index.exists(config):
                 score += 0.1
                 break
         
-        # TODO: Add more sophisticated code quality analysis
-        # - Cyclomatic complexity analysis
-        # - Code duplication detection
-        # - Naming convention analysis
+        # Cyclomatic complexity (average per function)
+        if complexity_metrics.get("function_count"):
+            average_complexity = complexity_metrics["cyclomatic_complexity"]
+            if average_complexity <= 5:
+                score += 0.1
+            elif average_complexity > 10:
+                score -= 0.1
         
-        return min(score, 1.0)
+        # Code duplication
+        if complexity_metrics.get("duplication_ratio", 0.0) > 0.15:
+            score -= 0.1
+        
+        return max(min(score, 1.0), 0.0)
     
-    async def _assess_security(self, project_path: Path) -> float:
+    async def _assess_security(self, index: ProjectFileIndex) -> float:
         """Assess security posture of the project."""
         score = 0.5  # Base score
         
         # Check for security-related files
         security_files = [".github/workflows/security.yml", "SECURITY.md"]
         for file in security_files:
-            if (project_path / file).exists():
+            if index.exists(file):
                 score += 0.1
         
         # Check for dependency scanning
-        if (project_path / ".github/workflows").exists():
+        if index.exists(".github/workflows"):
             # Look for dependency scanning in CI
             score += 0.1
         
@@ -885,78 +1720,125 @@ class UniversalProjectAnalyzer:
         
         return min(score, 1.0)
     
-    async def _assess_maintainability(self, project_path: Path) -> float:
+    async def _assess_maintainability(self, index: ProjectFileIndex,
+                                      duplicate_files: Optional[Dict[str, Any]] = None) -> float:
         """Assess code maintainability."""
         score = 0.5  # Base score
         
         # Check for proper project structure
         common_dirs = ["src", "lib", "tests", "docs"]
-        found_dirs = sum(1 for d in common_dirs if (project_path / d).exists())
+        found_dirs = sum(1 for d in common_dirs if index.exists(d))
         score += found_dirs * 0.05
         
         # Check for CI/CD configuration
         ci_configs = [".github/workflows", ".gitlab-ci.yml", "Jenkinsfile"]
         for config in ci_configs:
-            if (project_path / config).exists():
+            if index.exists(config):
                 score += 0.15
                 break
         
+        # Copied files drift apart; penalize by the share of redundant copies
+        if duplicate_files and duplicate_files.get("redundant_files"):
+            source_files = max(sum(1 for _ in index.source_files()), 1)
+            score -= min(duplicate_files["redundant_files"] / source_files, 0.2)
+        
         return min(score, 1.0)
     
-    async def _assess_documentation(self, project_path: Path) -> float:
+    async def _assess_documentation(self, index: ProjectFileIndex) -> float:
         """Assess documentation quality and completeness."""
         score = 0.0
         
         # Check for README
         readme_files = ["README.md", "README.txt", "README.rst"]
         for readme in readme_files:
-            if (project_path / readme).exists():
+            if index.exists(readme):
                 score += 0.4
                 break
         
         # Check for additional documentation
         doc_dirs = ["docs", "documentation", "wiki"]
         for doc_dir in doc_dirs:
-            if (project_path / doc_dir).exists():
+            if index.exists(doc_dir):
                 score += 0.2
                 break
         
         # Check for API documentation
         api_docs = ["openapi.yml", "swagger.yml", "api.md"]
         for api_doc in api_docs:
-            if (project_path / api_doc).exists():
+            if index.exists(api_doc):
                 score += 0.2
                 break
         
         # Check for changelog
         changelogs = ["CHANGELOG.md", "HISTORY.md", "RELEASES.md"]
         for changelog in changelogs:
-            if (project_path / changelog).exists():
+            if index.exists(changelog):
                 score += 0.1
                 break
         
         # Check for contributing guidelines
         contributing = ["CONTRIBUTING.md", "CONTRIBUTE.md"]
         for contrib in contributing:
-            if (project_path / contrib).exists():
+            if index.exists(contrib):
                 score += 0.1
                 break
         
         return min(score, 1.0)
     
-    async def _assess_dependency_health(self, project_path: Path) -> float:
-        """Assess health of project dependencies."""
+    async def _assess_dependency_health(self, index: ProjectFileIndex,
+                                        dependency_graph: Optional[DependencyGraph] = None,
+                                        vulnerabilities: Optional[List[VulnerabilityMatch]] = None) -> float:
+        """
+        Assess health of project dependencies.
+        
+        Args:
+            index: Project file index
+            dependency_graph: Resolved dependency graph
+            vulnerabilities: Known vulnerabilities of the graph's packages, or None when
+                no vulnerability index is available
+        
+        Returns:
+            Score between 0 and 1
+        """
         score = 0.7  # Base score assuming reasonable health
         
-        # TODO: Implement sophisticated dependency health analysis
-        # - Check for outdated dependencies
-        # - Analyze dependency tree complexity
-        # - Check for security vulnerabilities in dependencies
-        # - Assess dependency license compatibility
+        # Locked versions make builds reproducible
+        if dependency_graph is not None and len(dependency_graph):
+            locked = sum(1 for version in dependency_graph.versions if version)
+            score += 0.1 * locked / len(dependency_graph)
+        
+        if vulnerabilities is not None:
+            if not vulnerabilities:
+                score += 0.2
+            else:
+                penalties = {"CRITICAL": 0.2, "HIGH": 0.1, "MEDIUM": 0.05, "LOW": 0.02, "UNKNOWN": 0.05}
+                score -= sum(penalties.get(match.severity, 0.05) for match in vulnerabilities)
         
-        return score
+        return max(0.0, min(score, 1.0))
     
-    async def _identify_health_issues(self, project_path: Path, health: ProjectHealth) -> List[str]:
+    def _check_vulnerabilities(self, dependency_graph: DependencyGraph) -> Optional[List[VulnerabilityMatch]]:
+        """
+        Check every resolved package of the graph against the offline vulnerability index.
+        
+        Returns:
+            Known vulnerabilities, or None when no vulnerability index has been imported
+        """
+        vulnerability_index = VulnerabilityIndex.open_existing(
+            self.config.get("vulnerability_db", DEFAULT_VULNERABILITY_DB)
+        )
+        if vulnerability_index is None:
+            return None
+        try:
+            return vulnerability_index.lookup(
+                zip(dependency_graph.ecosystems, dependency_graph.names, dependency_graph.versions, strict=True)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Vulnerability lookup failed: {e}")
+            return None
+        finally:
+            vulnerability_index.close()
+    
+    async def _identify_health_issues(self, index: ProjectFileIndex, health: ProjectHealth) -> List[str]:
         """Identify specific health issues in the project."""
         issues = []
         
@@ -969,9 +1851,13 @@ class UniversalProjectAnalyzer:
         if health.documentation_score < 0.5:
             issues.append("Documentation is incomplete")
         
-        if not (project_path / "tests").exists() and not list(project_path.glob("**/test_*.py")):
+        if not index.exists("tests") and not index.glob("**/test_*.py"):
             issues.append("No test directory or test files found")
         
+        if health.duplicate_files.get("clusters"):
+            issues.append(f"{health.duplicate_files['redundant_files']} duplicated files in "
+                          f"{health.duplicate_files['clusters']} groups of identical content")
+        
         return issues
     
     async def _generate_health_recommendations(self, health: ProjectHealth) -> List[str]:
@@ -990,27 +1876,69 @@ class UniversalProjectAnalyzer:
         if health.overall_score < 70:
             recommendations.append("Consider implementing CI/CD pipeline")
         
+        if health.duplicate_files.get("clusters"):
+            recommendations.append("Replace copied files with shared modules or declared dependencies")
+        
         return recommendations
     
-    async def _analyze_dependencies(self, project_path: Path) -> Dict[str, List[str]]:
-        """Analyze project dependencies."""
-        dependencies = {
-            "production": [],
-            "development": [],
-            "optional": []
-        }
+    async def _analyze_dependencies(self, index: ProjectFileIndex,
+                                    cache: Optional[ScanCache] = None,
+                                    budget: Optional[StageBudget] = None) -> DependencyGraph:
+        """
+        Build the project dependency graph from its lockfiles and manifests.
+        
+        Every lockfile and manifest in the project is parsed on its own and cached per
+        file; lockfiles are merged first so the direct dependencies named by manifests
+        resolve to the locked versions.
         
-        # TODO: Implement dependency analysis for different package managers
-        # - npm/yarn (package.json)
-        # - pip (requirements.txt, setup.py, pyproject.toml)
-        # - cargo (Cargo.toml)
-        # - go modules (go.mod)
-        # - maven (pom.xml)
-        # - gradle (build.gradle)
+        Args:
+            index: Project file index
+            cache: Optional scan cache
+            budget: Files larger than max_file_bytes are skipped, and no further files
+                are parsed once the time budget is spent (cached results still merge)
         
-        return dependencies
+        Returns:
+            Dependency graph of all ecosystems in the project
+        """
+        if cache is not None:
+            cache.bind("dependencies", ScanCache.signature_of([DEPENDENCY_GRAPH_VERSION]))
+        budget = budget or StageBudget()
+        deadline = budget.deadline()
+        
+        lockfiles, manifests = [], []
+        for file_id in index.source_files():
+            parser, is_lockfile = dependency_parser(index.paths[file_id].rsplit("/", 1)[-1])
+            if parser is None:
+                continue
+            if budget.max_file_bytes is not None and index.sizes[file_id] > budget.max_file_bytes:
+                logger.debug(f"Skipping dependency file {index.paths[file_id]} above the size budget")
+                continue
+            (lockfiles if is_lockfile else manifests).append((file_id, parser))
+        
+        graph = DependencyGraph()
+        for file_id, parser in lockfiles + manifests:
+            rel_path = index.paths[file_id]
+            stat_key = index.stat_key(file_id)
+            payload = cache.get("dependencies", rel_path, stat_key) if cache is not None else None
+            if payload is None:
+                if deadline_passed(deadline):
+                    continue
+                file_graph = DependencyGraph()
+                try:
+                    parser(index.abs_path(file_id), file_graph)
+                except (OSError, ValueError, SyntaxError) as e:
+                    logger.warning(f"Could not parse dependency file {rel_path}: {e}")
+                    continue
+                record_read(index.sizes[file_id])
+                payload = file_graph.to_payload()
+                if cache is not None:
+                    cache.put("dependencies", rel_path, stat_key, payload)
+            graph.merge(payload)
+        
+        logger.debug(f"Dependency graph: {len(graph)} packages, {len(graph.roots)} direct")
+        return graph
     
-    async def _identify_configuration_files(self, project_path: Path) -> List[str]:
+    async def _identify_configuration_files(self, index: ProjectFileIndex) -> List[str]:
         """Identify configuration files in the project."""
         config_patterns = [
             "*.json", "*.yml", "*.yaml", "*.toml", "*.ini", "*.conf",
@@ -1019,11 +1947,11 @@ class UniversalProjectAnalyzer:
         
         config_files = []
         for pattern in config_patterns:
-            config_files.extend([str(f) for f in project_path.glob(pattern)])
+            config_files.extend([str(index.root / f) for f in index.glob(pattern)])
         
         return config_files
     
-    async def _determine_project_type(self, project_path: Path, tech_stack: TechnologyStack, file_structure: Dict) -> str:
+    async def _determine_project_type(self, index: ProjectFileIndex, tech_stack: TechnologyStack, file_structure: Dict) -> str:
         """Determine the primary type of the project."""
         type_scores = defaultdict(float)
         
@@ -1038,7 +1966,7 @@ class UniversalProjectAnalyzer:
             
             # Check file/directory indicators
             for indicator in indicators.get("indicators", []):
-                if (project_path / indicator).exists():
+                if index.exists(indicator):
                     score += 0.1
             
             type_scores[project_type] = score
@@ -1152,6 +2080,48 @@ class UniversalProjectAnalyzer:
         return json.dumps(self.to_dict(analysis), indent=indent, default=str)
 
 
+# Analyzer of the current batch worker process, created by _init_batch_worker
+_worker_analyzer: Optional[UniversalProjectAnalyzer] = None
+
+
+def _init_batch_worker(analyzer_class: type, config: Dict):
+    """Process pool initializer: one analyzer per worker, reused for every project."""
+    global _worker_analyzer
+    _worker_analyzer = analyzer_class(config)
+
+
+class _TimeLimitExpired(BaseException):
+    """Raised by the worker's alarm; not an Exception, so the stages' handlers let it through."""
+
+
+@contextlib.contextmanager
+def _time_limit(seconds: Optional[float]):
+    """Raise TimeoutError in the worker's main thread once `seconds` have passed."""
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+    
+    def _expired(signum, frame):
+        raise _TimeLimitExpired()
+    
+    previous = signal.signal(signal.SIGALRM, _expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    except _TimeLimitExpired:
+        raise TimeoutError(f"Analysis exceeded {seconds}s") from None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _analyze_in_worker(project_path: str, options: Dict[str, Any],
+                       timeout: Optional[float]) -> ProjectAnalysis:
+    """Analyze one project with the worker's analyzer; options are analyze_project keywords."""
+    with _time_limit(timeout):
+        return asyncio.run(_worker_analyzer.analyze_project(project_path, **options))
+
+
 # Example usage
 if __name__ == "__main__":
     async def main():
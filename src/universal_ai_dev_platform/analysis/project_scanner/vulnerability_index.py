@@ -0,0 +1,381 @@
+"""
+Vulnerability Index
+
+Offline vulnerability database for dependency health checks. OSV advisories (a JSON
+dump directory, an ecosystem zip from the OSV bucket or a single JSON file) are
+imported once into SQLite; every affected version range is stored as an interval row
+indexed by (ecosystem, package). Checking a dependency graph is one indexed join for
+all packages followed by interval tests in Python, with no network access.
+
+Imports are incremental: source files and zip members whose fingerprint is unchanged
+are not read again, and advisories are only rewritten when their "modified"
+timestamp is newer than the stored one.
+"""
+
+import json
+import logging
+import math
+import re
+import sqlite3
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from packaging.version import InvalidVersion, Version
+
+from .dependency_graph import normalize_python_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VULNERABILITY_DB = "~/.uai/vulnerabilities.sqlite"
+SCHEMA_VERSION = 1
+
+# OSV ecosystem -> dependency graph ecosystem
+OSV_ECOSYSTEMS = {"npm": "npm", "PyPI": "pypi", "crates.io": "cargo", "Go": "go", "Maven": "maven"}
+
+# Severity levels in increasing order
+SEVERITY_LEVELS = ("UNKNOWN", "LOW", "MEDIUM", "HIGH", "CRITICAL")
+_SEVERITY_ALIASES = {"MODERATE": "MEDIUM"}
+
+_VERSION_NUMBER = re.compile(r"\d+")
+
+# CVSS v3 base metric weights
+_CVSS_WEIGHTS = {
+    "AV": {"N": 0.85, "A": 0.62, "L": 0.55, "P": 0.2},
+    "AC": {"L": 0.77, "H": 0.44},
+    "UI": {"N": 0.85, "R": 0.62},
+    "C": {"H": 0.56, "L": 0.22, "N": 0.0},
+    "I": {"H": 0.56, "L": 0.22, "N": 0.0},
+    "A": {"H": 0.56, "L": 0.22, "N": 0.0},
+}
+_CVSS_PRIVILEGES = {"U": {"N": 0.85, "L": 0.62, "H": 0.27}, "C": {"N": 0.85, "L": 0.68, "H": 0.5}}
+
+
+@dataclass
+class VulnerabilityMatch:
+    """A dependency version affected by a known advisory."""
+    
+    advisory_id: str
+    ecosystem: str
+    package: str
+    version: str
+    severity: str
+    summary: str
+    fixed_versions: List[str] = field(default_factory=list)
+    aliases: List[str] = field(default_factory=list)
+
+
+class VulnerabilityIndex:
+    """
+    SQLite store of OSV advisories with interval lookups per (ecosystem, package).
+    
+    Each affected range becomes one row (introduced, fixed, last_affected); an open
+    bound is NULL. Advisories that list explicit versions without usable ranges get one
+    single-version row per listed version.
+    """
+    
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path).expanduser()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._initialize_schema()
+    
+    @classmethod
+    def open_existing(cls, db_path: Optional[str]) -> Optional["VulnerabilityIndex"]:
+        """Open an index that has been imported before, or None when there is none."""
+        if not db_path or not Path(db_path).expanduser().is_file():
+            return None
+        try:
+            return cls(Path(db_path))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not open vulnerability index {db_path}: {e}")
+            return None
+    
+    def _initialize_schema(self):
+        """Create tables, discarding indexes written by an older schema."""
+        conn = self._conn
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None or int(row[0]) != SCHEMA_VERSION:
+            for table in ("advisories", "affected", "sources"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)",
+                         (str(SCHEMA_VERSION),))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS advisories ("
+            " id TEXT PRIMARY KEY,"
+            " modified TEXT NOT NULL,"
+            " severity TEXT NOT NULL,"
+            " summary TEXT NOT NULL,"
+            " aliases TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS affected ("
+            " advisory_id TEXT NOT NULL,"
+            " ecosystem TEXT NOT NULL,"
+            " package TEXT NOT NULL,"
+            " introduced TEXT NOT NULL,"
+            " fixed TEXT,"
+            " last_affected TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS affected_package ON affected (ecosystem, package)")
+        conn.execute("CREATE INDEX IF NOT EXISTS affected_advisory ON affected (advisory_id)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sources (source TEXT PRIMARY KEY, fingerprint TEXT NOT NULL)"
+        )
+        conn.commit()
+    
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM advisories").fetchone()[0]
+    
+    def close(self):
+        self._conn.close()
+    
+    # Import
+    
+    def import_osv(self, source: Path) -> Dict[str, int]:
+        """
+        Import or refresh advisories from an OSV dump.
+        
+        Args:
+            source: Directory of advisory JSON files (searched recursively), a zip
+                archive of them, or a single JSON file holding one advisory or a list
+        
+        Returns:
+            Counts of "imported", "unchanged" and "withdrawn" advisories and of
+            "skipped_files" whose fingerprint had not changed
+        """
+        source = Path(source).expanduser()
+        counts = {"imported": 0, "unchanged": 0, "withdrawn": 0, "skipped_files": 0}
+        known = dict(self._conn.execute("SELECT source, fingerprint FROM sources"))
+        modified = dict(self._conn.execute("SELECT id, modified FROM advisories"))
+        
+        with self._conn:
+            for name, fingerprint, load in _osv_documents(source):
+                if known.get(name) == fingerprint:
+                    counts["skipped_files"] += 1
+                    continue
+                try:
+                    document = json.loads(load())
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not read advisory file {name}: {e}")
+                    continue
+                for advisory in document if isinstance(document, list) else [document]:
+                    if isinstance(advisory, dict) and advisory.get("id"):
+                        counts[self._store_advisory(advisory, modified)] += 1
+                self._conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?)", (name, fingerprint))
+        
+        logger.info(f"Vulnerability index {self.db_path}: {counts}")
+        return counts
+    
+    def _store_advisory(self, advisory: Dict[str, Any], modified: Dict[str, str]) -> str:
+        """Insert, replace or delete one advisory; returns the count it falls under."""
+        advisory_id = advisory["id"]
+        timestamp = advisory.get("modified", "")
+        if advisory_id in modified and modified[advisory_id] >= timestamp:
+            return "unchanged"
+        
+        conn = self._conn
+        conn.execute("DELETE FROM affected WHERE advisory_id = ?", (advisory_id,))
+        modified[advisory_id] = timestamp
+        if advisory.get("withdrawn"):
+            conn.execute("DELETE FROM advisories WHERE id = ?", (advisory_id,))
+            return "withdrawn"
+        
+        conn.execute(
+            "INSERT OR REPLACE INTO advisories VALUES (?, ?, ?, ?, ?)",
+            (advisory_id, timestamp, advisory_severity(advisory),
+             advisory.get("summary") or advisory.get("details", "")[:200],
+             json.dumps(advisory.get("aliases", [])))
+        )
+        conn.executemany(
+            "INSERT INTO affected VALUES (?, ?, ?, ?, ?, ?)",
+            ((advisory_id,) + interval for interval in _affected_intervals(advisory))
+        )
+        return "imported"
+    
+    # Lookup
+    
+    def lookup(self, packages: Iterable[Tuple[str, str, str]]) -> List[VulnerabilityMatch]:
+        """
+        Find the advisories affecting a set of resolved packages.
+        
+        Args:
+            packages: (ecosystem, name, version) triples using the dependency graph's
+                ecosystem names; packages without a version are skipped
+        
+        Returns:
+            One match per affected package and advisory
+        """
+        versions: Dict[Tuple[str, str], List[str]] = {}
+        for ecosystem, name, version in packages:
+            if version:
+                versions.setdefault((ecosystem, name), []).append(version)
+        if not versions:
+            return []
+        
+        conn = self._conn
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (ecosystem TEXT, package TEXT)")
+        conn.execute("DELETE FROM wanted")
+        conn.executemany("INSERT INTO wanted VALUES (?, ?)", versions.keys())
+        rows = conn.execute(
+            "SELECT a.advisory_id, a.ecosystem, a.package, a.introduced, a.fixed, a.last_affected,"
+            " v.severity, v.summary, v.aliases"
+            " FROM wanted w"
+            " JOIN affected a ON a.ecosystem = w.ecosystem AND a.package = w.package"
+            " JOIN advisories v ON v.id = a.advisory_id"
+        ).fetchall()
+        conn.execute("DELETE FROM wanted")
+        
+        matches: Dict[Tuple[str, str, str, str], VulnerabilityMatch] = {}
+        for advisory_id, ecosystem, name, introduced, fixed, last_affected, severity, summary, aliases in rows:
+            for version in versions[(ecosystem, name)]:
+                if not version_in_range(ecosystem, version, introduced, fixed, last_affected):
+                    continue
+                key = (advisory_id, ecosystem, name, version)
+                match = matches.get(key)
+                if match is None:
+                    match = matches[key] = VulnerabilityMatch(
+                        advisory_id, ecosystem, name, version, severity, summary,
+                        aliases=json.loads(aliases)
+                    )
+                if fixed and fixed not in match.fixed_versions:
+                    match.fixed_versions.append(fixed)
+        return list(matches.values())
+
+
+def _osv_documents(source: Path) -> Iterator[Tuple[str, str, Any]]:
+    """(source name, fingerprint, loader) for every advisory file in an OSV dump."""
+    if source.is_dir():
+        for path in sorted(source.rglob("*.json")):
+            stat = path.stat()
+            yield str(path), f"{stat.st_mtime_ns}:{stat.st_size}", path.read_bytes
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if info.filename.endswith(".json"):
+                    yield (f"{source}!{info.filename}", f"{info.CRC}:{info.file_size}",
+                           lambda info=info: archive.read(info))
+    else:
+        stat = source.stat()
+        yield str(source), f"{stat.st_mtime_ns}:{stat.st_size}", source.read_bytes
+
+
+def _affected_intervals(advisory: Dict[str, Any]) -> Iterator[Tuple[str, str, str, Optional[str], Optional[str]]]:
+    """(ecosystem, package, introduced, fixed, last_affected) rows of an advisory."""
+    for affected in advisory.get("affected", []):
+        package = affected.get("package", {})
+        ecosystem = OSV_ECOSYSTEMS.get(package.get("ecosystem", ""))
+        name = package.get("name")
+        if ecosystem is None or not name:
+            continue
+        if ecosystem == "pypi":
+            name = normalize_python_name(name)
+        
+        has_ranges = False
+        for version_range in affected.get("ranges", []):
+            if version_range.get("type") not in ("SEMVER", "ECOSYSTEM"):
+                continue
+            has_ranges = True
+            introduced = None
+            for event in version_range.get("events", []):
+                if "introduced" in event:
+                    introduced = event["introduced"]
+                elif introduced is not None and "fixed" in event:
+                    yield ecosystem, name, introduced, event["fixed"], None
+                    introduced = None
+                elif introduced is not None and "last_affected" in event:
+                    yield ecosystem, name, introduced, None, event["last_affected"]
+                    introduced = None
+            if introduced is not None:
+                yield ecosystem, name, introduced, None, None
+        
+        if not has_ranges:
+            for version in affected.get("versions", []):
+                yield ecosystem, name, version, None, version
+
+
+def advisory_severity(advisory: Dict[str, Any]) -> str:
+    """
+    Severity level of an advisory: the database-specific rating when present (GitHub
+    advisories), otherwise the rating of its highest CVSS v3 base score.
+    """
+    rating = (advisory.get("database_specific") or {}).get("severity")
+    if isinstance(rating, str):
+        rating = _SEVERITY_ALIASES.get(rating.upper(), rating.upper())
+        if rating in SEVERITY_LEVELS:
+            return rating
+    
+    scores = [
+        cvss3_base_score(entry.get("score", ""))
+        for entry in advisory.get("severity", []) if entry.get("type") == "CVSS_V3"
+    ]
+    score = max((value for value in scores if value is not None), default=None)
+    if score is None:
+        return "UNKNOWN"
+    if score >= 9.0:
+        return "CRITICAL"
+    if score >= 7.0:
+        return "HIGH"
+    if score >= 4.0:
+        return "MEDIUM"
+    return "LOW"
+
+
+def cvss3_base_score(vector: str) -> Optional[float]:
+    """Base score of a CVSS v3.x vector string, or None when it is incomplete."""
+    metrics = dict(part.split(":", 1) for part in vector.split("/")[1:] if ":" in part)
+    try:
+        scope = metrics["S"]
+        weights = {key: _CVSS_WEIGHTS[key][metrics[key]] for key in _CVSS_WEIGHTS}
+        privileges = _CVSS_PRIVILEGES[scope][metrics["PR"]]
+    except KeyError:
+        return None
+    
+    impact_subscore = 1 - (1 - weights["C"]) * (1 - weights["I"]) * (1 - weights["A"])
+    if scope == "U":
+        impact = 6.42 * impact_subscore
+    else:
+        impact = 7.52 * (impact_subscore - 0.029) - 3.25 * (impact_subscore - 0.02) ** 15
+    if impact <= 0:
+        return 0.0
+    exploitability = 8.22 * weights["AV"] * weights["AC"] * privileges * weights["UI"]
+    total = impact + exploitability if scope == "U" else 1.08 * (impact + exploitability)
+    return math.ceil(min(total, 10.0) * 10 - 1e-9) / 10
+
+
+def version_in_range(ecosystem: str, version: str, introduced: str,
+                     fixed: Optional[str], last_affected: Optional[str]) -> bool:
+    """Whether a version lies in [introduced, fixed) or [introduced, last_affected]."""
+    key = version_key(ecosystem, version)
+    if introduced != "0" and key < version_key(ecosystem, introduced):
+        return False
+    if fixed is not None and key >= version_key(ecosystem, fixed):
+        return False
+    if last_affected is not None and key > version_key(ecosystem, last_affected):
+        return False
+    return True
+
+
+def version_key(ecosystem: str, version: str) -> Tuple:
+    """
+    Sort key of a version: PEP 440 for PyPI, SemVer-like ordering elsewhere (numeric
+    release parts without trailing zeros, pre-releases before the release).
+    """
+    if ecosystem == "pypi":
+        try:
+            return (1, Version(version))
+        except InvalidVersion:
+            pass
+    
+    version = version.strip().lstrip("vV").split("+", 1)[0]
+    release, _, prerelease = version.partition("-")
+    numbers = [int(part) for part in _VERSION_NUMBER.findall(release)]
+    while numbers and numbers[-1] == 0:
+        numbers.pop()
+    if not prerelease:
+        return (0, tuple(numbers), 1, ())
+    return (0, tuple(numbers), 0, tuple(
+        (0, int(part), "") if part.isdigit() else (1, 0, part) for part in prerelease.split(".")
+    ))
@@ -0,0 +1,66 @@
+"""
+Workspace Discovery
+
+Finds the package roots of a monorepo or workspace in the shared file index: every
+walked directory below the project root that holds a package manifest is a package,
+and packages inside another package are nested under it. Discovery reads no files;
+it is one pass over the index's directories.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from .file_index import ProjectFileIndex
+
+logger = logging.getLogger(__name__)
+
+# Files that make the directory holding them a package root. Requirement lists alone
+# do not, since they often sit in docs/ or ci/ directories of a single project.
+PACKAGE_MANIFESTS = {
+    "package.json", "pyproject.toml", "setup.py", "setup.cfg", "Cargo.toml", "go.mod",
+    "pom.xml", "build.gradle", "build.gradle.kts", "composer.json", "Gemfile", "mix.exs",
+}
+
+DEFAULT_MAX_PACKAGES = 500
+
+
+def find_package_roots(index: ProjectFileIndex, max_packages: int = DEFAULT_MAX_PACKAGES) -> List[str]:
+    """
+    Package directories of a project, each followed by the packages inside it.
+    
+    Args:
+        index: Project file index
+        max_packages: Stop after this many packages (the rest are left to the project)
+    
+    Returns:
+        Relative paths of the package roots below the project root
+    """
+    roots = []
+    for dir_id in index.source_directories():
+        if dir_id == 0:
+            continue
+        if any(index.paths[file_id].rsplit("/", 1)[-1] in PACKAGE_MANIFESTS and not index.is_ignored(file_id)
+               for file_id in index.files_in_directory(dir_id)):
+            roots.append(index.directories[dir_id])
+    roots.sort(key=lambda root: root.split("/"))  # Packages directly followed by their contents
+    if len(roots) > max_packages:
+        logger.warning(f"Found {len(roots)} packages in {index.root}; analyzing the first {max_packages}")
+        roots = roots[:max_packages]
+    return roots
+
+
+def package_parents(roots: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Innermost enclosing package of every package root (None: the project itself).
+    
+    Args:
+        roots: Package roots below the project root
+    """
+    parents: Dict[str, Optional[str]] = {}
+    enclosing: List[str] = []  # Stack of packages containing the current one
+    for root in sorted(roots, key=lambda root: root.split("/")):
+        while enclosing and not root.startswith(enclosing[-1] + "/"):
+            enclosing.pop()
+        parents[root] = enclosing[-1] if enclosing else None
+        enclosing.append(root)
+    return parents
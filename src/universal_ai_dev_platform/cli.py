@@ -9,6 +9,7 @@ import asyncio
 import json
 import logging
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Optional, Dict, Any
 
@@ -20,10 +21,13 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.syntax import Syntax
 
-from .analysis import UniversalProjectAnalyzer
+from .analysis import UniversalProjectAnalyzer, VulnerabilityIndex
+from .analysis.project_scanner.stage_profiler import TRACE_FORMATS, AnalysisProfiler
+from .analysis.project_scanner.vulnerability_index import DEFAULT_VULNERABILITY_DB
 from .workflows.initialization import ProjectInitializer
 from .core.orchestration import AgentOrchestrator
-from .core.intelligence import ProjectIntelligence
+from .core.intelligence import AnalysisDaemon, ProjectIntelligence, query_daemon
+from .core.intelligence.analysis_daemon import DAEMON_QUERIES, DEFAULT_SOCKET
 from .core.adaptation import AdaptationEngine
 
 # Initialize rich console for beautiful output
@@ -76,19 +80,42 @@ def main(ctx: click.Context, verbose: bool, config: Optional[str]):
 @click.option('--output', '-o', type=click.Path(), help='Output file for analysis results')
 @click.option('--format', type=click.Choice(['json', 'yaml', 'table']), 
               default='table', help='Output format')
+@click.option('--no-cache', is_flag=True,
+              help='Ignore the per-file scan cache in .uai/cache and stored analysis results')
+@click.option('--since', metavar='REF',
+              help='Only re-analyze files changed since the git ref of a previous cached run')
+@click.option('--profile', is_flag=True, help='Show the time, CPU and reads of every analysis stage')
+@click.option('--profile-memory', is_flag=True, help='Also trace allocation peaks per stage (slower)')
+@click.option('--trace', 'trace_path', type=click.Path(), help='Write the stage profile to a trace file')
+@click.option('--trace-format', type=click.Choice(TRACE_FORMATS), default='chrome', show_default=True,
+              help='Trace file format: Chrome trace events (chrome://tracing, Perfetto) or speedscope')
 @click.pass_context
 async def analyze(ctx: click.Context, project_path: str, depth: str, focus: tuple, 
-                 output: Optional[str], format: str):
+                 output: Optional[str], format: str, no_cache: bool, since: Optional[str],
+                 profile: bool, profile_memory: bool, trace_path: Optional[str], trace_format: str):
     """
     Analyze any project and provide comprehensive insights.
     
     Performs deep analysis of project structure, technology stack, architecture patterns,
     health assessment, and provides enhancement recommendations.
+    
+    --depth selects the stages that run and how much of the project they read, from a
+    sampled "surface" pass to "comprehensive"; --focus skips optional stages that feed
+    none of the given areas.
+    
+    Results are stored by tree fingerprint, so analyzing an unchanged project again
+    (from any command) returns the stored result; --no-cache always re-analyzes.
+    
+    --profile records every stage (also in analysis_metadata.profile of JSON output);
+    --trace writes the stages as a timeline for chrome://tracing or speedscope.
     """
     console.print(f"[bold blue]🔍 Analyzing project:[/bold blue] {project_path}")
     
     try:
-        analyzer = UniversalProjectAnalyzer()
+        analyzer = UniversalProjectAnalyzer({"cache_enabled": not no_cache})
+        profiler = None
+        if profile or profile_memory or trace_path:
+            profiler = AnalysisProfiler(trace_memory=profile_memory)
         
         with Progress(
             SpinnerColumn(),
@@ -98,7 +125,9 @@ async def analyze(ctx: click.Context, project_path: str, depth: str, focus: tupl
             task = progress.add_task("Analyzing project...", total=None)
             
             # Perform analysis
-            analysis = await analyzer.analyze_project(project_path)
+            with profiler.activate() if profiler is not None else nullcontext():
+                analysis = await analyzer.analyze_project(project_path, since=since, depth=depth,
+                                                          focus=focus)
             
             progress.update(task, description="Analysis complete!")
         
@@ -116,6 +145,13 @@ async def analyze(ctx: click.Context, project_path: str, depth: str, focus: tupl
             # TODO: Implement YAML output
             console.print("[yellow]YAML output not yet implemented[/yellow]")
         
+        if profiler is not None:
+            if profile or profile_memory:
+                _display_profile_table(analysis.analysis_metadata["profile"])
+            if trace_path:
+                profiler.write_trace(trace_path, trace_format)
+                console.print(f"[green]✓[/green] {trace_format.title()} trace saved to {trace_path}")
+    
     except Exception as e:
         console.print(f"[red]✗ Analysis failed:[/red] {e}")
         if ctx.obj.get('verbose'):
@@ -455,6 +491,107 @@ async def adapt(ctx: click.Context, status: bool, check_updates: bool, force_upd
         sys.exit(1)
 
 
+@main.command()
+@click.argument('source', type=click.Path(exists=True))
+@click.option('--db', default=DEFAULT_VULNERABILITY_DB, show_default=True,
+              help='Vulnerability index used by project analysis')
+@click.pass_context
+async def vulnerabilities(ctx: click.Context, source: str, db: str):
+    """
+    Import OSV advisories into the offline vulnerability index.
+    
+    SOURCE is an OSV dump: a directory of advisory JSON files, an ecosystem zip
+    archive or a single JSON file. Re-importing a refreshed dump only processes
+    files and advisories that changed.
+    """
+    console.print(f"[bold blue]🛡️  Importing advisories:[/bold blue] {source}")
+    
+    try:
+        index = VulnerabilityIndex(Path(db))
+        try:
+            counts = index.import_osv(Path(source))
+            total = len(index)
+        finally:
+            index.close()
+        
+        console.print(f"[green]✓[/green] {counts['imported']} imported, {counts['unchanged']} unchanged, "
+                      f"{counts['withdrawn']} withdrawn, {counts['skipped_files']} files skipped "
+                      f"({total} advisories in {db})")
+    
+    except Exception as e:
+        console.print(f"[red]✗ Vulnerability import failed:[/red] {e}")
+        if ctx.obj.get('verbose'):
+            console.print_exception()
+        sys.exit(1)
+
+
+@main.command()
+@click.argument('project_path', type=click.Path(exists=True, file_okay=False), default='.')
+@click.option('--socket', 'socket_path', type=click.Path(),
+              help=f'Unix socket to serve queries on (default: PROJECT_PATH/{DEFAULT_SOCKET})')
+@click.option('--depth', type=click.Choice(['surface', 'standard', 'deep', 'comprehensive']),
+              default='standard', help='Analysis depth level')
+@click.option('--poll', is_flag=True, help='Poll the project fingerprint instead of using inotify')
+@click.option('--interval', type=float, default=1.0, show_default=True,
+              help='Seconds between polls')
+@click.pass_context
+async def watch(ctx: click.Context, project_path: str, socket_path: Optional[str], depth: str,
+                poll: bool, interval: float):
+    """
+    Keep a project's analysis current and serve it to other tools.
+    
+    Runs until interrupted. Changes are picked up through inotify when the watchdog
+    package is installed, otherwise by polling; each update only re-reads changed
+    files. Query the running daemon with `uai query`.
+    """
+    try:
+        daemon = AnalysisDaemon(project_path, socket_path=socket_path, depth=depth,
+                                poll_interval=interval, use_polling=poll)
+        console.print(f"[bold blue]👀 Watching project:[/bold blue] {daemon.project_path} "
+                      f"[dim]({daemon.watcher}, socket {daemon.socket_path})[/dim]")
+        await daemon.serve()
+    
+    except Exception as e:
+        console.print(f"[red]✗ Watch failed:[/red] {e}")
+        if ctx.obj.get('verbose'):
+            console.print_exception()
+        sys.exit(1)
+
+
+@main.command()
+@click.argument('query', type=click.Choice(DAEMON_QUERIES), default='status')
+@click.option('--project', 'project_path', type=click.Path(exists=True, file_okay=False), default='.',
+              help='Project watched by the daemon')
+@click.option('--socket', 'socket_path', type=click.Path(), help='Socket of the daemon (overrides --project)')
+@click.option('--field', help='Dotted path of one field of the analysis or pattern results')
+@click.option('--since', type=int, help='Version to list changed files since (changes query)')
+@click.pass_context
+async def query(ctx: click.Context, query: str, project_path: str, socket_path: Optional[str],
+                field: Optional[str], since: Optional[int]):
+    """
+    Query the analysis daemon started by `uai watch`.
+    
+    QUERY is status, analysis, patterns, changes or refresh.
+    """
+    socket_path = socket_path or str(Path(project_path).resolve() / DEFAULT_SOCKET)
+    params = {name: value for name, value in (("field", field), ("since", since)) if value is not None}
+    
+    try:
+        response = await query_daemon(socket_path, query, **params)
+        if not response["ok"]:
+            raise ValueError(response["error"])
+        console.print_json(json.dumps(response["result"]))
+    
+    except OSError as e:
+        console.print(f"[red]✗ No daemon is serving on {socket_path}:[/red] {e}")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[red]✗ Query failed:[/red] {e}")
+        if ctx.obj.get('verbose'):
+            console.print_exception()
+        sys.exit(1)
+
+
 async def _display_analysis_table(analysis):
     """Display analysis results in a formatted table."""
     
@@ -534,6 +671,46 @@ async def _display_analysis_table(analysis):
         console.print()
 
 
+def _display_profile_table(profile: Dict[str, Any]):
+    """Display the stages of an analysis profile, slowest first within each level."""
+    table = Table(title=f"⏱️  Stage Profile ({profile['wall_time'] * 1000:.0f} ms)")
+    table.add_column("Stage", style="bold")
+    table.add_column("Wall", justify="right")
+    table.add_column("CPU", justify="right")
+    table.add_column("Files", justify="right")
+    table.add_column("Read", justify="right")
+    if profile["memory_traced"]:
+        table.add_column("Peak Memory", justify="right")
+    
+    children = {}
+    for stage in profile["stages"]:
+        children.setdefault(stage["parent"], []).append(stage)
+    
+    def add_rows(parent: Optional[str], depth: int):
+        for stage in sorted(children.get(parent, []), key=lambda stage: -stage["wall_time"]):
+            name = "  " * depth + stage["name"] + (" [dim](stored)[/dim]" if stage["cached"] else "")
+            row = [name, f"{stage['wall_time'] * 1000:.1f} ms", f"{stage['cpu_time'] * 1000:.1f} ms",
+                   str(stage["files"]), _format_bytes(stage["bytes_read"])]
+            if profile["memory_traced"]:
+                row.append(_format_bytes(stage["memory_peak"] or 0))
+            table.add_row(*row)
+            if stage["name"] in children and stage["name"] != parent:
+                add_rows(stage["name"], depth + 1)
+    
+    add_rows(None, 0)
+    console.print(table)
+    console.print()
+
+
+def _format_bytes(size: int) -> str:
+    """Human-readable byte count."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
 def cli_main():
     """Main entry point for the CLI."""
     # Set up asyncio for the CLI
@@ -554,6 +731,9 @@ def cli_main():
     intelligence.callback = make_async(intelligence.callback)
     mcp.callback = make_async(mcp.callback)
     adapt.callback = make_async(adapt.callback)
+    vulnerabilities.callback = make_async(vulnerabilities.callback)
+    watch.callback = make_async(watch.callback)
+    query.callback = make_async(query.callback)
     
     main()
 
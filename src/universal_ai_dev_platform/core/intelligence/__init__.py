@@ -6,6 +6,7 @@ AI-powered intelligence analysis and optimization for projects.
 
 from .project_intelligence import ProjectIntelligence, IntelligenceAnalysis, IntelligenceResult
 from .pattern_analyzer import PatternAnalyzer, DetectedPattern, PatternAnalysisResult
+from .analysis_daemon import AnalysisDaemon, query_daemon
 
 __all__ = [
     "ProjectIntelligence",
@@ -13,5 +14,7 @@ __all__ = [
     "IntelligenceResult",
     "PatternAnalyzer",
     "DetectedPattern",
-    "PatternAnalysisResult"
+    "PatternAnalysisResult",
+    "AnalysisDaemon",
+    "query_daemon"
 ]
\ No newline at end of file
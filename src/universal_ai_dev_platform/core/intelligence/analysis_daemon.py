@@ -0,0 +1,375 @@
+"""
+Analysis Daemon
+
+Long-lived process behind `uai watch`: keeps the project analysis and the pattern
+analysis of one project up to date as its files change, and answers queries about
+them over a local Unix socket. File changes are picked up through inotify (via the
+optional watchdog package) or, without it, by polling the project's Merkle
+fingerprint; each update only re-reads the files that changed, since every other
+file is answered from the per-file scan cache. Queries are served from documents
+serialized once per update, so answering one takes well under a millisecond.
+
+Protocol: one JSON object per line in each direction.
+    
+    {"query": "status"}
+    {"query": "analysis", "field": "technology_stack.frameworks"}
+    {"query": "patterns"}
+    {"query": "changes", "since": 3}
+    {"query": "refresh"}
+
+Every response carries "ok" and the current "version" (incremented by each update),
+plus "result" or "error".
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ...analysis.project_scanner.file_index import INDEXED_HIDDEN_DIRECTORIES, ProjectFileIndex
+from ...analysis.project_scanner.fingerprint import ProjectFingerprint, changed_paths, fingerprint_index
+from ...analysis.project_scanner.ignore_rules import DEFAULT_IGNORE_PATTERNS, IgnoreMatcher
+from ...analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+from .pattern_analyzer import PatternAnalyzer
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = ".uai/daemon.sock"
+DAEMON_QUERIES = ("status", "analysis", "patterns", "changes", "refresh")
+CHANGE_HISTORY = 64  # Updates whose changed paths are kept for "changes" queries
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert analysis values (enums, enum-keyed dicts, datetimes, paths) to JSON types."""
+    if isinstance(value, dict):
+        return {
+            (key.value if isinstance(key, Enum) else str(key)): _jsonable(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple, set)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+class AnalysisDaemon:
+    """
+    Keeps the analyses of one project current and serves them over a Unix socket.
+    
+    Updates run in a worker thread with its own event loop, so queries are answered
+    while a project is being re-analyzed (from the previous results, with "updating"
+    set in the status). Bursts of file events are coalesced into one update.
+    
+    Example:
+        daemon = AnalysisDaemon("/src/app")
+        await daemon.serve()  # Until cancelled
+        
+        # Elsewhere
+        frameworks = await query_daemon("/src/app/.uai/daemon.sock", "analysis",
+                                        field="technology_stack.frameworks")
+    """
+    
+    def __init__(self, project_path: str, config: Optional[Dict[str, Any]] = None,
+                 socket_path: Optional[str] = None, depth: str = "standard",
+                 debounce: float = 0.2, poll_interval: float = 1.0, use_polling: bool = False):
+        """
+        Args:
+            project_path: Project directory to watch
+            config: Overrides applied to both analyzers' default configuration
+            socket_path: Unix socket to serve on (default: <project>/.uai/daemon.sock)
+            depth: Analysis depth passed on to analyze_project
+            debounce: Seconds to wait for further events before updating
+            poll_interval: Seconds between fingerprint polls when not using inotify
+            use_polling: Poll even when watchdog is installed
+        """
+        self.project_path = Path(project_path).resolve()
+        if not self.project_path.is_dir():
+            raise ValueError(f"Project path does not exist: {self.project_path}")
+        self.socket_path = Path(socket_path) if socket_path else self.project_path / DEFAULT_SOCKET
+        self.depth = depth
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_polling = use_polling or not WATCHDOG_AVAILABLE
+        
+        self.project_analyzer = UniversalProjectAnalyzer()
+        self.project_analyzer.config.update(config or {})
+        self.pattern_analyzer = PatternAnalyzer()
+        self.pattern_analyzer.config.update(config or {})
+        self._ignore = IgnoreMatcher(self.project_analyzer.config.get("ignore_patterns", DEFAULT_IGNORE_PATTERNS))
+        
+        self.version = 0
+        self.updated_at: Optional[str] = None
+        self.updating = False
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._fingerprint: Optional[ProjectFingerprint] = None
+        self._changes: Deque[Tuple[int, List[str]]] = deque(maxlen=CHANGE_HISTORY)
+        # name -> (document, its serialized form)
+        self._documents: Dict[str, Tuple[Any, bytes]] = {}
+        
+        self.started = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._update_lock = asyncio.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+    
+    @property
+    def watcher(self) -> str:
+        return "polling" if self.use_polling else "inotify"
+    
+    async def serve(self):
+        """Analyze the project, then keep it current and answer queries until cancelled."""
+        self._loop = asyncio.get_running_loop()
+        server = await self._start_server()
+        observer = None if self.use_polling else self._start_observer()
+        updater = asyncio.ensure_future(self._update_loop())
+        logger.info(f"Watching {self.project_path} ({self.watcher}), serving on {self.socket_path}")
+        self.started.set()
+        try:
+            await server.serve_forever()
+        finally:
+            server.close()
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            # Let a running update finish; its thread cannot be interrupted
+            self._stopping = True
+            self._wake.set()
+            await updater
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+    
+    async def _start_server(self) -> asyncio.AbstractServer:
+        if self.socket_path.exists():
+            try:
+                _, writer = await asyncio.open_unix_connection(str(self.socket_path))
+            except OSError:
+                self.socket_path.unlink()  # Left behind by a daemon that did not shut down
+            else:
+                writer.close()
+                raise RuntimeError(f"A daemon is already serving on {self.socket_path}")
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        return await asyncio.start_unix_server(self._handle_client, path=str(self.socket_path))
+    
+    def _start_observer(self):
+        """Recursive inotify watch whose relevant events wake the update loop."""
+        daemon = self
+        
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                paths = [event.src_path, getattr(event, "dest_path", "")]
+                if any(path and daemon._is_relevant(os.fsdecode(path)) for path in paths):
+                    daemon._loop.call_soon_threadsafe(daemon._wake.set)
+        
+        observer = Observer()
+        observer.schedule(_Handler(), str(self.project_path), recursive=True)
+        observer.daemon = True
+        observer.start()
+        return observer
+    
+    def _is_relevant(self, path: str) -> bool:
+        """
+        Whether an event path can change the index.
+        
+        Events below hidden or ignored directories (.git, .uai, node_modules) are
+        dropped, so the daemon's own cache writes do not trigger updates.
+        """
+        try:
+            parts = Path(path).relative_to(self.project_path).parts
+        except ValueError:
+            return False
+        for depth, name in enumerate(parts[:-1]):
+            if name.startswith(".") and name not in INDEXED_HIDDEN_DIRECTORIES:
+                return False
+            if self._ignore.is_ignored("/".join(parts[:depth + 1]), is_dir=True):
+                return False
+        return True
+    
+    async def _update_loop(self):
+        self._wake.set()  # Initial analysis
+        while not self._stopping:
+            if self.use_polling:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await self._wake.wait()
+                await asyncio.sleep(self.debounce)  # Coalesce a burst of events
+            self._wake.clear()
+            if self._stopping:
+                break
+            try:
+                await self.update()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Updating the analysis of {self.project_path} failed: {e}")
+    
+    async def update(self) -> Optional[List[str]]:
+        """
+        Re-analyze the project if its fingerprint changed.
+        
+        Returns:
+            Paths changed since the previous update (None for the first analysis), or
+            an empty list when nothing changed and the analyses were kept
+        """
+        async with self._update_lock:
+            started = time.perf_counter()
+            fingerprint = await asyncio.to_thread(self._fingerprint_tree)
+            if self._fingerprint is None:
+                changes = None
+            else:
+                changes = changed_paths(self._fingerprint, fingerprint)
+                if not changes:
+                    return changes
+            
+            self.updating = True
+            try:
+                analysis, patterns = await asyncio.to_thread(asyncio.run, self._analyze())
+            finally:
+                self.updating = False
+            
+            # Serialize once here, so queries only write out bytes
+            analysis_document = _jsonable(self.project_analyzer.to_dict(analysis))
+            pattern_document = _jsonable(asdict(patterns))
+            self._documents = {
+                "analysis": (analysis_document, _encode(analysis_document)),
+                "patterns": (pattern_document, _encode(pattern_document)),
+            }
+            self._fingerprint = fingerprint
+            self.version += 1
+            self._changes.append((self.version, changes or []))
+            self.updated_at = datetime.now().isoformat()
+            self.last_duration = time.perf_counter() - started
+            self.last_error = None
+            logger.info(f"Analysis of {self.project_path.name} updated to version {self.version} "
+                        f"({len(changes) if changes is not None else 'all'} files changed, "
+                        f"{self.last_duration:.2f}s)")
+            return changes
+    
+    def _fingerprint_tree(self) -> ProjectFingerprint:
+        index = ProjectFileIndex.build(self.project_path, self._ignore)
+        return fingerprint_index(index, self._fingerprint)
+    
+    async def _analyze(self):
+        """Both analyses, run on the worker thread's own event loop."""
+        analysis = await self.project_analyzer.analyze_project(str(self.project_path), depth=self.depth)
+        patterns = await self.pattern_analyzer.analyze_patterns(str(self.project_path))
+        # Only the current result is of use here; do not grow with every update
+        del self.pattern_analyzer.learning_database.patterns_db[:-1]
+        return analysis, patterns
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(await self._respond(line))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # Client went away, or the daemon is shutting down
+        finally:
+            writer.close()
+    
+    async def _respond(self, line: bytes) -> bytes:
+        try:
+            request = json.loads(line)
+            query = request.get("query") if isinstance(request, dict) else None
+            if query not in DAEMON_QUERIES:
+                raise ValueError(f"Unknown query: {query!r} (expected one of {', '.join(DAEMON_QUERIES)})")
+            
+            if query in ("analysis", "patterns"):
+                if query not in self._documents:
+                    raise ValueError("The project has not been analyzed yet")
+                document, encoded = self._documents[query]
+                if request.get("field"):
+                    encoded = _encode(self._resolve_field(document, request["field"]))
+            elif query == "changes":
+                encoded = _encode(self._changes_since(request.get("since", self.version - 1)))
+            else:
+                if query == "refresh":
+                    await self.update()
+                encoded = _encode(self.status())
+        except Exception as e:
+            return _encode({"ok": False, "version": self.version, "error": str(e)}) + b"\n"
+        return b'{"ok":true,"version":%d,"result":%s}\n' % (self.version, encoded)
+    
+    @staticmethod
+    def _resolve_field(document: Any, field: str) -> Any:
+        """Value at a dotted path ("health_assessment.overall_score", "patterns_detected.0")."""
+        value = document
+        for name in field.split("."):
+            try:
+                value = value[int(name)] if isinstance(value, list) else value[name]
+            except (KeyError, IndexError, ValueError, TypeError):
+                raise ValueError(f"Unknown field: {field}") from None
+        return value
+    
+    def _changes_since(self, since: int) -> Dict[str, Any]:
+        """Paths changed by the updates after version `since`."""
+        paths = set()
+        for version, changes in self._changes:
+            if version > since:
+                paths.update(changes)
+        # Older updates are no longer known, and the first analysis covered everything
+        complete = since >= 1 and (not self._changes or self._changes[0][0] <= since + 1)
+        return {"since": since, "paths": sorted(paths), "complete": complete}
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "project_path": str(self.project_path),
+            "watcher": self.watcher,
+            "version": self.version,
+            "updated_at": self.updated_at,
+            "updating": self.updating,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            "fingerprint": self._fingerprint.digest if self._fingerprint else None,
+        }
+
+
+async def query_daemon(socket_path: str, query: str, **params: Any) -> Dict[str, Any]:
+    """
+    Send one query to a running daemon.
+    
+    Args:
+        socket_path: Socket the daemon serves on
+        query: One of DAEMON_QUERIES
+        params: Query parameters ("field", "since")
+    
+    Returns:
+        The response: "ok", "version" and "result" or "error"
+    """
+    reader, writer = await asyncio.open_unix_connection(str(socket_path))
+    try:
+        writer.write(_encode({"query": query, **params}) + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
@@ -6,18 +6,43 @@ intelligent recommendations and learn from successful project implementations.
 """
 
 import asyncio
+import io
+import itertools
 import logging
 import json
+import mmap
+import os
 import re
-from dataclasses import dataclass, asdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any
-from collections import defaultdict, Counter
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple, Any
+from collections import defaultdict, deque, Counter
 from enum import Enum
 
+from ...analysis.project_scanner.content_dedup import cluster_representatives, find_duplicate_clusters
+from ...analysis.project_scanner.content_matcher import (
+    BINARY_SNIFF_BYTES, BufferLines, LineTable, MultiPatternMatcher, looks_binary
+)
+from ...analysis.project_scanner.file_index import ProjectFileIndex
+from ...analysis.project_scanner.ignore_rules import DEFAULT_IGNORE_PATTERNS, IgnoreMatcher
+from ...analysis.project_scanner.result_store import (
+    DEFAULT_RESULT_STORE, open_result_store, options_signature
+)
+from ...analysis.project_scanner.scan_cache import ScanCache, open_scan_cache
+from ...analysis.project_scanner.stage_profiler import AnalysisProfiler, active_profiler, profile_stage, record_read
+from ...analysis.project_scanner.suffix_census import files_with_suffixes, suffix_table
+
 logger = logging.getLogger(__name__)
 
+# Bump when detection logic changes without a change to the pattern definitions
+PATTERN_ANALYZER_VERSION = "1.1.0"
+
+# Scan result of a binary file: cached so the file is not sniffed again, never analyzed
+BINARY_SCAN = {"binary": True}
+
 
 class PatternType(Enum):
     """Types of patterns that can be detected."""
@@ -87,6 +112,7 @@ class PatternAnalysisResult:
     recommendations: List[str]
     anti_patterns: List[DetectedPattern]
     learning_insights: List[str]
+    analysis_metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 class PatternAnalyzer:
@@ -99,6 +125,8 @@ class PatternAnalyzer:
         self.config = config or self._default_config()
         self.pattern_definitions = self._load_pattern_definitions()
         self.anti_pattern_definitions = self._load_anti_pattern_definitions()
+        self.content_matcher = MultiPatternMatcher(self._all_content_patterns())
+        self.read_limits = self._read_limits()
         self.learning_database = PatternLearningDatabase()
         
     def _default_config(self) -> Dict:
@@ -126,9 +154,27 @@ class PatternAnalyzer:
                 ".yaml": 0.6,
                 ".json": 0.6,
                 ".md": 0.3
-            }
+            },
+            "ignore_patterns": list(DEFAULT_IGNORE_PATTERNS),  # Applied below .gitignore/.uaiignore
+            "max_workers": None,  # None: one scanning process per CPU
+            "parallel_min_files": 256,
+            "mmap_threshold": 1024 * 1024,  # Larger files are matched on a memory map
+            "max_file_size": 32 * 1024 * 1024,  # Only this many leading bytes are scanned
+            "deduplicate_content": True,  # Scan one copy of byte-identical files
+            "cache_enabled": True,
+            "cache_dir": ".uai/cache",
+            "result_store": DEFAULT_RESULT_STORE,  # Whole results by tree fingerprint; relative: in cache_dir, None: off
+            "result_store_max_bytes": 256 * 1024 * 1024,
+            "profile": False,  # Per-stage timings in analysis_metadata["profile"]
+            "profile_memory": False  # Also trace allocation peaks (slows the analysis down)
         }
     
+    def _read_limits(self) -> Tuple[int, int]:
+        """(mmap_threshold, max_file_size) for content scanning."""
+        max_file_size = self.config.get("max_file_size", 32 * 1024 * 1024)
+        mmap_threshold = min(self.config.get("mmap_threshold", 1024 * 1024), max_file_size)
+        return mmap_threshold, max_file_size
+    
     def _load_pattern_definitions(self) -> Dict[str, Dict]:
         """Load pattern detection definitions."""
         return {
@@ -480,12 +526,15 @@ class PatternAnalyzer:
             }
         }
     
-    async def analyze_patterns(self, project_path: str) -> PatternAnalysisResult:
+    async def analyze_patterns(self, project_path: str,
+                               since: Optional[str] = None) -> PatternAnalysisResult:
         """
         Perform comprehensive pattern analysis of a project.
         
         Args:
             project_path: Path to the project directory
+            since: Git ref of a previous run whose cached per-file results are reused
+                for files unchanged since that ref; only changed files are re-read
             
         Returns:
             Complete pattern analysis results
@@ -496,54 +545,95 @@ class PatternAnalyzer:
         if not project_path.exists():
             raise ValueError(f"Project path does not exist: {project_path}")
         
+        # Profiled when configured or when the caller activated a profiler
+        profiler = active_profiler()
+        if profiler is None and not self.config.get("profile", False):
+            return await self._analyze_patterns(project_path, since)
+        
+        profiler = profiler or AnalysisProfiler(trace_memory=self.config.get("profile_memory", False))
+        with profiler.activate():
+            result = await self._analyze_patterns(project_path, since)
+        result.analysis_metadata["profile"] = profiler.to_dict()
+        return result
+    
+    async def _analyze_patterns(self, project_path: Path, since: Optional[str]) -> PatternAnalysisResult:
+        """Index, look up and analyze a project's patterns (see analyze_patterns)."""
         try:
+            with profile_stage("patterns.index"):
+                index = ProjectFileIndex.build(
+                    project_path, IgnoreMatcher(self.config.get("ignore_patterns", DEFAULT_IGNORE_PATTERNS))
+                )
+            
+            # Unchanged trees are answered from the result store shared with other analyzers
+            store = open_result_store(self.config, project_path)
+            if store is not None:
+                with profile_stage("patterns.result_store") as profile:
+                    store_key = ("patterns", str(project_path.resolve()), options_signature(
+                        self.config, patterns=self.pattern_definitions, anti_patterns=self.anti_pattern_definitions
+                    ))
+                    fingerprint = index.fingerprint()
+                    stored = store.get(store_key, fingerprint, PATTERN_ANALYZER_VERSION)
+                    if profile is not None:
+                        profile.cached = stored is not None
+                if stored is not None:
+                    logger.info(f"Pattern analysis of {project_path} reused from the result store")
+                    await self.learning_database.store_patterns(stored)
+                    return stored
+            
             # Collect project files for analysis
-            project_files = await self._collect_project_files(project_path)
+            cache = open_scan_cache(project_path, self.config, since=since)
+            try:
+                with profile_stage("patterns.collect_files"):
+                    project_files = await self._collect_project_files(project_path, cache, index)
+            finally:
+                if cache is not None:
+                    cache.close()
             
             # Parallel pattern detection
             tasks = [
-                self._detect_architectural_patterns(project_files),
-                self._detect_design_patterns(project_files),
-                self._detect_api_patterns(project_files),
-                self._detect_security_patterns(project_files),
-                self._detect_performance_patterns(project_files),
-                self._detect_anti_patterns(project_files)
+                _profiled("patterns.architectural", self._detect_architectural_patterns(project_files)),
+                _profiled("patterns.design", self._detect_design_patterns(project_files)),
+                _profiled("patterns.api", self._detect_api_patterns(project_files)),
+                _profiled("patterns.security", self._detect_security_patterns(project_files)),
+                _profiled("patterns.performance", self._detect_performance_patterns(project_files)),
+                _profiled("patterns.anti_patterns", self._detect_anti_patterns(project_files))
             ]
             
             results = await asyncio.gather(*tasks)
             
-            detected_patterns = []
-            anti_patterns = []
-            
-            # Combine results
-            for result_set in results[:-1]:  # All except anti-patterns
-                detected_patterns.extend(result_set)
-            
-            anti_patterns = results[-1]  # Last result is anti-patterns
-            
-            # Filter patterns by confidence threshold
-            filtered_patterns = [
-                pattern for pattern in detected_patterns
-                if pattern.confidence >= self.config["confidence_threshold"]
-            ]
-            
-            # Generate pattern summary
-            pattern_summary = self._generate_pattern_summary(filtered_patterns)
-            
-            # Calculate overall pattern score
-            overall_score = self._calculate_overall_pattern_score(
-                filtered_patterns, anti_patterns
-            )
-            
-            # Generate recommendations
-            recommendations = await self._generate_pattern_recommendations(
-                filtered_patterns, anti_patterns
-            )
-            
-            # Extract learning insights
-            learning_insights = await self._extract_learning_insights(
-                filtered_patterns, project_path
-            )
+            with profile_stage("patterns.summarize"):
+                detected_patterns = []
+                anti_patterns = []
+                
+                # Combine results
+                for result_set in results[:-1]:  # All except anti-patterns
+                    detected_patterns.extend(result_set)
+                
+                anti_patterns = results[-1]  # Last result is anti-patterns
+                
+                # Filter patterns by confidence threshold
+                filtered_patterns = [
+                    pattern for pattern in detected_patterns
+                    if pattern.confidence >= self.config["confidence_threshold"]
+                ]
+                
+                # Generate pattern summary
+                pattern_summary = self._generate_pattern_summary(filtered_patterns)
+                
+                # Calculate overall pattern score
+                overall_score = self._calculate_overall_pattern_score(
+                    filtered_patterns, anti_patterns
+                )
+                
+                # Generate recommendations
+                recommendations = await self._generate_pattern_recommendations(
+                    filtered_patterns, anti_patterns
+                )
+                
+                # Extract learning insights
+                learning_insights = await self._extract_learning_insights(
+                    filtered_patterns, project_path
+                )
             
             result = PatternAnalysisResult(
                 project_path=str(project_path),
@@ -556,6 +646,9 @@ class PatternAnalyzer:
                 learning_insights=learning_insights
             )
             
+            if store is not None:
+                store.put(store_key, fingerprint, PATTERN_ANALYZER_VERSION, result)
+            
             # Store patterns in learning database
             await self.learning_database.store_patterns(result)
             
@@ -566,33 +659,45 @@ class PatternAnalyzer:
             logger.error(f"Error in pattern analysis: {e}")
             raise
     
-    async def _collect_project_files(self, project_path: Path) -> List[Dict[str, Any]]:
-        """Collect project files for analysis."""
+    async def _collect_project_files(self, project_path: Path,
+                                     cache: Optional[ScanCache] = None,
+                                     index: Optional[ProjectFileIndex] = None) -> List[Dict[str, Any]]:
+        """
+        Collect project files for analysis.
+        
+        Files stream through the scanner one at a time: each is read once, evaluated
+        against every content pattern and released, and only its hit table and line
+        count are kept. Files above mmap_threshold are matched on a memory map instead of
+        being decoded, so peak memory is bounded by that threshold plus the hit tables.
+        Results are cached by (mtime_ns, size, inode), so unchanged files are not read
+        again.
+        """
         files = []
+        weights = self.config["file_type_weights"]
+        
+        if cache is not None:
+            cache.bind("patterns", ScanCache.signature_of(
+                [self.content_matcher.patterns, list(self.read_limits)]
+            ))
         
         try:
-            for file_path in project_path.rglob("*"):
-                if (file_path.is_file() and 
-                    not self._should_ignore_file(file_path) and
-                    file_path.suffix in self.config["file_type_weights"]):
-                    
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                        
-                        files.append({
-                            "path": str(file_path),
-                            "relative_path": str(file_path.relative_to(project_path)),
-                            "content": content,
-                            "size": len(content),
-                            "lines": content.count('\n') + 1,
-                            "extension": file_path.suffix,
-                            "weight": self.config["file_type_weights"].get(file_path.suffix, 0.5)
-                        })
-                        
-                    except Exception as e:
-                        logger.debug(f"Could not read file {file_path}: {e}")
-                        continue
+            if index is None:
+                index = ProjectFileIndex.build(
+                    project_path, IgnoreMatcher(self.config.get("ignore_patterns", DEFAULT_IGNORE_PATTERNS))
+                )
+            
+            suffix_weights = suffix_table(index, weights, 0.5)
+            async for file_id, scan in self._stream_file_scans(index, cache):
+                file_path = index.abs_path(file_id)
+                files.append({
+                    "path": str(file_path),
+                    "relative_path": str(Path(index.paths[file_id])),
+                    "content_hits": scan["content_hits"],
+                    "size": scan["size"],
+                    "lines": scan["lines"],
+                    "extension": file_path.suffix,
+                    "weight": suffix_weights[index.suffix_ids[file_id]]
+                })
             
             logger.info(f"Collected {len(files)} files for analysis")
             return files
@@ -601,16 +706,144 @@ class PatternAnalyzer:
             logger.error(f"Error collecting project files: {e}")
             return []
     
-    def _should_ignore_file(self, file_path: Path) -> bool:
-        """Check if file should be ignored during analysis."""
-        ignore_patterns = [
-            "node_modules", "__pycache__", ".git", ".venv", "venv",
-            "target", "build", "dist", ".pytest_cache", ".coverage",
-            "*.pyc", "*.pyo", "*.log", "*.tmp"
-        ]
+    def _select_analysis_files(self, index: ProjectFileIndex) -> Iterator[int]:
+        """Ids of the indexed files that take part in pattern analysis."""
+        # Selected through the index's suffix table: one lookup per distinct suffix
+        return iter(files_with_suffixes(index, self.config["file_type_weights"]))
+    
+    async def _stream_file_scans(self, index: ProjectFileIndex,
+                                 cache: Optional[ScanCache] = None
+                                 ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield (file_id, scan result) in index order, reading only cache misses.
+        
+        Cache hits are resolved up front without touching file contents. Misses are
+        scanned in-process one file at a time, or, when there are at least
+        parallel_min_files of them, in contiguous size-balanced shards across a process
+        pool with a bounded number of shards in flight. Results are consumed in input
+        order, so the merge is deterministic. Unreadable files are skipped; binary files
+        are skipped too, and cached as such so that later runs do not reopen them.
+        
+        Misses with byte-identical content (see content_dedup) are scanned once: the
+        first copy in index order is scanned and its result is reused for the others.
+        """
+        selected = list(self._select_analysis_files(index))
+        cached = {}
+        misses = []
+        for file_id in selected:
+            scan = None
+            if cache is not None:
+                scan = cache.get("patterns", index.paths[file_id], index.stat_key(file_id))
+            if scan is None:
+                misses.append(file_id)
+            else:
+                cached[file_id] = scan
+        
+        copies = {}  # Copy -> first file with the same content
+        if self.config.get("deduplicate_content", True) and len(misses) > 1:
+            # Digests of misses only: kept apart from the project-wide "content" digests
+            copies = cluster_representatives(find_duplicate_clusters(index, misses, cache, kind="pattern_content"))
+            misses = [file_id for file_id in misses if file_id not in copies]
+        pending_copies = Counter(copies.values())  # Representative -> copies not yet yielded
+        shared = {}  # Representative -> scan, until its last copy is yielded
+        
+        max_workers = self.config.get("max_workers") or os.cpu_count() or 1
+        if max_workers > 1 and len(misses) >= self.config.get("parallel_min_files", 256):
+            fresh_scans = self._scan_in_pool(index, misses, max_workers)
+        else:
+            fresh_scans = self._scan_in_process(index, misses)
+        
+        for file_id in selected:
+            if file_id in cached:
+                scan = cached.pop(file_id)
+                if not scan.get("binary"):
+                    yield file_id, scan
+                continue
+            
+            if file_id in copies:
+                representative = copies[file_id]
+                scan = shared.get(representative)
+                pending_copies[representative] -= 1
+                if not pending_copies[representative]:
+                    shared.pop(representative, None)
+            else:
+                scan = await anext(fresh_scans)
+                if file_id in pending_copies:
+                    shared[file_id] = scan
+                if scan is not None:
+                    read = BINARY_SNIFF_BYTES if scan.get("binary") else min(scan["size"], self.read_limits[1])
+                    record_read(read)
+            if scan is None:
+                continue  # Could not be read
+            if cache is not None:
+                cache.put("patterns", index.paths[file_id], index.stat_key(file_id), scan)
+            if not scan.get("binary"):
+                yield file_id, scan
+    
+    async def _scan_in_process(self, index: ProjectFileIndex,
+                               file_ids: List[int]) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Scan files one at a time in this process."""
+        for file_id in file_ids:
+            yield _scan_path(str(index.abs_path(file_id)), self.content_matcher, self.read_limits)
+    
+    async def _scan_in_pool(self, index: ProjectFileIndex, file_ids: List[int],
+                            max_workers: int) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Scan files in worker processes, yielding results in input order.
+        
+        At most two shards per worker are in flight, so finished results never pile up
+        beyond that window. Falls back to in-process scanning when no pool can be started.
+        """
+        paths = [str(index.abs_path(file_id)) for file_id in file_ids]
+        chunks = _shard_by_size(paths, [index.sizes[file_id] for file_id in file_ids],
+                                max_workers * 4)
+        loop = asyncio.get_running_loop()
+        window = max_workers * 2
+        try:
+            executor = ProcessPoolExecutor(max_workers=min(max_workers, len(chunks)),
+                                           initializer=_init_scan_worker,
+                                           initargs=(self.content_matcher.patterns, self.read_limits))
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"Parallel scanning unavailable ({e}); scanning in-process")
+            async for scan in self._scan_in_process(index, file_ids):
+                yield scan
+            return
+        
+        with executor:
+            in_flight = deque()
+            chunk_iter = iter(chunks)
+            for chunk in itertools.islice(chunk_iter, window):
+                in_flight.append((chunk, loop.run_in_executor(executor, _scan_shard, chunk)))
+            
+            while in_flight:
+                chunk, future = in_flight.popleft()
+                try:
+                    shard = await future
+                except BrokenProcessPool as e:
+                    logger.warning(f"Scanning worker pool failed ({e}); finishing in-process")
+                    remaining = [chunk] + [queued for queued, _ in in_flight] + list(chunk_iter)
+                    for path in itertools.chain.from_iterable(remaining):
+                        yield _scan_path(path, self.content_matcher, self.read_limits)
+                    return
+                
+                next_chunk = next(chunk_iter, None)
+                if next_chunk is not None:
+                    in_flight.append(
+                        (next_chunk, loop.run_in_executor(executor, _scan_shard, next_chunk))
+                    )
+                
+                for scan in shard:
+                    yield scan
         
-        path_str = str(file_path).lower()
-        return any(pattern in path_str for pattern in ignore_patterns)
+        logger.debug(f"Scanned {len(paths)} files in {len(chunks)} shards")
+    
+    def _all_content_patterns(self) -> List[str]:
+        """Every content pattern used by the pattern and anti-pattern definitions."""
+        patterns = set()
+        for definitions in (self.pattern_definitions, self.anti_pattern_definitions):
+            for pattern_def in definitions.values():
+                patterns.update(pattern_def.get("indicators", {}).get("content_patterns", []))
+        return sorted(patterns)
     
     async def _detect_architectural_patterns(self, files: List[Dict]) -> List[DetectedPattern]:
         """Detect architectural patterns in the project."""
@@ -818,22 +1051,15 @@ class PatternAnalyzer:
         for pattern in content_patterns:
             pattern_matches = 0
             for file_info in files:
-                matches = re.findall(pattern, file_info["content"], re.IGNORECASE | re.MULTILINE)
-                if matches:
-                    pattern_matches += len(matches)
+                hit = file_info["content_hits"].get(pattern)
+                if hit:
+                    count, example = hit
+                    pattern_matches += count
                     evidence_files.append(file_info["relative_path"])
                     
                     # Extract code examples
-                    for match in matches[:2]:  # Limit to 2 examples per file
-                        lines = file_info["content"].split('\n')
-                        for i, line in enumerate(lines):
-                            if re.search(pattern, line, re.IGNORECASE):
-                                # Get context around the match
-                                start = max(0, i - 2)
-                                end = min(len(lines), i + 3)
-                                context = '\n'.join(lines[start:end])
-                                code_examples.append(context)
-                                break
+                    if example is not None:
+                        code_examples.extend([example] * min(count, 2))  # Limit to 2 examples per file
             
             total_matches += pattern_matches
         
@@ -944,6 +1170,145 @@ class PatternAnalyzer:
         return insights
 
 
+def _scan_file_content(file_path: str, matcher: MultiPatternMatcher,
+                       read_limits: Tuple[int, int]) -> Dict[str, Any]:
+    """
+    Read a file once and record, per content pattern, its match count and first example.
+    
+    The example is the code around the first line matching the pattern, as used in
+    pattern evidence. Files from mmap_threshold bytes up are matched on a memory map
+    and only their first max_file_size bytes are scanned.
+    
+    Args:
+        file_path: File to scan
+        matcher: Content pattern matcher
+        read_limits: (mmap_threshold, max_file_size) in bytes
+    
+    Returns:
+        Scan result, or BINARY_SCAN for binary files
+    """
+    mmap_threshold, max_file_size = read_limits
+    with open(file_path, 'rb') as f:
+        if looks_binary(f.read(BINARY_SNIFF_BYTES)):
+            logger.debug(f"Skipping binary file {file_path}")
+            return BINARY_SCAN
+        
+        size = os.fstat(f.fileno()).st_size
+        if size and size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return _scan_buffer_content(buffer, min(size, max_file_size), matcher)
+        
+        f.seek(0)
+        content = io.TextIOWrapper(f, encoding='utf-8', errors='ignore').read()
+    
+    counts = defaultdict(int)
+    first_offsets = {}
+    for pattern_id, offset in matcher.scan(content):
+        counts[pattern_id] += 1
+        first_offsets.setdefault(pattern_id, offset)
+    
+    content_hits = {}
+    lines = LineTable(content) if counts else None
+    for pattern_id, count in counts.items():
+        pattern = matcher.compiled[pattern_id]
+        example = None
+        # No earlier line can contain a match, so start at the first match's line
+        for i in range(lines.line_of(first_offsets[pattern_id]), len(lines)):
+            if pattern.search(lines.line(i)):
+                # Get context around the match
+                example = lines.context(i)
+                break
+        content_hits[matcher.patterns[pattern_id]] = [count, example]
+    
+    return {
+        "content_hits": content_hits,
+        "size": len(content),
+        "lines": content.count('\n') + 1
+    }
+
+
+def _scan_buffer_content(buffer, end: int, matcher: MultiPatternMatcher) -> Dict[str, Any]:
+    """
+    Scan buffer[:end] with byte patterns, decoding only the example context windows.
+    
+    Size is reported in bytes rather than characters.
+    """
+    counts = defaultdict(int)
+    first_offsets = {}
+    for pattern_id, offset in matcher.scan_buffer(buffer, end):
+        counts[pattern_id] += 1
+        first_offsets.setdefault(pattern_id, offset)
+    
+    content_hits = {}
+    lines = BufferLines(buffer, end)
+    for pattern_id, count in counts.items():
+        pattern = matcher.compiled_bytes[pattern_id]
+        example = None
+        # Check the lines of successive matches instead of walking every line
+        for match in pattern.finditer(buffer, first_offsets[pattern_id], end):
+            line_start, line_end = lines.bounds(match.start())
+            if pattern.search(buffer, line_start, line_end):
+                example = lines.context(match.start())
+                break
+        content_hits[matcher.patterns[pattern_id]] = [count, example]
+    
+    return {
+        "content_hits": content_hits,
+        "size": end,
+        "lines": lines.count()
+    }
+
+
+# Matcher and read limits of the current scanning worker process, set by _init_scan_worker
+_worker_matcher: Optional[MultiPatternMatcher] = None
+_worker_read_limits: Optional[Tuple[int, int]] = None
+
+
+async def _profiled(name: str, coroutine):
+    """Await a coroutine as a profiled stage."""
+    with profile_stage(name):
+        return await coroutine
+
+
+def _init_scan_worker(patterns: List[str], read_limits: Tuple[int, int]):
+    """Process pool initializer: compile the content patterns once per worker."""
+    global _worker_matcher, _worker_read_limits
+    _worker_matcher = MultiPatternMatcher(patterns)
+    _worker_read_limits = read_limits
+
+
+def _scan_path(path: str, matcher: MultiPatternMatcher,
+               read_limits: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+    """Scan one file, or None when it cannot be read (BINARY_SCAN when it is binary)."""
+    try:
+        return _scan_file_content(path, matcher, read_limits)
+    except Exception as e:
+        logger.debug(f"Could not read file {path}: {e}")
+        return None
+
+
+def _scan_shard(paths: List[str], matcher: Optional[MultiPatternMatcher] = None,
+                read_limits: Optional[Tuple[int, int]] = None) -> List[Optional[Dict[str, Any]]]:
+    """Scan a shard of files; unreadable files yield None and binary ones BINARY_SCAN."""
+    matcher = matcher or _worker_matcher
+    read_limits = read_limits or _worker_read_limits
+    return [_scan_path(path, matcher, read_limits) for path in paths]
+
+
+def _shard_by_size(paths: List[str], sizes: List[int], shard_count: int) -> List[List[str]]:
+    """Split paths into contiguous shards of roughly equal total size."""
+    budget = max(sum(sizes) // max(shard_count, 1), 1)
+    shards = [[]]
+    shard_size = 0
+    for path, size in zip(paths, sizes, strict=True):
+        if shard_size >= budget:
+            shards.append([])
+            shard_size = 0
+        shards[-1].append(path)
+        shard_size += size
+    return shards
+
+
 class PatternLearningDatabase:
     """Database for storing and learning from detected patterns."""
     
@@ -385,7 +385,7 @@ class IssuePredictor:
                 factors.append(f"Below recommended test coverage ({test_coverage:.1%})")
             
             # Integration test indicators
-            if test_coverage > 0.7 but code_quality < 0.7:
+            if test_coverage > 0.7 and code_quality < 0.7:
                 # High coverage but low quality suggests unit-test-only approach
                 score += 0.3
                 factors.append("Potential integration testing gaps")
@@ -453,9 +453,21 @@ class RiskAnalyzer:
                 risk_score += maint_risk
                 factors.append("High maintenance burden from dependency updates")
             
-            # Simulate outdated dependency risk based on project characteristics
-            # (In real implementation, this would analyze actual dependency ages)
-            if loc > 30000 or dependency_count > 50:
+            # Known vulnerabilities from the offline vulnerability index, when the project
+            # analysis provides them; otherwise estimate from project characteristics
+            vulnerabilities = project_context.get("vulnerabilities")
+            if vulnerabilities is not None:
+                severity_weights = {"CRITICAL": 0.3, "HIGH": 0.2, "MEDIUM": 0.1, "LOW": 0.05}
+                vulnerability_risk = min(0.6, sum(
+                    severity_weights.get(v.get("severity"), 0.1) for v in vulnerabilities
+                ))
+                if vulnerability_risk:
+                    risk_score += vulnerability_risk
+                    vulnerable_packages = {(v.get("package"), v.get("version")) for v in vulnerabilities}
+                    critical = sum(1 for v in vulnerabilities if v.get("severity") in ("CRITICAL", "HIGH"))
+                    factors.append(f"{len(vulnerabilities)} known vulnerabilities in "
+                                   f"{len(vulnerable_packages)} dependencies ({critical} high or critical)")
+            elif loc > 30000 or dependency_count > 50:
                 risk_score += 0.25
                 factors.append("Likely outdated dependencies requiring security updates")
             
@@ -502,7 +514,8 @@ class RiskAnalyzer:
                     "dependency_count": dependency_count,
                     "lines_of_code": loc,
                     "risk_score": risk_score,
-                    "security_surface_area": dependency_count
+                    "security_surface_area": dependency_count,
+                    "known_vulnerabilities": len(vulnerabilities) if vulnerabilities is not None else None
                 }
             )
             
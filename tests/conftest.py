@@ -3,6 +3,7 @@ Pytest configuration and fixtures for Universal AI Development Platform tests.
 """
 
 import asyncio
+import sys
 import pytest
 import tempfile
 import shutil
@@ -13,6 +14,23 @@ from unittest.mock import Mock, AsyncMock
 # Test fixtures for the Universal AI Development Platform
 
 
+# Modules reading the default location of the analysis result store
+RESULT_STORE_MODULES = (
+    "universal_ai_dev_platform.analysis.project_scanner.result_store",
+    "universal_ai_dev_platform.analysis.project_scanner.universal_analyzer",
+    "universal_ai_dev_platform.core.intelligence.pattern_analyzer",
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_result_store(tmp_path, monkeypatch):
+    """Keep the stored analysis results of every test in its own temporary directory."""
+    for name in RESULT_STORE_MODULES:
+        module = sys.modules.get(name)  # Imported by the test modules using it
+        if module is not None:
+            monkeypatch.setattr(module, "DEFAULT_RESULT_STORE", str(tmp_path / "results.sqlite"))
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
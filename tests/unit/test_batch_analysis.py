@@ -0,0 +1,117 @@
+"""
+Unit tests for batch analysis of many projects.
+"""
+
+import os
+import time
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import (
+    BatchAnalysisResult, UniversalProjectAnalyzer
+)
+
+
+class CrashingAnalyzer(UniversalProjectAnalyzer):
+    """Analyzer that kills its worker process on projects named "crash"."""
+    
+    async def analyze_project(self, project_path, **options):
+        if project_path.endswith("crash"):
+            os._exit(1)
+        return await super().analyze_project(project_path, **options)
+
+
+class SlowAnalyzer(UniversalProjectAnalyzer):
+    """Analyzer that blocks without yielding on projects named "slow"."""
+    
+    async def analyze_project(self, project_path, **options):
+        if project_path.endswith("slow"):
+            time.sleep(30)
+        return await super().analyze_project(project_path, **options)
+
+
+def _config(**overrides):
+    config = UniversalProjectAnalyzer()._default_config()
+    config.update(cache_enabled=False, vulnerability_db=None, **overrides)
+    return config
+
+
+def _projects(root, names):
+    paths = []
+    for name in names:
+        project = root / name
+        project.mkdir()
+        (project / "main.py").write_text(f"def {name}(value):\n    return value\n")
+        (project / "requirements.txt").write_text("flask==3.0.0\n")
+        paths.append(str(project))
+    return paths
+
+
+async def _collect(results):
+    return {result.project_path: result async for result in results}
+
+
+class TestBatchAnalysis:
+    """Test suite for UniversalProjectAnalyzer.analyze_projects."""
+    
+    @pytest.mark.asyncio
+    async def test_in_process_batch_isolates_failures(self, tmp_path):
+        """Test sequential batches report missing projects without stopping."""
+        paths = _projects(tmp_path, ["alpha", "beta"])
+        missing = str(tmp_path / "missing")
+        analyzer = UniversalProjectAnalyzer(_config())
+        
+        results = await _collect(analyzer.analyze_projects(iter([paths[0], missing, paths[1]]), concurrency=1))
+        
+        assert set(results) == {paths[0], paths[1], missing}
+        assert all(isinstance(result, BatchAnalysisResult) for result in results.values())
+        assert results[missing].analysis is None
+        assert results[missing].error.startswith("ValueError")
+        for path in paths:
+            assert results[path].error is None
+            assert results[path].analysis.project_path == path
+            assert results[path].analysis.dependencies["production"] == ["flask"]
+    
+    @pytest.mark.asyncio
+    async def test_pool_batch_matches_single_analysis(self, tmp_path):
+        """Test that pooled analyses equal analyze_project results."""
+        paths = _projects(tmp_path, ["one", "two", "three", "four", "five"])
+        analyzer = UniversalProjectAnalyzer(_config())
+        
+        results = await _collect(analyzer.analyze_projects(paths, concurrency=2))
+        
+        assert set(results) == set(paths)
+        expected = await analyzer.analyze_project(paths[2])
+        pooled = results[paths[2]].analysis
+        assert pooled.technology_stack == expected.technology_stack
+        assert pooled.complexity_metrics == expected.complexity_metrics
+        assert pooled.dependency_graph == expected.dependency_graph
+        assert all(result.duration > 0 for result in results.values())
+    
+    @pytest.mark.asyncio
+    async def test_crashed_worker_is_isolated(self, tmp_path):
+        """Test that a project killing its worker fails alone and the batch goes on."""
+        paths = _projects(tmp_path, ["first", "crash", "second", "third"])
+        analyzer = CrashingAnalyzer(_config())
+        
+        results = await _collect(analyzer.analyze_projects(paths, concurrency=2))
+        
+        assert set(results) == set(paths)
+        assert results[paths[1]].error == "Worker process crashed"
+        assert [path for path in paths if results[path].analysis is not None] == [
+            paths[0], paths[2], paths[3]
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_project_timeout(self, tmp_path):
+        """Test that a project stuck in synchronous work is interrupted by its timeout."""
+        paths = _projects(tmp_path, ["quick", "slow"])
+        analyzer = SlowAnalyzer(_config())
+        
+        started = time.perf_counter()
+        results = await _collect(analyzer.analyze_projects(paths, concurrency=2, timeout=1.0))
+        
+        assert time.perf_counter() - started < 10
+        assert results[paths[0]].error is None
+        assert results[paths[1]].analysis is None
+        assert results[paths[1]].error == "Timed out after 1.0s"
@@ -0,0 +1,137 @@
+"""
+Unit tests for the Code Metrics engine.
+"""
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner.code_metrics import (
+    MinHashLSH, aggregate_metrics, measure_source, minhash_signature,
+    python_function_complexities, shingle_hashes, signature_similarity
+)
+from universal_ai_dev_platform.analysis.project_scanner.syntax_parser import SyntaxParser
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+
+
+PYTHON_SOURCE = b"""def outer(x):
+    if x and y or z:
+        return [i for i in x if i]
+    def inner():
+        while True:
+            pass
+    return inner
+
+class Handler:
+    def handle(self, event):
+        try:
+            return event.run()
+        except ValueError:
+            return None
+"""
+
+
+def _module(seed: int, functions: int = 30) -> bytes:
+    """Distinct but realistic Python source."""
+    return "\n".join(
+        f"def handler_{seed}_{i}(value_{i}):\n    return value_{i} * {seed + i} + compute_{seed}({i})\n"
+        for i in range(functions)
+    ).encode()
+
+
+class TestCodeMetrics:
+    """Test suite for complexity and duplication metrics."""
+    
+    def test_python_function_complexities(self):
+        """Test McCabe complexity per Python function, nested functions measured separately."""
+        assert python_function_complexities(PYTHON_SOURCE) == [
+            ["outer", 6, 1], ["inner", 2, 4], ["handle", 2, 10]
+        ]
+        assert python_function_complexities(b"def broken(:\n") == []
+    
+    def test_tree_sitter_function_complexities(self):
+        """Test complexity of JavaScript functions from the tree-sitter tree."""
+        pytest.importorskip("tree_sitter_javascript")
+        source = b"""function f(a, b) {
+  if (a && b || a) { for (const x of a) {} }
+  const g = (y) => y ? 1 : 2;
+  switch (a) { case 1: break; case 2: break; default: }
+  try {} catch (e) {}
+}
+"""
+        metrics = measure_source("f.js", source, SyntaxParser({"javascript": [".js"]}))
+        assert metrics["functions"] == [["f", 8, 1], ["<anonymous>", 2, 3]]
+        assert metrics["loc"] == 6
+    
+    def test_signature_similarity(self):
+        """Test that copies match exactly and unrelated files do not."""
+        original = minhash_signature(shingle_hashes(_module(1)))
+        assert signature_similarity(original, minhash_signature(shingle_hashes(_module(1)))) == 1.0
+        assert signature_similarity(original, minhash_signature(shingle_hashes(_module(2)))) < 0.2
+        assert minhash_signature(shingle_hashes(b"x = 1\n")) is None
+    
+    def test_lsh_finds_near_duplicates(self):
+        """Test that a lightly edited copy is reported and an unrelated file is not."""
+        edited = _module(1).replace(b"handler_1_29", b"renamed")
+        lsh = MinHashLSH()
+        for key, source in (("a.py", _module(1)), ("b.py", edited), ("c.py", _module(3))):
+            lsh.add(key, minhash_signature(shingle_hashes(source)))
+        
+        pairs = lsh.near_duplicates(0.8)
+        assert [(a, b) for a, b, _ in pairs] == [("a.py", "b.py")]
+    
+    def test_aggregate_metrics(self):
+        """Test the complexity_metrics dict consumed by the predictors."""
+        files = {
+            "a.py": measure_source("a.py", _module(1)),
+            "b.py": measure_source("b.py", _module(1)),
+            "c.py": measure_source("c.py", PYTHON_SOURCE),
+        }
+        metrics = aggregate_metrics(files, complexity_threshold=5)
+        
+        assert metrics["function_count"] == 63
+        assert metrics["cyclomatic_complexity"] == round((60 + 6 + 2 + 2) / 63, 2)
+        assert metrics["max_cyclomatic_complexity"] == 6
+        assert metrics["complex_function_count"] == 1
+        assert metrics["most_complex_functions"][0]["function"] == "outer"
+        assert metrics["lines_of_code"] == sum(f["loc"] for f in files.values())
+        assert metrics["duplicate_files"] == [["a.py", "b.py", 1.0]]
+        assert metrics["duplication_ratio"] == round(2 * files["a.py"]["loc"] / metrics["lines_of_code"], 4)
+    
+    @pytest.mark.asyncio
+    async def test_analyzer_emits_and_caches_metrics(self, temp_dir, monkeypatch):
+        """Test that analysis reports complexity_metrics and reuses cached per-file results."""
+        (temp_dir / "app.py").write_bytes(PYTHON_SOURCE)
+        (temp_dir / "copy.py").write_bytes(PYTHON_SOURCE)
+        analyzer = UniversalProjectAnalyzer()
+        
+        first = await analyzer.analyze_project(str(temp_dir))
+        assert first.complexity_metrics["function_count"] == 6
+        assert first.complexity_metrics["dependency_count"] == 0
+        
+        monkeypatch.setattr("universal_ai_dev_platform.analysis.project_scanner.universal_analyzer.measure_source",
+                            lambda *args: pytest.fail("metrics should come from the cache"))
+        second = await analyzer.analyze_project(str(temp_dir))
+        assert second.complexity_metrics == first.complexity_metrics
+    
+    @pytest.mark.asyncio
+    async def test_warm_analysis_reads_only_changed_files(self, temp_dir, monkeypatch):
+        """Test that unchanged files are answered from the cache without being read."""
+        (temp_dir / "app.py").write_bytes(PYTHON_SOURCE)
+        (temp_dir / "models.py").write_text("class User:\n    pass\n")
+        config = UniversalProjectAnalyzer()._default_config()
+        config.update(result_store=None, vulnerability_db=None, profile=True)
+        analyzer = UniversalProjectAnalyzer(config)
+        
+        first = await analyzer.analyze_project(str(temp_dir))
+        second = await analyzer.analyze_project(str(temp_dir))
+        assert second.complexity_metrics == first.complexity_metrics
+        assert second.analysis_metadata["profile"]["bytes_read"] == 0
+        
+        # A copy is read and hashed, and reuses the result of its content
+        (temp_dir / "renamed.py").write_bytes(PYTHON_SOURCE)
+        monkeypatch.setattr("universal_ai_dev_platform.analysis.project_scanner.universal_analyzer.measure_source",
+                            lambda *args: pytest.fail("metrics should come from the cache"))
+        third = await analyzer.analyze_project(str(temp_dir))
+        stages = {stage["name"]: stage for stage in third.analysis_metadata["profile"]["stages"]}
+        assert (stages["complexity_metrics"]["files"], stages["complexity_metrics"]["bytes_read"]) \
+            == (1, len(PYTHON_SOURCE))
+        assert third.complexity_metrics["function_count"] == 2 * first.complexity_metrics["function_count"]
@@ -0,0 +1,109 @@
+"""
+Unit tests for the columnar export of project analyses.
+"""
+
+import json
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner.columnar_export import (
+    PROJECT_COLUMNS, AnalysisTableBuilder, export_schema, write_parquet
+)
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+
+
+async def _analyses(root, count):
+    config = UniversalProjectAnalyzer()._default_config()
+    config.update(cache_enabled=False, vulnerability_db=None)
+    analyzer = UniversalProjectAnalyzer(config)
+    analyses = []
+    for number in range(count):
+        project = root / f"project{number}"
+        project.mkdir()
+        (project / "app.py").write_text(
+            "def handler(value):\n    if value:\n        return 1\n    return 0\n"
+        )
+        (project / "package.json").write_text(json.dumps({
+            "dependencies": {"react": "^18.0.0"}, "devDependencies": {"jest": "^29.0.0"}
+        }))
+        analyses.append(await analyzer.analyze_project(str(project)))
+    analyses[0].vulnerabilities.append({
+        "advisory_id": "GHSA-1", "ecosystem": "npm", "package": "react", "version": "18.0.0",
+        "severity": "HIGH", "summary": "Example", "fixed_versions": ["18.0.1"], "aliases": []
+    })
+    return analyses
+
+
+class TestColumnarExport:
+    """Test suite for AnalysisTableBuilder and Parquet export."""
+    
+    @pytest.mark.asyncio
+    async def test_builder_columns_follow_schema(self, tmp_path):
+        """Test that every table gets one list per schema column with coerced values."""
+        analyses = await _analyses(tmp_path, 2)
+        builder = AnalysisTableBuilder()
+        builder.extend(analyses)
+        
+        assert len(builder) == 2
+        for table, columns in export_schema().items():
+            assert list(builder.columns[table]) == [column for column, _ in columns]
+        
+        projects = builder.columns["projects"]
+        assert projects["project_path"] == [analysis.project_path for analysis in analyses]
+        assert projects["primary_language"] == ["python", "python"]
+        assert projects["lines_of_code"] == [4, 4]
+        assert projects["max_cyclomatic_complexity"] == [2, 2]
+        assert projects["vulnerability_count"] == [1, 0]
+        assert projects["health_test_coverage"] == [None, None]
+        assert all(isinstance(value, float) for value in projects["health_overall_score"])
+        
+        dependencies = builder.columns["dependencies"]
+        assert list(zip(dependencies["scope"], dependencies["name"], strict=True)) == [
+            ("production", "react"), ("development", "jest")
+        ] * 2
+        assert builder.columns["vulnerabilities"]["fixed_versions"] == [["18.0.1"]]
+        largest = builder.columns["largest_files"]
+        assert ("source", "app.py", 64) in zip(largest["category"], largest["path"], largest["size"], strict=True)
+        
+        builder.clear()
+        assert len(builder) == 0
+        assert builder.columns["dependencies"]["name"] == []
+    
+    @pytest.mark.asyncio
+    async def test_parquet_round_trip(self, tmp_path):
+        """Test streaming row groups to Parquet and reading them back with the fixed schema."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        analyses = await _analyses(tmp_path, 3)
+        
+        files = write_parquet(analyses, tmp_path / "export", row_group_size=2)
+        
+        projects = pq.read_table(files["projects"])
+        assert projects.num_rows == 3
+        assert projects.column_names == [column for column, _, _ in PROJECT_COLUMNS]
+        assert pq.ParquetFile(files["projects"]).num_row_groups == 2
+        assert projects.schema.field("lines_of_code").type == "int64"
+        assert projects.schema.field("frameworks").type.value_type == "string"
+        assert projects.schema.metadata[b"uai_export_schema_version"] == b"1"
+        
+        dependencies = pq.read_table(files["dependencies"])
+        assert dependencies.num_rows == 6
+        vulnerabilities = pq.read_table(files["vulnerabilities"]).to_pylist()
+        assert vulnerabilities[0]["fixed_versions"] == ["18.0.1"]
+        
+        # Tables without rows are still written with their schema
+        empty = write_parquet([], tmp_path / "empty")
+        assert pq.read_table(empty["projects"]).schema == projects.schema
+    
+    @pytest.mark.asyncio
+    async def test_dataframes_keep_nullable_integers(self, tmp_path):
+        """Test pandas frames of the same tables."""
+        pytest.importorskip("pandas")
+        builder = AnalysisTableBuilder()
+        builder.extend(await _analyses(tmp_path, 2))
+        builder.columns["projects"]["lines_of_code"][1] = None
+        
+        frames = builder.to_dataframes()
+        
+        assert str(frames["projects"]["lines_of_code"].dtype) == "Int64"
+        assert frames["projects"]["lines_of_code"].isna().tolist() == [False, True]
+        assert len(frames["dependencies"]) == 4
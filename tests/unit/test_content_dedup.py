@@ -0,0 +1,146 @@
+"""
+Unit tests for content-hash deduplication.
+"""
+
+import sqlite3
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import ProjectFileIndex, ScanCache
+from universal_ai_dev_platform.analysis.project_scanner import content_dedup
+from universal_ai_dev_platform.analysis.project_scanner.scan_cache import CACHE_FILENAME, DEFAULT_CACHE_DIR
+from universal_ai_dev_platform.analysis.project_scanner.content_dedup import (
+    PREFIX_BYTES, cluster_representatives, find_duplicate_clusters, summarize_duplicates
+)
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+from universal_ai_dev_platform.core.intelligence import pattern_analyzer
+from universal_ai_dev_platform.core.intelligence.pattern_analyzer import PatternAnalyzer
+
+LIBRARY = b"class HttpClient:\n    def get(self):\n        pass\n" * 400  # Larger than the prefix
+
+
+@pytest.fixture
+def project(temp_dir):
+    files = {
+        "vendor/a/client.py": LIBRARY,
+        "vendor/b/client.py": LIBRARY,
+        "generated/client.py": LIBRARY,
+        # Same size as the library, differing in the prefix or only after it
+        "src/other.py": b"#" + LIBRARY[1:],
+        "src/patched.py": LIBRARY[:-1] + b"#",
+        "config/dev.yaml": b"database:\n  host: localhost\n  port: 5432\n  name: app_development\n",
+        "config/test.yaml": b"database:\n  host: localhost\n  port: 5432\n  name: app_development\n",
+        "src/app.py": b"class UserRepository:\n    pass\n",
+    }
+    for path, content in files.items():
+        target = temp_dir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+    return temp_dir
+
+
+def _paths(index, clusters):
+    return [[index.paths[file_id] for file_id in cluster] for cluster in clusters]
+
+
+class TestDuplicateClusters:
+    """Test suite for find_duplicate_clusters and its summary."""
+    
+    def test_identical_files_are_clustered(self, project):
+        """Test that only byte-identical files end up in one cluster."""
+        assert len(LIBRARY) > PREFIX_BYTES
+        index = ProjectFileIndex.build(project)
+        clusters = find_duplicate_clusters(index, index.source_files())
+        
+        assert _paths(index, clusters) == [
+            ["config/dev.yaml", "config/test.yaml"],
+            ["generated/client.py", "vendor/a/client.py", "vendor/b/client.py"],
+        ]
+        copies = cluster_representatives(clusters)
+        assert copies[index.file_id("vendor/b/client.py")] == index.file_id("generated/client.py")
+        
+        summary = summarize_duplicates(index, clusters, top_k=1)
+        assert summary["clusters"] == 2
+        assert summary["redundant_files"] == 3
+        assert summary["redundant_bytes"] == 2 * len(LIBRARY) + (project / "config" / "dev.yaml").stat().st_size
+        assert summary["largest_clusters"] == [{"size": len(LIBRARY), "paths": _paths(index, clusters)[1]}]
+        
+        # Small files can be left out
+        assert len(find_duplicate_clusters(index, index.source_files(), min_size=len(LIBRARY))) == 1
+    
+    def test_cached_digests_are_not_recomputed(self, project, monkeypatch):
+        """Test that a second run groups unchanged files from the scan cache."""
+        index = ProjectFileIndex.build(project)
+        cache = ScanCache.for_project(project)
+        try:
+            first = find_duplicate_clusters(index, index.source_files(), cache)
+            
+            def unexpected_read(*args):
+                raise AssertionError("file read again")
+            monkeypatch.setattr(content_dedup, "_read", unexpected_read)
+            assert find_duplicate_clusters(index, index.source_files(), cache) == first
+        finally:
+            cache.close()
+
+
+class TestDeduplicatedAnalysis:
+    """Test suite for analyses using the duplicate clusters."""
+    
+    @pytest.mark.asyncio
+    async def test_pattern_scan_fans_out_copies(self, project, monkeypatch):
+        """Test that each blob is scanned once and every copy gets its hits."""
+        config = PatternAnalyzer()._default_config()
+        config.update(cache_enabled=False, max_workers=1)
+        
+        scanned = []
+        original = pattern_analyzer._scan_path
+        monkeypatch.setattr(pattern_analyzer, "_scan_path",
+                            lambda path, *args: scanned.append(path) or original(path, *args))
+        files = await PatternAnalyzer(config)._collect_project_files(project)
+        
+        by_path = {file_info["relative_path"]: file_info for file_info in files}
+        assert len(by_path) == 8
+        assert len(scanned) == 5
+        assert by_path["vendor/b/client.py"]["content_hits"] == by_path["generated/client.py"]["content_hits"]
+        assert by_path["vendor/b/client.py"]["weight"] == 1.0
+        
+        config.update(deduplicate_content=False)
+        scanned.clear()
+        assert await PatternAnalyzer(config)._collect_project_files(project) == files
+        assert len(scanned) == 8
+    
+    @pytest.mark.asyncio
+    async def test_health_reports_duplicate_clusters(self, project):
+        """Test that duplicate clusters are a maintainability signal."""
+        config = UniversalProjectAnalyzer()._default_config()
+        config.update(cache_enabled=False, result_store=None, vulnerability_db=None, workspace_detection=False)
+        analysis = await UniversalProjectAnalyzer(config).analyze_project(str(project))
+        
+        health = analysis.health_assessment
+        assert health.duplicate_files["clusters"] == 2
+        assert health.duplicate_files["largest_clusters"][0]["paths"][0] == "generated/client.py"
+        assert "3 duplicated files in 2 groups of identical content" in health.issues
+        
+        surface = await UniversalProjectAnalyzer(config).analyze_project(str(project), depth="surface")
+        assert surface.health_assessment.duplicate_files == {}
+        assert surface.health_assessment.maintainability_score > health.maintainability_score
+    
+    @pytest.mark.asyncio
+    async def test_analyzers_keep_each_others_digests(self, project):
+        """Test that pattern analysis of a few changed files does not prune the project's digests."""
+        def content_rows():
+            with sqlite3.connect(str(project / DEFAULT_CACHE_DIR / CACHE_FILENAME)) as conn:
+                return conn.execute("SELECT COUNT(*) FROM file_results WHERE kind = 'content'").fetchone()[0]
+        
+        config = UniversalProjectAnalyzer()._default_config()
+        config.update(result_store=None, vulnerability_db=None, workspace_detection=False)
+        await UniversalProjectAnalyzer(config).analyze_project(str(project))
+        digests = content_rows()
+        assert digests == 6  # Files sharing their size and prefix with another one
+        
+        (project / "src" / "app.py").write_bytes(b"class UserService:\n    pass\n")
+        (project / "config" / "test.yaml").write_bytes(b"database:\n  host: db\n")
+        pattern_config = PatternAnalyzer()._default_config()
+        pattern_config.update(result_store=None, max_workers=1)
+        await PatternAnalyzer(pattern_config).analyze_patterns(str(project))
+        assert content_rows() == digests
@@ -0,0 +1,114 @@
+"""
+Unit tests for the multi-pattern Content Matcher.
+"""
+
+import re
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner.content_matcher import (
+    BufferLines, LineTable, MultiPatternMatcher, looks_binary
+)
+
+
+PATTERNS = [
+    r"class\s+\w*Helper\w*",
+    r"def\s+find_by_",
+    r"@app\.route",
+    r"port\s*=\s*\d+",
+    r"x|y",
+]
+
+CONTENT = """import os
+class StringHelper:
+    port = 8080
+
+@APP.ROUTE("/")
+def find_by_name(name):
+    return None
+claſs KelvinHelper: pass
+"""
+
+
+class TestMultiPatternMatcher:
+    """Test suite for MultiPatternMatcher."""
+    
+    @pytest.fixture
+    def matcher(self):
+        """Matcher over a mix of literal and alternation patterns."""
+        return MultiPatternMatcher(PATTERNS)
+    
+    def test_required_literals(self, matcher):
+        """Test that literal runs are extracted and alternations stay unfiltered."""
+        assert matcher._by_literal["helper"] == [0]
+        assert matcher._by_literal["@app.route"] == [2]
+        assert matcher._unfiltered == [4]
+    
+    def test_scan_matches_findall(self, matcher):
+        """Test that scan reports exactly the matches of re.findall, with offsets."""
+        hits = list(matcher.scan(CONTENT))
+        for pattern_id, pattern in enumerate(PATTERNS):
+            offsets = [offset for hit_id, offset in hits if hit_id == pattern_id]
+            expected = [m.start() for m in re.finditer(pattern, CONTENT, re.IGNORECASE | re.MULTILINE)]
+            assert offsets == expected
+    
+    def test_prefilter_skips_absent_literals(self, matcher):
+        """Test that patterns whose literal is missing are not run."""
+        assert matcher.candidates("nothing relevant here") == [4]
+    
+    def test_prefilter_honours_unicode_case_folding(self, matcher):
+        """Test that characters re.IGNORECASE equates with ASCII letters still match."""
+        assert 0 in matcher.candidates("claſs KelvinHELPER")
+        assert matcher.search("İmport; class FooHelper") == [0]
+    
+    def test_search_uses_search_semantics(self):
+        """Test that search reports each pattern with any match once."""
+        matcher = MultiPatternMatcher([r"from\s+flask", r"import\s+Flask"], re.IGNORECASE)
+        assert matcher.search("from flask import Flask\nfrom flask import request") == [0, 1]
+    
+    def test_scan_buffer_matches_scan_on_ascii(self, matcher):
+        """Test that byte matching over a buffer agrees with text matching for ASCII content."""
+        content = CONTENT.replace("claſs", "class")
+        assert list(matcher.scan_buffer(content.encode(), len(content))) == list(matcher.scan(content))
+    
+    def test_buffer_candidates_across_windows(self, matcher, monkeypatch):
+        """Test that a literal split across two windows is still found."""
+        monkeypatch.setattr(
+            "universal_ai_dev_platform.analysis.project_scanner.content_matcher._WINDOW_BYTES", 8
+        )
+        buffer = b"x" * 5 + b"@App.Route" + b"z" * 20
+        assert 2 in matcher.buffer_candidates(buffer, len(buffer))
+        assert 2 not in matcher.buffer_candidates(buffer, 10)
+    
+    def test_looks_binary(self):
+        """Test the NUL byte binary sniff."""
+        assert looks_binary(b"PK\x03\x04\x00\x00")
+        assert not looks_binary("const x = 'é';".encode())
+
+
+class TestLineTable:
+    """Test suite for LineTable."""
+    
+    def test_context_matches_split_lines(self):
+        """Test that context equals joining the split lines around a match."""
+        lines = CONTENT.split("\n")
+        table = LineTable(CONTENT)
+        assert len(table) == len(lines)
+        for i in range(len(lines)):
+            assert table.line(i) == lines[i]
+            start, end = max(0, i - 2), min(len(lines), i + 3)
+            assert table.context(i) == "\n".join(lines[start:end])
+    
+    def test_line_of_offset(self):
+        """Test mapping offsets to line numbers."""
+        table = LineTable("ab\ncd\n\nef")
+        assert [table.line_of(offset) for offset in (0, 2, 3, 6, 7)] == [0, 0, 1, 2, 3]
+    
+    def test_buffer_lines_match_line_table(self):
+        """Test that buffer line lookups agree with the newline offset table."""
+        data = CONTENT.encode()
+        table = LineTable(CONTENT)
+        lines = BufferLines(data, len(data))
+        assert lines.count() == len(table)
+        for line in range(len(table)):
+            offset = len(CONTENT[:table.line_start(line)].encode())
+            assert lines.context(offset) == table.context(line)
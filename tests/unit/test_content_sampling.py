@@ -0,0 +1,84 @@
+"""
+Unit tests for stratified content sampling and framework detection.
+"""
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import ProjectFileIndex
+from universal_ai_dev_platform.analysis.project_scanner.content_sampling import (
+    converged, sample_batches, stratified_sample_order
+)
+from universal_ai_dev_platform.analysis.project_scanner.stage_planner import StageBudget
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+
+
+@pytest.fixture
+def mixed_project(temp_dir):
+    """Project whose alphabetically first directories hold no framework code."""
+    for i in range(60):
+        tools = temp_dir / "aaa_tools" / f"group{i // 10}"
+        tools.mkdir(parents=True, exist_ok=True)
+        (tools / f"tool_{i}.py").write_text("import os\n\ndef run():\n    return os.getcwd()\n")
+    backend = temp_dir / "backend"
+    backend.mkdir()
+    for i in range(30):
+        (backend / f"views_{i}.py").write_text("from django.http import HttpResponse\n" if i % 3 == 0 else "x = 1\n")
+    components = temp_dir / "frontend" / "components"
+    components.mkdir(parents=True)
+    for i in range(30):
+        (components / f"C{i}.tsx").write_text("import React from 'react'\n")
+    (temp_dir / "README.md").write_text("# Mixed\n")
+    return temp_dir
+
+
+class TestContentSampling:
+    """Test suite for the stratified sampling order and its convergence rule."""
+    
+    def test_order_covers_every_stratum_first(self, mixed_project):
+        """Test that the first files come from every directory/language stratum."""
+        index = ProjectFileIndex.build(mixed_project)
+        order = stratified_sample_order(
+            index, {".py": "python", ".tsx": "typescript"}, {"python": 1, "typescript": 1}
+        )
+        
+        assert len(order) == 120
+        assert {index.paths[file_id].split("/")[0] for file_id in order[:3]} == {
+            "aaa_tools", "backend", "frontend"
+        }
+        assert order == stratified_sample_order(
+            ProjectFileIndex.build(mixed_project), {".py": "python", ".tsx": "typescript"},
+            {"python": 1, "typescript": 1}
+        )
+        # Shares follow stratum size: aaa_tools holds half of the candidates
+        first_half = [index.paths[file_id] for file_id in order[:60]]
+        assert sum(path.startswith("aaa_tools/") for path in first_half) == 30
+    
+    def test_language_weight_zero_excludes_files(self, mixed_project):
+        """Test that languages without weight are not sampled."""
+        index = ProjectFileIndex.build(mixed_project)
+        order = stratified_sample_order(
+            index, {".py": "python", ".tsx": "typescript"}, {"python": 0, "typescript": 1}
+        )
+        assert all(index.suffix(file_id) == ".tsx" for file_id in order)
+    
+    def test_batches_double_and_convergence(self):
+        """Test the doubling batch schedule and the stopping rule."""
+        assert [len(batch) for batch in sample_batches(range(75), 10)] == [10, 10, 20, 35]
+        assert not converged({}, {}, 1, 0.8)
+        assert converged({"react": 0.2}, {"react": 0.2}, 2, 0.8)
+        assert not converged({"react": 0.2}, {"react": 0.4}, 3, 0.8)
+        assert converged({"react": 0.6}, {"react": 0.8}, 3, 0.8)
+    
+    @pytest.mark.asyncio
+    async def test_framework_content_found_outside_first_directories(self, mixed_project):
+        """Test that content confidence reflects every part of the project."""
+        analyzer = UniversalProjectAnalyzer()
+        index = ProjectFileIndex.build(mixed_project)
+        
+        confidence = await analyzer._check_content_patterns(index, budget=StageBudget(max_files=100))
+        
+        assert confidence["react"] == 0.8
+        assert confidence["django"] >= 0.5
+        assert await analyzer._check_content_patterns(index, budget=StageBudget(max_files=100)) == confidence
+        # Every candidate read matches the exhaustive result here
+        assert await analyzer._check_content_patterns(index, budget=StageBudget(max_files=None)) == confidence
@@ -0,0 +1,390 @@
+"""
+Unit tests for the dependency graph and lockfile parsers.
+"""
+
+import io
+import json
+from collections import defaultdict
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner.dependency_graph import (
+    DependencyGraph, _JsonStream, dependency_parser, parse_cargo_lock, parse_cargo_toml,
+    parse_go_mod, parse_go_sum, parse_gradle, parse_package_json, parse_package_lock,
+    parse_pnpm_lock, parse_poetry_lock, parse_pom_xml, parse_pyproject, parse_requirements,
+    parse_yarn_lock
+)
+from universal_ai_dev_platform.analysis.project_scanner.file_index import ProjectFileIndex
+from universal_ai_dev_platform.analysis.project_scanner.scan_cache import ScanCache
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+
+
+PACKAGE_LOCK = {
+    "name": "app",
+    "lockfileVersion": 3,
+    "requires": True,
+    "packages": {
+        "": {"name": "app", "dependencies": {"a": "^1.0.0", "shared": "*"},
+             "devDependencies": {"jest": "^29.0.0"}},
+        "node_modules/a": {"version": "1.0.0", "dependencies": {"b": "^2.0.0"}},
+        "node_modules/a/node_modules/b": {"version": "2.0.0", "dependencies": {"c": "^1.0.0"}},
+        "node_modules/b": {"version": "1.0.0"},
+        "node_modules/c": {"version": "1.2.0"},
+        "node_modules/jest": {"version": "29.0.0", "dev": True, "dependencies": {"b": "^1.0.0"}},
+        "node_modules/shared": {"resolved": "packages/shared", "link": True},
+        "packages/shared": {"name": "shared", "version": "0.0.1", "dependencies": {"c": "^1.0.0"}}
+    },
+    "dependencies": {"a": {"version": "1.0.0"}}
+}
+
+
+def _labels(graph, package_ids):
+    return sorted(graph.label(package_id) for package_id in package_ids)
+
+
+def _edges(graph):
+    return sorted(
+        (graph.label(source), graph.label(target))
+        for source in range(len(graph)) for target in graph.dependencies_of(source)
+    )
+
+
+class TestDependencyGraph:
+    """Test suite for the interned CSR dependency graph."""
+    
+    def test_adjacency_and_statistics(self):
+        """Test CSR rows, depths, fan-in and transitive closure on a small graph with a cycle."""
+        graph = DependencyGraph()
+        app, lib, util, core, orphan = (
+            graph.add_package("npm", name, "1.0.0") for name in ("app", "lib", "util", "core", "orphan")
+        )
+        for source, target in ((app, util), (app, lib), (app, lib), (lib, util),
+                               (util, core), (core, util)):
+            graph.add_dependency(source, target)
+        graph.add_root("production", app)
+        graph.add_root("development", lib)
+        
+        offsets, targets = graph.adjacency()
+        assert list(offsets) == [0, 2, 3, 4, 5, 5]
+        assert list(graph.dependencies_of(app)) == [lib, util]
+        assert list(graph.depths()) == [1, 1, 2, 3, -1]
+        assert list(graph.fan_in()) == [0, 1, 3, 1, 0]
+        assert list(graph.transitive_closure([lib])) == [0, 1, 1, 1, 0]
+        assert graph.closure_sizes([app, core]) == {app: 3, core: 1}
+        
+        stats = graph.stats(top=2)
+        assert stats["packages"] == 5
+        assert stats["edges"] == 5
+        assert stats["direct_dependencies"] == 2
+        assert stats["transitive_dependencies"] == 2
+        assert stats["unreachable_packages"] == 1
+        assert stats["max_depth"] == 3
+        assert stats["most_depended_on"][0] == {"package": "util@1.0.0", "dependents": 3}
+        assert stats["heaviest_dependencies"][0] == {"package": "app@1.0.0", "transitive_dependencies": 3}
+    
+    def test_versionless_packages_resolve_to_locked_versions(self):
+        """Test that name-only packages attach to a locked version and scopes keep precedence."""
+        graph = DependencyGraph()
+        placeholder = graph.add_package("pypi", "requests")
+        assert graph.add_package("pypi", "requests", "2.31.0") == placeholder
+        assert graph.add_package("pypi", "requests") == placeholder
+        assert graph.add_package("npm", "requests") != placeholder
+        
+        graph.add_root("development", placeholder)
+        graph.add_root("production", placeholder)
+        graph.add_root("optional", placeholder)
+        assert graph.direct_dependencies() == {
+            "production": ["requests"], "optional": [], "development": []
+        }
+    
+    def test_payload_round_trip(self):
+        """Test that merging a payload reproduces packages, edges and roots."""
+        graph = DependencyGraph()
+        first = graph.add_package("cargo", "serde", "1.0.0")
+        graph.add_dependency(first, graph.add_package("cargo", "serde_derive", "1.0.0"))
+        graph.add_root("production", first)
+        
+        merged = DependencyGraph()
+        merged.add_package("cargo", "log", "0.4.0")
+        merged.merge(json.loads(json.dumps(graph.to_payload())))
+        assert _edges(merged) == [("serde@1.0.0", "serde_derive@1.0.0")]
+        assert merged.direct_dependencies()["production"] == ["serde"]
+    
+    def test_json_stream_across_chunks(self):
+        """Test that members, values and skipped sections survive tiny read chunks."""
+        document = json.dumps({
+            "skip": {"nested": ["a", {"b": '}"]\\'}], "n": 1.5e3},
+            "keep": {"x": {"v": 12345}, "y": [1, 2, 3], "z": True},
+            "after": "end"
+        })
+        stream = _JsonStream(io.StringIO(document), chunk_size=3)
+        seen = {}
+        for key in stream.members():
+            if key == "keep":
+                seen[key] = {member: stream.value() for member in stream.members()}
+            elif key == "skip":
+                stream.skip()
+            else:
+                seen[key] = stream.value()
+        assert seen == {"keep": {"x": {"v": 12345}, "y": [1, 2, 3], "z": True}, "after": "end"}
+
+
+class TestLockfileParsers:
+    """Test suite for the streaming lockfile and manifest parsers."""
+    
+    def test_package_lock_resolves_nested_node_modules(self, tmp_path):
+        """Test Node-style resolution, project scopes and workspace links in lockfile v3."""
+        lockfile = tmp_path / "package-lock.json"
+        lockfile.write_text(json.dumps(PACKAGE_LOCK, indent=2))
+        graph = DependencyGraph()
+        parse_package_lock(lockfile, graph)
+        
+        assert _edges(graph) == [
+            ("a@1.0.0", "b@2.0.0"), ("b@2.0.0", "c@1.2.0"), ("jest@29.0.0", "b@1.0.0")
+        ]
+        assert graph.direct_dependencies() == {
+            "production": ["a", "c"], "optional": [], "development": ["jest"]
+        }
+        assert "shared" not in graph.names
+    
+    def test_package_lock_v1(self, tmp_path):
+        """Test the nested "dependencies" tree of lockfile v1."""
+        lockfile = tmp_path / "package-lock.json"
+        lockfile.write_text(json.dumps({"lockfileVersion": 1, "dependencies": {
+            "a": {"version": "1.0.0", "requires": {"b": "^2.0.0"},
+                  "dependencies": {"b": {"version": "2.0.0"}}},
+            "b": {"version": "1.0.0"}
+        }}))
+        graph = DependencyGraph()
+        parse_package_lock(lockfile, graph)
+        assert _edges(graph) == [("a@1.0.0", "b@2.0.0")]
+    
+    def test_yarn_lock_classic_and_berry(self, tmp_path):
+        """Test specifier resolution in yarn v1 and Berry lockfiles."""
+        classic = tmp_path / "yarn.lock"
+        classic.write_text(
+            '# yarn lockfile v1\n\n'
+            '"@scope/a@^1.0.0", "@scope/a@^1.1.0":\n'
+            '  version "1.1.0"\n'
+            '  dependencies:\n'
+            '    b "^2.0.0"\n\n'
+            'b@^2.0.0:\n'
+            '  version "2.3.0"\n'
+        )
+        graph = DependencyGraph()
+        parse_yarn_lock(classic, graph)
+        assert _edges(graph) == [("@scope/a@1.1.0", "b@2.3.0")]
+        
+        berry = tmp_path / "berry.lock"
+        berry.write_text(
+            '__metadata:\n  version: 6\n\n'
+            '"app@workspace:.":\n  version: 0.0.0-use.local\n  dependencies:\n    b: ^2.0.0\n\n'
+            '"b@npm:^2.0.0":\n  version: 2.3.0\n  dependencies:\n    "@scope/c": ^1.0.0\n'
+            '  peerDependencies:\n    d: "*"\n\n'
+            '"@scope/c@npm:^1.0.0":\n  version: 1.0.4\n'
+        )
+        graph = DependencyGraph()
+        parse_yarn_lock(berry, graph)
+        assert _edges(graph) == [("b@2.3.0", "@scope/c@1.0.4")]
+    
+    @pytest.mark.parametrize("content", [
+        # Lockfile v9: importers, packages and snapshots
+        "lockfileVersion: '9.0'\n\nimporters:\n\n  .:\n    dependencies:\n      react:\n"
+        "        specifier: ^18.2.0\n        version: 18.2.0\n    devDependencies:\n"
+        "      local:\n        specifier: link:../local\n        version: link:../local\n\n"
+        "packages:\n\n  loose-envify@1.4.0:\n    resolution: {integrity: sha512-x}\n\n"
+        "  react@18.2.0:\n    resolution: {integrity: sha512-y}\n\n"
+        "snapshots:\n\n  loose-envify@1.4.0: {}\n\n  react@18.2.0:\n    dependencies:\n"
+        "      loose-envify: 1.4.0\n",
+        # Lockfile v5: top-level sections and "/name/version" keys
+        "lockfileVersion: 5.4\n\nspecifiers:\n  react: ^18.2.0\n\ndependencies:\n  react: 18.2.0\n\n"
+        "packages:\n\n  /loose-envify/1.4.0:\n    dev: false\n\n"
+        "  /react/18.2.0_typescript@5.0.0:\n    dependencies:\n      loose-envify: 1.4.0\n    dev: false\n",
+    ])
+    def test_pnpm_lock(self, tmp_path, content):
+        """Test exact-version edges and direct dependencies across pnpm lockfile versions."""
+        lockfile = tmp_path / "pnpm-lock.yaml"
+        lockfile.write_text(content)
+        graph = DependencyGraph()
+        parse_pnpm_lock(lockfile, graph)
+        assert _edges(graph) == [("react@18.2.0", "loose-envify@1.4.0")]
+        assert _labels(graph, graph.roots) == ["react@18.2.0"]
+    
+    def test_python_lockfile_and_manifests(self, tmp_path):
+        """Test poetry.lock edges with pyproject and requirements direct dependencies."""
+        (tmp_path / "poetry.lock").write_text(
+            '[[package]]\nname = "Requests"\nversion = "2.31.0"\n\n'
+            '[package.dependencies]\ncharset-normalizer = ">=2,<4"\nurllib3 = {version = ">=1.21.1"}\n\n'
+            '[[package]]\nname = "charset_normalizer"\nversion = "3.3.2"\n\n'
+            '[[package]]\nname = "urllib3"\nversion = "2.1.0"\n\n'
+            '[package.extras]\nsocks = ["pysocks"]\n\n[metadata]\nlock-version = "2.0"\n'
+        )
+        (tmp_path / "pyproject.toml").write_text(
+            '[project]\nname = "app"\ndependencies = ["requests>=2", "click[extra]==8.1.7"]\n\n'
+            '[project.optional-dependencies]\nfast = ["orjson"]\n\n'
+            '[tool.poetry.group.test.dependencies]\npytest = "^7"\n'
+        )
+        (tmp_path / "requirements-dev.txt").write_text(
+            "-r requirements.txt\nblack==23.1.0  # formatter\n-e .\nhttps://example.com/pkg.whl\n"
+        )
+        graph = DependencyGraph()
+        parse_poetry_lock(tmp_path / "poetry.lock", graph)
+        parse_pyproject(tmp_path / "pyproject.toml", graph)
+        parse_requirements(tmp_path / "requirements-dev.txt", graph)
+        
+        assert _edges(graph) == [
+            ("requests@2.31.0", "charset-normalizer@3.3.2"), ("requests@2.31.0", "urllib3@2.1.0")
+        ]
+        assert graph.direct_dependencies() == {
+            "production": ["click", "requests"], "optional": ["orjson"], "development": ["black", "pytest"]
+        }
+        assert graph.label(graph.add_package("pypi", "click")) == "click@8.1.7"
+    
+    def test_cargo_lockfile_and_manifest(self, tmp_path):
+        """Test Cargo.lock edges with multiple locked versions and Cargo.toml scopes."""
+        (tmp_path / "Cargo.lock").write_text(
+            'version = 3\n\n[[package]]\nname = "app"\nversion = "0.1.0"\n'
+            'dependencies = [\n "rand 0.8.5",\n "serde",\n]\n\n'
+            '[[package]]\nname = "rand"\nversion = "0.7.3"\n'
+            'source = "registry+https://github.com/rust-lang/crates.io-index"\n\n'
+            '[[package]]\nname = "rand"\nversion = "0.8.5"\n'
+            'source = "registry+https://github.com/rust-lang/crates.io-index"\n'
+            'dependencies = ["libc"]\n\n'
+            '[[package]]\nname = "libc"\nversion = "0.2.150"\nsource = "registry+x"\n\n'
+            '[[package]]\nname = "serde"\nversion = "1.0.0"\nsource = "registry+x"\n'
+            'dependencies = [\n "rand 0.7.3",\n]\n'
+        )
+        (tmp_path / "Cargo.toml").write_text(
+            '[package]\nname = "app"\n\n[dependencies]\nserde = "1"\n'
+            'rng = { package = "rand", version = "0.8" }\nlocal = { path = "../local" }\n'
+            'extra = { version = "1", optional = true }\n\n'
+            '[target.\'cfg(unix)\'.dev-dependencies]\nlibc = "0.2"\n'
+        )
+        graph = DependencyGraph()
+        parse_cargo_lock(tmp_path / "Cargo.lock", graph)
+        parse_cargo_toml(tmp_path / "Cargo.toml", graph)
+        
+        assert _edges(graph) == [("rand@0.8.5", "libc@0.2.150"), ("serde@1.0.0", "rand@0.7.3")]
+        assert "app" not in graph.names
+        assert graph.direct_dependencies() == {
+            "production": ["rand", "serde"], "optional": ["extra"], "development": ["libc"]
+        }
+    
+    def test_go_modules(self, tmp_path):
+        """Test go.mod direct requirements and go.sum modules."""
+        (tmp_path / "go.mod").write_text(
+            "module example.com/app\n\ngo 1.21\n\nrequire github.com/pkg/errors v0.9.1\n\n"
+            "require (\n\tgolang.org/x/sys v0.15.0 // indirect\n\tgithub.com/spf13/cobra v1.8.0\n)\n"
+            "\nreplace (\n\texample.com/old v1.0.0 => ../old\n)\n"
+        )
+        (tmp_path / "go.sum").write_text(
+            "github.com/spf13/cobra v1.8.0 h1:abc=\ngithub.com/spf13/cobra v1.8.0/go.mod h1:def=\n"
+            "github.com/old/only v0.1.0/go.mod h1:ghi=\n"
+        )
+        graph = DependencyGraph()
+        parse_go_sum(tmp_path / "go.sum", graph)
+        parse_go_mod(tmp_path / "go.mod", graph)
+        
+        assert _labels(graph, range(len(graph))) == [
+            "github.com/pkg/errors@v0.9.1", "github.com/spf13/cobra@v1.8.0", "golang.org/x/sys@v0.15.0"
+        ]
+        assert graph.direct_dependencies()["production"] == [
+            "github.com/pkg/errors", "github.com/spf13/cobra"
+        ]
+    
+    def test_maven_and_gradle(self, tmp_path):
+        """Test pom.xml scopes and property versions, and Gradle configurations."""
+        (tmp_path / "pom.xml").write_text(
+            '<?xml version="1.0"?>\n<project xmlns="http://maven.apache.org/POM/4.0.0">\n'
+            '  <properties><junit.version>5.10.0</junit.version></properties>\n'
+            '  <dependencyManagement><dependencies><dependency><groupId>m</groupId>'
+            '<artifactId>managed</artifactId></dependency></dependencies></dependencyManagement>\n'
+            '  <dependencies>\n'
+            '    <dependency><groupId>org.slf4j</groupId><artifactId>slf4j-api</artifactId>'
+            '<version>2.0.9</version></dependency>\n'
+            '    <dependency><groupId>org.junit</groupId><artifactId>junit</artifactId>'
+            '<version>${junit.version}</version><scope>test</scope></dependency>\n'
+            '  </dependencies>\n'
+            '  <build><plugins><plugin><dependencies><dependency><groupId>p</groupId>'
+            '<artifactId>plugin-dep</artifactId></dependency></dependencies></plugin></plugins></build>\n'
+            '</project>\n'
+        )
+        (tmp_path / "build.gradle.kts").write_text(
+            'dependencies {\n    implementation("com.google.guava:guava:32.1.3-jre")\n'
+            "    testImplementation 'org.mockito:mockito-core:5.7.0'\n"
+            '    compileOnly("org.projectlombok:lombok:1.18.30")\n}\n'
+        )
+        graph = DependencyGraph()
+        parse_pom_xml(tmp_path / "pom.xml", graph)
+        parse_gradle(tmp_path / "build.gradle.kts", graph)
+        
+        assert _labels(graph, graph.roots) == [
+            "com.google.guava:guava@32.1.3-jre", "org.junit:junit@5.10.0",
+            "org.mockito:mockito-core@5.7.0", "org.projectlombok:lombok@1.18.30",
+            "org.slf4j:slf4j-api@2.0.9"
+        ]
+        assert graph.direct_dependencies()["development"] == ["org.junit:junit", "org.mockito:mockito-core"]
+    
+    def test_dependency_parser_lookup(self):
+        """Test parser selection by file name."""
+        assert dependency_parser("yarn.lock") == (parse_yarn_lock, True)
+        assert dependency_parser("package.json") == (parse_package_json, False)
+        assert dependency_parser("requirements-test.txt") == (parse_requirements, False)
+        assert dependency_parser("README.md") == (None, False)
+
+
+class TestDependencyAnalysis:
+    """Test suite for dependency analysis in the universal analyzer."""
+    
+    @pytest.mark.asyncio
+    async def test_analyze_dependencies_merges_lockfiles_and_manifests(self, tmp_path):
+        """Test the project graph across ecosystems, cached per file."""
+        (tmp_path / "package.json").write_text(json.dumps({
+            "dependencies": {"a": "^1.0.0"}, "devDependencies": {"jest": "^29.0.0"}
+        }))
+        (tmp_path / "package-lock.json").write_text(json.dumps(PACKAGE_LOCK))
+        (tmp_path / "requirements.txt").write_text("flask==3.0.0\n")
+        (tmp_path / "node_modules" / "x").mkdir(parents=True)
+        (tmp_path / "node_modules" / "x" / "package.json").write_text('{"dependencies": {"y": "1"}}')
+        
+        analyzer = UniversalProjectAnalyzer()
+        index = ProjectFileIndex.build(tmp_path)
+        cache = ScanCache(tmp_path / "cache.db")
+        try:
+            graph = await analyzer._analyze_dependencies(index, cache)
+            cached = await analyzer._analyze_dependencies(index, cache)
+        finally:
+            cache.close()
+        
+        for result in (graph, cached):
+            assert result.direct_dependencies() == {
+                "production": ["a", "c", "flask"], "optional": [], "development": ["jest"]
+            }
+            stats = result.stats()
+            assert stats["ecosystems"] == {"npm": 5, "pypi": 1}
+            assert stats["max_depth"] == 2
+            assert stats["transitive_dependencies"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_manifest_dependencies_feed_technology_detection(self, tmp_path):
+        """Test that direct dependencies of Cargo, Go and JVM manifests identify frameworks and databases."""
+        (tmp_path / "Cargo.toml").write_text('[dependencies]\naxum = "0.7"\nrusqlite = { version = "0.31" }\n')
+        (tmp_path / "go.mod").write_text(
+            "module example.com/app\n\nrequire (\n\tgithub.com/gin-gonic/gin v1.9.1\n"
+            "\tgithub.com/lib/pq v1.10.9 // indirect\n)\n"
+        )
+        (tmp_path / "pom.xml").write_text(
+            '<?xml version="1.0"?>\n<project xmlns="http://maven.apache.org/POM/4.0.0"><dependencies>'
+            '<dependency><groupId>org.springframework.boot</groupId>'
+            '<artifactId>spring-boot-starter-web</artifactId></dependency></dependencies></project>\n'
+        )
+        (tmp_path / "build.gradle.kts").write_text(
+            'dependencies {\n    implementation("io.ktor:ktor-server-core:2.3.0")\n'
+            '    runtimeOnly("org.postgresql:postgresql:42.7.0")\n}\n'
+        )
+        
+        detected_tech = defaultdict(lambda: defaultdict(float))
+        await UniversalProjectAnalyzer()._analyze_package_files(ProjectFileIndex.build(tmp_path), detected_tech)
+        assert set(detected_tech["frameworks"]) == {"axum", "gin", "spring_boot", "ktor"}
+        assert set(detected_tech["databases"]) == {"sqlite", "postgresql"}  # Indirect requirements don't count
+        assert detected_tech["build_tools"]["gradle"] == 1.0
@@ -0,0 +1,74 @@
+"""
+Unit tests for the Project File Index.
+"""
+
+import pytest
+from pathlib import Path
+
+from universal_ai_dev_platform.analysis.project_scanner import ProjectFileIndex
+
+
+class TestProjectFileIndex:
+    """Test suite for ProjectFileIndex."""
+    
+    @pytest.fixture
+    def index(self, sample_project_structure):
+        """Build an index over the sample project."""
+        (sample_project_structure / "node_modules" / "react").mkdir(parents=True)
+        (sample_project_structure / "node_modules" / "react" / "index.js").write_text("")
+        (sample_project_structure / ".github" / "workflows").mkdir(parents=True)
+        (sample_project_structure / ".github" / "workflows" / "ci.yml").write_text("on: push")
+        return ProjectFileIndex.build(sample_project_structure)
+    
+    def test_build_indexes_files_once(self, index):
+        """Test that every source file is indexed with its metadata."""
+        assert "src/App.tsx" in index.paths
+        assert "src/components/Button.tsx" in index.paths
+        assert len(index.paths) == len(index.sizes) == len(index.mtimes) == len(index.depths)
+        
+        file_id = index.paths.index("src/components/Button.tsx")
+        assert index.suffix(file_id) == ".tsx"
+        assert index.depths[file_id] == 2
+        assert index.sizes[file_id] > 0
+    
+    def test_pruned_directories_are_recorded_not_walked(self, index):
+        """Test that node_modules is known but its contents are not indexed."""
+        assert index.is_dir("node_modules")
+        assert not any(path.startswith("node_modules/") for path in index.paths)
+    
+    def test_hidden_ci_directory_is_indexed_but_not_source(self, index):
+        """Test that CI configuration is queryable without counting as source."""
+        assert index.exists(".github/workflows")
+        ci_id = index.paths.index(".github/workflows/ci.yml")
+        assert index.is_hidden(ci_id)
+        assert ci_id not in set(index.source_files())
+    
+    def test_glob_root_and_recursive(self, index):
+        """Test pathlib-style glob semantics."""
+        assert set(index.glob("*.json")) == {"package.json", "tsconfig.json"}
+        assert index.glob("**/*.tsx") == ["src/App.tsx", "src/main.tsx", "src/components/Button.tsx"]
+        assert index.glob("src/") == ["src"]
+        assert index.glob("*.py") == []
+    
+    def test_child_directories_and_depth(self, index):
+        """Test directory queries."""
+        assert index.child_directories("src") == ["src/components"]
+        assert index.max_depth() == 2
+    
+    def test_files_in_directory_are_sorted(self, index):
+        """Test that files of a directory are contiguous and sorted."""
+        src_dir = index.directories.index("src")
+        names = [Path(index.paths[i]).name for i in index.files_in_directory(src_dir)]
+        assert names == sorted(names) == ["App.tsx", "main.tsx"]
+    
+    def test_max_files_samples_breadth_first(self, sample_project_structure):
+        """Test that a file limit keeps the shallow levels and flags the index as truncated."""
+        full = ProjectFileIndex.build(sample_project_structure)
+        root_files = [path for path in full.paths if "/" not in path]
+        
+        sampled = ProjectFileIndex.build(sample_project_structure, max_files=len(root_files) + 1)
+        
+        assert sampled.truncated and not full.truncated
+        assert len(sampled) == len(root_files) + 1
+        assert sampled.paths[:len(root_files)] == root_files
+        assert sampled.is_dir("src/components")
@@ -0,0 +1,107 @@
+"""
+Unit tests for Merkle project fingerprints.
+"""
+
+import os
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import ProjectFileIndex
+from universal_ai_dev_platform.analysis.project_scanner.fingerprint import (
+    FingerprintStore, changed_paths, content_hash_algorithm, fingerprint_index, fingerprint_project
+)
+
+
+@pytest.fixture
+def project(temp_dir):
+    project = temp_dir / "project"
+    for directory in ("src/api", "src/ui", "docs"):
+        (project / directory).mkdir(parents=True)
+    (project / "src" / "api" / "routes.py").write_text("def route():\n    pass\n")
+    (project / "src" / "ui" / "App.tsx").write_text("export default () => null\n")
+    (project / "docs" / "index.md").write_text("# Docs\n")
+    (project / "README.md").write_text("# Project\n")
+    return project
+
+
+def _touch(path, content=None):
+    """Rewrite a file (optionally with new content) and move its mtime forward."""
+    if content is not None:
+        path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestProjectFingerprint:
+    """Test suite for fingerprint_index and changed_paths."""
+    
+    def test_unchanged_subtrees_are_reused(self, project):
+        """Test that only the changed directory and its ancestors are rehashed."""
+        first = fingerprint_index(ProjectFileIndex.build(project))
+        assert fingerprint_index(ProjectFileIndex.build(project)).digest == first.digest
+        
+        _touch(project / "src" / "api" / "routes.py", "def route():\n    return 1\n")
+        second = fingerprint_index(ProjectFileIndex.build(project), first)
+        
+        assert second.digest != first.digest
+        assert second.changed_directories == ["", "src", "src/api"]
+        assert second.nodes["docs"].digest == first.nodes["docs"].digest
+        # Reusing the previous tree gives the same hashes as building from scratch
+        assert second.digest == fingerprint_index(ProjectFileIndex.build(project)).digest
+    
+    def test_changed_paths(self, project):
+        """Test that added, removed and modified files are reported."""
+        old = fingerprint_index(ProjectFileIndex.build(project))
+        
+        _touch(project / "src" / "ui" / "App.tsx", "export default () => 1\n")
+        (project / "docs" / "index.md").unlink()
+        (project / "src" / "api" / "v2").mkdir()
+        (project / "src" / "api" / "v2" / "routes.py").write_text("")
+        new = fingerprint_index(ProjectFileIndex.build(project), old)
+        
+        assert changed_paths(old, new) == ["docs/index.md", "src/api/v2/routes.py", "src/ui/App.tsx"]
+        assert changed_paths(new, new) == []
+        with pytest.raises(ValueError):
+            changed_paths(old, fingerprint_index(ProjectFileIndex.build(project), content=True))
+    
+    def test_content_mode_ignores_touches(self, project):
+        """Test that content fingerprints only change when contents do."""
+        algorithm = content_hash_algorithm("blake2b")
+        old = fingerprint_index(ProjectFileIndex.build(project), content=True, algorithm=algorithm)
+        assert old.mode == "content:blake2b"
+        
+        _touch(project / "README.md")
+        touched = fingerprint_index(ProjectFileIndex.build(project), old, content=True, algorithm=algorithm)
+        assert touched.digest == old.digest
+        assert changed_paths(old, touched) == []
+        
+        _touch(project / "README.md", "# Renamed project\n")
+        edited = fingerprint_index(ProjectFileIndex.build(project), touched, content=True, algorithm=algorithm)
+        assert changed_paths(touched, edited) == ["README.md"]
+        
+        with pytest.raises(ValueError):
+            content_hash_algorithm("md4")
+    
+    def test_persisted_fingerprint_round_trip(self, project):
+        """Test that fingerprint_project stores the tree and reports changes against it."""
+        config = {"cache_dir": ".uai/cache"}
+        first, previous = fingerprint_project(str(project), config)
+        assert previous is None
+        
+        store = FingerprintStore.for_project(project)
+        loaded = store.load()
+        store.close()
+        assert loaded.digest == first.digest
+        assert loaded.nodes["src/api"].names == ("routes.py",)
+        
+        # The cache directory itself is hidden and pruned, so storing does not change the tree
+        again, previous = fingerprint_project(str(project), config)
+        assert again.digest == previous.digest
+        assert again.changed_directories == []
+        
+        (project / "src" / "ui" / "App.tsx").unlink()
+        changed, previous = fingerprint_project(str(project), config)
+        assert changed_paths(previous, changed) == ["src/ui/App.tsx"]
+        store = FingerprintStore.for_project(project)
+        assert store.load().digest == changed.digest
+        store.close()
@@ -0,0 +1,108 @@
+"""
+Unit tests for git-aware incremental analysis.
+"""
+
+import os
+import shutil
+import subprocess
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner.git_changes import (
+    clean_head_commit, resolve_commit, unchanged_paths_since
+)
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        check=True, capture_output=True
+    )
+
+
+def _touch_all(repo):
+    """Give every file a new mtime, as a fresh checkout would."""
+    for path in repo.rglob("*"):
+        if path.is_file() and ".git" not in path.parts and ".uai" not in path.parts:
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+class TestGitChanges:
+    """Test suite for git change detection and --since analysis."""
+    
+    @pytest.fixture
+    def repo(self, sample_project_structure):
+        """Sample project committed to a fresh git repository."""
+        (sample_project_structure / ".gitignore").write_text(".uai/\n")
+        _git(sample_project_structure, "init", "-q")
+        _git(sample_project_structure, "add", "-A")
+        _git(sample_project_structure, "commit", "-q", "-m", "baseline")
+        return sample_project_structure
+    
+    def test_unchanged_paths_since(self, repo):
+        """Test that modified and untracked files are not reported as unchanged."""
+        (repo / "src" / "App.tsx").write_text("export default 1;\n")
+        (repo / "src" / "new.ts").write_text("export const x = 1;\n")
+        
+        unchanged = unchanged_paths_since(repo, "HEAD")
+        assert "src/main.tsx" in unchanged
+        assert "src/App.tsx" not in unchanged
+        assert "src/new.ts" not in unchanged
+    
+    def test_clean_head_commit(self, repo):
+        """Test that a dirty tracked file clears the clean commit."""
+        assert clean_head_commit(repo) == resolve_commit(repo, "HEAD")
+        (repo / "package.json").write_text("{}")
+        assert clean_head_commit(repo) is None
+    
+    def test_not_a_repository(self, temp_dir):
+        """Test that git helpers degrade to None outside a work tree."""
+        assert resolve_commit(temp_dir, "HEAD") is None
+        assert unchanged_paths_since(temp_dir, "HEAD") is None
+    
+    @pytest.mark.asyncio
+    async def test_since_rescans_only_changed_files(self, repo, monkeypatch):
+        """Test that --since reads only changed files and matches a full run."""
+        analyzer = UniversalProjectAnalyzer()
+        await analyzer.analyze_project(str(repo))
+        
+        _touch_all(repo)
+        (repo / "src" / "App.tsx").write_text(
+            "import React, { useState } from 'react';\nexport default function App() {}\n"
+        )
+        
+        scanned = []
+        original_scan = analyzer._scan_framework_patterns
+        
+        def record_scan(file_path):
+            scanned.append(file_path.name)
+            return original_scan(file_path)
+        
+        monkeypatch.setattr(analyzer, "_scan_framework_patterns", record_scan)
+        incremental = await analyzer.analyze_project(str(repo), since="HEAD")
+        monkeypatch.undo()
+        
+        full = await UniversalProjectAnalyzer({"cache_enabled": False}).analyze_project(str(repo))
+        
+        assert scanned == ["App.tsx"]
+        assert incremental.technology_stack == full.technology_stack
+    
+    @pytest.mark.asyncio
+    async def test_since_ignores_baseline_from_other_commit(self, repo, monkeypatch):
+        """Test that cached results are not trusted against a different baseline commit."""
+        analyzer = UniversalProjectAnalyzer()
+        await analyzer.analyze_project(str(repo))
+        
+        (repo / "tsconfig.json").write_text("{}\n")
+        _git(repo, "commit", "-q", "-am", "docs")
+        _touch_all(repo)
+        
+        scanned = []
+        monkeypatch.setattr(analyzer, "_scan_framework_patterns",
+                            lambda file_path: scanned.append(file_path.name) or {})
+        await analyzer.analyze_project(str(repo), since="HEAD")
+        
+        assert "App.tsx" in scanned
@@ -0,0 +1,71 @@
+"""
+Unit tests for the .gitignore-style Ignore Rules.
+"""
+
+from universal_ai_dev_platform.analysis.project_scanner import ProjectFileIndex
+from universal_ai_dev_platform.analysis.project_scanner.ignore_rules import IgnoreMatcher, IgnoreRules
+
+
+class TestIgnoreRules:
+    """Test suite for IgnoreRules and IgnoreMatcher."""
+    
+    def _ignored(self, patterns, rel_path, is_dir=False, base=""):
+        return IgnoreRules(patterns, base).match(rel_path, rel_path.rsplit("/", 1)[-1], is_dir)
+    
+    def test_name_patterns_match_at_any_depth(self):
+        """Test that slash-free patterns match entry names, not path substrings."""
+        assert self._ignored(["*.pyc"], "pkg/mod/cache.pyc")
+        assert self._ignored(["build/"], "packages/web/build", is_dir=True)
+        assert self._ignored(["build/"], "src/buildHelpers.ts") is None
+        assert self._ignored(["build/"], "build") is None  # Directory-only rule, file entry
+    
+    def test_anchored_and_double_star_patterns(self):
+        """Test patterns containing a slash and '**' segments."""
+        assert self._ignored(["/docs"], "docs", is_dir=True)
+        assert self._ignored(["/docs"], "src/docs", is_dir=True) is None
+        assert self._ignored(["**/gen/*.ts"], "a/b/gen/api.ts")
+        assert self._ignored(["a/**/z"], "a/z")
+        assert self._ignored(["a/**/z"], "a/b/c/z")
+        assert self._ignored(["logs/**"], "logs/x/y.txt")
+    
+    def test_negation_last_rule_wins(self):
+        """Test that a later negated rule re-includes a path."""
+        patterns = ["*.log", "!keep.log", "# comment", "", "\\#literal"]
+        assert self._ignored(patterns, "debug.log")
+        assert self._ignored(patterns, "keep.log") is False
+        assert self._ignored(patterns, "#literal")
+    
+    def test_rules_are_relative_to_their_directory(self):
+        """Test that anchored rules of a nested ignore file apply below its directory."""
+        assert self._ignored(["/out"], "web/out", is_dir=True, base="web")
+        assert self._ignored(["/out"], "out", is_dir=True, base="web") is None
+    
+    def test_deeper_rules_take_precedence(self, temp_dir):
+        """Test that a nested ignore file overrides the project-level one."""
+        (temp_dir / "pkg").mkdir()
+        (temp_dir / ".gitignore").write_text("*.gen.ts\n")
+        (temp_dir / "pkg" / ".uaiignore").write_text("!api.gen.ts\n")
+        
+        root = IgnoreMatcher.default().enter("", temp_dir, [".gitignore", "pkg"])
+        nested = root.enter("pkg", temp_dir / "pkg", [".uaiignore"])
+        assert root.is_ignored("pkg/api.gen.ts")
+        assert not nested.is_ignored("pkg/api.gen.ts")
+        assert nested.is_ignored("pkg/other.gen.ts")
+        assert nested.is_ignored("pkg/node_modules", is_dir=True)
+    
+    def test_index_prunes_ignored_directories(self, sample_project_structure):
+        """Test that the index records ignored directories without walking them."""
+        (sample_project_structure / ".gitignore").write_text("generated/\n*.snap\n")
+        (sample_project_structure / "generated").mkdir()
+        (sample_project_structure / "generated" / "schema.ts").write_text("export {}")
+        (sample_project_structure / "src" / "App.snap").write_text("")
+        (sample_project_structure / "src" / "buildInfo.ts").write_text("export {}")
+        
+        index = ProjectFileIndex.build(sample_project_structure)
+        snapshot = index.file_id("src/App.snap")
+        
+        assert index.is_dir("generated")
+        assert not any(path.startswith("generated/") for path in index.paths)
+        assert index.is_ignored(snapshot)
+        assert snapshot not in set(index.source_files())
+        assert not index.is_ignored(index.file_id("src/buildInfo.ts"))
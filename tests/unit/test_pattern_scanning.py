@@ -0,0 +1,116 @@
+"""
+Unit tests for PatternAnalyzer content scanning.
+"""
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import ScanCache
+from universal_ai_dev_platform.core.intelligence import pattern_analyzer
+from universal_ai_dev_platform.core.intelligence.pattern_analyzer import (
+    PatternAnalyzer, _shard_by_size
+)
+
+
+class TestPatternScanning:
+    """Test suite for sharded content scanning."""
+    
+    @pytest.fixture
+    def project(self, temp_dir):
+        """Project with enough files to be sharded."""
+        for i in range(12):
+            (temp_dir / f"service_{i}.py").write_text(
+                f"class Order{i}Service:\n    def find_by_id(self):\n        port = {8000 + i}\n"
+            )
+        (temp_dir / "repository.py").write_text("class UserRepository:\n    pass\n")
+        return temp_dir
+    
+    def _analyzer(self, **overrides):
+        config = PatternAnalyzer()._default_config()
+        config.update(cache_enabled=False, **overrides)
+        return PatternAnalyzer(config)
+    
+    def test_shard_by_size_keeps_order(self):
+        """Test that shards are contiguous and cover every path once."""
+        paths = [f"f{i}" for i in range(10)]
+        shards = _shard_by_size(paths, [100, 1, 1, 1, 100, 1, 1, 1, 1, 100], 3)
+        assert [path for shard in shards for path in shard] == paths
+        assert len(shards) > 1
+    
+    @pytest.mark.asyncio
+    async def test_parallel_scan_matches_in_process(self, project):
+        """Test that the process pool merge is identical to in-process scanning."""
+        serial = await self._analyzer(max_workers=1)._collect_project_files(project)
+        parallel = await self._analyzer(max_workers=2, parallel_min_files=1)._collect_project_files(project)
+        
+        assert parallel == serial
+        assert len(serial) == 13
+        by_name = {file_info["relative_path"]: file_info for file_info in serial}
+        assert by_name["service_3.py"]["content_hits"]["class.*Service"][0] == 1
+        assert "class.*Service" not in by_name["repository.py"]["content_hits"]
+    
+    @pytest.mark.asyncio
+    async def test_stream_merges_cached_and_fresh_scans_in_order(self, project):
+        """Test that a partially cached run yields the same files as an uncached one."""
+        config = PatternAnalyzer()._default_config()
+        config.update(cache_dir=str(project / ".cache"))
+        analyzer = PatternAnalyzer(config)
+        await analyzer.analyze_patterns(str(project))
+        
+        (project / "service_5.py").write_text("class Renamed:\n    pass\n")
+        cache = ScanCache.for_project(project, config["cache_dir"])
+        try:
+            streamed = await analyzer._collect_project_files(project, cache)
+        finally:
+            cache.close()
+        
+        uncached = await self._analyzer(max_workers=1)._collect_project_files(project)
+        assert streamed == uncached
+        assert cache.hits == 12
+    
+    @pytest.mark.asyncio
+    async def test_mapped_scan_matches_text_scan(self, project):
+        """Test that matching on a memory map gives the same hits and examples."""
+        text = await self._analyzer(max_workers=1)._collect_project_files(project)
+        mapped = await self._analyzer(max_workers=1, mmap_threshold=1)._collect_project_files(project)
+        
+        assert [f["content_hits"] for f in mapped] == [f["content_hits"] for f in text]
+        assert [f["lines"] for f in mapped] == [f["lines"] for f in text]
+    
+    @pytest.mark.asyncio
+    async def test_binary_and_oversized_files(self, project):
+        """Test that binary files are skipped and large files are scanned up to the cap."""
+        (project / "bundle.js").write_bytes(b"\x00\x01binary class FooService")
+        (project / "huge.py").write_text("class BigService:\n" + "x = 1\n" * 100 + "class LateService:\n")
+        
+        files = await self._analyzer(max_workers=1, mmap_threshold=64,
+                                     max_file_size=128)._collect_project_files(project)
+        by_name = {file_info["relative_path"]: file_info for file_info in files}
+        
+        assert "bundle.js" not in by_name
+        assert by_name["huge.py"]["size"] == 128
+        assert by_name["huge.py"]["content_hits"]["class.*Service"] == [1, "class BigService:\nx = 1\nx = 1"]
+    
+    @pytest.mark.asyncio
+    async def test_binary_files_cached_as_skipped(self, project, monkeypatch):
+        """Test that a warm run skips binary files without opening them again."""
+        (project / "bundle.js").write_bytes(b"\x00\x01binary class FooService")
+        config = PatternAnalyzer()._default_config()
+        config.update(cache_dir=str(project / ".cache"), max_workers=1)
+        analyzer = PatternAnalyzer(config)
+        
+        async def collect():
+            cache = ScanCache.for_project(project, config["cache_dir"])
+            try:
+                return await analyzer._collect_project_files(project, cache)
+            finally:
+                cache.close()
+        
+        cold = await collect()
+        assert "bundle.js" not in [file_info["relative_path"] for file_info in cold]
+        
+        scanned = []
+        original = pattern_analyzer._scan_path
+        monkeypatch.setattr(pattern_analyzer, "_scan_path",
+                            lambda path, *args: scanned.append(path) or original(path, *args))
+        assert await collect() == cold
+        assert scanned == []
@@ -0,0 +1,148 @@
+"""
+Unit tests for the analysis result store.
+"""
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import AnalysisResultStore, ProjectFileIndex
+from universal_ai_dev_platform.analysis.project_scanner.result_store import open_result_store
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+from universal_ai_dev_platform.core.intelligence.pattern_analyzer import PatternAnalyzer
+
+
+KEY = ("project", "/src/app", "options")
+
+
+class TestAnalysisResultStore:
+    """Test suite for AnalysisResultStore."""
+    
+    def test_get_requires_matching_fingerprint_and_version(self, temp_dir):
+        """Test that results are only returned for the tree state they were computed for."""
+        store = AnalysisResultStore(temp_dir / "results.sqlite")
+        store.put(KEY, "tree-1", "1.0", {"files": [1, 2]})
+        
+        assert store.get(KEY, "tree-1", "1.0") == {"files": [1, 2]}
+        assert store.get(KEY, "tree-2", "1.0") is None
+        assert store.get(KEY, "tree-1", "2.0") is None
+        
+        # Callers get copies they can mutate
+        store.get(KEY, "tree-1", "1.0")["files"].append(3)
+        assert store.get(KEY, "tree-1", "1.0") == {"files": [1, 2]}
+        store.close()
+        
+        # A new process sees the disk level
+        reopened = AnalysisResultStore(temp_dir / "results.sqlite")
+        assert reopened.get(KEY, "tree-1", "1.0") == {"files": [1, 2]}
+        assert (reopened.hits, reopened.misses) == (1, 0)
+        reopened.close()
+    
+    def test_lru_eviction_by_size(self, temp_dir):
+        """Test that the least recently read results are evicted past the size caps."""
+        store = AnalysisResultStore(temp_dir / "results.sqlite", max_bytes=2500, memory_max_bytes=2500)
+        for name in ("a", "b"):
+            store.put(("project", name, ""), "fp", "1", "x" * 1000)
+        assert store.get(("project", "a", ""), "fp", "1") is not None
+        
+        store.put(("project", "c", ""), "fp", "1", "x" * 1000)
+        
+        assert store.get(("project", "b", ""), "fp", "1") is None
+        assert store.get(("project", "a", ""), "fp", "1") is not None
+        assert store.get(("project", "c", ""), "fp", "1") is not None
+        
+        store.invalidate("a")
+        assert store.get(("project", "a", ""), "fp", "1") is None
+        store.close()
+    
+    def test_open_result_store_in_project_cache_dir(self, temp_dir):
+        """Test that relative store paths are kept in the project's cache directory."""
+        project = temp_dir / "project"
+        
+        store = open_result_store({"result_store": "results.sqlite"}, project)
+        assert store.db_path == project / ".uai" / "cache" / "results.sqlite"
+        assert open_result_store({"result_store": "results.sqlite", "cache_dir": "cache"}, project).db_path == (
+            project / "cache" / "results.sqlite"
+        )
+        
+        # Absolute paths are shared by every project
+        shared = temp_dir / "shared.sqlite"
+        assert open_result_store({"result_store": str(shared)}, project).db_path == shared
+        assert open_result_store({"result_store": str(shared)}, temp_dir / "other") is open_result_store(
+            {"result_store": str(shared)}, project
+        )
+        
+        assert open_result_store({"result_store": None}, project) is None
+        assert open_result_store({"result_store": "results.sqlite", "cache_enabled": False}, project) is None
+
+
+class TestAnalysisMemoization:
+    """Test suite for analyzers sharing stored results."""
+    
+    @pytest.fixture
+    def project(self, temp_dir):
+        project = temp_dir / "project"
+        project.mkdir()
+        (project / "app.py").write_text("from flask import Flask\napp = Flask(__name__)\n")
+        (project / "requirements.txt").write_text("flask==3.0.0\n")
+        return project
+    
+    def _config(self, analyzer_class, temp_dir, **overrides):
+        config = analyzer_class()._default_config()
+        config.update(cache_dir=str(temp_dir / "scan-cache"), result_store=str(temp_dir / "results.sqlite"),
+                      vulnerability_db=None, **overrides)
+        return config
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_tree_reuses_analysis(self, project, temp_dir, monkeypatch):
+        """Test that a second analyzer gets the stored result until the tree changes."""
+        first = await UniversalProjectAnalyzer(self._config(UniversalProjectAnalyzer, temp_dir)).analyze_project(str(project))
+        
+        analyzer = UniversalProjectAnalyzer(self._config(UniversalProjectAnalyzer, temp_dir))
+        calls = []
+        original = analyzer._analyze_file_structure
+        monkeypatch.setattr(analyzer, "_analyze_file_structure", lambda index: calls.append(1) or original(index))
+        
+        stored = await analyzer.analyze_project(str(project))
+        assert calls == []
+        assert stored.dependencies == first.dependencies
+        assert stored.analysis_metadata == first.analysis_metadata
+        
+        # Other options are stored separately
+        await analyzer.analyze_project(str(project), depth="surface")
+        assert calls == [1]
+        
+        (project / "requirements.txt").write_text("flask==3.0.0\nrequests==2.31.0\n")
+        changed = await analyzer.analyze_project(str(project))
+        assert changed.dependencies["production"] == ["flask", "requests"]
+        
+        uncached = UniversalProjectAnalyzer(self._config(UniversalProjectAnalyzer, temp_dir, cache_enabled=False))
+        assert (await uncached.analyze_project(str(project))).dependencies == changed.dependencies
+    
+    @pytest.mark.asyncio
+    async def test_pattern_analysis_shared_between_analyzers(self, project, temp_dir):
+        """Test that separately constructed pattern analyzers share stored results."""
+        first = await PatternAnalyzer(self._config(PatternAnalyzer, temp_dir)).analyze_patterns(str(project))
+        
+        analyzer = PatternAnalyzer(self._config(PatternAnalyzer, temp_dir))
+        
+        async def not_collected(*args, **kwargs):
+            raise AssertionError("files were scanned again")
+        analyzer._collect_project_files = not_collected
+        
+        stored = await analyzer.analyze_patterns(str(project))
+        assert stored.overall_pattern_score == first.overall_pattern_score
+        assert [pattern.pattern_id for pattern in stored.patterns_detected] == [
+            pattern.pattern_id for pattern in first.patterns_detected
+        ]
+        assert analyzer.learning_database.patterns_db == [stored]
+    
+    def test_fingerprint_tracks_tree_changes(self, project):
+        """Test that the fingerprint changes with file content and layout only."""
+        fingerprint = ProjectFileIndex.build(project).fingerprint()
+        assert ProjectFileIndex.build(project).fingerprint() == fingerprint
+        
+        (project / "app.py").write_text("import os\n")
+        modified = ProjectFileIndex.build(project).fingerprint()
+        assert modified != fingerprint
+        
+        (project / "docs").mkdir()
+        assert ProjectFileIndex.build(project).fingerprint() != modified
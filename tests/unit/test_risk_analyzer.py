@@ -0,0 +1,48 @@
+"""
+Unit tests for the Risk Analyzer.
+"""
+
+import pytest
+
+from universal_ai_dev_platform.core.prediction.risk_analyzer import RiskAnalyzer
+
+
+VULNERABILITIES = [
+    {"package": "lodash", "version": "4.17.20", "severity": "CRITICAL"},
+    {"package": "lodash", "version": "4.17.20", "severity": "HIGH"},
+    {"package": "minimist", "version": "1.2.5", "severity": "LOW"},
+]
+
+
+class TestRiskAnalyzer:
+    """Test suite for RiskAnalyzer."""
+    
+    @pytest.fixture
+    def risk_analyzer(self):
+        """Create a risk analyzer for testing."""
+        return RiskAnalyzer()
+    
+    @pytest.mark.asyncio
+    async def test_dependency_risk_uses_known_vulnerabilities(self, risk_analyzer):
+        """Test that known vulnerabilities replace the outdated dependency estimate."""
+        metrics = {"dependency_count": 60, "lines_of_code": 1000}  # 0.55 from the dependency count alone
+        
+        estimated = await risk_analyzer._analyze_dependency_risks({"complexity_metrics": metrics}, "3_months")
+        assert estimated.metadata["known_vulnerabilities"] is None
+        assert estimated.metadata["risk_score"] == pytest.approx(0.8)
+        assert "Likely outdated dependencies requiring security updates" in estimated.factors
+        
+        clean = await risk_analyzer._analyze_dependency_risks(
+            {"complexity_metrics": metrics, "vulnerabilities": []}, "3_months"
+        )
+        assert clean.metadata["known_vulnerabilities"] == 0
+        assert clean.metadata["risk_score"] == pytest.approx(0.55)
+        assert not any("vulnerabilities" in factor or "outdated" in factor for factor in clean.factors)
+        
+        vulnerable = await risk_analyzer._analyze_dependency_risks(
+            {"complexity_metrics": metrics, "vulnerabilities": VULNERABILITIES}, "3_months"
+        )
+        assert vulnerable.metadata["known_vulnerabilities"] == 3
+        assert vulnerable.metadata["risk_score"] == pytest.approx(0.55 + 0.3 + 0.2 + 0.05)
+        assert vulnerable.probability == pytest.approx(0.9)
+        assert "3 known vulnerabilities in 2 dependencies (2 high or critical)" in vulnerable.factors
@@ -0,0 +1,173 @@
+"""
+Unit tests for the persistent Scan Cache.
+"""
+
+import os
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import ProjectFileIndex, ScanCache
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+
+
+class TestScanCache:
+    """Test suite for ScanCache."""
+    
+    @pytest.fixture
+    def cache_path(self, temp_dir):
+        """Location of a scan cache database."""
+        return temp_dir / ".uai" / "cache" / "scan_cache.sqlite"
+    
+    def test_roundtrip_across_sessions(self, cache_path):
+        """Test that entries persist and are returned for an unchanged stat key."""
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "sig")
+        cache.put("scanner", "src/app.py", (1, 2, 3), {"react": 2})
+        cache.close()
+        
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "sig")
+        assert cache.get("scanner", "src/app.py", (1, 2, 3)) == {"react": 2}
+        assert cache.hits == 1
+        cache.close()
+    
+    def test_changed_stat_key_invalidates(self, cache_path):
+        """Test that any change of mtime, size or inode is a miss."""
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "sig")
+        cache.put("scanner", "a.py", (1, 2, 3), {})
+        
+        assert cache.get("scanner", "a.py", (9, 2, 3)) is None
+        assert cache.get("scanner", "a.py", (1, 9, 3)) is None
+        assert cache.get("scanner", "a.py", (1, 2, 9)) is None
+        assert cache.misses == 3
+        cache.close()
+    
+    def test_partial_session_keeps_unvisited_entries(self, cache_path):
+        """Test that a sampled session neither prunes nor records a git baseline."""
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "sig")
+        cache.put("scanner", "a.py", (1, 2, 3), {"a": 1})
+        cache.put("scanner", "b.py", (1, 2, 3), {"b": 1})
+        cache.close()
+        
+        cache = ScanCache(cache_path)
+        cache.git_commit = "abc123"
+        cache.bind("scanner", "sig")
+        assert cache.get("scanner", "a.py", (1, 2, 3)) == {"a": 1}
+        cache.close(complete=False)
+        
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "sig")
+        assert cache.get("scanner", "b.py", (1, 2, 3)) == {"b": 1}
+        assert cache._conn.execute("SELECT git_commit FROM kinds").fetchone() == (None,)
+        cache.close()
+    
+    def test_signature_change_discards_kind(self, cache_path):
+        """Test that changing the rules of a kind drops its cached entries only."""
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "v1")
+        cache.bind("patterns", "v1")
+        cache.put("scanner", "a.py", (1, 2, 3), {})
+        cache.put("patterns", "a.py", (1, 2, 3), {})
+        cache.close()
+        
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "v2")
+        cache.bind("patterns", "v1")
+        assert cache.get("scanner", "a.py", (1, 2, 3)) is None
+        assert cache.get("patterns", "a.py", (1, 2, 3)) == {}
+        cache.close()
+    
+    def test_untouched_entries_are_pruned(self, cache_path):
+        """Test that entries not read or written in a session are dropped on close."""
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "sig")
+        cache.put("scanner", "kept.py", (1, 2, 3), {})
+        cache.put("scanner", "gone.py", (1, 2, 3), {})
+        cache.close()
+        
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "sig")
+        assert cache.get("scanner", "kept.py", (1, 2, 3)) == {}
+        cache.close()
+        
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "sig")
+        assert cache.get("scanner", "gone.py", (1, 2, 3)) is None
+        assert cache.get("scanner", "kept.py", (1, 2, 3)) == {}
+        cache.close()
+    
+    def test_git_baseline_trusts_unchanged_paths(self, cache_path):
+        """Test that unchanged files survive a stat change only at the recorded commit."""
+        cache = ScanCache(cache_path)
+        cache.git_commit = "abc"
+        cache.bind("scanner", "sig")
+        cache.put("scanner", "same.py", (1, 2, 3), {"react": 1})
+        cache.put("scanner", "edited.py", (1, 2, 3), {})
+        cache.close()
+        
+        cache = ScanCache(cache_path)
+        cache.trust_git_baseline("abc", {"same.py"})
+        cache.bind("scanner", "sig")
+        assert cache.get("scanner", "same.py", (7, 2, 8)) == {"react": 1}
+        assert cache.get("scanner", "edited.py", (7, 2, 8)) is None
+        cache.close()
+        
+        cache = ScanCache(cache_path)
+        cache.trust_git_baseline("other", {"same.py"})
+        cache.bind("scanner", "sig")
+        assert cache.get("scanner", "same.py", (9, 9, 9)) is None
+        assert cache.get("scanner", "same.py", (7, 2, 8)) == {"react": 1}
+        cache.close()
+    
+    def test_large_inode_is_storable(self, cache_path):
+        """Test that inodes above the signed 64-bit range still round-trip."""
+        key = (1, 2, (1 << 64) - 5)
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "sig")
+        cache.put("scanner", "a.py", key, {})
+        cache.close()
+        
+        cache = ScanCache(cache_path)
+        cache.bind("scanner", "sig")
+        assert cache.get("scanner", "a.py", key) == {}
+        cache.close()
+    
+    def test_index_stat_key_tracks_file_changes(self, sample_project_structure):
+        """Test that editing a file changes its index stat key."""
+        before = ProjectFileIndex.build(sample_project_structure)
+        app = sample_project_structure / "src" / "App.tsx"
+        stat = app.stat()
+        app.write_text(app.read_text() + "\n// edited\n")
+        os.utime(app, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        after = ProjectFileIndex.build(sample_project_structure)
+        
+        rel_path = "src/App.tsx"
+        assert before.stat_key(before.file_id(rel_path)) != after.stat_key(after.file_id(rel_path))
+    
+    @pytest.mark.asyncio
+    async def test_warm_analysis_reads_no_content(self, sample_project_structure, monkeypatch):
+        """Test that re-analyzing an unchanged project is served from the cache."""
+        analyzer = UniversalProjectAnalyzer()
+        cold = await analyzer.analyze_project(str(sample_project_structure))
+        assert (sample_project_structure / ".uai" / "cache" / "scan_cache.sqlite").exists()
+        
+        reads = []
+        
+        async def record_manifest_read(file_path, detected_tech):
+            reads.append(file_path)
+        
+        monkeypatch.setattr(analyzer, "_scan_framework_patterns", reads.append)
+        monkeypatch.setattr(analyzer, "_analyze_package_json", record_manifest_read)
+        warm = await analyzer.analyze_project(str(sample_project_structure))
+        
+        assert reads == []
+        assert warm.technology_stack == cold.technology_stack
+    
+    @pytest.mark.asyncio
+    async def test_cache_can_be_disabled(self, sample_project_structure):
+        """Test that no cache is written when caching is disabled."""
+        analyzer = UniversalProjectAnalyzer({"cache_enabled": False})
+        await analyzer.analyze_project(str(sample_project_structure))
+        
+        assert not (sample_project_structure / ".uai").exists()
@@ -0,0 +1,90 @@
+"""
+Unit tests for the streaming size distribution.
+"""
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import ProjectFileIndex, SizeDistribution
+from universal_ai_dev_platform.analysis.project_scanner.size_distribution import SIZE_BUCKET_LABELS
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+
+
+@pytest.fixture
+def project(temp_dir):
+    files = {
+        "src/app.py": 100,
+        "src/util.py": 3000,
+        "src/api/routes.py": 200,
+        "static/vendor/bundle.min.js": 600_000,
+        "static/vendor/logo.png": 50_000,
+        "static/fonts/icons.woff2": 20_000,
+        "data/dump.sql": 2_000_000,
+        "README.md": 10,
+        "LICENSE": 1000,
+    }
+    for path, size in files.items():
+        target = temp_dir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(b"x" * size)
+    return temp_dir
+
+
+def _distribution(project, **options):
+    index = ProjectFileIndex.build(project)
+    sizes = SizeDistribution(index, source_suffixes={".py", ".js"}, **options)
+    for file_id in index.source_files():
+        sizes.add(file_id)
+    return sizes
+
+
+class TestSizeDistribution:
+    """Test suite for SizeDistribution."""
+    
+    def test_histograms_and_totals(self, project):
+        """Test per-suffix histograms and byte totals."""
+        summary = _distribution(project).summary()
+        
+        assert summary["total_files"] == 9
+        assert summary["total_bytes"] == 2_674_310
+        assert summary["size_buckets"] == SIZE_BUCKET_LABELS
+        # 100 and 200 bytes fall in the first bucket, 3000 in the second
+        assert summary["histogram_by_suffix"][".py"] == [2, 1, 0, 0, 0, 0, 0, 0, 0]
+        assert summary["histogram_by_suffix"][".sql"][6] == 1
+        # Suffixes are listed by bytes, largest first
+        assert list(summary["bytes_by_suffix"])[:2] == [".sql", ".js"]
+        assert summary["bytes_by_suffix"][".py"] == 3300
+        assert summary["large_files"] == {"threshold": 1024 * 1024, "count": 1, "bytes": 2_000_000}
+    
+    def test_directory_totals_include_subdirectories(self, project):
+        """Test that directory totals roll up to every ancestor."""
+        summary = _distribution(project, top_k=3).summary()
+        
+        assert summary["largest_directories"] == [
+            {"path": "data", "bytes": 2_000_000, "files": 1},
+            {"path": "static", "bytes": 670_000, "files": 3},
+            {"path": "static/vendor", "bytes": 650_000, "files": 2},
+        ]
+    
+    def test_bounded_top_lists(self, project):
+        """Test the overall and per-category largest files."""
+        sizes = _distribution(project, top_k=2)
+        summary = sizes.summary()
+        
+        assert summary["largest_files"] == [("data/dump.sql", 2_000_000), ("static/vendor/bundle.min.js", 600_000)]
+        assert sizes.largest_files(absolute=True)[0] == (str(project / "data" / "dump.sql"), 2_000_000)
+        categories = summary["largest_by_category"]
+        assert categories["source"] == [("static/vendor/bundle.min.js", 600_000), ("src/util.py", 3000)]
+        assert categories["media"] == [("static/vendor/logo.png", 50_000), ("static/fonts/icons.woff2", 20_000)]
+        assert categories["other"] == [("LICENSE", 1000)]
+        assert all(len(files) <= 2 for files in categories.values())
+    
+    @pytest.mark.asyncio
+    async def test_file_structure_reports_distribution(self, project):
+        """Test that the file structure stage reports sizes from its single pass."""
+        analyzer = UniversalProjectAnalyzer()
+        structure = await analyzer._analyze_file_structure(ProjectFileIndex.build(project))
+        
+        assert structure["total_files"] == 9
+        assert structure["largest_files"][0] == (str(project / "data" / "dump.sql"), 2_000_000)
+        assert len(structure["largest_files"]) == 9
+        assert structure["size_distribution"]["large_files"]["count"] == 1
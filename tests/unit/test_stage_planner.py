@@ -0,0 +1,105 @@
+"""
+Unit tests for the analysis stage planner and depth-controlled analysis.
+"""
+
+import json
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner.stage_planner import (
+    ANALYSIS_STAGES, StageBudget, plan_analysis
+)
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+
+
+def _analyzer():
+    config = UniversalProjectAnalyzer()._default_config()
+    config.update(cache_enabled=False, vulnerability_db=None)
+    return UniversalProjectAnalyzer(config)
+
+
+class TestStagePlanner:
+    """Test suite for plan_analysis."""
+    
+    def test_depth_selects_cost_classes(self):
+        """Test that surface skips full-read stages and samples the index."""
+        surface = plan_analysis("surface")
+        assert not surface.runs("complexity_metrics")
+        assert surface.runs("dependencies") and surface.runs("technology_stack")
+        assert surface.index_max_files is not None
+        assert surface.budget("technology_stack").time_budget is not None
+        assert not surface.complete
+        
+        standard = plan_analysis()
+        assert list(standard.stages) == list(ANALYSIS_STAGES)
+        assert standard.budget("technology_stack").max_files == 100
+        assert standard.complete and not standard.parallel
+        
+        comprehensive = plan_analysis("comprehensive")
+        assert comprehensive.parallel
+        assert comprehensive.budget("technology_stack") == StageBudget(max_files=None)
+    
+    def test_focus_narrows_optional_stages(self):
+        """Test that focus keeps required stages and the optional stages feeding it."""
+        plan = plan_analysis("deep", ["security"])
+        assert plan.runs("dependencies") and plan.runs("vulnerabilities")
+        assert not plan.runs("complexity_metrics")
+        assert not plan.runs("architecture_patterns")
+        assert all(plan.runs(name) for name, spec in ANALYSIS_STAGES.items() if spec.required)
+        assert plan.describe()["skipped_stages"] == [
+            "architecture_patterns", "complexity_metrics", "duplicate_files", "syntax_summaries"
+        ]
+        
+        performance = plan_analysis("standard", ["performance"])
+        assert performance.runs("complexity_metrics") and not performance.runs("dependencies")
+    
+    def test_unknown_depth_or_focus(self):
+        """Test that invalid options are rejected."""
+        with pytest.raises(ValueError):
+            plan_analysis("exhaustive")
+        with pytest.raises(ValueError):
+            plan_analysis("standard", ["speed"])
+
+
+class TestDepthControlledAnalysis:
+    """Test suite for analyze_project depth and focus."""
+    
+    @pytest.fixture
+    def project(self, tmp_path):
+        (tmp_path / "app.py").write_text("def main(flag):\n    return 1 if flag else 0\n")
+        (tmp_path / "package.json").write_text(json.dumps({"dependencies": {"react": "^18.0.0"}}))
+        # Larger than the surface size budget for dependency files
+        (tmp_path / "requirements.txt").write_text("flask==3.0.0\n" + "# padding\n" * 30000)
+        return tmp_path
+    
+    @pytest.mark.asyncio
+    async def test_surface_skips_heavy_stages(self, project):
+        """Test that surface analysis skips metrics and oversized dependency files."""
+        analysis = await _analyzer().analyze_project(str(project), depth="surface")
+        
+        assert analysis.complexity_metrics == {}
+        assert analysis.dependencies["production"] == ["react"]
+        assert analysis.analysis_metadata["depth"] == "surface"
+        assert "complexity_metrics" in analysis.analysis_metadata["skipped_stages"]
+        assert analysis.analysis_metadata["index_truncated"] is False
+    
+    @pytest.mark.asyncio
+    async def test_comprehensive_matches_standard_results(self, project):
+        """Test that the parallel plan computes the same results as the standard one."""
+        analyzer = _analyzer()
+        standard = await analyzer.analyze_project(str(project))
+        comprehensive = await analyzer.analyze_project(str(project), depth="comprehensive")
+        
+        assert standard.dependencies["production"] == ["flask", "react"]
+        assert comprehensive.complexity_metrics == standard.complexity_metrics
+        assert comprehensive.dependency_graph == standard.dependency_graph
+        assert comprehensive.analysis_metadata["skipped_stages"] == []
+    
+    @pytest.mark.asyncio
+    async def test_focus_skips_unrelated_stages(self, project):
+        """Test that a performance focus measures code but skips dependencies."""
+        analysis = await _analyzer().analyze_project(str(project), focus=("performance",))
+        
+        assert analysis.complexity_metrics["function_count"] == 1
+        assert analysis.dependencies == {"production": [], "optional": [], "development": []}
+        assert analysis.architecture_patterns == []
@@ -0,0 +1,151 @@
+"""
+Unit tests for per-stage analysis profiles.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import AnalysisProfiler, StageProfile
+from universal_ai_dev_platform.analysis.project_scanner.stage_profiler import (
+    _assign_tracks, profile_stage, record_read
+)
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+from universal_ai_dev_platform.core.intelligence.pattern_analyzer import PatternAnalyzer
+
+
+@pytest.fixture
+def project(temp_dir):
+    project = temp_dir / "project"
+    (project / "src").mkdir(parents=True)
+    (project / "src" / "app.py").write_text("def handler(event):\n    return event\n" * 20)
+    (project / "src" / "models.py").write_text("class User:\n    pass\n")
+    (project / "requirements.txt").write_text("flask==2.3.0\n")
+    return project
+
+
+class TestAnalysisProfiler:
+    """Test suite for AnalysisProfiler and its exports."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_stages_get_their_own_reads(self):
+        """Test that reads are credited to the stage of the task doing them."""
+        profiler = AnalysisProfiler(trace_memory=True)
+        
+        async def stage(name, reads, allocate=0):
+            with profile_stage(name):
+                for size in reads:
+                    record_read(size)
+                    await asyncio.sleep(0)
+                buffer = bytearray(allocate)
+                await asyncio.sleep(0.01)
+                del buffer
+        
+        record_read(100)  # Outside any stage: not recorded
+        with profiler.activate():
+            with profile_stage("outer"):
+                await asyncio.gather(stage("a", [10, 20]), stage("b", [5], allocate=1024 * 1024))
+                await asyncio.to_thread(lambda: stage_in_thread())
+        assert profile_stage("after") is not None  # A null context once inactive
+        
+        stages = {stage["name"]: stage for stage in profiler.to_dict()["stages"]}
+        assert (stages["a"]["files"], stages["a"]["bytes_read"]) == (2, 30)
+        assert (stages["b"]["files"], stages["b"]["bytes_read"]) == (1, 5)
+        assert stages["thread"]["bytes_read"] == 7
+        assert stages["outer"]["bytes_read"] == 0
+        assert stages["a"]["parent"] == "outer"
+        assert stages["b"]["memory_peak"] >= 1024 * 1024
+        assert stages["outer"]["memory_peak"] >= 1024 * 1024
+        assert stages["outer"]["wall_time"] >= max(stages["a"]["wall_time"], stages["b"]["wall_time"])
+    
+    def test_trace_exports(self, temp_dir):
+        """Test that overlapping stages go to separate, well-nested tracks."""
+        profiler = AnalysisProfiler()
+        with profiler.activate():
+            with profile_stage("run"):
+                with profile_stage("index"):
+                    pass
+                with profile_stage("metrics"):
+                    record_read(4096)
+        # Fixed timings, plus a stage overlapping "metrics" without being nested in it
+        for stage, (start, end) in zip(profiler.stages, [(1.0, 2.0), (3.0, 6.0), (0.0, 10.0)], strict=True):
+            stage.start, stage.wall_time = start, end - start
+        profiler.stages.append(StageProfile("dependencies", 4.0, "run", wall_time=4.0))
+        
+        tracks = {stage.name: track for track, stage in _assign_tracks(profiler.stages)}
+        assert tracks["run"] == tracks["index"] == tracks["metrics"]
+        assert tracks["dependencies"] != tracks["metrics"]
+        
+        chrome_path = temp_dir / "trace.json"
+        profiler.write_trace(chrome_path)
+        events = [event for event in json.loads(chrome_path.read_text())["traceEvents"] if event["ph"] == "X"]
+        assert {event["name"] for event in events} == {"run", "index", "metrics", "dependencies"}
+        assert next(event for event in events if event["name"] == "metrics")["args"]["bytes_read"] == 4096
+        
+        speedscope_path = temp_dir / "trace.speedscope.json"
+        profiler.write_trace(speedscope_path, "speedscope")
+        speedscope = json.loads(speedscope_path.read_text())
+        for profile in speedscope["profiles"]:
+            stack = []
+            for event in profile["events"]:
+                if event["type"] == "O":
+                    stack.append(event["frame"])
+                else:
+                    assert stack.pop() == event["frame"]
+            assert stack == []
+            assert [event["at"] for event in profile["events"]] == sorted(event["at"] for event in profile["events"])
+        
+        with pytest.raises(ValueError):
+            profiler.write_trace(temp_dir / "trace.txt", "text")
+
+
+def stage_in_thread():
+    with profile_stage("thread"):
+        record_read(7)
+
+
+class TestProfiledAnalysis:
+    """Test suite for the profiles of analyzer runs."""
+    
+    @pytest.mark.asyncio
+    async def test_analysis_metadata_profile(self, project, temp_dir):
+        """Test that every stage is profiled, including the ones answered from the result store."""
+        config = UniversalProjectAnalyzer()._default_config()
+        config.update(result_store=str(temp_dir / "results.sqlite"), vulnerability_db=None, profile=True)
+        analysis = await UniversalProjectAnalyzer(config).analyze_project(str(project))
+        profile = analysis.analysis_metadata["profile"]
+        stages = {stage["name"]: stage for stage in profile["stages"]}
+        assert {"index", "result_store", "complexity_metrics", "technology_stack", "health"} <= set(stages)
+        assert stages["complexity_metrics"]["files"] == 2
+        assert stages["dependencies"]["bytes_read"] == len("flask==2.3.0\n")
+        assert profile["memory_traced"] is False and stages["health"]["memory_peak"] is None
+        
+        # Profiling is not an option of the result, and profiles are not stored with it
+        config.update(profile=False)
+        assert "profile" not in (await UniversalProjectAnalyzer(config).analyze_project(str(project))).analysis_metadata
+        
+        config.update(profile=True)
+        stored = await UniversalProjectAnalyzer(config).analyze_project(str(project))
+        stages = {stage["name"]: stage for stage in stored.analysis_metadata["profile"]["stages"]}
+        assert set(stages) == {"index", "result_store"}
+        assert stages["result_store"]["cached"] is True
+        
+        focused = await UniversalProjectAnalyzer(config).analyze_project(str(project), focus=["performance"])
+        stages = {stage["name"]: stage for stage in focused.analysis_metadata["profile"]["stages"]}
+        assert stages["complexity_metrics"]["cached"] is True
+        assert stages["complexity_metrics"]["files"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_pattern_analysis_profile(self, project):
+        """Test that pattern analysis stages join an active profiler."""
+        config = PatternAnalyzer()._default_config()
+        config.update(cache_enabled=False, result_store=None)
+        profiler = AnalysisProfiler()
+        with profiler.activate():
+            result = await PatternAnalyzer(config).analyze_patterns(str(project))
+        
+        stages = {stage["name"]: stage for stage in result.analysis_metadata["profile"]["stages"]}
+        assert stages["patterns.collect_files"]["files"] == 2  # .txt files are not scanned
+        assert {"patterns.index", "patterns.anti_patterns", "patterns.summarize"} <= set(stages)
+        assert len(profiler.stages) == len(stages)
@@ -0,0 +1,205 @@
+"""
+Unit tests for the analysis stage registry and DAG runner.
+"""
+
+import asyncio
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import AnalysisResultStore
+from universal_ai_dev_platform.analysis.project_scanner import stage_registry
+from universal_ai_dev_platform.analysis.project_scanner.stage_planner import COST_FULL
+from universal_ai_dev_platform.analysis.project_scanner.stage_registry import (
+    AnalysisStage, StageOutputCache, StageRegistry, load_stage_plugins, run_stages
+)
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+
+
+def _stage(name, inputs, outputs, run=None, **options):
+    return AnalysisStage(name, run or (lambda *args: None), tuple(inputs), tuple(outputs), **options)
+
+
+class TestStageRegistry:
+    """Test suite for stage registration and ordering."""
+    
+    def test_resolve_orders_by_dependencies(self):
+        """Test that stages follow their producers and unsatisfiable stages are dropped."""
+        registry = StageRegistry([
+            _stage("report", ["health", "stack"], ["report"]),
+            _stage("health", ["index", "stack"], ["health"]),
+            _stage("stack", ["index"], ["stack"]),
+            _stage("orphan", ["missing"], ["orphan"]),
+            _stage("after_orphan", ["orphan"], ["after_orphan"]),
+        ])
+        assert [stage.name for stage in registry.resolve(available=["index"])] == ["stack", "health", "report"]
+        assert [stage.name for stage in registry.resolve(["index"], include=lambda stage: stage.name != "health")] \
+            == ["stack"]
+        
+        with pytest.raises(ValueError):
+            registry.register(_stage("other_stack", ["index"], ["stack"]))
+        with pytest.raises(ValueError):
+            _stage("bad", [], ["value"], executor="gpu")
+        for executor in ("thread", "process"):
+            with pytest.raises(ValueError, match="cache"):
+                _stage("cached", ["index", "cache"], ["value"], executor=executor)
+        assert _stage("cached", ["index", "cache"], ["value"]).executor == "async"
+        
+        cyclic = StageRegistry([_stage("a", ["b"], ["a"]), _stage("b", ["a"], ["b"])])
+        with pytest.raises(ValueError):
+            cyclic.resolve()
+
+
+class TestRunStages:
+    """Test suite for run_stages."""
+    
+    @pytest.mark.asyncio
+    async def test_independent_stages_run_concurrently(self):
+        """Test that stages start as soon as their inputs exist, on every executor."""
+        ready = asyncio.Event()
+        
+        async def waits():
+            await asyncio.wait_for(ready.wait(), timeout=5)  # Only set by the sibling stage
+            return "waited"
+        
+        async def signals():
+            ready.set()
+            return "signalled"
+        
+        registry = StageRegistry([
+            _stage("waits", [], ["a"], waits),
+            _stage("signals", [], ["b"], signals),
+            _stage("joined", ["a", "b"], ["joined"], lambda a, b: f"{a}+{b}"),
+            _stage("total", ["numbers"], ["total"], sum, executor="process"),
+            _stage("count", ["numbers"], ["count"], len, executor="thread"),
+            _stage("split", ["numbers"], ["low", "high"], lambda numbers: (min(numbers), max(numbers))),
+        ])
+        values = await run_stages(registry.resolve(["numbers"]), {"numbers": [3, 1, 2]}, max_workers=1)
+        
+        assert values["joined"] == "waited+signalled"
+        assert (values["total"], values["count"], values["low"], values["high"]) == (6, 3, 1, 3)
+    
+    @pytest.mark.asyncio
+    async def test_failures(self):
+        """Test that optional stages fail softly and required failures stop the run."""
+        def broken():
+            raise RuntimeError("boom")
+        
+        soft = StageRegistry([
+            _stage("plugin", [], ["extra"], broken, optional=True),
+            _stage("uses_plugin", ["extra"], ["result"], lambda extra: extra is None),
+        ])
+        assert (await run_stages(soft.resolve(), {}))["result"] is True
+        
+        never_finished = []
+        
+        async def slow():
+            await asyncio.sleep(5)
+            never_finished.append(True)
+        
+        hard = StageRegistry([_stage("broken", [], ["value"], broken), _stage("slow", [], ["other"], slow)])
+        with pytest.raises(RuntimeError):
+            await run_stages(hard.resolve(), {})
+        assert never_finished == []
+    
+    @pytest.mark.asyncio
+    async def test_cacheable_outputs_are_reused(self, temp_dir):
+        """Test that cached stages are skipped for the same fingerprint."""
+        calls = []
+        registry = StageRegistry([
+            _stage("heavy", ["n"], ["square"], lambda n: calls.append(n) or n * n, cacheable=True),
+        ])
+        store = AnalysisResultStore(temp_dir / "results.sqlite")
+        try:
+            def cache(fingerprint):
+                return StageOutputCache(store, "/project", fingerprint, "1", lambda stage: "options")
+            
+            for fingerprint in ("tree-1", "tree-1", "tree-2"):
+                values = await run_stages(registry.resolve(["n"]), {"n": 4}, cache(fingerprint))
+                assert values["square"] == 16
+            assert calls == [4, 4]
+        finally:
+            store.close()
+
+
+class _EntryPoint:
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+    
+    def load(self):
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value
+
+
+class TestStagePlugins:
+    """Test suite for third-party stages loaded from entry points."""
+    
+    @pytest.fixture
+    def plugins(self, monkeypatch):
+        def todo_stages():
+            return [
+                AnalysisStage("todo_count", lambda index: len(index), ("index",), ("todo_count",)),
+                AnalysisStage("todo_report", lambda count, stack: f"{count} files of {stack.primary_language}",
+                              ("todo_count", "technology_stack"), ("todo_report",)),
+                AnalysisStage("deep_scan", lambda index: "scanned", ("index",), ("deep_scan",),
+                              cost=COST_FULL, focus=("security",)),
+            ]
+        
+        monkeypatch.setattr(stage_registry, "entry_points", lambda group: [
+            _EntryPoint("todo", todo_stages),
+            _EntryPoint("broken", ImportError("missing dependency")),
+            _EntryPoint("clash", AnalysisStage("health", len, ("index",), ("health_assessment",))),
+        ])
+        load_stage_plugins.cache_clear()
+        yield
+        load_stage_plugins.cache_clear()
+    
+    @pytest.mark.asyncio
+    async def test_plugin_outputs_become_extensions(self, plugins, temp_dir):
+        """Test that plugin stages run after the builtin stages they consume."""
+        (temp_dir / "app.py").write_text("print('hello')\n")
+        config = UniversalProjectAnalyzer()._default_config()
+        config.update(cache_enabled=False, vulnerability_db=None)
+        analyzer = UniversalProjectAnalyzer(config)
+        assert "todo_report" in analyzer.stage_registry
+        
+        analysis = await analyzer.analyze_project(str(temp_dir))
+        assert analysis.extensions == {"todo_count": 1, "todo_report": "1 files of python", "deep_scan": "scanned"}
+        
+        # Plugin stages are planned by their cost and focus like the builtin ones
+        surface = await analyzer.analyze_project(str(temp_dir), depth="surface")
+        assert "deep_scan" not in surface.extensions
+        focused = await analyzer.analyze_project(str(temp_dir), focus=["maintainability"])
+        assert focused.extensions == {"todo_count": 1, "todo_report": "1 files of python"}
+        
+        config.update(stage_plugins=False)
+        assert (await UniversalProjectAnalyzer(config).analyze_project(str(temp_dir))).extensions == {}
+
+
+class TestBuiltinStages:
+    """Test suite for the analyzer's builtin stage DAG."""
+    
+    @pytest.mark.asyncio
+    async def test_stage_outputs_shared_between_plans(self, temp_dir, monkeypatch):
+        """Test that a stage planned identically under other options is not run again."""
+        project = temp_dir / "project"
+        project.mkdir()
+        (project / "app.py").write_text("def handler(event):\n    return event\n")
+        config = UniversalProjectAnalyzer()._default_config()
+        config.update(result_store=str(temp_dir / "results.sqlite"), vulnerability_db=None)
+        analyzer = UniversalProjectAnalyzer(config)
+        
+        measured = []
+        original = analyzer._compute_complexity_metrics
+        
+        async def recording(*args, **kwargs):
+            measured.append(1)
+            return await original(*args, **kwargs)
+        monkeypatch.setattr(analyzer, "_compute_complexity_metrics", recording)
+        
+        performance = await analyzer.analyze_project(str(project), focus=["performance"])
+        maintainability = await analyzer.analyze_project(str(project), focus=["maintainability"])
+        assert measured == [1]
+        assert maintainability.complexity_metrics == performance.complexity_metrics
+        assert maintainability.complexity_metrics["function_count"] == 1
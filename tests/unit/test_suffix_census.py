@@ -0,0 +1,75 @@
+"""
+Unit tests for batched suffix classification.
+"""
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import ProjectFileIndex, SuffixClassifier
+from universal_ai_dev_platform.analysis.project_scanner import suffix_census
+from universal_ai_dev_platform.analysis.project_scanner.suffix_census import files_with_suffixes, suffix_table
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+
+
+@pytest.fixture
+def project(temp_dir):
+    files = [
+        "api/app.py", "api/models.py", "api/handlers/users.py", "api/handlers/Legacy.PY",
+        "web/index.ts", "web/App.tsx", "web/util.js", "web/style.css",
+        "README.md", "Makefile", "setup.py",
+        ".github/workflows/ci.py", "node_modules/pkg/index.js",
+    ]
+    for path in files:
+        target = temp_dir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text("x\n")
+    return temp_dir
+
+
+LANGUAGES = {"python": [".py"], "typescript": [".ts", ".tsx"], "javascript": [".js"]}
+
+
+class TestSuffixCensus:
+    """Test suite for SuffixClassifier and the suffix table helpers."""
+    
+    @pytest.mark.parametrize("vectorized", [True, False])
+    def test_counts_shares_and_directory_mix(self, project, monkeypatch, vectorized):
+        """Test that one pass yields file types, language shares and directory mixes."""
+        if not vectorized:
+            monkeypatch.setattr(suffix_census, "NUMPY_AVAILABLE", False)
+        elif not suffix_census.NUMPY_AVAILABLE:
+            pytest.skip("numpy is not installed")
+        census = SuffixClassifier(LANGUAGES).classify(ProjectFileIndex.build(project))
+        
+        # Hidden and ignored files are not counted; suffixes are matched lower-cased
+        assert census.total_files == 11
+        assert census.file_types() == {".md": 1, "": 1, ".py": 5, ".css": 1, ".ts": 1, ".tsx": 1, ".js": 1}
+        assert census.counts() == {"python": 5, "typescript": 2, "javascript": 1}
+        assert census.shares()["python"] == pytest.approx(5 / 8)
+        
+        mix = census.directory_mix()
+        assert mix == {"api": {"python": 1.0}, "web": {"typescript": 2 / 3, "javascript": 1 / 3}}
+        assert census.directory_mix(max_depth=2)["api/handlers"] == {"python": 1.0}
+    
+    def test_suffix_tables(self, project):
+        """Test per-suffix lookups and suffix-based file selection."""
+        index = ProjectFileIndex.build(project)
+        weights = suffix_table(index, {".py": 1.0, ".md": 0.3}, 0.5)
+        assert weights[index.suffix_ids[index.file_id("README.md")]] == 0.3
+        assert weights[index.suffix_ids[index.file_id("web/style.css")]] == 0.5
+        
+        selected = [index.paths[file_id] for file_id in files_with_suffixes(index, [".ts", ".js"])]
+        assert selected == ["web/index.ts", "web/util.js"]
+        assert files_with_suffixes(index, [".rs"]) == []
+    
+    @pytest.mark.asyncio
+    async def test_stages_share_the_census(self, project):
+        """Test that file structure and technology stack agree on the counts."""
+        analyzer = UniversalProjectAnalyzer()
+        index = ProjectFileIndex.build(project)
+        structure = await analyzer._analyze_file_structure(index)
+        stack = await analyzer._detect_technology_stack(index)
+        
+        assert structure["file_types"][".py"] == 5
+        assert structure["language_mix"]["web"]["typescript"] == pytest.approx(2 / 3)
+        assert stack.primary_language == "python"
+        assert stack.secondary_languages == ["typescript", "javascript"]
@@ -0,0 +1,117 @@
+"""
+Unit tests for the Syntax Parser.
+"""
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import ProjectFileIndex, ScanCache
+from universal_ai_dev_platform.analysis.project_scanner.syntax_parser import (
+    SyntaxParser, _source_edit, _summarize_python_ast
+)
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+
+
+PYTHON_SOURCE = b"""import os, a.b as z
+from ..pkg import helper
+
+class Service(Base):
+    def run(self, x):
+        if x:
+            return helper(x)
+        os.path.join("a", str(x)).strip()
+"""
+
+
+class TestSyntaxParser:
+    """Test suite for SyntaxParser."""
+    
+    @pytest.fixture
+    def parser(self):
+        """Parser for Python and JavaScript files."""
+        return SyntaxParser({"python": [".py"], "javascript": [".js"], "java": [".java"]})
+    
+    def test_python_summary(self, parser):
+        """Test that classes, functions, imports and calls are extracted."""
+        summary = parser.parse("service.py", PYTHON_SOURCE)
+        assert summary.classes == ["Service"]
+        assert summary.functions == ["run"]
+        assert summary.imports == ["os", "a.b", "..pkg"]
+        assert summary.calls == {"helper": 1, "os.path.join": 1, "str": 1}
+        assert not summary.has_errors
+    
+    def test_backends_agree_on_python(self, parser):
+        """Test that the ast fallback produces the same summary as tree-sitter."""
+        pytest.importorskip("tree_sitter_python")
+        tree_summary = parser.parse("service.py", PYTHON_SOURCE)
+        ast_summary = _summarize_python_ast(PYTHON_SOURCE)
+        assert tree_summary.backend == "tree-sitter"
+        for field_name in ("classes", "functions", "imports", "calls"):
+            assert getattr(tree_summary, field_name) == getattr(ast_summary, field_name)
+    
+    def test_unsupported_language(self, parser):
+        """Test that files without a grammar are not parsed."""
+        assert parser.grammar_for("Main.java") is None
+        assert parser.parse("Main.java", b"class Main {}") is None
+    
+    def test_reparse_reuses_previous_tree(self, parser):
+        """Test that an edited file is parsed incrementally to the same tree as a fresh parse."""
+        pytest.importorskip("tree_sitter_python")
+        parser.parse("service.py", PYTHON_SOURCE)
+        edited = PYTHON_SOURCE.replace(b"helper(x)", b"helper(x, retries=3)\n    def stop(self): pass")
+        
+        incremental = parser._parse_tree(parser._parser("python"), "service.py", edited)
+        fresh = parser._parser("python").parse(edited)
+        assert str(incremental.root_node) == str(fresh.root_node)
+        assert parser.parse("service.py", edited).functions == ["run", "stop"]
+    
+    def test_source_edit_points(self):
+        """Test the byte range and row/column points of a single edit."""
+        edit = _source_edit(b"ab\ncd\nef", b"ab\nXYZ\nef")
+        assert (edit["start_byte"], edit["old_end_byte"], edit["new_end_byte"]) == (3, 5, 6)
+        assert edit["start_point"] == (1, 0)
+        assert edit["old_end_point"] == (1, 2)
+        assert edit["new_end_point"] == (1, 3)
+        assert _source_edit(b"same", b"same") is None
+    
+    @pytest.mark.asyncio
+    async def test_summaries_are_cached_by_content(self, temp_dir, monkeypatch):
+        """Test that a copied file reuses the cached summary of identical content."""
+        (temp_dir / "service.py").write_bytes(PYTHON_SOURCE)
+        analyzer = UniversalProjectAnalyzer()
+        cache = ScanCache.for_project(temp_dir)
+        try:
+            first = await analyzer.extract_syntax_summaries(ProjectFileIndex.build(temp_dir), cache)
+        finally:
+            cache.close()
+        
+        (temp_dir / "copy.py").write_bytes(PYTHON_SOURCE)
+        monkeypatch.setattr(analyzer.syntax_parser, "parse",
+                            lambda *args: pytest.fail("summary should come from the cache"))
+        cache = ScanCache.for_project(temp_dir)
+        try:
+            second = await analyzer.extract_syntax_summaries(ProjectFileIndex.build(temp_dir), cache)
+        finally:
+            cache.close()
+        
+        assert second["copy.py"] == second["service.py"] == first["service.py"]
+    
+    @pytest.mark.asyncio
+    async def test_code_structure_stage(self, temp_dir):
+        """Test that analyses summarize the syntax of the project unless the plan skips it."""
+        (temp_dir / "service.py").write_bytes(PYTHON_SOURCE)
+        (temp_dir / "copy.py").write_bytes(PYTHON_SOURCE)
+        (temp_dir / "notes.txt").write_text("not source\n")
+        config = UniversalProjectAnalyzer()._default_config()
+        config.update(result_store=None, vulnerability_db=None)
+        analyzer = UniversalProjectAnalyzer(config)
+        
+        structure = (await analyzer.analyze_project(str(temp_dir))).code_structure
+        assert structure["files_parsed"] == 2
+        assert (structure["classes"], structure["functions"]) == (2, 2)
+        assert structure["languages"] == {"python": 2}
+        assert dict(structure["top_imports"])["os"] == 2
+        assert structure["files_with_errors"] == []
+        
+        skipped = await analyzer.analyze_project(str(temp_dir), depth="surface")
+        assert skipped.code_structure == {}
+        assert "syntax_summaries" in skipped.analysis_metadata["skipped_stages"]
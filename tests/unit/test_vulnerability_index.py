@@ -0,0 +1,225 @@
+"""
+Unit tests for the offline vulnerability index.
+"""
+
+import json
+import zipfile
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner.dependency_graph import DependencyGraph
+from universal_ai_dev_platform.analysis.project_scanner.file_index import ProjectFileIndex
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+from universal_ai_dev_platform.analysis.project_scanner.vulnerability_index import (
+    VulnerabilityIndex, advisory_severity, cvss3_base_score, version_in_range
+)
+
+
+def _advisory(advisory_id, ecosystem, name, events, modified="2024-01-01T00:00:00Z", **extra):
+    advisory = {
+        "id": advisory_id,
+        "modified": modified,
+        "summary": f"{advisory_id} in {name}",
+        "affected": [{
+            "package": {"ecosystem": ecosystem, "name": name},
+            "ranges": [{"type": "ECOSYSTEM" if ecosystem != "npm" else "SEMVER", "events": events}]
+        }]
+    }
+    advisory.update(extra)
+    return advisory
+
+
+ADVISORIES = [
+    _advisory("GHSA-lodash", "npm", "lodash", [{"introduced": "0"}, {"fixed": "4.17.21"}],
+              aliases=["CVE-2021-23337"], database_specific={"severity": "HIGH"}),
+    _advisory("PYSEC-jinja", "PyPI", "Jinja2", [{"introduced": "2.0"}, {"fixed": "2.11.3"},
+                                                {"introduced": "3.0.0"}, {"last_affected": "3.1.2"}],
+              severity=[{"type": "CVSS_V3", "score": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:L/I:N/A:N"}]),
+    _advisory("RUSTSEC-time", "crates.io", "time", [{"introduced": "0.2.0"}]),
+]
+
+
+def _open(tmp_path):
+    return VulnerabilityIndex(tmp_path / "db" / "vulnerabilities.sqlite")
+
+
+class TestVulnerabilityIndex:
+    """Test suite for OSV imports and interval lookups."""
+    
+    def test_import_directory_and_lookup(self, tmp_path):
+        """Test importing a dump directory and matching resolved packages against ranges."""
+        dump = tmp_path / "osv"
+        (dump / "npm").mkdir(parents=True)
+        for advisory in ADVISORIES:
+            (dump / "npm" / f"{advisory['id']}.json").write_text(json.dumps(advisory))
+        (dump / "broken.json").write_text("{not json")
+        
+        index = _open(tmp_path)
+        try:
+            counts = index.import_osv(dump)
+            assert counts == {"imported": 3, "unchanged": 0, "withdrawn": 0, "skipped_files": 0}
+            assert len(index) == 3
+            
+            matches = index.lookup([
+                ("npm", "lodash", "4.17.20"),
+                ("npm", "lodash", "4.17.21"),
+                ("pypi", "jinja2", "2.10"),
+                ("pypi", "jinja2", "2.11.3"),
+                ("pypi", "jinja2", "3.1.2"),
+                ("pypi", "jinja2", "3.1.3"),
+                ("cargo", "time", "0.1.45"),
+                ("cargo", "time", "0.3.0"),
+                ("npm", "left-pad", "1.0.0"),
+                ("npm", "lodash", ""),
+            ])
+        finally:
+            index.close()
+        
+        found = sorted((match.advisory_id, match.version, match.severity) for match in matches)
+        assert found == [
+            ("GHSA-lodash", "4.17.20", "HIGH"),
+            ("PYSEC-jinja", "2.10", "MEDIUM"),
+            ("PYSEC-jinja", "3.1.2", "MEDIUM"),
+            ("RUSTSEC-time", "0.3.0", "UNKNOWN"),
+        ]
+        lodash = next(match for match in matches if match.package == "lodash")
+        assert lodash.fixed_versions == ["4.17.21"]
+        assert lodash.aliases == ["CVE-2021-23337"]
+        assert lodash.summary == "GHSA-lodash in lodash"
+    
+    def test_delta_import_skips_unchanged_files(self, tmp_path):
+        """Test that re-importing a zip only reads changed members and applies newer advisories."""
+        archive_path = tmp_path / "npm.zip"
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            for advisory in ADVISORIES:
+                archive.writestr(f"{advisory['id']}.json", json.dumps(advisory))
+        
+        index = _open(tmp_path)
+        try:
+            assert index.import_osv(archive_path)["imported"] == 3
+            assert index.import_osv(archive_path) == {
+                "imported": 0, "unchanged": 0, "withdrawn": 0, "skipped_files": 3
+            }
+            
+            updated = _advisory("GHSA-lodash", "npm", "lodash", [{"introduced": "0"}, {"fixed": "4.17.22"}],
+                                modified="2024-06-01T00:00:00Z")
+            withdrawn = dict(ADVISORIES[2], modified="2024-06-01T00:00:00Z", withdrawn="2024-06-01T00:00:00Z")
+            with zipfile.ZipFile(archive_path, "w") as archive:
+                archive.writestr("GHSA-lodash.json", json.dumps(updated))
+                archive.writestr("PYSEC-jinja.json", json.dumps(ADVISORIES[1]))
+                archive.writestr("RUSTSEC-time.json", json.dumps(withdrawn))
+            assert index.import_osv(archive_path) == {
+                "imported": 1, "unchanged": 0, "withdrawn": 1, "skipped_files": 1
+            }
+            
+            # An older copy of an advisory never overwrites a newer one
+            stale = tmp_path / "stale.json"
+            stale.write_text(json.dumps([ADVISORIES[0]]))
+            assert index.import_osv(stale)["unchanged"] == 1
+            
+            assert len(index) == 2
+            matches = index.lookup([("npm", "lodash", "4.17.21"), ("cargo", "time", "0.3.0")])
+        finally:
+            index.close()
+        
+        assert [(match.advisory_id, match.fixed_versions) for match in matches] == [
+            ("GHSA-lodash", ["4.17.22"])
+        ]
+    
+    def test_versions_list_without_ranges(self, tmp_path):
+        """Test advisories that only enumerate affected versions."""
+        advisory = {
+            "id": "OSV-1", "modified": "2024-01-01T00:00:00Z",
+            "affected": [{"package": {"ecosystem": "PyPI", "name": "Some_Package"},
+                          "ranges": [{"type": "GIT", "events": [{"introduced": "abc"}]}],
+                          "versions": ["1.0", "1.1"]}],
+            "details": "Details used when there is no summary"
+        }
+        source = tmp_path / "advisory.json"
+        source.write_text(json.dumps(advisory))
+        
+        index = _open(tmp_path)
+        try:
+            index.import_osv(source)
+            matches = index.lookup([("pypi", "some-package", version) for version in ("1.0.0", "1.1", "1.2")])
+        finally:
+            index.close()
+        
+        assert sorted(match.version for match in matches) == ["1.0.0", "1.1"]
+        assert matches[0].summary == "Details used when there is no summary"
+    
+    def test_open_existing(self, tmp_path):
+        """Test that no index is opened when none has been imported."""
+        assert VulnerabilityIndex.open_existing(str(tmp_path / "missing.sqlite")) is None
+        assert VulnerabilityIndex.open_existing(None) is None
+        _open(tmp_path).close()
+        index = VulnerabilityIndex.open_existing(str(tmp_path / "db" / "vulnerabilities.sqlite"))
+        assert index is not None and len(index) == 0
+        index.close()
+
+
+class TestVersionsAndSeverity:
+    """Test suite for version ordering and severity ratings."""
+    
+    def test_version_ranges(self):
+        """Test interval bounds, pre-releases and PEP 440 ordering."""
+        assert version_in_range("npm", "1.0.0", "0", "1.0.1", None)
+        assert not version_in_range("npm", "1.0.1", "0", "1.0.1", None)
+        assert version_in_range("npm", "1.0.1-beta.2", "0", "1.0.1", None)
+        assert not version_in_range("npm", "1.0.1-beta.2", "1.0.1", None, None)
+        assert version_in_range("npm", "1.0.1-beta.10", "1.0.1-beta.2", None, None)
+        assert version_in_range("go", "v1.2", "1.2.0", None, "1.2.0")
+        assert not version_in_range("cargo", "1.10.0", "1.2.0", "1.9.0", None)
+        assert version_in_range("pypi", "2.0rc1", "1.0", "2.0", None)
+        assert not version_in_range("pypi", "2.0.post1", "1.0", "2.0", None)
+        assert version_in_range("maven", "2.15.0", "2.0-beta9", "2.15.1", None)
+    
+    def test_cvss3_base_score(self):
+        """Test CVSS v3 base scores against published examples."""
+        assert cvss3_base_score("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H") == 9.8
+        assert cvss3_base_score("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H") == 10.0
+        assert cvss3_base_score("CVSS:3.0/AV:N/AC:L/PR:N/UI:R/S:C/C:L/I:L/A:N") == 6.1
+        assert cvss3_base_score("CVSS:3.1/AV:L/AC:L/PR:L/UI:N/S:U/C:N/I:N/A:N") == 0.0
+        assert cvss3_base_score("CVSS:3.1/AV:N/AC:L") is None
+    
+    def test_advisory_severity(self):
+        """Test database ratings taking precedence over CVSS scores."""
+        critical = [{"type": "CVSS_V3", "score": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"}]
+        assert advisory_severity({"severity": critical}) == "CRITICAL"
+        assert advisory_severity({"severity": critical, "database_specific": {"severity": "moderate"}}) == "MEDIUM"
+        assert advisory_severity({"severity": [{"type": "CVSS_V2", "score": "AV:N/AC:L/Au:N/C:P/I:P/A:P"}]}) == "UNKNOWN"
+
+
+class TestVulnerabilityHealth:
+    """Test suite for vulnerability-based dependency health in the universal analyzer."""
+    
+    @pytest.mark.asyncio
+    async def test_dependency_health_uses_vulnerabilities(self, tmp_path):
+        """Test that known vulnerabilities lower the dependency health score."""
+        db_path = tmp_path / "vulnerabilities.sqlite"
+        index = VulnerabilityIndex(db_path)
+        source = tmp_path / "advisories.json"
+        source.write_text(json.dumps(ADVISORIES))
+        index.import_osv(source)
+        index.close()
+        
+        graph = DependencyGraph()
+        graph.add_package("npm", "lodash", "4.17.20")
+        graph.add_package("pypi", "jinja2", "3.1.3")
+        graph.add_package("npm", "unpinned")
+        
+        analyzer = UniversalProjectAnalyzer()
+        project_index = ProjectFileIndex.build(tmp_path)
+        
+        analyzer.config = dict(analyzer.config, vulnerability_db=str(db_path))
+        matches = analyzer._check_vulnerabilities(graph)
+        assert [match.advisory_id for match in matches] == ["GHSA-lodash"]
+        
+        assert await analyzer._assess_dependency_health(project_index) == pytest.approx(0.7)
+        clean = await analyzer._assess_dependency_health(project_index, graph, [])
+        vulnerable = await analyzer._assess_dependency_health(project_index, graph, matches)
+        assert clean == pytest.approx(0.7 + 0.1 * 2 / 3 + 0.2)
+        assert vulnerable == pytest.approx(0.7 + 0.1 * 2 / 3 - 0.1)
+        
+        analyzer.config["vulnerability_db"] = str(tmp_path / "missing.sqlite")
+        assert analyzer._check_vulnerabilities(graph) is None
@@ -0,0 +1,117 @@
+"""
+Unit tests for the analysis daemon behind `uai watch`.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from universal_ai_dev_platform.core.intelligence import AnalysisDaemon, query_daemon
+
+
+@pytest.fixture
+def project(temp_dir):
+    project = temp_dir / "project"
+    (project / "app").mkdir(parents=True)
+    (project / "app" / "main.py").write_text("from flask import Flask\napp = Flask(__name__)\n")
+    (project / "requirements.txt").write_text("flask==3.0.0\n")
+    return project
+
+
+def _daemon(project, temp_dir, **options):
+    config = {"cache_dir": str(temp_dir / "scan-cache"), "result_store": str(temp_dir / "results.sqlite"),
+              "vulnerability_db": None}
+    return AnalysisDaemon(str(project), config, socket_path=str(temp_dir / "daemon.sock"), **options)
+
+
+async def _wait_for_version(socket_path, version, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = await query_daemon(socket_path, "status")
+        if response["version"] >= version and not response["result"]["updating"]:
+            return response
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"Daemon did not reach version {version}")
+
+
+class TestAnalysisDaemon:
+    """Test suite for AnalysisDaemon and query_daemon."""
+
+    @pytest.mark.asyncio
+    async def test_serves_updates_after_file_changes(self, project, temp_dir):
+        """Test that a changed file is picked up and served without restarting."""
+        daemon = _daemon(project, temp_dir, use_polling=True, poll_interval=0.1)
+        server = asyncio.ensure_future(daemon.serve())
+        socket_path = str(daemon.socket_path)
+        try:
+            await daemon.started.wait()
+            status = (await _wait_for_version(socket_path, 1))["result"]
+            assert status["watcher"] == "polling"
+            assert status["fingerprint"] is not None
+
+            response = await query_daemon(socket_path, "analysis", field="dependencies.production")
+            assert response == {"ok": True, "version": 1, "result": ["flask"]}
+            patterns = await query_daemon(socket_path, "patterns", field="project_path")
+            assert patterns["result"] == str(project)
+
+            # Answered from the serialized documents
+            started = time.perf_counter()
+            for _ in range(20):
+                assert (await query_daemon(socket_path, "analysis"))["ok"]
+            assert (time.perf_counter() - started) / 20 < 0.05
+
+            (project / "requirements.txt").write_text("flask==3.0.0\nrequests==2.31.0\n")
+            stat = (project / "requirements.txt").stat()
+            os.utime(project / "requirements.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            await _wait_for_version(socket_path, 2)
+
+            response = await query_daemon(socket_path, "analysis", field="dependencies.production")
+            assert response["result"] == ["flask", "requests"]
+            changes = (await query_daemon(socket_path, "changes", since=1))["result"]
+            assert changes == {"since": 1, "paths": ["requirements.txt"], "complete": True}
+
+            # Writes below hidden directories (caches, the socket) do not trigger updates
+            (project / ".uai" / "scratch").mkdir(parents=True, exist_ok=True)
+            await asyncio.sleep(0.3)
+            assert (await query_daemon(socket_path, "status"))["version"] == 2
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+        assert not daemon.socket_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_query_errors(self, project, temp_dir):
+        """Test that bad queries are answered with errors and the daemon keeps serving."""
+        daemon = _daemon(project, temp_dir, use_polling=True, poll_interval=60)
+        server = asyncio.ensure_future(daemon.serve())
+        socket_path = str(daemon.socket_path)
+        try:
+            await daemon.started.wait()
+            await _wait_for_version(socket_path, 1)
+
+            unknown = await query_daemon(socket_path, "reanalyze")
+            assert not unknown["ok"] and "Unknown query" in unknown["error"]
+            missing = await query_daemon(socket_path, "analysis", field="dependencies.missing")
+            assert missing == {"ok": False, "version": 1, "error": "Unknown field: dependencies.missing"}
+
+            # A refresh rescans immediately instead of waiting for the next poll
+            (project / "app" / "views.py").write_text("def index():\n    return 'ok'\n")
+            refreshed = await query_daemon(socket_path, "refresh")
+            assert refreshed["version"] == 2
+
+            with pytest.raises(RuntimeError):
+                await _daemon(project, temp_dir).serve()
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+
+    def test_event_filter(self, project, temp_dir):
+        """Test that events below hidden and ignored directories are dropped."""
+        daemon = _daemon(project, temp_dir)
+        assert daemon._is_relevant(str(project / "app" / "main.py"))
+        assert daemon._is_relevant(str(project / ".github" / "workflows" / "ci.yml"))
+        assert not daemon._is_relevant(str(project / ".uai" / "cache" / "scan.sqlite"))
+        assert not daemon._is_relevant(str(project / "node_modules" / "react" / "index.js"))
+        assert not daemon._is_relevant(str(temp_dir / "elsewhere.py"))
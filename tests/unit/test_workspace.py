@@ -0,0 +1,122 @@
+"""
+Unit tests for workspace discovery and per-package sub-analyses.
+"""
+
+import json
+
+import pytest
+
+from universal_ai_dev_platform.analysis.project_scanner import ProjectFileIndex
+from universal_ai_dev_platform.analysis.project_scanner.fingerprint import fingerprint_index
+from universal_ai_dev_platform.analysis.project_scanner.universal_analyzer import UniversalProjectAnalyzer
+from universal_ai_dev_platform.analysis.project_scanner.workspace import find_package_roots, package_parents
+
+
+@pytest.fixture
+def monorepo(temp_dir):
+    files = {
+        "package.json": {"private": True, "workspaces": ["packages/*"]},
+        "packages/web/package.json": {"dependencies": {"react": "^18.0.0"}},
+        "packages/web/src/App.jsx": "export default () => null\n",
+        "packages/api/pyproject.toml": "[project]\nname = \"api\"\n",
+        "packages/api/requirements.txt": "flask==3.0.0\n",
+        "packages/api/app.py": "from flask import Flask\n",
+        "packages/api/plugins/auth/package.json": {"dependencies": {"express": "^4.0.0"}},
+        "packages/api-client/setup.py": "from setuptools import setup\n",
+        "docs/requirements.txt": "sphinx==7.0.0\n",
+        "node_modules/left-pad/package.json": {"name": "left-pad"},
+    }
+    for path, content in files.items():
+        target = temp_dir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content if isinstance(content, str) else json.dumps(content))
+    return temp_dir
+
+
+class TestWorkspaceDiscovery:
+    """Test suite for find_package_roots, package_parents and index subtrees."""
+    
+    def test_package_roots_and_nesting(self, monorepo):
+        """Test that manifest directories are found with packages after their parents."""
+        roots = find_package_roots(ProjectFileIndex.build(monorepo))
+        
+        # Requirement lists alone and ignored directories are not packages
+        assert roots == ["packages/api", "packages/api/plugins/auth", "packages/api-client", "packages/web"]
+        assert package_parents(roots) == {
+            "packages/api": None,
+            "packages/api/plugins/auth": "packages/api",
+            "packages/api-client": None,
+            "packages/web": None,
+        }
+        assert find_package_roots(ProjectFileIndex.build(monorepo), max_packages=1) == ["packages/api"]
+    
+    def test_subtree_matches_a_fresh_index(self, monorepo):
+        """Test that a subtree of the index equals indexing the directory itself."""
+        index = ProjectFileIndex.build(monorepo)
+        sub = index.subtree("packages/api")
+        fresh = ProjectFileIndex.build(monorepo / "packages" / "api")
+        
+        assert sub.root == monorepo / "packages" / "api"
+        assert sorted(sub.paths) == sorted(fresh.paths)
+        assert sorted(sub.directories) == sorted(fresh.directories)
+        assert sub.file_id("plugins/auth/package.json") is not None
+        assert sub.glob("*.toml") == ["pyproject.toml"]
+        assert [sub.paths[file_id] for file_id in sub.files_in_directory(0)] == [
+            "app.py", "pyproject.toml", "requirements.txt"
+        ]
+        # The subtree hashes like the directory's node in the project's Merkle tree
+        assert fingerprint_index(sub).digest == fingerprint_index(index).nodes["packages/api"].digest.hex()
+        
+        with pytest.raises(ValueError):
+            index.subtree("missing")
+
+
+class TestWorkspaceAnalysis:
+    """Test suite for workspace sub-analyses in analyze_project."""
+    
+    def _analyzer(self, temp_dir, **overrides):
+        config = UniversalProjectAnalyzer()._default_config()
+        config.update(cache_dir=str(temp_dir / ".uai" / "cache"), result_store=str(temp_dir / ".uai" / "results.sqlite"),
+                      vulnerability_db=None, **overrides)
+        return UniversalProjectAnalyzer(config)
+    
+    @pytest.mark.asyncio
+    async def test_packages_become_sub_projects(self, monorepo):
+        """Test that every package is analyzed on its own and rolled up."""
+        analysis = await self._analyzer(monorepo).analyze_project(str(monorepo))
+        
+        children = {child.analysis_metadata["package_path"]: child for child in analysis.sub_projects}
+        assert list(children) == ["packages/api", "packages/api-client", "packages/web"]
+        assert [child.project_name for child in children["packages/api"].sub_projects] == ["auth"]
+        
+        assert "flask" in children["packages/api"].technology_stack.frameworks
+        assert "react" not in children["packages/api"].technology_stack.frameworks
+        assert "react" in children["packages/web"].technology_stack.frameworks
+        # The root only has a workspace manifest; its stack comes from the packages
+        assert {"react", "flask", "express"} <= set(analysis.technology_stack.frameworks)
+        assert "express" in children["packages/api"].technology_stack.frameworks
+        assert analysis.analysis_metadata["workspace_packages"] == 4
+        
+        single = await self._analyzer(monorepo, workspace_detection=False).analyze_project(str(monorepo))
+        assert single.sub_projects == []
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_packages_are_skipped(self, monorepo, monkeypatch):
+        """Test that only changed packages are analyzed again."""
+        await self._analyzer(monorepo).analyze_project(str(monorepo))
+        
+        analyzer = self._analyzer(monorepo)
+        analyzed = []
+        original = analyzer._analyze_index
+        
+        async def recording(index, cache, plan, store=None):
+            analyzed.append(index.root.relative_to(monorepo).as_posix())
+            return await original(index, cache, plan, store)
+        monkeypatch.setattr(analyzer, "_analyze_index", recording)
+        
+        (monorepo / "packages" / "web" / "src" / "App.jsx").write_text("export default () => 1\n")
+        analysis = await analyzer.analyze_project(str(monorepo))
+        
+        assert analyzed == [".", "packages/web"]
+        assert len(analysis.sub_projects) == 3
+        assert [child.project_name for child in analysis.sub_projects[0].sub_projects] == ["auth"]